@@ -0,0 +1,82 @@
+"""Per-invoke overhead of getting a compiled graph: fresh compile vs the process cache.
+
+Each iteration starts a practice thread on a pooled scene (the graph goes
+straight to the user's turn), so no LLM is called and the time measured is graph
+setup, checkpointer connection and checkpoint writes.
+
+    python benchmarks/graph_overhead.py [--runs 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from openpraxis.db import connect
+from openpraxis.graph import build_graph, close_compiled_graphs, get_compiled_graph
+from openpraxis.models import PracticeMessage, PracticeScene, SceneType
+
+
+def _uncached_graph(db_path: str):
+    """What ``get_compiled_graph`` did before the cache (the connection is never closed)."""
+    conn = connect(
+        db_path + ".checkpoints", None, check_same_thread=False, factory=sqlite3.Connection
+    )
+    return build_graph().compile(checkpointer=SqliteSaver(conn))
+
+
+def _initial_state() -> dict:
+    scene = PracticeScene(
+        scene_id=str(uuid4()),
+        scene_type=SceneType.EXPLAIN,
+        role="Tech Lead",
+        task="Explain RAG failure modes in 3 minutes.",
+        constraints=["3 minutes"],
+        rubric=["clarity"],
+        expected_structure_hint=["Definition", "Example"],
+    )
+    return {
+        "input_id": "bench",
+        "raw_text": "bench",
+        "scene": scene,
+        "practice_messages": [PracticeMessage(role="coach", content="Walk me through it.")],
+    }
+
+
+def _measure(get_graph, db_path: str, runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        graph = get_graph(db_path)
+        graph.invoke(_initial_state(), config={"configurable": {"thread_id": str(uuid4())}})
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<10} median {statistics.median(timings):7.2f} ms   p95 {p95:7.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "praxis.db")
+        get_compiled_graph(db_path)  # warm imports and create the checkpoint tables
+        _report("uncached", _measure(_uncached_graph, db_path, args.runs))
+        _report("cached", _measure(get_compiled_graph, db_path, args.runs))
+        close_compiled_graphs()
+
+
+if __name__ == "__main__":
+    main()
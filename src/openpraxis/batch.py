@@ -0,0 +1,450 @@
+"""Offline bulk processing through the provider Batch API (``praxis batch``).
+
+``submit_batch`` serializes pending Tagger or practice-generator requests into
+a JSONL file of chat-completion requests, uploads it and records the batch in
+``batch_jobs`` (and each request in ``batch_requests``).  ``refresh_batches``
+polls the provider for progress.  ``collect_batch`` downloads the output file,
+validates every reply against ``TaggerOutput`` / ``PracticeSceneLLM`` and
+writes it through ``db.py`` as the synchronous paths do.  Batches cost about
+half as much as synchronous calls but may take up to the completion window
+(24 hours), so they suit backfills and nightly re-tagging, not anything a user
+is waiting on.
+
+Requests use the same prompts, node routing (``[llm.nodes.<name>]`` model,
+temperature and reply-token cap) and response schema as the synchronous calls.
+Long inputs need the map-reduce Tagger (two dependent rounds of calls) and are
+left to the synchronous paths.  Pooled scenes from a batch have no coach
+opening; ``praxis practice`` asks the coach for it when the scene is taken.
+
+Queued worker jobs (``praxis add --async``) for the batched inputs are parked
+while the batch runs, so the worker does not redo the work.  Collecting deletes
+them, queueing the ``generate`` follow-up a ``tag`` job asked for, or hands
+them back to the queue when their request failed.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+
+from pydantic import BaseModel, Field
+
+from openpraxis.db import (
+    clear_pool_requests,
+    count_pooled_scenes,
+    create_batch_job,
+    enqueue_job,
+    finish_batched_jobs,
+    get_batch_job,
+    get_batch_requests,
+    get_batched_input_ids,
+    get_input_by_id,
+    get_job_input_ids,
+    get_pool_requests,
+    get_tagger_input_ids,
+    get_untagged_input_ids,
+    list_batch_jobs,
+    mark_batch_collected,
+    park_batched_jobs,
+    requeue_batched_jobs,
+    save_chunks,
+    save_pooled_scene,
+    save_tagger_output,
+    transaction,
+    update_batch_job,
+)
+from openpraxis.models import PracticeSceneLLM, TaggerOutput
+from openpraxis.pool import pool_versions, practice_state
+from openpraxis.prompts import get_prompt_version
+from openpraxis.scheduler import format_timestamp, utc_now
+
+BATCH_KINDS = ("tag", "generate")
+# Graph node whose prompt (and ``[llm.nodes]`` route) each kind of batch uses.
+BATCH_NODES = {"tag": "tagger", "generate": "practice_generator"}
+# Providers with the OpenAI Files + Batches endpoints.
+BATCH_PROVIDERS = ("openai",)
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+# Provider statuses after which a batch will not change any more.
+FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+# Upload / poll calls are few and cheap to repeat, so the SDK retries them.
+_CLIENT_RETRIES = 3
+
+
+class BatchSubmitResult(BaseModel):
+    """A submitted batch (``batch_id`` is None when nothing was pending)."""
+
+    kind: str
+    batch_id: str | None = None
+    requests: int = 0
+    skipped: list[tuple[str, str]] = Field(default_factory=list)
+
+
+class BatchItemResult(BaseModel):
+    """Outcome for one request of a collected batch."""
+
+    input_id: str
+    custom_id: str
+    ok: bool
+    error: str | None = None
+
+
+class BatchCollectSummary(BaseModel):
+    """Counts for one collected batch."""
+
+    batch_id: str
+    saved: int = 0
+    failed: int = 0
+    failures: list[BatchItemResult] = Field(default_factory=list)
+
+    def record(self, result: BatchItemResult) -> None:
+        if result.ok:
+            self.saved += 1
+        else:
+            self.failed += 1
+            self.failures.append(result)
+
+
+@contextmanager
+def _node_settings(node: str) -> Iterator:
+    """Settings for ``node``'s calls: its routed provider, model and reply-token cap."""
+    from openpraxis.config import get_settings, llm_overrides
+    from openpraxis.runtime import ExecutionMode, current_model_id, get_execution_mode
+
+    if get_execution_mode() == ExecutionMode.OPENCLAW:
+        raise ValueError("Batch processing calls the provider directly; not in OpenClaw mode.")
+    route = get_settings().llm_nodes.get(node)
+    model = current_model_id(node).split("/", 1)[1]
+    with llm_overrides(
+        provider=route.provider if route else None,
+        model=model,
+        max_output_tokens=route.max_output_tokens if route else None,
+    ) as settings:
+        if settings.llm_provider not in BATCH_PROVIDERS:
+            raise ValueError(
+                f"{settings.llm_provider} has no Batch API support "
+                f"(supported: {', '.join(BATCH_PROVIDERS)})."
+            )
+        yield settings
+
+
+def _provider_settings(provider: str):
+    """Settings for calls about a batch submitted to ``provider``."""
+    from openpraxis.config import get_settings, llm_overrides
+
+    if provider == get_settings().llm_provider:
+        return nullcontext()
+    return llm_overrides(provider=provider)
+
+
+def _client():
+    from openpraxis.llm import get_client
+
+    return get_client().with_options(max_retries=_CLIENT_RETRIES)
+
+
+def _request_line(
+    custom_id: str,
+    model: str,
+    messages: list[dict],
+    response_model: type[BaseModel],
+    temperature: float,
+) -> dict:
+    """One line of a batch input file."""
+    from openpraxis.llm import _output_limit, _response_format
+
+    body = {
+        "model": model,
+        "messages": messages,
+        "response_format": _response_format(response_model),
+        "temperature": temperature,
+        **_output_limit("chat"),
+    }
+    return {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}
+
+
+def _node_temperature(node: str, default: float) -> float:
+    from openpraxis.config import get_settings
+
+    route = get_settings().llm_nodes.get(node)
+    if route is None or route.temperature is None:
+        return default
+    return route.temperature
+
+
+def _tag_requests(
+    conn: sqlite3.Connection, model: str, stale: bool, limit: int | None
+) -> tuple[list[dict], list[tuple[str, str]], list[tuple[str, str]]]:
+    """Request lines, ``(custom_id, input_id)`` pairs and skipped inputs for the Tagger."""
+    from openpraxis.chunking import needs_chunking
+    from openpraxis.llm import _system_user_messages
+    from openpraxis.nodes.tagger import TAGGER_TEMPERATURE, _tagger_user_content
+    from openpraxis.prompts import get_tagger_system_prompt
+
+    input_ids = get_untagged_input_ids(conn)
+    if stale:
+        input_ids += get_tagger_input_ids(conn, stale_for=get_prompt_version("tagger"))
+    in_flight = get_batched_input_ids(conn, "tag")
+    running = get_job_input_ids(conn, "tag", "leased")
+    temperature = _node_temperature("tagger", TAGGER_TEMPERATURE)
+    system_prompt = get_tagger_system_prompt()
+    lines: list[dict] = []
+    requests: list[tuple[str, str]] = []
+    skipped: list[tuple[str, str]] = []
+    for input_id in dict.fromkeys(input_ids):
+        if limit is not None and len(lines) >= limit:
+            break
+        if input_id in in_flight:
+            continue
+        if input_id in running:
+            skipped.append((input_id, "a worker is tagging it"))
+            continue
+        row = get_input_by_id(conn, input_id)
+        if needs_chunking(row["raw_text"]):
+            skipped.append((input_id, "long input: needs the synchronous map-reduce Tagger"))
+            continue
+        state = {"input_id": input_id, "raw_text": row["raw_text"], "type_hint": row["type_hint"]}
+        custom_id = f"tag-{input_id}"
+        messages = _system_user_messages(system_prompt, _tagger_user_content(state))
+        lines.append(_request_line(custom_id, model, messages, TaggerOutput, temperature))
+        requests.append((custom_id, input_id))
+    return lines, requests, skipped
+
+
+def _generate_requests(
+    conn: sqlite3.Connection, model: str, pool_size: int, limit: int | None
+) -> tuple[list[dict], list[tuple[str, str]], list[tuple[str, str]]]:
+    """Request lines, ``(custom_id, input_id)`` pairs and skipped inputs for queued pool refills."""
+    from openpraxis.llm import _system_user_messages
+    from openpraxis.nodes.practice import _generator_user_content
+    from openpraxis.prompts import get_practice_generator_system_prompt
+
+    targets = get_pool_requests(conn)
+    counts = count_pooled_scenes(conn, targets, pool_versions())
+    in_flight = get_batched_input_ids(conn, "generate")
+    # ``call_structured``'s default, which the generator node uses.
+    temperature = _node_temperature("practice_generator", 0.7)
+    system_prompt = get_practice_generator_system_prompt()
+    lines: list[dict] = []
+    requests: list[tuple[str, str]] = []
+    skipped: list[tuple[str, str]] = []
+    for input_id in targets:
+        missing = pool_size - counts.get(input_id, 0)
+        if missing <= 0 or input_id in in_flight:
+            continue
+        if limit is not None and len(lines) + missing > limit:
+            break
+        try:
+            state = practice_state(conn, input_id)
+        except LookupError as exc:
+            skipped.append((input_id, str(exc)))
+            continue
+        messages = _system_user_messages(system_prompt, _generator_user_content(state))
+        for n in range(missing):
+            custom_id = f"generate-{input_id}-{n}"
+            lines.append(_request_line(custom_id, model, messages, PracticeSceneLLM, temperature))
+            requests.append((custom_id, input_id))
+    return lines, requests, skipped
+
+
+def submit_batch(
+    conn: sqlite3.Connection,
+    kind: str,
+    stale: bool = False,
+    limit: int | None = None,
+    pool_size: int = 2,
+) -> BatchSubmitResult:
+    """Upload every pending ``kind`` request (at most ``limit``) as one provider batch.
+
+    ``tag``: inputs without a TaggerOutput, plus (with ``stale``) those tagged
+    by another Tagger prompt version.  ``generate``: scenes missing from the
+    pool (up to ``pool_size`` per input) for inputs queued for a refill.
+    Inputs already in a batch that has not been collected are left out.
+    Queued ``kind`` jobs for the submitted inputs are parked until collection.
+    """
+    if kind not in BATCH_KINDS:
+        raise ValueError(f"Unknown batch kind: {kind} (expected one of {', '.join(BATCH_KINDS)})")
+    result = BatchSubmitResult(kind=kind)
+    with _node_settings(BATCH_NODES[kind]) as settings:
+        model = settings.model_name
+        if kind == "tag":
+            versions = (get_prompt_version("tagger"), None)
+            lines, requests, result.skipped = _tag_requests(conn, model, stale, limit)
+        else:
+            versions = pool_versions()
+            lines, requests, result.skipped = _generate_requests(conn, model, pool_size, limit)
+        if not lines:
+            return result
+        payload = "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines)
+        client = _client()
+        uploaded = client.files.create(
+            file=(f"praxis-{kind}.jsonl", payload.encode("utf-8")), purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=COMPLETION_WINDOW,
+            metadata={"praxis_kind": kind},
+        )
+        provider = settings.llm_provider
+    with transaction(conn):
+        create_batch_job(
+            conn, batch.id, kind, provider, model, uploaded.id, batch.status, requests, *versions
+        )
+        park_batched_jobs(conn, kind, sorted({input_id for _, input_id in requests}))
+    result.batch_id = batch.id
+    result.requests = len(requests)
+    return result
+
+
+def refresh_batches(conn: sqlite3.Connection, batch_id: str | None = None) -> list[sqlite3.Row]:
+    """Fetch the provider status of ``batch_id`` (default: every uncollected batch).
+
+    Returns the refreshed rows.  Batches already in a final status are not polled.
+    """
+    rows = [_require_batch(conn, batch_id)] if batch_id else list_batch_jobs(conn, True)
+    for row in rows:
+        if row["status"] in FINAL_STATUSES:
+            continue
+        with _provider_settings(row["provider"]):
+            batch = _client().batches.retrieve(row["id"])
+        counts = batch.request_counts
+        update_batch_job(
+            conn,
+            row["id"],
+            batch.status,
+            batch.output_file_id,
+            batch.error_file_id,
+            counts.completed if counts else 0,
+            counts.failed if counts else 0,
+        )
+    return [get_batch_job(conn, row["id"]) for row in rows]
+
+
+def _require_batch(conn: sqlite3.Connection, batch_id: str) -> sqlite3.Row:
+    row = get_batch_job(conn, batch_id)
+    if row is None:
+        raise LookupError(f"batch {batch_id} not found")
+    return row
+
+
+def _read_results(file_id: str | None) -> dict[str, dict]:
+    """``custom_id`` -> result line of a batch output or error file."""
+    if not file_id:
+        return {}
+    text = _client().files.content(file_id).text
+    results: dict[str, dict] = {}
+    for line in text.splitlines():
+        if line.strip():
+            item = json.loads(line)
+            results[item["custom_id"]] = item
+    return results
+
+
+def _reply_content(item: dict | None) -> str:
+    """Message content of a successful result line; raise ValueError for anything else."""
+    if item is None:
+        raise ValueError("no result in the batch output")
+    if item.get("error"):
+        error = item["error"]
+        raise ValueError(f"{error.get('code')}: {error.get('message')}")
+    response = item.get("response") or {}
+    body = response.get("body") or {}
+    if response.get("status_code") != 200:
+        message = (body.get("error") or {}).get("message", "request failed")
+        raise ValueError(f"HTTP {response.get('status_code')}: {message}")
+    choice = body["choices"][0]
+    if choice.get("finish_reason") == "length":
+        raise ValueError("reply hit the output token limit")
+    message = choice["message"]
+    if message.get("refusal"):
+        raise ValueError(f"refused: {message['refusal']}")
+    if not message.get("content"):
+        raise ValueError("empty reply")
+    return message["content"]
+
+
+def _save_result(
+    conn: sqlite3.Connection, row: sqlite3.Row, input_id: str, content: str
+) -> None:
+    """Validate one reply and write it (caller holds the transaction)."""
+    if row["kind"] == "tag":
+        output = TaggerOutput.model_validate_json(content)
+        model_id = f"{row['provider']}/{row['model']}"
+        save_tagger_output(conn, input_id, output, model_id, row["prompt_version"])
+        # Only short inputs are batched; drop chunks left by an earlier long version.
+        save_chunks(conn, input_id, [])
+    else:
+        from openpraxis.nodes.practice import _scene_from_llm
+
+        scene = _scene_from_llm(PracticeSceneLLM.model_validate_json(content))
+        save_pooled_scene(
+            conn, input_id, scene, None, row["prompt_version"], row["coach_version"]
+        )
+
+
+def _finish_jobs(conn: sqlite3.Connection, kind: str, input_ids: list[str]) -> None:
+    """Drop the jobs parked for ``input_ids``, queueing the follow-ups ``worker`` would."""
+    from openpraxis.config import get_settings
+
+    payloads = finish_batched_jobs(conn, kind, input_ids)
+    if kind != "tag":
+        return
+    generate = {p["input_id"] for p in payloads if p.get("generate")}
+    for input_id in sorted(generate):
+        enqueue_job(
+            conn,
+            "generate",
+            {"input_id": input_id},
+            max_attempts=get_settings().worker_max_attempts,
+        )
+
+
+def collect_batch(conn: sqlite3.Connection, batch_id: str) -> BatchCollectSummary:
+    """Validate and store the results of a finished batch.
+
+    Each result is written in its own transaction; replies that fail validation
+    (or requests the provider failed) are recorded in the summary and can be
+    resubmitted with the next ``submit_batch``; their parked jobs go back to
+    the queue.  Raises ValueError if the batch is still running or was already
+    collected.
+    """
+    row = _require_batch(conn, batch_id)
+    if row["collected_at"] is not None:
+        raise ValueError(f"batch {batch_id} was already collected")
+    if row["status"] not in FINAL_STATUSES:
+        raise ValueError(f"batch {batch_id} is still {row['status']}")
+    with _provider_settings(row["provider"]):
+        results = _read_results(row["error_file_id"])
+        results.update(_read_results(row["output_file_id"]))
+    summary = BatchCollectSummary(batch_id=batch_id)
+    failed_inputs: set[str] = set()
+    requests = get_batch_requests(conn, batch_id)
+    for custom_id, input_id in requests.items():
+        try:
+            content = _reply_content(results.get(custom_id))
+            with transaction(conn):
+                _save_result(conn, row, input_id, content)
+        except (ValueError, KeyError, IndexError, sqlite3.Error) as exc:
+            failed_inputs.add(input_id)
+            summary.record(
+                BatchItemResult(input_id=input_id, custom_id=custom_id, ok=False, error=str(exc))
+            )
+        else:
+            summary.record(BatchItemResult(input_id=input_id, custom_id=custom_id, ok=True))
+    done = sorted({i for i in requests.values() if i not in failed_inputs})
+    with transaction(conn):
+        if row["kind"] == "generate":
+            clear_pool_requests(conn, done)
+        _finish_jobs(conn, row["kind"], done)
+        requeue_batched_jobs(conn, row["kind"], sorted(failed_inputs))
+        mark_batch_collected(conn, batch_id, format_timestamp(utc_now()))
+    return summary
+
+
+def collect_batches(conn: sqlite3.Connection) -> list[BatchCollectSummary]:
+    """Refresh every uncollected batch and collect the finished ones."""
+    rows = refresh_batches(conn)
+    return [collect_batch(conn, row["id"]) for row in rows if row["status"] in FINAL_STATUSES]
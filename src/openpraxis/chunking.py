@@ -0,0 +1,127 @@
+"""Split long inputs into chunks and select the ones relevant to a task.
+
+Inputs longer than ``CHUNK_THRESHOLD_CHARS`` are tagged chunk by chunk (see
+``nodes.tagger``), and downstream nodes send only the most relevant chunks
+instead of the full text.  Chunk ids are stable for a given input text:
+``<input_id>#chunk-001``, ``<input_id>#chunk-002``, ...
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+
+from openpraxis.models import Chunk
+
+# Inputs up to this size are sent whole, exactly as before chunking existed.
+CHUNK_THRESHOLD_CHARS = 12_000
+CHUNK_MAX_CHARS = 6_000
+# Reference text budget for practice generation / evaluation prompts.
+CONTEXT_MAX_CHARS = 8_000
+
+_WORD_RE = re.compile(r"\w{3,}", re.UNICODE)
+
+
+def chunk_id(input_id: str, seq: int) -> str:
+    return f"{input_id}#chunk-{seq:03d}"
+
+
+def _hard_split(text: str, max_chars: int) -> list[str]:
+    """Split an oversized block on line breaks, then at ``max_chars``."""
+    pieces: list[str] = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        while len(line) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if len(current) + len(line) > max_chars and current:
+            pieces.append(current)
+            current = ""
+        current += line
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_text(text: str, max_chars: int = CHUNK_MAX_CHARS) -> list[str]:
+    """Pack paragraphs into chunks of at most ``max_chars`` characters."""
+    chunks: list[str] = []
+    current = ""
+    for para in re.split(r"\n\s*\n", text):
+        para = para.strip()
+        if not para:
+            continue
+        blocks = _hard_split(para, max_chars) if len(para) > max_chars else [para]
+        for block in blocks:
+            if current and len(current) + 2 + len(block) > max_chars:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{block}" if current else block
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def needs_chunking(text: str) -> bool:
+    return len(text) > CHUNK_THRESHOLD_CHARS
+
+
+def chunk_input(input_id: str, text: str, max_chars: int = CHUNK_MAX_CHARS) -> list[Chunk]:
+    return [
+        Chunk(chunk_id=chunk_id(input_id, seq), seq=seq, text=piece)
+        for seq, piece in enumerate(split_text(text, max_chars), 1)
+    ]
+
+
+def _terms(text: str) -> Counter:
+    return Counter(w.lower() for w in _WORD_RE.findall(text))
+
+
+def select_relevant_chunks(
+    chunks: list[Chunk], query: str, max_chars: int = CONTEXT_MAX_CHARS
+) -> list[Chunk]:
+    """Pick the chunks that best match ``query`` (TF-IDF overlap) within ``max_chars``.
+
+    The best chunk is always included; the result is returned in document order.
+    """
+    if not chunks:
+        return []
+    query_terms = set(_terms(query))
+    chunk_terms = [_terms(c.text) for c in chunks]
+    df = Counter(t for terms in chunk_terms for t in terms.keys() & query_terms)
+    n = len(chunks)
+
+    def score(i: int) -> float:
+        terms = chunk_terms[i]
+        return sum(
+            (1 + math.log(terms[t])) * math.log(1 + n / df[t]) for t in query_terms if terms[t]
+        )
+
+    ranked = sorted(range(n), key=lambda i: (-score(i), i))
+    chosen: list[int] = []
+    used = 0
+    for i in ranked:
+        size = len(chunks[i].text)
+        if chosen and used + size > max_chars:
+            continue
+        chosen.append(i)
+        used += size
+    return [chunks[i] for i in sorted(chosen)]
+
+
+def reference_text(state: dict, query: str, max_chars: int = CONTEXT_MAX_CHARS) -> str:
+    """Raw text for a prompt: the whole input if short, else the relevant chunks.
+
+    Uses ``state["chunks"]`` when present, otherwise chunks ``raw_text`` on the fly
+    (ids are deterministic, so they match what the Tagger stored).
+    """
+    raw_text = state.get("raw_text", "")
+    if not needs_chunking(raw_text):
+        return raw_text
+    chunks = state.get("chunks") or chunk_input(state.get("input_id", "input"), raw_text)
+    selected = select_relevant_chunks(chunks, query, max_chars)
+    return "\n\n[...]\n\n".join(f"[{c.chunk_id}]\n{c.text}" for c in selected)
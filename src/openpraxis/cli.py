@@ -1,13 +1,24 @@
-"""Typer CLI entrypoint."""
+"""Typer CLI entrypoint.
 
-import json
+LangGraph, the node modules and the OpenAI SDK are imported inside the
+commands that run the graph or call an LLM, so commands that only read the
+database (``list``, ``show``, ``insight``, ``export``, ``llm show``) start
+without loading them.
+"""
+
+import itertools
+import sys
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import TYPE_CHECKING
 from uuid import uuid4
 
 import typer
 from rich import box
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 
 from openpraxis.config import (
@@ -25,14 +36,21 @@ from openpraxis.db import (
     ensure_schema,
     get_connection,
     get_input_by_hash,
+    get_tagger_output_by_hash,
+    get_chunks,
+    save_chunks,
+    pop_pooled_scene,
+    request_pool_refill,
+    get_pool_stats,
     get_input_by_id,
     create_input,
     get_scene,
+    get_scene_input_id,
     get_scenes_by_input,
     get_tagger_output,
     get_thread_by_scene_id,
     get_response_by_scene,
-    get_all_insights,
+    iter_insights,
     list_inputs,
     get_insights,
     save_tagger_output,
@@ -40,14 +58,64 @@ from openpraxis.db import (
     upsert_graph_thread,
     create_response,
     update_response_performance,
-    save_insight,
+    save_insights_many,
+    transaction,
+    count_stale_rows,
+    count_search_pending,
+    count_due_reviews,
+    get_due_reviews,
+    get_review_forecast,
+    enqueue_job,
+    get_job_counts,
+    get_dead_jobs,
+    retry_dead_jobs,
+)
+from openpraxis.batch import (
+    BATCH_KINDS,
+    collect_batch,
+    collect_batches,
+    refresh_batches,
+    submit_batch,
+)
+from openpraxis.display import (
+    CoachStream,
+    show_batch_collect_summary,
+    show_coach_message,
+    show_ingest_summary,
+    show_pool_refill_summary,
+    show_reprocess_summary,
+    show_review_plan,
+    show_review_queue,
+    show_search_results,
+    show_insight_cards,
+    show_performance,
+    show_scene,
+    show_tagger_summary,
+    show_worker_summary,
 )
-from openpraxis.display import show_scene, show_tagger_summary, show_insight_cards, show_performance
-from openpraxis.graph import get_compiled_graph, PraxisState
+from openpraxis.export import EXPORT_FORMATS, WRITERS
+from openpraxis.ingest import collect_files, hash_file, image_to_text, is_image_file, run_bulk_ingest
+from openpraxis.prompts import get_prompt_version, get_prompt_versions
+from openpraxis.models import PracticeMessage
+from openpraxis.pool import pool_versions, refill_pool
+from openpraxis.reprocess import REPROCESS_STAGES, plan_reprocess, run_reprocess
+from openpraxis.scheduler import format_timestamp, record_review, utc_now
+from openpraxis.worker import JOB_KINDS, run_worker
+
+if TYPE_CHECKING:
+    from openpraxis.graph import PraxisState
 
 app = typer.Typer(name="praxis", help="OpenPraxis - Turn notes into structured practice and cognitive insights")
 llm_app = typer.Typer(help="LLM configuration commands")
 app.add_typer(llm_app, name="llm")
+cache_app = typer.Typer(help="LLM response cache commands")
+app.add_typer(cache_app, name="cache")
+pool_app = typer.Typer(help="Pre-generated practice scene pool commands")
+app.add_typer(pool_app, name="pool")
+jobs_app = typer.Typer(help="Background job queue commands (see `praxis worker`)")
+app.add_typer(jobs_app, name="jobs")
+batch_app = typer.Typer(help="Offline bulk processing through the provider Batch API")
+app.add_typer(batch_app, name="batch")
 console = Console()
 
 
@@ -187,51 +255,463 @@ def llm_show() -> None:
     console.print(table)
 
 
-def _hash_file(path: Path) -> str:
-    import hashlib
-    h = hashlib.sha256()
-    h.update(path.read_bytes())
-    return h.hexdigest()
+def _open_response_cache():
+    from openpraxis.llm_backends.cached_backend import ResponseCache
+
+    settings = get_settings()
+    return ResponseCache(
+        settings.cache_path,
+        max_bytes=settings.cache_max_bytes,
+        ttl_seconds=settings.cache_ttl_seconds,
+        storage=settings.storage,
+    )
+
+
+@cache_app.command("stats")
+def cache_stats() -> None:
+    """Show LLM response cache size."""
+    settings = get_settings()
+    cache = _open_response_cache()
+    stats = cache.stats()
+    cache.close()
+    table = Table(title="LLM Response Cache", box=box.SIMPLE_HEAD)
+    table.add_column("Key", style="cyan", no_wrap=True)
+    table.add_column("Value", style="white")
+    table.add_row("enabled", str(settings.cache_enabled))
+    table.add_row("path", str(settings.cache_path))
+    table.add_row("entries", str(stats["entries"]))
+    table.add_row("size", f"{stats['bytes'] / 1024:.1f} KiB / {stats['max_bytes'] / 1024 / 1024:.0f} MiB")
+    table.add_row("max_temperature", str(settings.cache_max_temperature))
+    console.print(table)
+
+
+@cache_app.command("clear")
+def cache_clear() -> None:
+    """Delete all cached LLM responses."""
+    cache = _open_response_cache()
+    removed = cache.clear()
+    cache.close()
+    console.print(f"[green]Removed {removed} cached responses.[/green]")
+
+
+@pool_app.command("status")
+def pool_status() -> None:
+    """Show how many pre-generated scenes are ready."""
+    settings, conn = _get_conn()
+    stats = get_pool_stats(conn)
+    conn.close()
+    table = Table(title="Scene pool", box=box.SIMPLE_HEAD)
+    table.add_column("Key", style="cyan", no_wrap=True)
+    table.add_column("Value", style="white")
+    table.add_row("size per input", str(settings.pool_size))
+    table.add_row("ready scenes", str(stats["scenes"]))
+    table.add_row("inputs with scenes", str(stats["inputs"]))
+    table.add_row("queued refills", str(stats["requests"]))
+    console.print(table)
+
+
+@pool_app.command("refill")
+def pool_refill(
+    input_id: list[str] | None = typer.Option(
+        None, "--input-id", help="Fill these inputs (repeatable; default: queued refills)"
+    ),
+    jobs: int | None = typer.Option(None, "--jobs", "-j", min=1, help="Concurrent scene generations"),
+) -> None:
+    """Generate scenes until every queued input has a full pool."""
+    settings, conn = _get_conn()
+    if settings.pool_size == 0:
+        console.print("[dim]Scene pool is disabled ([pool] size = 0).[/dim]")
+        conn.close()
+        return
+    _refill_pool(settings, conn, input_id or None, jobs or settings.pool_jobs)
+    conn.close()
+
+
+def _refill_pool(settings, conn, input_ids: list[str] | None, jobs: int) -> None:
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task("Generating scenes", total=None)
+        summary = refill_pool(
+            conn,
+            settings.pool_size,
+            input_ids=input_ids,
+            jobs=jobs,
+            evict_stale=settings.pool_evict_stale,
+            max_age_seconds=settings.pool_max_age_seconds,
+            on_result=lambda _result: progress.advance(task),
+        )
+    show_pool_refill_summary(
+        summary.generated,
+        summary.evicted,
+        [(f.input_id, f.error or "") for f in summary.failures],
+    )
 
 
-_IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp", ".tiff", ".tif"}
+@jobs_app.command("status")
+def jobs_status(
+    limit: int = typer.Option(10, "--limit", "-n", min=0, help="Dead jobs to list"),
+) -> None:
+    """Show queued, running and dead-lettered jobs."""
+    _settings, conn = _get_conn()
+    counts = get_job_counts(conn)
+    dead = get_dead_jobs(conn, limit) if limit else []
+    conn.close()
+    table = Table(title="Job queue", box=box.SIMPLE_HEAD)
+    table.add_column("Status", style="cyan", no_wrap=True)
+    table.add_column("Jobs", justify="right")
+    for status in ("queued", "leased", "batched", "dead"):
+        table.add_row(status, str(counts.get(status, 0)))
+    console.print(table)
+    if dead:
+        table = Table(title="Dead jobs", box=box.SIMPLE_HEAD, row_styles=["none", "dim"])
+        table.add_column("id", style="cyan", no_wrap=True)
+        table.add_column("kind", style="green")
+        table.add_column("attempts", justify="right")
+        table.add_column("last error", style="red")
+        table.add_column("updated_at", style="dim")
+        for row in dead:
+            table.add_row(
+                str(row["id"]), row["kind"], str(row["attempts"]), row["last_error"] or "-",
+                row["updated_at"],
+            )
+        console.print(table)
+        console.print("[dim]Retry with [bold cyan]praxis jobs retry[/bold cyan] [ID...][/dim]")
 
 
-def _is_image_file(path: Path) -> bool:
-    return path.suffix.lower() in _IMAGE_SUFFIXES
+@jobs_app.command("retry")
+def jobs_retry(
+    job_ids: list[int] | None = typer.Argument(None, help="Dead job ids (default: all dead jobs)"),
+) -> None:
+    """Queue dead-lettered jobs again with a fresh set of attempts."""
+    _settings, conn = _get_conn()
+    retried = retry_dead_jobs(conn, job_ids or None)
+    conn.close()
+    console.print(f"[green]Re-queued {retried} dead jobs.[/green]")
 
 
-def _image_to_text(path: Path, type_hint: str | None) -> str:
-    from openpraxis.runtime import get_backend
+@batch_app.command("submit")
+def batch_submit(
+    kind: str = typer.Argument(..., help=f"What to batch: {', '.join(BATCH_KINDS)}"),
+    stale: bool = typer.Option(
+        False, "--stale", help="tag: also re-tag inputs tagged by another Tagger prompt version"
+    ),
+    limit: int | None = typer.Option(None, "--limit", "-n", min=1, help="Most requests to submit"),
+) -> None:
+    """Upload pending Tagger or scene-pool requests as one provider batch.
 
-    prompt = (
-        "Extract all readable text from the image. Preserve headings, paragraphs, bullet points, and tables. "
-        "If the image is code, keep formatting. If there is little/no text, describe the image clearly. "
-        "Return plain text only."
+    `tag` covers inputs without a Tagger output (e.g. from `praxis add --async`);
+    `generate` fills the scene pool for queued refills.  Collect the results
+    with `praxis batch collect` once the batch has finished (within 24 hours).
+    """
+    if kind not in BATCH_KINDS:
+        console.print(f"[red]Unknown batch kind: {kind} (expected {', '.join(BATCH_KINDS)})[/red]")
+        raise typer.Exit(1)
+    settings, conn = _get_conn()
+    try:
+        result = submit_batch(conn, kind, stale=stale, limit=limit, pool_size=settings.pool_size)
+    except ValueError as exc:
+        console.print(f"[red]{escape(str(exc))}[/red]")
+        raise typer.Exit(1) from exc
+    finally:
+        conn.close()
+    for input_id, reason in result.skipped:
+        console.print(f"[yellow]Skipped[/yellow] {input_id}: {escape(reason)}")
+    if result.batch_id is None:
+        console.print(f"[dim]No pending {kind} requests.[/dim]")
+        return
+    console.print(
+        f"[green]Submitted batch[/green] {result.batch_id} "
+        f"[dim]({result.requests} {kind} requests)[/dim]"
     )
-    if type_hint:
-        prompt = f"[User type hint: {type_hint}]\n\n{prompt}"
-    return get_backend().call_vision_text(path, prompt=prompt, temperature=0.0)
+
+
+@batch_app.command("status")
+def batch_status(
+    batch_id: str | None = typer.Argument(None, help="Batch id (default: uncollected batches)"),
+) -> None:
+    """Fetch the provider status of batches that have not been collected."""
+    _settings, conn = _get_conn()
+    try:
+        rows = refresh_batches(conn, batch_id)
+    except LookupError as exc:
+        console.print(f"[red]{escape(str(exc))}[/red]")
+        raise typer.Exit(1) from exc
+    finally:
+        conn.close()
+    if not rows:
+        console.print("[dim]No uncollected batches.[/dim]")
+        return
+    table = Table(title="Batches", box=box.SIMPLE_HEAD, row_styles=["none", "dim"])
+    table.add_column("id", style="cyan", no_wrap=True)
+    table.add_column("kind", style="green")
+    table.add_column("model")
+    table.add_column("status")
+    table.add_column("done", justify="right")
+    table.add_column("failed", justify="right")
+    table.add_column("created_at", style="dim")
+    for row in rows:
+        table.add_row(
+            row["id"], row["kind"], f"{row['provider']}/{row['model']}", row["status"],
+            f"{row['completed_count']}/{row['request_count']}", str(row["failed_count"]),
+            row["created_at"],
+        )
+    console.print(table)
+
+
+@batch_app.command("collect")
+def batch_collect(
+    batch_id: str | None = typer.Argument(None, help="Batch id (default: every finished batch)"),
+) -> None:
+    """Validate and store the results of finished batches."""
+    _settings, conn = _get_conn()
+    try:
+        if batch_id:
+            refresh_batches(conn, batch_id)
+            summaries = [collect_batch(conn, batch_id)]
+        else:
+            summaries = collect_batches(conn)
+    except (LookupError, ValueError) as exc:
+        console.print(f"[red]{escape(str(exc))}[/red]")
+        raise typer.Exit(1) from exc
+    finally:
+        conn.close()
+    if not summaries:
+        console.print("[dim]No finished batches to collect.[/dim]")
+    for summary in summaries:
+        show_batch_collect_summary(
+            summary.batch_id,
+            summary.saved,
+            [(f.input_id, f.error or "") for f in summary.failures],
+        )
 
 
 def _get_conn():
     settings = get_settings()
-    conn = get_connection(settings.db_path)
+    conn = get_connection(settings.db_path, settings.storage)
     ensure_schema(conn)
     return settings, conn
 
 
+def get_compiled_graph(db_path: str, storage=None):
+    """``graph.get_compiled_graph``, imported on first use (LangGraph is slow to import)."""
+    from openpraxis.graph import get_compiled_graph as _get_compiled_graph
+
+    return _get_compiled_graph(db_path, storage)
+
+
+def _run_graph(graph, graph_input, config: dict, on_update=None) -> dict:
+    """Run the graph to its next interrupt (or the end) and return the state.
+
+    Pending interrupts are returned under ``"__interrupt__"``, as ``graph.invoke``
+    does.
+    Coach replies render token by token as they stream.  ``on_update(node,
+    update)`` is called as each node finishes, so earlier results (summary,
+    scene) appear before the coach starts talking.
+    """
+    state: dict = {}
+    interrupts: tuple = ()
+    with CoachStream() as coach:
+        for mode, chunk in graph.stream(
+            graph_input, config=config, stream_mode=["custom", "updates", "values"]
+        ):
+            if mode == "custom":
+                if isinstance(chunk, dict) and "coach_message" in chunk:
+                    coach.update(chunk["coach_message"])
+            elif mode == "updates":
+                for node, update in chunk.items():
+                    if node == "__interrupt__":
+                        interrupts = tuple(update)
+                        continue
+                    if not isinstance(update, dict):
+                        continue
+                    if node == "coach_turn" and update.get("practice_messages"):
+                        # The completed reply is authoritative over the last partial.
+                        coach.update(update["practice_messages"][-1].content)
+                        coach.close()
+                    if on_update is not None:
+                        on_update(node, update)
+            else:
+                state = chunk
+    if interrupts:
+        # Same shape as ``graph.invoke``: pending interrupts under "__interrupt__".
+        state = {**state, "__interrupt__": interrupts}
+    return state
+
+
+def _add_async(files: list[Path], type_hint: str | None, force: bool) -> None:
+    """Store the inputs and queue a Tagger job for each; `praxis worker` does the rest."""
+    settings, conn = _get_conn()
+    queued: list[tuple[Path, str]] = []
+    skipped: list[tuple[Path, str]] = []
+    with transaction(conn):
+        for path in files:
+            if is_image_file(path):
+                skipped.append((path, "images need text extraction first; add without --async"))
+                continue
+            file_hash = hash_file(path)
+            existing = get_input_by_hash(conn, file_hash)
+            if existing and not force:
+                skipped.append((path, f"same content already added as {existing['id']}"))
+                continue
+            input_id = existing["id"] if existing else str(uuid4())
+            if not existing:
+                raw_text = path.read_text(encoding="utf-8", errors="replace")
+                create_input(conn, input_id, str(path), file_hash, raw_text, type_hint)
+            enqueue_job(
+                conn,
+                "tag",
+                {"input_id": input_id, "generate": settings.pool_size > 0},
+                max_attempts=settings.worker_max_attempts,
+            )
+            queued.append((path, input_id))
+    conn.close()
+    for path, input_id in queued:
+        console.print(f"[green]Queued[/green] {input_id}  [dim]{path}[/dim]")
+    for path, reason in skipped:
+        console.print(f"[yellow]Skipped[/yellow] {path}: {reason}")
+    if queued:
+        console.print(
+            "\n[dim]Next: run [bold cyan]praxis worker[/bold cyan] to process the queue, then "
+            "[bold cyan]praxis practice <input_id>[/bold cyan][/dim]"
+        )
+    elif skipped:
+        raise typer.Exit(1)
+
+
+def _add_directory(
+    root: Path,
+    type_hint: str | None,
+    force: bool,
+    recursive: bool,
+    jobs: int | None,
+    retag: bool = False,
+) -> None:
+    """Bulk-import every supported file under a directory (Tagger only)."""
+    files = collect_files(root, recursive=recursive)
+    if not files:
+        console.print(f"[dim]No importable files found in {root}.[/dim]")
+        return
+    settings, conn = _get_conn()
+    if jobs is None:
+        # The rate limiter decides how many of these threads actually send requests.
+        jobs = settings.rate_limit_max_concurrency if settings.rate_limit_enabled else 4
+    imported_ids: list[str] = []
+
+    def _on_result(result) -> None:
+        if result.status == "imported" and result.input_id:
+            imported_ids.append(result.input_id)
+        progress.advance(task)
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task("Importing", total=len(files))
+        summary = run_bulk_ingest(
+            conn,
+            files,
+            type_hint=type_hint,
+            jobs=jobs,
+            force=force,
+            retag=retag,
+            on_result=_on_result,
+        )
+    if settings.pool_fill_on_import and settings.pool_size > 0 and imported_ids:
+        request_pool_refill(conn, imported_ids)
+        _refill_pool(settings, conn, None, settings.pool_jobs)
+    conn.close()
+    show_ingest_summary(
+        summary.imported,
+        summary.skipped,
+        summary.failed,
+        [(f.path, f.error or "") for f in summary.failures],
+    )
+    if summary.imported:
+        console.print(
+            "\n[dim]Next: use [bold cyan]praxis list[/bold cyan] and "
+            "[bold cyan]praxis practice <input_id>[/bold cyan] to start practicing[/dim]"
+        )
+
+
 @app.command()
 def add(
-    file: Path = typer.Argument(..., exists=True, path_type=Path),
+    file: Path = typer.Argument(..., exists=True, path_type=Path, help="File or directory to import"),
     type: str = typer.Option(None, "--type", "-t", help="report|interview|reflection|idea"),
     force: bool = typer.Option(False, "--force", "-f", help="Force reprocessing (ignore duplicate hash)"),
+    recursive: bool = typer.Option(
+        False, "--recursive", "-r", help="Recurse into subdirectories when importing a directory"
+    ),
+    jobs: int | None = typer.Option(
+        None,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Concurrent Tagger calls when importing a directory (default: [llm.rate_limit] max_concurrency)",
+    ),
+    retag: bool = typer.Option(
+        False,
+        "--retag",
+        help="With --force, re-run the Tagger even if a stored output from the same model and prompt exists",
+    ),
+    async_: bool = typer.Option(
+        False,
+        "--async",
+        help="Store the input and queue the Tagger for `praxis worker`; print the input id and return",
+    ),
 ) -> None:
-    """Add file and run Tagger, optionally enter Practice."""
+    """Add file and run Tagger, optionally enter Practice.
+
+    When FILE is a directory, every supported file is tagged concurrently and a
+    summary of imported/skipped/failed counts is printed.
+
+    Re-adding identical content with --force reuses the existing input and its
+    stored Tagger output (when it came from the current model and prompt
+    version) and goes straight to Practice.
+
+    With --async nothing waits on the LLM: the input is stored, a Tagger job is
+    queued (followed by a pooled practice scene) and the input id is printed.
+    """
+    if async_:
+        files = collect_files(file, recursive=recursive) if file.is_dir() else [file]
+        _add_async(files, type, force)
+        return
+    if file.is_dir():
+        _add_directory(file, type, force, recursive, jobs, retag)
+        return
     settings, conn = _get_conn()
-    if _is_image_file(file):
+    file_hash = hash_file(file)
+    existing = get_input_by_hash(conn, file_hash)
+    if existing and not force:
+        console.print(
+            Panel(
+                "Same content already exists; use --force to reprocess.",
+                title="Skipped",
+                border_style="yellow",
+                box=box.ROUNDED,
+            )
+        )
+        conn.close()
+        return
+    from openpraxis.nodes.tagger import tagger_update, tagger_version
+
+    tagger_model, tagger_prompt_version = tagger_version()
+    reused = None
+    if existing and not retag:
+        reused = get_tagger_output_by_hash(conn, file_hash, tagger_model, tagger_prompt_version)
+        raw_text = existing["raw_text"]
+    elif is_image_file(file):
         try:
-            raw_text = _image_to_text(file, type)
+            raw_text = image_to_text(file, type)
         except Exception as exc:
             console.print(
                 Panel(
@@ -245,58 +725,59 @@ def add(
             raise typer.Exit(1) from exc
     else:
         raw_text = file.read_text(encoding="utf-8", errors="replace")
-    file_hash = _hash_file(file)
-    if not force:
-        existing = get_input_by_hash(conn, file_hash)
-        if existing:
-            console.print(
-                Panel(
-                    "Same content already exists; use --force to reprocess.",
-                    title="Skipped",
-                    border_style="yellow",
-                    box=box.ROUNDED,
-                )
-            )
-            conn.close()
-            return
-    input_id = str(uuid4())
+    input_id = existing["id"] if existing else str(uuid4())
     thread_id = str(uuid4())
-    create_input(conn, input_id, str(file), file_hash, raw_text, type)
-    graph = get_compiled_graph(str(settings.db_path))
-    upsert_graph_thread(conn, thread_id, input_id, status="running")
+    graph = get_compiled_graph(str(settings.db_path), settings.storage)
     initial: PraxisState = {
         "input_id": input_id,
         "raw_text": raw_text,
         "type_hint": type,
     }
+    if reused is not None:
+        # A stored tagger_output makes the graph enter at practice_generator.
+        initial.update(tagger_update(reused[1]))
     config = {"configurable": {"thread_id": thread_id}}
-    result = graph.invoke(initial, config=config)
+    if reused is not None:
+        console.print(
+            f"[dim]Reused stored Tagger output for {input_id} (prompt {tagger_prompt_version}).[/dim]"
+        )
+        show_tagger_summary(reused[1].summary, reused[1].capability_map.model_dump())
+
+    def _on_update(node: str, update: dict) -> None:
+        if node == "tagger" and update.get("tagger_output"):
+            out = update["tagger_output"]
+            show_tagger_summary(out.summary, out.capability_map.model_dump())
+        elif node == "practice_generator" and update.get("scene"):
+            sc = update["scene"]
+            show_scene(sc.role, sc.task, sc.constraints, sc.expected_structure_hint)
+
+    result = _run_graph(graph, initial, config, _on_update)
     tagger_output = result.get("tagger_output")
-    if tagger_output:
-        save_tagger_output(conn, input_id, tagger_output)
-        cap = tagger_output.capability_map.model_dump()
-        show_tagger_summary(tagger_output.summary, cap)
     scene = result.get("scene")
+    # Persist the whole run in one unit of work (single commit).
+    with transaction(conn):
+        if not existing:
+            create_input(conn, input_id, str(file), file_hash, raw_text, type)
+        if tagger_output and reused is None:
+            save_tagger_output(
+                conn, input_id, tagger_output, tagger_model, tagger_prompt_version
+            )
+            save_chunks(conn, input_id, result.get("chunks", []))
+        if scene:
+            save_scene(conn, input_id, scene, get_prompt_version("practice_generator"))
+            upsert_graph_thread(conn, thread_id, input_id, scene_id=scene.scene_id, status="interrupted")
+        else:
+            upsert_graph_thread(conn, thread_id, input_id, status="completed")
     if scene:
-        save_scene(conn, input_id, scene)
-        upsert_graph_thread(conn, thread_id, input_id, scene_id=scene.scene_id, status="interrupted")
-        show_scene(
-            scene.role,
-            scene.task,
-            scene.constraints,
-            scene.expected_structure_hint,
-        )
         console.print(
             f"\n[dim]Next: use [bold cyan]praxis answer {scene.scene_id}[/bold cyan] to submit your answer[/dim]"
         )
-    else:
-        upsert_graph_thread(conn, thread_id, input_id, status="completed")
     conn.close()
 
 
 @app.command()
 def practice(input_id: str = typer.Argument(...)) -> None:
-    """Force generate a new Practice scene for existing input."""
+    """Start practicing an input (a pre-generated scene is used when one is ready)."""
     settings, conn = _get_conn()
     row = get_input_by_id(conn, input_id)
     if not row:
@@ -311,8 +792,7 @@ def practice(input_id: str = typer.Argument(...)) -> None:
         conn.close()
         raise typer.Exit(1)
     thread_id = str(uuid4())
-    graph = get_compiled_graph(str(settings.db_path))
-    upsert_graph_thread(conn, thread_id, input_id, status="running")
+    graph = get_compiled_graph(str(settings.db_path), settings.storage)
     initial: PraxisState = {
         "input_id": input_id,
         "raw_text": raw_text,
@@ -320,31 +800,126 @@ def practice(input_id: str = typer.Argument(...)) -> None:
         "tagger_output": tagger_out,
         "should_practice": True,
     }
+    chunks = get_chunks(conn, input_id)
+    if chunks:
+        initial["chunks"] = chunks
+    prompt_version = get_prompt_version("practice_generator")
+    if settings.pool_size > 0:
+        pooled = pop_pooled_scene(
+            conn, input_id, pool_versions() if settings.pool_evict_stale else None
+        )
+        request_pool_refill(conn, [input_id])
+        if pooled is not None:
+            # The graph resumes at the user's turn: no LLM call before the interrupt.
+            initial["scene"] = pooled["scene"]
+            prompt_version = pooled["prompt_version"]
+            if pooled["opening"]:
+                initial["practice_messages"] = [
+                    PracticeMessage(role="coach", content=pooled["opening"])
+                ]
     config = {"configurable": {"thread_id": thread_id}}
-    result = graph.invoke(initial, config=config)
+    if "scene" in initial:
+        sc = initial["scene"]
+        show_scene(sc.role, sc.task, sc.constraints, sc.expected_structure_hint)
+        for message in initial.get("practice_messages", []):
+            show_coach_message(message.content)
+
+    def _on_update(node: str, update: dict) -> None:
+        if node == "practice_generator" and update.get("scene"):
+            sc = update["scene"]
+            show_scene(sc.role, sc.task, sc.constraints, sc.expected_structure_hint)
+
+    result = _run_graph(graph, initial, config, _on_update)
     scene = result.get("scene")
     if scene:
-        save_scene(conn, input_id, scene)
-        upsert_graph_thread(conn, thread_id, input_id, scene_id=scene.scene_id, status="interrupted")
-        show_scene(
-            scene.role,
-            scene.task,
-            scene.constraints,
-            scene.expected_structure_hint,
-        )
+        with transaction(conn):
+            save_scene(conn, input_id, scene, prompt_version)
+            upsert_graph_thread(conn, thread_id, input_id, scene_id=scene.scene_id, status="interrupted")
         console.print(
             f"\n[dim]Next: use [bold cyan]praxis answer {scene.scene_id}[/bold cyan] to submit your answer[/dim]"
         )
     conn.close()
 
 
+SESSION_REPLY_END = "."
+
+
+def _read_answer(editor: bool, file: Path | None, session: bool) -> str | None:
+    """Read one reply from $EDITOR, FILE or stdin; None when stdin is already exhausted.
+
+    On stdin a session reply ends at a line holding only ``SESSION_REPLY_END``
+    (so later rounds can still be read); otherwise it ends at EOF.
+    """
+    if editor:
+        import tempfile
+        import subprocess
+        import os
+        with tempfile.NamedTemporaryFile(suffix=".md", delete=False, mode="w", encoding="utf-8") as tf:
+            tf.write("# Write your answer here\n\n")
+            tf.flush()
+            editor_cmd = os.environ.get("EDITOR", "vim")
+            subprocess.call([editor_cmd, tf.name])
+            answer_text = Path(tf.name).read_text(encoding="utf-8", errors="replace")
+            os.unlink(tf.name)
+        return answer_text
+    if file:
+        return file.read_text(encoding="utf-8", errors="replace")
+    if session:
+        console.print(
+            "[bold cyan]Enter your reply on stdin[/bold cyan] "
+            f"[dim](end with a line containing only '{SESSION_REPLY_END}', or EOF)[/dim]"
+        )
+    else:
+        console.print("[bold cyan]Enter your answer on stdin[/bold cyan] [dim](end with EOF / Ctrl+D)[/dim]")
+    lines: list[str] = []
+    try:
+        while True:
+            line = input()
+            if session and line.strip() == SESSION_REPLY_END:
+                break
+            lines.append(line + "\n")
+    except EOFError:
+        if not lines:
+            return None
+    return "".join(lines)
+
+
+def _pending_round(result: dict) -> int | None:
+    """Round number of the human turn the graph is waiting on, or None if it finished."""
+    for pending in result.get("__interrupt__", ()):
+        value = getattr(pending, "value", None)
+        if isinstance(value, dict):
+            return value.get("round")
+    return None
+
+
 @app.command()
 def answer(
     scene_id: str = typer.Argument(...),
     editor: bool = typer.Option(False, "--editor", "-e", help="Edit with $EDITOR"),
     file: Path | None = typer.Option(None, "--file", "-f", path_type=Path),
+    session: bool = typer.Option(
+        False,
+        "--session",
+        "-s",
+        help="Keep answering the coach's follow-ups in this process until the evaluation",
+    ),
+    async_: bool = typer.Option(
+        False,
+        "--async",
+        help="Submit this as the final answer and evaluate it in `praxis worker` (no follow-ups)",
+    ),
 ) -> None:
-    """Submit answer for a scene and resume the graph."""
+    """Submit answer for a scene and resume the graph.
+
+    The coach may follow up for a few rounds before evaluating.  Without
+    --session each follow-up is answered with another `praxis answer`; with
+    --session the command prompts for every round itself and reuses the
+    compiled graph, database connections and HTTP client between them.
+
+    With --async the answer is queued for evaluation and the command returns;
+    the scores and insight cards appear in `praxis show` once a worker has run.
+    """
     settings, conn = _get_conn()
     row = get_thread_by_scene_id(conn, scene_id)
     if not row:
@@ -353,49 +928,126 @@ def answer(
         raise typer.Exit(1)
     thread_id = row["thread_id"]
     input_id = row["input_id"]
-    if editor:
-        import tempfile
-        import subprocess
-        import os
-        with tempfile.NamedTemporaryFile(suffix=".md", delete=False, mode="w", encoding="utf-8") as tf:
-            tf.write("# Write your answer here\n\n")
-            tf.flush()
-            editor_cmd = os.environ.get("EDITOR", "vim")
-            subprocess.call([editor_cmd, tf.name])
-            answer_text = Path(tf.name).read_text(encoding="utf-8", errors="replace")
-            os.unlink(tf.name)
-    elif file:
-        answer_text = file.read_text(encoding="utf-8", errors="replace")
-    else:
-        console.print("[bold cyan]Enter your answer on stdin[/bold cyan] [dim](end with EOF / Ctrl+D)[/dim]")
-        answer_text = ""
-        try:
-            while True:
-                line = input()
-                answer_text += line + "\n"
-        except EOFError:
-            pass
+    answer_text = _read_answer(editor, file, session) or ""
+    if async_:
+        job_id = enqueue_job(
+            conn,
+            "evaluate",
+            {"scene_id": scene_id, "answer": answer_text, "thread_id": thread_id},
+            max_attempts=settings.worker_max_attempts,
+        )
+        conn.close()
+        console.print(
+            f"[green]Queued evaluation[/green] (job {job_id}). "
+            "[dim]Run [bold cyan]praxis worker[/bold cyan] to process it.[/dim]"
+        )
+        return
     from langgraph.types import Command
-    graph = get_compiled_graph(str(settings.db_path))
+
+    from openpraxis.nodes.practice import MAX_PRACTICE_ROUNDS
+
+    graph = get_compiled_graph(str(settings.db_path), settings.storage)
     config = {"configurable": {"thread_id": thread_id}}
-    result = graph.invoke(Command(resume=answer_text), config=config)
+    while True:
+        result = _run_graph(graph, Command(resume=answer_text), config)
+        pending_round = _pending_round(result)
+        if pending_round is None or not session:
+            break
+        console.print(f"\n[dim]Round {pending_round} of {MAX_PRACTICE_ROUNDS}[/dim]")
+        # --file holds the first reply only; later rounds come from $EDITOR or stdin.
+        next_text = _read_answer(editor, None, session)
+        if next_text is None:
+            break
+        answer_text = next_text
     performance = result.get("performance")
     insights = result.get("insights", [])
+    replies = [m.content.strip() for m in result.get("practice_messages", []) if m.role == "user"]
     scene = get_scene(conn, scene_id)
+    with transaction(conn):
+        if scene and performance:
+            resp_id = create_response(conn, scene_id, "\n\n".join(replies) or answer_text)
+            update_response_performance(
+                conn, resp_id, performance, get_prompt_version("practice_evaluator")
+            )
+            save_insights_many(
+                conn, input_id, scene_id, resp_id, insights, get_prompt_version("insight_generator")
+            )
+            record_review(conn, scene_id, input_id, performance)
+        status = "interrupted" if pending_round is not None else "completed"
+        upsert_graph_thread(conn, thread_id, input_id, scene_id=scene_id, status=status)
     if scene and performance:
-        resp_id = create_response(conn, scene_id, answer_text)
-        update_response_performance(conn, resp_id, performance)
-        for card in insights:
-            save_insight(conn, input_id, scene_id, resp_id, card)
         show_performance(
             performance.performance_signal.model_dump(),
             performance.improvement_vectors,
         )
         show_insight_cards([c.model_dump() for c in insights])
-    upsert_graph_thread(conn, thread_id, input_id, scene_id=scene_id, status="completed")
+    elif pending_round is not None:
+        console.print(
+            f"\n[dim]Next: reply with [bold cyan]praxis answer {scene_id}[/bold cyan] "
+            "(or [bold cyan]--session[/bold cyan] to stay in one conversation)[/dim]"
+        )
+    conn.close()
+
+
+@app.command()
+def review(
+    scene_id: str | None = typer.Argument(None, help="Start a review attempt for this scene"),
+    due: bool = typer.Option(True, "--due/--plan", help="List the due batch, or the upcoming workload"),
+    limit: int = typer.Option(20, "--limit", "-n", min=1),
+    days: int = typer.Option(14, "--days", min=1, help="Days covered by --plan"),
+) -> None:
+    """Spaced-repetition review of answered scenes."""
+    settings, conn = _get_conn()
+    if scene_id is not None:
+        _start_review(settings, conn, scene_id)
+        conn.close()
+        return
+    now = utc_now()
+    due_now = count_due_reviews(conn, format_timestamp(now))
+    if due:
+        show_review_queue(get_due_reviews(conn, format_timestamp(now), limit), due_now)
+        if due_now:
+            console.print(
+                "\n[dim]Next: use [bold cyan]praxis review <scene_id>[/bold cyan] to practice a scene again[/dim]"
+            )
+    else:
+        until = format_timestamp(now + timedelta(days=days))
+        show_review_plan(due_now, get_review_forecast(conn, format_timestamp(now), until))
     conn.close()
 
 
+def _start_review(settings, conn, scene_id: str) -> None:
+    """Open a new practice thread on an existing scene (the Tagger and generator are skipped)."""
+    scene = get_scene(conn, scene_id)
+    if scene is None:
+        console.print(f"[red]Scene {scene_id} not found.[/red]")
+        conn.close()
+        raise typer.Exit(1)
+    input_id = get_scene_input_id(conn, scene_id)
+    row = get_input_by_id(conn, input_id)
+    initial: PraxisState = {
+        "input_id": input_id,
+        "raw_text": row["raw_text"],
+        "type_hint": row["type_hint"],
+        "scene": scene,
+        "should_practice": True,
+    }
+    tagger_out = get_tagger_output(conn, input_id)
+    if tagger_out:
+        initial["tagger_output"] = tagger_out
+    chunks = get_chunks(conn, input_id)
+    if chunks:
+        initial["chunks"] = chunks
+    thread_id = str(uuid4())
+    graph = get_compiled_graph(str(settings.db_path), settings.storage)
+    show_scene(scene.role, scene.task, scene.constraints, scene.expected_structure_hint)
+    _run_graph(graph, initial, {"configurable": {"thread_id": thread_id}})
+    upsert_graph_thread(conn, thread_id, input_id, scene_id=scene_id, status="interrupted")
+    console.print(
+        f"\n[dim]Next: use [bold cyan]praxis answer {scene_id}[/bold cyan] to submit your answer[/dim]"
+    )
+
+
 @app.command()
 def insight(
     input_id: str | None = typer.Argument(None),
@@ -477,51 +1129,267 @@ def show(id: str = typer.Argument(...)) -> None:
     conn.close()
 
 
+def _parse_since(value: str | None) -> str | None:
+    """Normalize ``--since`` to the ``created_at`` text format used in SQLite."""
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as exc:
+        console.print(f"[red]Invalid --since value: {value} (expected YYYY-MM-DD[THH:MM:SS]).[/red]")
+        raise typer.Exit(1) from exc
+    return parsed.strftime("%Y-%m-%d %H:%M:%S")
+
+
 @app.command()
 def export(
-    format: str = typer.Option("md", "--format", "-fmt", help="md|json"),
+    format: str = typer.Option("md", "--format", "-fmt", help="md|json|jsonl"),
     output: Path | None = typer.Option(None, "--output", "-o", path_type=Path),
+    since: str | None = typer.Option(
+        None, "--since", help="Only cards created at or after this date (YYYY-MM-DD)"
+    ),
+    input_id: str | None = typer.Option(None, "--input-id", help="Only cards for this input"),
 ) -> None:
-    """Export insight cards."""
+    """Export insight cards (streamed; memory use does not grow with card count)."""
+    if format not in EXPORT_FORMATS:
+        console.print(f"[red]Unsupported format: {format}. Use one of: {', '.join(EXPORT_FORMATS)}.[/red]")
+        raise typer.Exit(1)
+    since_ts = _parse_since(since)
+
     _settings, conn = _get_conn()
-    cards = get_all_insights(conn)
-    conn.close()
+    try:
+        cards = iter_insights(conn, since=since_ts, input_id=input_id)
+        first = next(cards, None)
+        if first is None:
+            console.print("[dim]No insight cards to export.[/dim]")
+            return
+        cards = itertools.chain([first], cards)
+        write = WRITERS[format]
+        if output:
+            with output.open("w", encoding="utf-8") as fh:
+                count = write(cards, fh)
+            console.print(f"[green]Exported {count} cards to {output}[/green]")
+        else:
+            write(cards, sys.stdout)
+            sys.stdout.flush()
+    finally:
+        conn.close()
 
-    # Strip internal metadata key for export
-    export_cards = []
-    for c in cards:
-        card = {k: v for k, v in c.items() if not k.startswith("_")}
-        export_cards.append(card)
 
-    if not export_cards:
-        console.print("[dim]No insight cards to export.[/dim]")
+@app.command()
+def reprocess(
+    stale_only: bool = typer.Option(
+        True,
+        "--stale-only/--all",
+        help="Only recompute rows produced by an older prompt version (default)",
+    ),
+    stage: list[str] | None = typer.Option(
+        None, "--stage", "-s", help="tagger|insight_generator (repeatable; default: both)"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only report what would be recomputed"),
+) -> None:
+    """Recompute stored Tagger outputs and insight cards after a prompt change."""
+    stages = tuple(stage) if stage else REPROCESS_STAGES
+    unknown = [s for s in stages if s not in REPROCESS_STAGES]
+    if unknown:
+        console.print(
+            f"[red]Unknown stage: {', '.join(unknown)}. Use one of: {', '.join(REPROCESS_STAGES)}.[/red]"
+        )
+        raise typer.Exit(1)
+    _settings, conn = _get_conn()
+    versions = get_prompt_versions()
+    stale = count_stale_rows(conn, versions)
+    plan = plan_reprocess(conn, stages, stale_only=stale_only)
+    table = Table(title="Prompt versions", box=box.SIMPLE_HEAD)
+    table.add_column("stage", style="cyan")
+    table.add_column("version", style="green")
+    table.add_column("stale rows", justify="right")
+    table.add_column("to recompute", justify="right")
+    for name, version in versions.items():
+        planned = str(len(plan[name])) if name in plan else "-"
+        table.add_row(name, version, str(stale.get(name, "-")), planned)
+    console.print(table)
+    total = sum(len(ids) for ids in plan.values())
+    if dry_run or total == 0:
+        if total == 0:
+            console.print("[dim]Nothing to reprocess.[/dim]")
+        conn.close()
         return
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task("Reprocessing", total=total)
+        summary = run_reprocess(conn, plan, on_result=lambda _result: progress.advance(task))
+    conn.close()
+    show_reprocess_summary(
+        summary.updated,
+        [(f"{f.stage} {f.row_id}", f.error or "") for f in summary.failures],
+    )
 
-    if format == "json":
-        text = json.dumps(export_cards, indent=2, ensure_ascii=False)
-    else:
-        # Markdown format
-        lines = ["# OpenPraxis Insight Cards\n"]
-        for i, card in enumerate(export_cards, 1):
-            lines.append(f"## {i}. {card.get('insight_title', 'Untitled')}")
-            lines.append(f"**Type:** {card.get('insight_type', '')}  ")
-            lines.append(f"**Intensity:** {card.get('intensity', '')}  \n")
-            lines.append(f"**What happened:** {card.get('what_happened', '')}\n")
-            lines.append(f"**Why it matters:** {card.get('why_it_matters', '')}\n")
-            lines.append(f"**Upgrade pattern:** {card.get('upgrade_pattern', '')}\n")
-            lines.append(f"**Micro practice:** {card.get('micro_practice', '')}\n")
-            if card.get("concepts"):
-                lines.append(f"**Concepts:** {', '.join(card['concepts'])}\n")
-            if card.get("skills"):
-                lines.append(f"**Skills:** {', '.join(card['skills'])}\n")
-            lines.append("---\n")
-        text = "\n".join(lines)
-
-    if output:
-        output.write_text(text, encoding="utf-8")
-        console.print(f"[green]Exported {len(export_cards)} cards to {output}[/green]")
+
+@app.command()
+def search(
+    query: str = typer.Argument(..., help="Free-text query"),
+    kind: list[str] | None = typer.Option(
+        None, "--kind", "-k", help="input|scene|insight (repeatable; default: all)"
+    ),
+    limit: int = typer.Option(10, "--limit", "-n", min=1),
+    text: bool = typer.Option(
+        False, "--text", help="Keyword search (BM25-ranked, highlighted) instead of semantic"
+    ),
+    rebuild: bool = typer.Option(False, "--rebuild", help="Re-embed everything before searching"),
+) -> None:
+    """Search inputs, practice scenes and insight cards (semantic, or keyword with --text)."""
+    from openpraxis.search import SEARCH_KINDS, TEXT_SEARCH_KINDS, search_text
+
+    allowed = TEXT_SEARCH_KINDS if text else SEARCH_KINDS
+    kinds = tuple(kind) if kind else allowed
+    unknown = [k for k in kinds if k not in allowed]
+    if unknown:
+        console.print(f"[red]Unknown kind: {', '.join(unknown)}. Use one of: {', '.join(allowed)}.[/red]")
+        raise typer.Exit(1)
+    settings, conn = _get_conn()
+    try:
+        if text:
+            hits = search_text(conn, query, limit=limit, kinds=kinds)
+        else:
+            hits = _semantic_search(settings, conn, query, limit, kinds, rebuild)
+    except RuntimeError as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(1) from exc
+    finally:
+        conn.close()
+    show_search_results(query, [h.model_dump() for h in hits])
+
+
+def _semantic_search(settings, conn, query: str, limit: int, kinds: tuple[str, ...], rebuild: bool):
+    """Bring the vector index up to date, then rank by embedding similarity."""
+    from openpraxis.embeddings import get_embedder
+    from openpraxis.search import open_index, rebuild_index, search as run_search, sync_index
+
+    embedder = get_embedder(settings)
+    if rebuild:
+        index = rebuild_index(settings.search_index_dir, embedder, conn)
     else:
-        console.print(text)
+        index = open_index(settings.search_index_dir, embedder, conn)
+    pending = count_search_pending(conn)
+    if pending:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            console=console,
+            transient=True,
+        ) as progress:
+            task = progress.add_task("Indexing", total=pending)
+            sync_index(
+                conn,
+                index,
+                embedder,
+                batch_size=settings.search_batch_size,
+                ivf_min_rows=settings.search_ivf_min_rows,
+                on_batch=lambda n: progress.advance(task, n),
+            )
+    return run_search(
+        conn, index, embedder, query, limit=limit, kinds=kinds, nprobe=settings.search_ivf_nprobe
+    )
+
+
+@app.command()
+def serve(
+    socket_path: Path | None = typer.Option(
+        None, "--socket", path_type=Path, help="Unix socket to listen on (default: [serve] socket)"
+    ),
+    port: int | None = typer.Option(
+        None, "--port", min=1, max=65535, help="Listen on 127.0.0.1:PORT (HTTP) instead of a socket"
+    ),
+) -> None:
+    """Run a daemon that serves praxis commands from a warm process.
+
+    While it listens on the configured socket, `praxis add|practice|answer|show|
+    insight|export|list` are forwarded to it instead of starting a new process.
+    """
+    from openpraxis.server import make_server, serve as serve_forever, warm_up
+
+    settings = get_settings()
+    try:
+        server = make_server(socket_path or settings.serve_socket, port)
+    except (OSError, RuntimeError) as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(1) from exc
+    warm_up()
+    where = f"http://127.0.0.1:{port}" if port is not None else str(socket_path or settings.serve_socket)
+    console.print(f"[green]praxis serve[/green] listening on {where} [dim](Ctrl+C to stop)[/dim]")
+    serve_forever(server)
+
+
+@app.command()
+def worker(
+    concurrency: int | None = typer.Option(
+        None, "--concurrency", "-c", min=1, help="Jobs run at a time (default: [worker] concurrency)"
+    ),
+    once: bool = typer.Option(False, "--once", help="Exit once no job is ready instead of waiting"),
+    kind: list[str] | None = typer.Option(
+        None, "--kind", help=f"Only run these job kinds (repeatable): {', '.join(JOB_KINDS)}"
+    ),
+) -> None:
+    """Run queued background jobs: tagging, scene generation, evaluation, insights.
+
+    Several workers can share one data dir; each leases jobs for [worker]
+    visibility_seconds and renews the lease while they run, so a job whose
+    worker dies is picked up again.  Failed jobs are retried with exponential
+    backoff, then dead-lettered (see `praxis jobs status`).
+    """
+    unknown = sorted(set(kind or ()) - set(JOB_KINDS))
+    if unknown:
+        console.print(f"[red]Unknown job kind: {', '.join(unknown)}[/red]")
+        raise typer.Exit(1)
+    settings, conn = _get_conn()
+    concurrency = concurrency or settings.worker_concurrency
+
+    def _on_result(result) -> None:
+        if result.ok:
+            console.print(f"[green]done[/green] {result.kind} job {result.job_id}")
+        else:
+            console.print(
+                f"[yellow]{result.status}[/yellow] {result.kind} job {result.job_id}: "
+                f"[dim]{escape(result.error or '')}[/dim]"
+            )
+
+    if not once:
+        console.print(
+            f"[green]praxis worker[/green] running {concurrency} jobs at a time "
+            "[dim](Ctrl+C to stop)[/dim]"
+        )
+    try:
+        summary = run_worker(
+            conn,
+            concurrency=concurrency,
+            visibility_seconds=settings.worker_visibility_seconds,
+            backoff_base_seconds=settings.worker_backoff_seconds,
+            backoff_max_seconds=settings.worker_backoff_max_seconds,
+            poll_seconds=settings.worker_poll_seconds,
+            once=once,
+            kinds=tuple(kind) if kind else None,
+            on_result=_on_result,
+        )
+    except KeyboardInterrupt:
+        console.print("\n[dim]Stopped; unfinished jobs were handed back to the queue.[/dim]")
+        return
+    finally:
+        conn.close()
+    show_worker_summary(
+        summary.done,
+        summary.retried,
+        summary.dead,
+        [(f"{f.kind} job {f.job_id}", f.error or "") for f in summary.failures],
+    )
 
 
 @app.command(name="list")
@@ -0,0 +1,167 @@
+"""Thin client for a running ``praxis serve`` daemon.
+
+``praxis`` starts here.  When a daemon is listening on the Unix socket and the
+command can be served remotely, the arguments (plus stdin and the working
+directory) are posted to it and its output is printed.  This skips the
+interpreter-side cost of loading pydantic, Typer, Rich, LangGraph and the
+database.  Otherwise, or when ``OPENPRAXIS_NO_DAEMON`` is set, the normal
+in-process CLI runs.
+
+This module only uses the standard library so the forwarding path stays fast.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import io
+import json
+import os
+import shutil
+import socket
+import sys
+import tomllib
+from pathlib import Path
+
+from openpraxis.paths import socket_path_from_config
+
+API_PREFIX = "/v1"
+# Commands the daemon runs.  Global options (--provider ...) and interactive or
+# configuration commands always run locally.
+SERVED_COMMANDS = ("add", "practice", "answer", "show", "insight", "export", "list")
+_CONNECT_TIMEOUT = 0.5
+# Environment the CLI reads on every run: the execution mode and the provider
+# keys (``config._PROVIDER_ENV_KEY_MAP``).  A daemon started with other values
+# would run the command in its own mode and with its own credentials.
+_MODE_ENV = "OPENPRAXIS_MODE"
+_KEY_ENV_VARS = ("OPENAI_API_KEY", "ARK_API_KEY", "MOONSHOT_API_KEY", "DEEPSEEK_API_KEY")
+_CONFIG_PATH = Path.home() / ".openpraxis" / "config.toml"
+_DEFAULT_DATA_DIR = Path.home() / ".openpraxis" / "data"
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening on the socket."""
+
+
+def default_socket_path() -> Path:
+    config: dict = {}
+    if _CONFIG_PATH.exists():
+        with open(_CONFIG_PATH, "rb") as f:
+            config = tomllib.load(f)
+    return socket_path_from_config(config, _DEFAULT_DATA_DIR)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: Path, timeout: float | None = None) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self._path = str(path)
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(_CONNECT_TIMEOUT)
+        try:
+            sock.connect(self._path)
+        except OSError:
+            sock.close()
+            raise
+        sock.settimeout(self.timeout)
+        self.sock = sock
+
+
+def request(
+    method: str, path: str, payload: dict | None = None, socket_path: Path | None = None
+) -> dict:
+    """Send one JSON request to the daemon and return the decoded JSON reply.
+
+    Raises ``DaemonUnavailable`` if nothing accepts the connection, and
+    ``RuntimeError`` for an error reply.
+    """
+    # No read timeout: commands such as `add` wait on the LLM.
+    conn = _UnixHTTPConnection(socket_path or default_socket_path(), timeout=None)
+    body = json.dumps(payload).encode("utf-8") if payload is not None else None
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    try:
+        try:
+            conn.request(method, API_PREFIX + path, body=body, headers=headers)
+        except (FileNotFoundError, ConnectionRefusedError, TimeoutError) as exc:
+            raise DaemonUnavailable(str(exc)) from exc
+        response = conn.getresponse()
+        data = json.loads(response.read() or b"{}")
+    finally:
+        conn.close()
+    if response.status != 200:
+        raise RuntimeError(data.get("error", f"daemon returned HTTP {response.status}"))
+    return data
+
+
+def caller_env(environ: dict[str, str] | None = None) -> dict[str, str | None]:
+    """What a command's result depends on in ``environ`` (default: this process).
+
+    Keys are compared by digest, so their values never leave the process.
+    """
+    environ = os.environ if environ is None else environ
+    env: dict[str, str | None] = {_MODE_ENV: environ.get(_MODE_ENV, "").strip().lower()}
+    for name in _KEY_ENV_VARS:
+        value = environ.get(name)
+        env[name] = hashlib.sha256(value.encode("utf-8")).hexdigest()[:16] if value else None
+    return env
+
+
+def _forwardable(args: list[str]) -> bool:
+    if not args or args[0] not in SERVED_COMMANDS:
+        return False
+    if args[0] == "answer":
+        # $EDITOR and --session are interactive; they need this terminal.
+        if {"--editor", "-e", "--session", "-s"} & set(args):
+            return False
+        if not {"--file", "-f"} & set(args) and sys.stdin.isatty():
+            return False
+    return True
+
+
+def run_remote(args: list[str], socket_path: Path | None = None) -> int | None:
+    """Run ``praxis <args>`` on the daemon; None if it must run locally."""
+    if os.environ.get("OPENPRAXIS_NO_DAEMON") or not _forwardable(args):
+        return None
+    socket_path = socket_path or default_socket_path()
+    if not socket_path.exists():
+        return None
+    stdin = None
+    if args[0] == "answer" and not {"--file", "-f"} & set(args):
+        stdin = sys.stdin.read()
+    payload = {
+        "args": args,
+        "stdin": stdin,
+        "cwd": os.getcwd(),
+        "columns": shutil.get_terminal_size().columns,
+        "env": caller_env(),
+    }
+    try:
+        reply = request("POST", "/run", payload, socket_path)
+    except DaemonUnavailable:
+        if stdin is not None:
+            # stdin is consumed; the local CLI cannot read it again.
+            sys.stderr.write("praxis serve is not responding; the answer was not submitted.\n")
+            return 1
+        return None
+    except RuntimeError as exc:
+        sys.stderr.write(f"praxis serve: {exc}\n")
+        return 1
+    if reply.get("status") == "run_locally":
+        if stdin is not None:
+            # Hand the answer already read to the local CLI.
+            sys.stdin = io.StringIO(stdin)
+        return None
+    sys.stdout.write(reply["output"])
+    sys.stdout.flush()
+    return int(reply["exit_code"])
+
+
+def main() -> None:
+    """``praxis`` entry point: forward to a running daemon, else run the CLI here."""
+    code = run_remote(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+    from openpraxis.cli import main as cli_main
+
+    cli_main()
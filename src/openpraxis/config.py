@@ -1,11 +1,16 @@
 """Config loading (TOML + env vars)."""
 
 import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import tomllib
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from openpraxis.paths import socket_path_from_config
 
 _DEFAULT_CONFIG_DIR = Path.home() / ".openpraxis"
 _DEFAULT_CONFIG_PATH = _DEFAULT_CONFIG_DIR / "config.toml"
@@ -30,6 +35,37 @@ _PROVIDER_MODEL_MAP = {
     "deepseek": "deepseek-chat",
 }
 SUPPORTED_LLM_PROVIDERS = tuple(_PROVIDER_ENV_KEY_MAP.keys())
+# Graph nodes whose LLM calls can be routed with ``[llm.nodes.<name>]``.
+LLM_NODES = (
+    "tagger",
+    "practice_generator",
+    "coach_turn",
+    "practice_evaluator",
+    "insight_generator",
+)
+
+
+class StorageSettings(BaseModel):
+    """SQLite tuning applied to every connection (app DB, checkpoints, caches)."""
+
+    journal_mode: Literal["wal", "delete", "truncate", "persist", "memory"] = "wal"
+    synchronous: Literal["off", "normal", "full", "extra"] = "normal"
+    cache_size_kib: int = Field(default=16 * 1024, ge=0)
+    mmap_size_mib: int = Field(default=128, ge=0)
+    busy_timeout_ms: int = Field(default=5000, ge=0)
+
+
+class NodeLLMSettings(BaseModel):
+    """``[llm.nodes.<name>]``: what one node's calls use instead of the ``[llm]`` defaults."""
+
+    # A misspelt key would otherwise be dropped and the node quietly unrouted.
+    model_config = ConfigDict(extra="forbid")
+
+    provider: str | None = None
+    model: str | None = None
+    temperature: float | None = None
+    max_output_tokens: int | None = Field(default=None, ge=1)
+    timeout_seconds: float | None = Field(default=None, gt=0)
 
 
 class Settings(BaseModel):
@@ -38,9 +74,60 @@ class Settings(BaseModel):
     llm_base_url: str | None = None
     model_name: str = "gpt-4o"
     temperature: float = 0.7
+    # Cap on reply tokens (None: provider default) and a per-call timeout that
+    # replaces resilience_timeout_seconds; both are usually set per node.
+    llm_max_output_tokens: int | None = Field(default=None, ge=1)
+    llm_timeout_seconds: float | None = Field(default=None, gt=0)
+    llm_nodes: dict[str, NodeLLMSettings] = Field(default_factory=dict)
     data_dir: Path = _DEFAULT_DATA_DIR
     db_path: Path = Field(default_factory=lambda: _DEFAULT_DATA_DIR / "praxis.db")
+    storage: StorageSettings = Field(default_factory=StorageSettings)
     color: bool = True
+    cache_enabled: bool = True
+    cache_path: Path = Field(default_factory=lambda: _DEFAULT_DATA_DIR / "llm_cache.db")
+    cache_max_bytes: int = 256 * 1024 * 1024
+    cache_ttl_seconds: int = 30 * 24 * 3600
+    cache_max_temperature: float = 0.0
+    search_embedder: Literal["local", "provider"] = "local"
+    search_embedding_model: str = "text-embedding-3-small"
+    search_batch_size: int = Field(default=64, ge=1)
+    search_index_dir: Path = Field(default_factory=lambda: _DEFAULT_DATA_DIR / "search")
+    search_ivf_min_rows: int = Field(default=200_000, ge=0)
+    search_ivf_nprobe: int = Field(default=8, ge=1)
+    pool_size: int = Field(default=2, ge=0)
+    pool_fill_on_import: bool = False
+    pool_jobs: int = Field(default=4, ge=1)
+    pool_evict_stale: bool = True
+    pool_max_age_seconds: int = Field(default=30 * 24 * 3600, ge=0)
+    serve_socket: Path = Field(default_factory=lambda: _DEFAULT_DATA_DIR / "praxis.sock")
+    rate_limit_enabled: bool = True
+    rate_limit_rpm: int = Field(default=0, ge=0)
+    rate_limit_tpm: int = Field(default=0, ge=0)
+    rate_limit_initial_concurrency: int = Field(default=4, ge=1)
+    rate_limit_max_concurrency: int = Field(default=32, ge=1)
+    resilience_enabled: bool = True
+    resilience_max_attempts: int = Field(default=4, ge=1)
+    resilience_output_attempts: int = Field(default=2, ge=1)
+    resilience_backoff_seconds: float = Field(default=0.5, ge=0)
+    resilience_backoff_max_seconds: float = Field(default=20.0, ge=0)
+    resilience_timeout_seconds: float = Field(default=60.0, gt=0)
+    resilience_deadline_seconds: float = Field(default=180.0, gt=0)
+    resilience_breaker_failures: int = Field(default=5, ge=1)
+    resilience_breaker_reset_seconds: float = Field(default=30.0, ge=0)
+    hedge_enabled: bool = False
+    hedge_scope: Literal["stream", "all"] = "stream"
+    hedge_percentile: float = Field(default=95.0, gt=0, lt=100)
+    hedge_min_delay_seconds: float = Field(default=0.3, ge=0)
+    hedge_max_delay_seconds: float = Field(default=5.0, ge=0)
+    hedge_min_samples: int = Field(default=20, ge=1)
+    hedge_provider: str | None = None
+    hedge_model: str | None = None
+    worker_concurrency: int = Field(default=2, ge=1)
+    worker_visibility_seconds: int = Field(default=300, ge=1)
+    worker_max_attempts: int = Field(default=5, ge=1)
+    worker_backoff_seconds: float = Field(default=30.0, ge=0)
+    worker_backoff_max_seconds: float = Field(default=3600.0, ge=0)
+    worker_poll_seconds: float = Field(default=2.0, gt=0)
 
     @property
     def openai_api_key(self) -> str:
@@ -49,6 +136,10 @@ class Settings(BaseModel):
 
 
 _settings: Settings | None = None
+# Per-thread / per-task settings installed by ``llm_overrides()``.
+_settings_override: ContextVar[Settings | None] = ContextVar(
+    "praxis_settings_override", default=None
+)
 
 
 def _normalize_provider(provider: str) -> str:
@@ -136,14 +227,24 @@ def persist_llm_config(
 
 def get_settings() -> Settings:
     global _settings
+    override = _settings_override.get()
+    if override is not None:
+        return override
     if _settings is not None:
         return _settings
 
     config = load_config_dict()
 
     llm_cfg = config.get("llm", {})
+    rate_cfg = llm_cfg.get("rate_limit", {})
+    resilience_cfg = llm_cfg.get("resilience", {})
+    hedge_cfg = llm_cfg.get("hedge", {})
     storage_cfg = config.get("storage", {})
     display_cfg = config.get("display", {})
+    cache_cfg = config.get("cache", {})
+    search_cfg = config.get("search", {})
+    pool_cfg = config.get("pool", {})
+    worker_cfg = config.get("worker", {})
 
     provider = _normalize_provider(str(llm_cfg.get("provider", "openai")))
     env_key = _PROVIDER_ENV_KEY_MAP[provider]
@@ -160,13 +261,78 @@ def get_settings() -> Settings:
         llm_base_url=base_url,
         model_name=str(llm_cfg.get("model", get_provider_default_model(provider))),
         temperature=float(llm_cfg.get("temperature", 0.7)),
+        llm_max_output_tokens=llm_cfg.get("max_output_tokens"),
+        llm_nodes=_node_settings(llm_cfg.get("nodes", {})),
         data_dir=data_dir,
         db_path=data_dir / "praxis.db",
+        storage=StorageSettings(
+            **{k: v for k, v in storage_cfg.items() if k in StorageSettings.model_fields}
+        ),
         color=display_cfg.get("color", True),
+        cache_enabled=bool(cache_cfg.get("enabled", True)),
+        cache_path=data_dir / "llm_cache.db",
+        cache_max_bytes=int(float(cache_cfg.get("max_mb", 256)) * 1024 * 1024),
+        cache_ttl_seconds=int(float(cache_cfg.get("ttl_days", 30)) * 24 * 3600),
+        cache_max_temperature=float(cache_cfg.get("max_temperature", 0.0)),
+        search_embedder=str(search_cfg.get("embedder", "local")),
+        search_embedding_model=str(search_cfg.get("embedding_model", "text-embedding-3-small")),
+        search_batch_size=int(search_cfg.get("batch_size", 64)),
+        search_index_dir=data_dir / "search",
+        search_ivf_min_rows=int(search_cfg.get("ivf_min_rows", 200_000)),
+        search_ivf_nprobe=int(search_cfg.get("ivf_nprobe", 8)),
+        pool_size=int(pool_cfg.get("size", 2)),
+        pool_fill_on_import=bool(pool_cfg.get("fill_on_import", False)),
+        pool_jobs=int(pool_cfg.get("jobs", 4)),
+        pool_evict_stale=bool(pool_cfg.get("evict_stale", True)),
+        pool_max_age_seconds=int(float(pool_cfg.get("max_age_days", 30)) * 24 * 3600),
+        serve_socket=socket_path_from_config(config, _DEFAULT_DATA_DIR),
+        rate_limit_enabled=bool(rate_cfg.get("enabled", True)),
+        rate_limit_rpm=int(rate_cfg.get("rpm", 0)),
+        rate_limit_tpm=int(rate_cfg.get("tpm", 0)),
+        rate_limit_initial_concurrency=int(rate_cfg.get("initial_concurrency", 4)),
+        rate_limit_max_concurrency=int(rate_cfg.get("max_concurrency", 32)),
+        resilience_enabled=bool(resilience_cfg.get("enabled", True)),
+        resilience_max_attempts=int(resilience_cfg.get("max_attempts", 4)),
+        resilience_output_attempts=int(resilience_cfg.get("output_attempts", 2)),
+        resilience_backoff_seconds=float(resilience_cfg.get("backoff_seconds", 0.5)),
+        resilience_backoff_max_seconds=float(resilience_cfg.get("backoff_max_seconds", 20)),
+        resilience_timeout_seconds=float(resilience_cfg.get("timeout_seconds", 60)),
+        resilience_deadline_seconds=float(resilience_cfg.get("deadline_seconds", 180)),
+        resilience_breaker_failures=int(resilience_cfg.get("breaker_failures", 5)),
+        resilience_breaker_reset_seconds=float(resilience_cfg.get("breaker_reset_seconds", 30)),
+        hedge_enabled=bool(hedge_cfg.get("enabled", False)),
+        hedge_scope=str(hedge_cfg.get("scope", "stream")),
+        hedge_percentile=float(hedge_cfg.get("percentile", 95)),
+        hedge_min_delay_seconds=float(hedge_cfg.get("min_delay_seconds", 0.3)),
+        hedge_max_delay_seconds=float(hedge_cfg.get("max_delay_seconds", 5)),
+        hedge_min_samples=int(hedge_cfg.get("min_samples", 20)),
+        hedge_provider=(
+            _normalize_provider(str(hedge_cfg["provider"])) if hedge_cfg.get("provider") else None
+        ),
+        hedge_model=str(hedge_cfg.get("model") or "") or None,
+        worker_concurrency=int(worker_cfg.get("concurrency", 2)),
+        worker_visibility_seconds=int(worker_cfg.get("visibility_seconds", 300)),
+        worker_max_attempts=int(worker_cfg.get("max_attempts", 5)),
+        worker_backoff_seconds=float(worker_cfg.get("backoff_seconds", 30)),
+        worker_backoff_max_seconds=float(worker_cfg.get("backoff_max_seconds", 3600)),
+        worker_poll_seconds=float(worker_cfg.get("poll_seconds", 2)),
     )
     return _settings
 
 
+def _node_settings(nodes_cfg: dict[str, Any]) -> dict[str, NodeLLMSettings]:
+    nodes: dict[str, NodeLLMSettings] = {}
+    for name, node_cfg in nodes_cfg.items():
+        if name not in LLM_NODES:
+            allowed = ", ".join(LLM_NODES)
+            raise ValueError(f"Unknown node in [llm.nodes.{name}]. Allowed: {allowed}")
+        node = NodeLLMSettings(**node_cfg)
+        if node.provider:
+            node.provider = _normalize_provider(node.provider)
+        nodes[name] = node
+    return nodes
+
+
 def set_runtime_llm_overrides(
     provider: str | None = None,
     api_key: str | None = None,
@@ -178,8 +344,59 @@ def set_runtime_llm_overrides(
     global _settings
     if all(value is None for value in (provider, api_key, base_url, model, temperature)):
         return
+    _settings = _with_llm_overrides(get_settings(), provider, api_key, base_url, model, temperature)
+
+
+@contextmanager
+def llm_overrides(
+    provider: str | None = None,
+    api_key: str | None = None,
+    base_url: str | None = None,
+    model: str | None = None,
+    temperature: float | None = None,
+    max_output_tokens: int | None = None,
+    timeout_seconds: float | None = None,
+) -> Iterator[Settings]:
+    """Apply LLM overrides for the current thread / asyncio task only.
+
+    Used to send one call to a different provider or model (a hedged request
+    to a secondary provider, a node routed by ``[llm.nodes.<name>]``) without
+    touching the process settings.
+    """
+    settings = _with_llm_overrides(get_settings(), provider, api_key, base_url, model, temperature)
+    if max_output_tokens is not None:
+        settings.llm_max_output_tokens = max_output_tokens
+    if timeout_seconds is not None:
+        settings.llm_timeout_seconds = timeout_seconds
+    token = _settings_override.set(settings)
+    try:
+        yield settings
+    finally:
+        _settings_override.reset(token)
 
-    settings = get_settings()
+
+def provider_api_key(provider: str) -> str:
+    """API key for switching calls to ``provider``: its environment variable.
+
+    ``[llm] api_key`` belongs to the ``[llm]`` provider, so a switch to another
+    provider (node routing, hedging, ``--provider``) never inherits it; that
+    would send one provider's secret to another.  Raises ValueError if unset.
+    """
+    env_key = _PROVIDER_ENV_KEY_MAP[_normalize_provider(provider)]
+    api_key = os.environ.get(env_key)
+    if not api_key:
+        raise ValueError(f"No API key for provider {provider}: set {env_key}.")
+    return api_key
+
+
+def _with_llm_overrides(
+    settings: Settings,
+    provider: str | None,
+    api_key: str | None,
+    base_url: str | None,
+    model: str | None,
+    temperature: float | None,
+) -> Settings:
     updates: dict = {}
     normalized_provider: str | None = None
 
@@ -192,9 +409,10 @@ def set_runtime_llm_overrides(
 
     if api_key is not None:
         updates["llm_api_key"] = api_key
+    elif normalized_provider is not None and normalized_provider != settings.llm_provider:
+        updates["llm_api_key"] = provider_api_key(normalized_provider)
     elif normalized_provider is not None:
-        env_key = _PROVIDER_ENV_KEY_MAP[normalized_provider]
-        env_value = os.environ.get(env_key)
+        env_value = os.environ.get(_PROVIDER_ENV_KEY_MAP[normalized_provider])
         if env_value:
             updates["llm_api_key"] = env_value
 
@@ -204,5 +422,4 @@ def set_runtime_llm_overrides(
         updates["model_name"] = model
     if temperature is not None:
         updates["temperature"] = temperature
-
-    _settings = settings.model_copy(update=updates)
+    return settings.model_copy(update=updates)
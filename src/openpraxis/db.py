@@ -2,13 +2,18 @@
 
 import json
 import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from uuid import uuid4
 
+from openpraxis.config import StorageSettings
 from openpraxis.models import (
+    Chunk,
     InsightCard,
     PracticePerformance,
     PracticeScene,
+    ReviewState,
     TaggerOutput,
 )
 
@@ -69,18 +74,358 @@ CREATE INDEX IF NOT EXISTS idx_graph_threads_input_id ON graph_threads(input_id)
 CREATE INDEX IF NOT EXISTS idx_graph_threads_scene_id ON graph_threads(scene_id);
 """
 
+# Ordered schema migrations.  ``SCHEMA_SQL`` is the version-0 baseline and must
+# not change; every later change is appended here.  Migration N (1-based) moves
+# ``PRAGMA user_version`` from N-1 to N.  Never edit or reorder past entries.
+MIGRATIONS: list[str] = [
+    # 1: index the lookups done by insight / show / list commands.
+    """
+    CREATE INDEX IF NOT EXISTS idx_insights_type_intensity
+        ON insights(insight_type, intensity);
+    CREATE INDEX IF NOT EXISTS idx_insights_input_created ON insights(input_id, created_at);
+    CREATE INDEX IF NOT EXISTS idx_insights_created ON insights(created_at);
+    CREATE INDEX IF NOT EXISTS idx_scenes_input_created ON scenes(input_id, created_at);
+    CREATE INDEX IF NOT EXISTS idx_responses_scene_created ON responses(scene_id, created_at);
+    CREATE INDEX IF NOT EXISTS idx_inputs_type_created ON inputs(input_type, created_at);
+    CREATE INDEX IF NOT EXISTS idx_inputs_created ON inputs(created_at);
+    """,
+    # 2: record which model / prompt version produced each TaggerOutput.
+    """
+    ALTER TABLE tagger_outputs ADD COLUMN model TEXT;
+    ALTER TABLE tagger_outputs ADD COLUMN prompt_version TEXT;
+    """,
+    # 3: prompt fingerprints for the remaining LLM-produced rows.
+    """
+    ALTER TABLE scenes ADD COLUMN prompt_version TEXT;
+    ALTER TABLE responses ADD COLUMN prompt_version TEXT;
+    ALTER TABLE insights ADD COLUMN prompt_version TEXT;
+    """,
+    # 4: chunks of long inputs (``<input_id>#chunk-NNN``).
+    """
+    CREATE TABLE IF NOT EXISTS chunks (
+        chunk_id    TEXT PRIMARY KEY,
+        input_id    TEXT NOT NULL REFERENCES inputs(id),
+        seq         INTEGER NOT NULL,
+        text        TEXT NOT NULL,
+        created_at  TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+    CREATE INDEX IF NOT EXISTS idx_chunks_input_seq ON chunks(input_id, seq);
+    """,
+    # 5: semantic search bookkeeping.  Triggers queue every new Tagger output,
+    # scene and insight card for embedding; search_docs maps vector rows back.
+    """
+    CREATE TABLE IF NOT EXISTS search_pending (
+        kind    TEXT NOT NULL,
+        ref_id  TEXT NOT NULL,
+        PRIMARY KEY (kind, ref_id)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS search_docs (
+        row     INTEGER PRIMARY KEY,
+        kind    TEXT NOT NULL,
+        ref_id  TEXT NOT NULL,
+        UNIQUE (kind, ref_id)
+    );
+    CREATE TRIGGER IF NOT EXISTS search_enqueue_input AFTER INSERT ON tagger_outputs BEGIN
+        INSERT OR IGNORE INTO search_pending (kind, ref_id) VALUES ('input', NEW.input_id);
+    END;
+    CREATE TRIGGER IF NOT EXISTS search_enqueue_scene AFTER INSERT ON scenes BEGIN
+        INSERT OR IGNORE INTO search_pending (kind, ref_id) VALUES ('scene', NEW.scene_id);
+    END;
+    CREATE TRIGGER IF NOT EXISTS search_enqueue_insight AFTER INSERT ON insights BEGIN
+        INSERT OR IGNORE INTO search_pending (kind, ref_id) VALUES ('insight', NEW.id);
+    END;
+    CREATE TRIGGER IF NOT EXISTS search_drop_insight AFTER DELETE ON insights BEGIN
+        DELETE FROM search_pending WHERE kind = 'insight' AND ref_id = OLD.id;
+        DELETE FROM search_docs WHERE kind = 'insight' AND ref_id = OLD.id;
+    END;
+    INSERT OR IGNORE INTO search_pending (kind, ref_id) SELECT 'input', input_id FROM tagger_outputs;
+    INSERT OR IGNORE INTO search_pending (kind, ref_id) SELECT 'scene', scene_id FROM scenes;
+    INSERT OR IGNORE INTO search_pending (kind, ref_id) SELECT 'insight', id FROM insights;
+    """,
+    # 6: FTS5 keyword index.  FTS rowids mirror the source tables' rowids so
+    # triggers can update a document without scanning the index; the 2- and
+    # 3-character prefix indexes keep short ``word*`` queries fast.
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS inputs_fts USING fts5(
+        title, body, summary, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    );
+    CREATE VIRTUAL TABLE IF NOT EXISTS insights_fts USING fts5(
+        title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    );
+    CREATE TRIGGER IF NOT EXISTS fts_input_insert AFTER INSERT ON inputs BEGIN
+        INSERT INTO inputs_fts (rowid, title, body, summary)
+        VALUES (NEW.rowid, COALESCE(NEW.file_path, ''), NEW.raw_text, '');
+    END;
+    CREATE TRIGGER IF NOT EXISTS fts_input_delete AFTER DELETE ON inputs BEGIN
+        DELETE FROM inputs_fts WHERE rowid = OLD.rowid;
+    END;
+    CREATE TRIGGER IF NOT EXISTS fts_tagger_insert AFTER INSERT ON tagger_outputs BEGIN
+        UPDATE inputs_fts
+        SET summary = json_extract(NEW.output_json, '$.summary') || ' '
+                      || json_extract(NEW.output_json, '$.tags.topics')
+        WHERE rowid = (SELECT rowid FROM inputs WHERE id = NEW.input_id);
+    END;
+    CREATE TRIGGER IF NOT EXISTS fts_insight_insert AFTER INSERT ON insights BEGIN
+        INSERT INTO insights_fts (rowid, title, body)
+        VALUES (
+            NEW.rowid,
+            json_extract(NEW.card_json, '$.insight_title'),
+            json_extract(NEW.card_json, '$.what_happened') || ' '
+                || json_extract(NEW.card_json, '$.upgrade_pattern')
+        );
+    END;
+    CREATE TRIGGER IF NOT EXISTS fts_insight_delete AFTER DELETE ON insights BEGIN
+        DELETE FROM insights_fts WHERE rowid = OLD.rowid;
+    END;
+    INSERT INTO inputs_fts (rowid, title, body, summary)
+        SELECT i.rowid, COALESCE(i.file_path, ''), i.raw_text,
+               COALESCE(json_extract(t.output_json, '$.summary') || ' '
+                        || json_extract(t.output_json, '$.tags.topics'), '')
+        FROM inputs i LEFT JOIN tagger_outputs t ON t.input_id = i.id;
+    INSERT INTO insights_fts (rowid, title, body)
+        SELECT rowid, json_extract(card_json, '$.insight_title'),
+               json_extract(card_json, '$.what_happened') || ' '
+                   || json_extract(card_json, '$.upgrade_pattern')
+        FROM insights;
+    """,
+    # 7: spaced-repetition schedule, one row per answered scene.  The due queue
+    # is a range scan on idx_review_schedule_due.  Scenes answered before this
+    # migration start at the first (one-day) step from their latest answer.
+    """
+    CREATE TABLE IF NOT EXISTS review_schedule (
+        scene_id         TEXT PRIMARY KEY REFERENCES scenes(scene_id),
+        input_id         TEXT NOT NULL REFERENCES inputs(id),
+        reps             INTEGER NOT NULL DEFAULT 0,
+        lapses           INTEGER NOT NULL DEFAULT 0,
+        stability        REAL NOT NULL DEFAULT 0,
+        difficulty       REAL NOT NULL DEFAULT 5,
+        last_grade       INTEGER,
+        next_due         TEXT NOT NULL,
+        last_reviewed_at TEXT,
+        updated_at       TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+    CREATE INDEX IF NOT EXISTS idx_review_schedule_due ON review_schedule(next_due);
+    INSERT OR IGNORE INTO review_schedule
+        (scene_id, input_id, reps, stability, next_due, last_reviewed_at)
+        SELECT s.scene_id, s.input_id, 1, 1.0,
+               datetime(MAX(r.created_at), '+1 day'), MAX(r.created_at)
+        FROM responses r JOIN scenes s ON s.scene_id = r.scene_id
+        WHERE r.perf_json IS NOT NULL
+        GROUP BY s.scene_id;
+    """,
+    # 8: pre-generated practice scenes (with the coach's opening message) and
+    # the inputs waiting for a pool refill.
+    """
+    CREATE TABLE IF NOT EXISTS scene_pool (
+        scene_id       TEXT PRIMARY KEY,
+        input_id       TEXT NOT NULL REFERENCES inputs(id),
+        scene_json     TEXT NOT NULL,
+        opening        TEXT,
+        prompt_version TEXT,
+        coach_version  TEXT,
+        created_at     TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+    CREATE INDEX IF NOT EXISTS idx_scene_pool_input_created ON scene_pool(input_id, created_at);
+    CREATE TABLE IF NOT EXISTS scene_pool_requests (
+        input_id     TEXT PRIMARY KEY,
+        requested_at TEXT NOT NULL DEFAULT (datetime('now'))
+    ) WITHOUT ROWID;
+    """,
+    # 9: durable queue for background LLM work (``praxis worker``).  A job is
+    # queued, leased by one worker until ``leased_until``, then deleted when it
+    # succeeds, re-queued with a later ``available_at`` when it fails, or moved
+    # to 'dead' after ``max_attempts``.  ``praxis batch`` parks the jobs whose
+    # work it submitted as 'batched' until the batch is collected.
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id           INTEGER PRIMARY KEY,
+        kind         TEXT NOT NULL,
+        payload      TEXT NOT NULL,
+        status       TEXT NOT NULL DEFAULT 'queued',
+        attempts     INTEGER NOT NULL DEFAULT 0,
+        max_attempts INTEGER NOT NULL DEFAULT 5,
+        available_at TEXT NOT NULL DEFAULT (datetime('now')),
+        lease_owner  TEXT,
+        leased_until TEXT,
+        last_error   TEXT,
+        created_at   TEXT NOT NULL DEFAULT (datetime('now')),
+        updated_at   TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+    CREATE INDEX IF NOT EXISTS idx_jobs_status_available ON jobs(status, available_at);
+    CREATE INDEX IF NOT EXISTS idx_jobs_status_leased ON jobs(status, leased_until);
+    """,
+    # 10: provider Batch API jobs (``praxis batch``).  ``id`` is the provider's
+    # batch id and ``status`` its last reported status; ``batch_requests`` maps
+    # each request's ``custom_id`` back to its input.  The prompt versions are
+    # the ones the requests were built with, so collected results are stamped
+    # correctly even if the prompts change while the batch runs.
+    """
+    CREATE TABLE IF NOT EXISTS batch_jobs (
+        id              TEXT PRIMARY KEY,
+        kind            TEXT NOT NULL,
+        provider        TEXT NOT NULL,
+        model           TEXT NOT NULL,
+        prompt_version  TEXT,
+        coach_version   TEXT,
+        status          TEXT NOT NULL,
+        input_file_id   TEXT NOT NULL,
+        output_file_id  TEXT,
+        error_file_id   TEXT,
+        request_count   INTEGER NOT NULL,
+        completed_count INTEGER NOT NULL DEFAULT 0,
+        failed_count    INTEGER NOT NULL DEFAULT 0,
+        collected_at    TEXT,
+        created_at      TEXT NOT NULL DEFAULT (datetime('now')),
+        updated_at      TEXT NOT NULL DEFAULT (datetime('now'))
+    );
+    CREATE TABLE IF NOT EXISTS batch_requests (
+        batch_id  TEXT NOT NULL REFERENCES batch_jobs(id),
+        custom_id TEXT NOT NULL,
+        input_id  TEXT NOT NULL REFERENCES inputs(id),
+        PRIMARY KEY (batch_id, custom_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_batch_requests_input ON batch_requests(input_id);
+    """,
+]
 
-def get_connection(db_path: Path | str) -> sqlite3.Connection:
+
+class PraxisConnection(sqlite3.Connection):
+    """Connection that tracks ``transaction()`` nesting depth."""
+
+    tx_depth: int = 0
+
+
+def apply_pragmas(conn: sqlite3.Connection, storage: StorageSettings) -> None:
+    """Apply journaling, durability, cache and lock-wait pragmas."""
+    conn.execute(f"PRAGMA busy_timeout = {int(storage.busy_timeout_ms)}")
+    conn.execute(f"PRAGMA journal_mode = {storage.journal_mode}")
+    conn.execute(f"PRAGMA synchronous = {storage.synchronous}")
+    # Negative cache_size is in KiB rather than pages.
+    conn.execute(f"PRAGMA cache_size = -{int(storage.cache_size_kib)}")
+    conn.execute(f"PRAGMA mmap_size = {int(storage.mmap_size_mib) * 1024 * 1024}")
+
+
+def connect(
+    db_path: Path | str,
+    storage: StorageSettings | None = None,
+    *,
+    check_same_thread: bool = True,
+    factory: type[sqlite3.Connection] = PraxisConnection,
+) -> sqlite3.Connection:
+    """Connection factory shared by the app DB, the checkpointer and local caches."""
+    storage = storage or StorageSettings()
+    conn = sqlite3.connect(
+        str(db_path),
+        timeout=storage.busy_timeout_ms / 1000,
+        check_same_thread=check_same_thread,
+        factory=factory,
+    )
+    apply_pragmas(conn, storage)
+    return conn
+
+
+def get_connection(
+    db_path: Path | str, storage: StorageSettings | None = None
+) -> sqlite3.Connection:
     """Return database connection."""
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(db_path, storage)
     conn.row_factory = sqlite3.Row
     return conn
 
 
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Unit of work: CRUD helpers inside the block share one commit.
+
+    The outermost block takes the write lock up front (``BEGIN IMMEDIATE``)
+    and commits once on exit; nested blocks become savepoints, so a failing
+    inner block rolls back only its own writes.  Any exception rolls back.
+    """
+    if not isinstance(conn, PraxisConnection):
+        raise TypeError("transaction() requires a connection from get_connection().")
+    depth = conn.tx_depth
+    savepoint = f"praxis_sp_{depth}"
+    if depth == 0:
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+    else:
+        conn.execute(f"SAVEPOINT {savepoint}")
+    conn.tx_depth = depth + 1
+    try:
+        yield conn
+    except BaseException:
+        conn.tx_depth = depth
+        if depth == 0:
+            conn.rollback()
+        else:
+            conn.execute(f"ROLLBACK TO {savepoint}")
+            conn.execute(f"RELEASE {savepoint}")
+        raise
+    conn.tx_depth = depth
+    if depth == 0:
+        conn.commit()
+    else:
+        conn.execute(f"RELEASE {savepoint}")
+
+
+def _commit(conn: sqlite3.Connection) -> None:
+    """Commit unless the caller is inside a ``transaction()`` block."""
+    if getattr(conn, "tx_depth", 0) == 0:
+        conn.commit()
+
+
+def _split_sql(script: str) -> list[str]:
+    """Split a script into complete statements (trigger bodies stay intact)."""
+    statements: list[str] = []
+    buffer = ""
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            if buffer.strip():
+                statements.append(buffer.strip())
+            buffer = ""
+    if buffer.strip():
+        raise ValueError(f"Incomplete SQL statement in migration: {buffer.strip()[:80]}")
+    return statements
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _apply_migrations(conn: sqlite3.Connection) -> None:
+    """Apply pending ``MIGRATIONS``, one transaction per step.
+
+    The version is re-read under the write lock so concurrent processes never
+    apply the same step twice.
+    """
+    target = len(MIGRATIONS)
+    if get_schema_version(conn) >= target:
+        return
+    if conn.in_transaction:
+        conn.commit()
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = get_schema_version(conn)
+            if version >= target:
+                conn.rollback()
+                break
+            for statement in _split_sql(MIGRATIONS[version]):
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version + 1}")
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    conn.execute("PRAGMA optimize")
+
+
 def ensure_schema(conn: sqlite3.Connection) -> None:
-    """Create tables."""
+    """Create baseline tables and apply pending migrations."""
     conn.executescript(SCHEMA_SQL)
     conn.commit()
+    _apply_migrations(conn)
 
 
 def create_input(
@@ -96,7 +441,7 @@ def create_input(
         "INSERT INTO inputs (id, file_path, file_hash, raw_text, type_hint) VALUES (?, ?, ?, ?, ?)",
         (input_id, file_path, file_hash, raw_text, type_hint),
     )
-    conn.commit()
+    _commit(conn)
 
 
 def get_input_by_id(conn: sqlite3.Connection, input_id: str) -> sqlite3.Row | None:
@@ -111,28 +456,98 @@ def get_input_by_hash(conn: sqlite3.Connection, file_hash: str) -> sqlite3.Row |
     return cur.fetchone()
 
 
+# SQLite caps bound parameters per statement (999 on older builds).
+_HASH_BATCH_SIZE = 500
+
+# Rows pulled per fetchmany() when streaming insight cards.
+EXPORT_BATCH_SIZE = 200
+
+
+def get_existing_hashes(conn: sqlite3.Connection, file_hashes: list[str]) -> dict[str, str]:
+    """Map each already-imported file_hash to its input id (batched IN queries)."""
+    existing: dict[str, str] = {}
+    unique = list(dict.fromkeys(file_hashes))
+    for start in range(0, len(unique), _HASH_BATCH_SIZE):
+        batch = unique[start : start + _HASH_BATCH_SIZE]
+        placeholders = ", ".join("?" for _ in batch)
+        cur = conn.execute(
+            f"SELECT id, file_hash FROM inputs WHERE file_hash IN ({placeholders})",
+            batch,
+        )
+        for row in cur.fetchall():
+            existing[row["file_hash"]] = row["id"]
+    return existing
+
+
+def get_tagger_versions(
+    conn: sqlite3.Connection, input_ids: list[str]
+) -> dict[str, tuple[str | None, str | None]]:
+    """Map input ids to the ``(model, prompt_version)`` of their stored TaggerOutput."""
+    versions: dict[str, tuple[str | None, str | None]] = {}
+    unique = list(dict.fromkeys(input_ids))
+    for start in range(0, len(unique), _HASH_BATCH_SIZE):
+        batch = unique[start : start + _HASH_BATCH_SIZE]
+        placeholders = ", ".join("?" for _ in batch)
+        cur = conn.execute(
+            f"SELECT input_id, model, prompt_version FROM tagger_outputs "
+            f"WHERE input_id IN ({placeholders})",
+            batch,
+        )
+        for row in cur.fetchall():
+            versions[row["input_id"]] = (row["model"], row["prompt_version"])
+    return versions
+
+
 def save_tagger_output(
-    conn: sqlite3.Connection, input_id: str, output: TaggerOutput
+    conn: sqlite3.Connection,
+    input_id: str,
+    output: TaggerOutput,
+    model: str | None = None,
+    prompt_version: str | None = None,
 ) -> None:
-    """Insert into tagger_outputs."""
+    """Insert into tagger_outputs, stamped with the model / prompt version that produced it."""
     conn.execute(
-        "INSERT OR REPLACE INTO tagger_outputs (input_id, output_json) VALUES (?, ?)",
-        (input_id, output.model_dump_json()),
+        """INSERT OR REPLACE INTO tagger_outputs (input_id, output_json, model, prompt_version)
+           VALUES (?, ?, ?, ?)""",
+        (input_id, output.model_dump_json(), model, prompt_version),
     )
     conn.execute(
         "UPDATE inputs SET input_type = ? WHERE id = ?",
         (output.input_type.value, input_id),
     )
-    conn.commit()
+    _commit(conn)
+
+
+def save_chunks(conn: sqlite3.Connection, input_id: str, chunks: list[Chunk]) -> None:
+    """Replace the stored chunks of an input."""
+    conn.execute("DELETE FROM chunks WHERE input_id = ?", (input_id,))
+    conn.executemany(
+        "INSERT INTO chunks (chunk_id, input_id, seq, text) VALUES (?, ?, ?, ?)",
+        [(c.chunk_id, input_id, c.seq, c.text) for c in chunks],
+    )
+    _commit(conn)
+
+
+def get_chunks(conn: sqlite3.Connection, input_id: str) -> list[Chunk]:
+    """Stored chunks of an input, in document order (empty for short inputs)."""
+    cur = conn.execute(
+        "SELECT chunk_id, seq, text FROM chunks WHERE input_id = ? ORDER BY seq", (input_id,)
+    )
+    return [Chunk(chunk_id=r["chunk_id"], seq=r["seq"], text=r["text"]) for r in cur.fetchall()]
 
 
-def save_scene(conn: sqlite3.Connection, input_id: str, scene: PracticeScene) -> None:
+def save_scene(
+    conn: sqlite3.Connection,
+    input_id: str,
+    scene: PracticeScene,
+    prompt_version: str | None = None,
+) -> None:
     """Insert into scenes."""
     conn.execute(
-        "INSERT INTO scenes (scene_id, input_id, scene_json) VALUES (?, ?, ?)",
-        (scene.scene_id, input_id, scene.model_dump_json()),
+        "INSERT INTO scenes (scene_id, input_id, scene_json, prompt_version) VALUES (?, ?, ?, ?)",
+        (scene.scene_id, input_id, scene.model_dump_json(), prompt_version),
     )
-    conn.commit()
+    _commit(conn)
 
 
 def get_scene(conn: sqlite3.Connection, scene_id: str) -> PracticeScene | None:
@@ -144,6 +559,12 @@ def get_scene(conn: sqlite3.Connection, scene_id: str) -> PracticeScene | None:
     return PracticeScene.model_validate_json(row["scene_json"])
 
 
+def get_scene_input_id(conn: sqlite3.Connection, scene_id: str) -> str | None:
+    """Get the input id a scene was generated from."""
+    row = conn.execute("SELECT input_id FROM scenes WHERE scene_id = ?", (scene_id,)).fetchone()
+    return row["input_id"] if row else None
+
+
 def create_response(
     conn: sqlite3.Connection, scene_id: str, answer_text: str
 ) -> str:
@@ -153,19 +574,22 @@ def create_response(
         "INSERT INTO responses (id, scene_id, answer_text) VALUES (?, ?, ?)",
         (resp_id, scene_id, answer_text),
     )
-    conn.commit()
+    _commit(conn)
     return resp_id
 
 
 def update_response_performance(
-    conn: sqlite3.Connection, response_id: str, performance: PracticePerformance
+    conn: sqlite3.Connection,
+    response_id: str,
+    performance: PracticePerformance,
+    prompt_version: str | None = None,
 ) -> None:
     """Update response perf_json."""
     conn.execute(
-        "UPDATE responses SET perf_json = ? WHERE id = ?",
-        (performance.model_dump_json(), response_id),
+        "UPDATE responses SET perf_json = ?, prompt_version = ? WHERE id = ?",
+        (performance.model_dump_json(), prompt_version, response_id),
     )
-    conn.commit()
+    _commit(conn)
 
 
 def save_insight(
@@ -174,12 +598,14 @@ def save_insight(
     scene_id: str | None,
     response_id: str | None,
     card: InsightCard,
+    prompt_version: str | None = None,
 ) -> None:
     """Insert into insights."""
     card_id = str(uuid4())
     conn.execute(
-        """INSERT INTO insights (id, input_id, scene_id, response_id, card_json, insight_type, intensity)
-           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        """INSERT INTO insights (id, input_id, scene_id, response_id, card_json, insight_type,
+                                 intensity, prompt_version)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
         (
             card_id,
             input_id,
@@ -188,9 +614,40 @@ def save_insight(
             card.model_dump_json(),
             card.insight_type.value,
             card.intensity,
+            prompt_version,
         ),
     )
-    conn.commit()
+    _commit(conn)
+
+
+def save_insights_many(
+    conn: sqlite3.Connection,
+    input_id: str,
+    scene_id: str | None,
+    response_id: str | None,
+    cards: list[InsightCard],
+    prompt_version: str | None = None,
+) -> None:
+    """Insert several insight cards with one executemany."""
+    conn.executemany(
+        """INSERT INTO insights (id, input_id, scene_id, response_id, card_json, insight_type,
+                                 intensity, prompt_version)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+        [
+            (
+                str(uuid4()),
+                input_id,
+                scene_id,
+                response_id,
+                card.model_dump_json(),
+                card.insight_type.value,
+                card.intensity,
+                prompt_version,
+            )
+            for card in cards
+        ],
+    )
+    _commit(conn)
 
 
 def upsert_graph_thread(
@@ -210,15 +667,17 @@ def upsert_graph_thread(
              updated_at = datetime('now')""",
         (thread_id, input_id, scene_id, status),
     )
-    conn.commit()
+    _commit(conn)
 
 
 def get_thread_by_scene_id(
     conn: sqlite3.Connection, scene_id: str
 ) -> sqlite3.Row | None:
-    """Get graph_threads by scene_id."""
+    """Get the most recent graph_threads row for scene_id (reviews add new threads)."""
     cur = conn.execute(
-        "SELECT * FROM graph_threads WHERE scene_id = ?", (scene_id,)
+        "SELECT * FROM graph_threads WHERE scene_id = ? "
+        "ORDER BY updated_at DESC, rowid DESC LIMIT 1",
+        (scene_id,),
     )
     return cur.fetchone()
 
@@ -263,6 +722,26 @@ def get_tagger_output(conn: sqlite3.Connection, input_id: str) -> TaggerOutput |
     return TaggerOutput.model_validate_json(row["output_json"])
 
 
+def get_tagger_output_by_hash(
+    conn: sqlite3.Connection,
+    file_hash: str,
+    model: str,
+    prompt_version: str,
+) -> tuple[str, TaggerOutput] | None:
+    """Stored ``(input_id, TaggerOutput)`` for identical content, if produced by
+    the same model and prompt version."""
+    cur = conn.execute(
+        """SELECT t.input_id, t.output_json FROM inputs i
+           JOIN tagger_outputs t ON t.input_id = i.id
+           WHERE i.file_hash = ? AND t.model = ? AND t.prompt_version = ?""",
+        (file_hash, model, prompt_version),
+    )
+    row = cur.fetchone()
+    if row is None:
+        return None
+    return row["input_id"], TaggerOutput.model_validate_json(row["output_json"])
+
+
 def get_scenes_by_input(conn: sqlite3.Connection, input_id: str) -> list[PracticeScene]:
     """Get all scenes for an input."""
     cur = conn.execute(
@@ -280,6 +759,185 @@ def get_response_by_scene(conn: sqlite3.Connection, scene_id: str) -> sqlite3.Ro
     return cur.fetchone()
 
 
+def get_response(conn: sqlite3.Connection, response_id: str) -> sqlite3.Row | None:
+    """Get a response by id."""
+    cur = conn.execute("SELECT * FROM responses WHERE id = ?", (response_id,))
+    return cur.fetchone()
+
+
+# Pipeline stage (a key of ``prompts.PROMPTS``) -> table whose rows record
+# that stage's prompt_version.
+PROMPT_VERSION_TABLES = {
+    "tagger": "tagger_outputs",
+    "practice_generator": "scenes",
+    "practice_evaluator": "responses",
+    "insight_generator": "insights",
+}
+
+
+def count_stale_rows(conn: sqlite3.Connection, versions: dict[str, str]) -> dict[str, int]:
+    """Per stage, count rows whose prompt_version differs from ``versions[stage]``."""
+    counts: dict[str, int] = {}
+    for stage, table in PROMPT_VERSION_TABLES.items():
+        if stage not in versions:
+            continue
+        sql = f"SELECT COUNT(*) FROM {table} WHERE prompt_version IS NOT ?"
+        if table == "responses":
+            sql += " AND perf_json IS NOT NULL"
+        counts[stage] = conn.execute(sql, (versions[stage],)).fetchone()[0]
+    return counts
+
+
+def get_tagger_input_ids(conn: sqlite3.Connection, stale_for: str | None = None) -> list[str]:
+    """Ids of inputs with a stored TaggerOutput.
+
+    With ``stale_for``, only those whose output was not produced by that prompt version.
+    """
+    sql = "SELECT input_id FROM tagger_outputs"
+    params: list = []
+    if stale_for is not None:
+        sql += " WHERE prompt_version IS NOT ?"
+        params.append(stale_for)
+    sql += " ORDER BY created_at"
+    return [r["input_id"] for r in conn.execute(sql, params)]
+
+
+def get_insight_response_ids(conn: sqlite3.Connection, stale_for: str | None = None) -> list[str]:
+    """Ids of evaluated responses that have insight cards.
+
+    With ``stale_for``, only responses holding cards not produced by that prompt
+    version.  Cards without a response cannot be regenerated and are ignored.
+    """
+    sql = """SELECT DISTINCT i.response_id FROM insights i
+             JOIN responses r ON r.id = i.response_id
+             WHERE r.perf_json IS NOT NULL"""
+    params: list = []
+    if stale_for is not None:
+        sql += " AND i.prompt_version IS NOT ?"
+        params.append(stale_for)
+    return [r["response_id"] for r in conn.execute(sql, params)]
+
+
+def delete_insights_for_response(conn: sqlite3.Connection, response_id: str) -> int:
+    """Delete all insight cards generated from a response; return the count."""
+    cur = conn.execute("DELETE FROM insights WHERE response_id = ?", (response_id,))
+    _commit(conn)
+    return cur.rowcount
+
+
+def get_insight_card(conn: sqlite3.Connection, insight_id: str) -> dict | None:
+    """Get one insight card by id."""
+    row = conn.execute("SELECT card_json FROM insights WHERE id = ?", (insight_id,)).fetchone()
+    return json.loads(row["card_json"]) if row else None
+
+
+def get_search_pending(conn: sqlite3.Connection, limit: int) -> list[tuple[str, str]]:
+    """Up to ``limit`` queued ``(kind, ref_id)`` pairs awaiting embedding."""
+    cur = conn.execute("SELECT kind, ref_id FROM search_pending LIMIT ?", (limit,))
+    return [(r["kind"], r["ref_id"]) for r in cur.fetchall()]
+
+
+def count_search_pending(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT COUNT(*) FROM search_pending").fetchone()[0]
+
+
+def record_search_docs(
+    conn: sqlite3.Connection,
+    docs: list[tuple[int, str, str]],
+    done: list[tuple[str, str]],
+) -> None:
+    """Map vector rows to ``(kind, ref_id)`` and dequeue the processed items."""
+    conn.executemany(
+        """INSERT INTO search_docs (row, kind, ref_id) VALUES (?, ?, ?)
+           ON CONFLICT(kind, ref_id) DO UPDATE SET row = excluded.row""",
+        docs,
+    )
+    conn.executemany("DELETE FROM search_pending WHERE kind = ? AND ref_id = ?", done)
+    _commit(conn)
+
+
+def get_search_docs(conn: sqlite3.Connection, rows: list[int]) -> dict[int, tuple[str, str]]:
+    """Map vector rows to ``(kind, ref_id)``; rows superseded or deleted are absent."""
+    found: dict[int, tuple[str, str]] = {}
+    for start in range(0, len(rows), _HASH_BATCH_SIZE):
+        batch = [int(r) for r in rows[start : start + _HASH_BATCH_SIZE]]
+        placeholders = ", ".join("?" for _ in batch)
+        cur = conn.execute(
+            f"SELECT row, kind, ref_id FROM search_docs WHERE row IN ({placeholders})", batch
+        )
+        for r in cur.fetchall():
+            found[r["row"]] = (r["kind"], r["ref_id"])
+    return found
+
+
+def reset_search_docs(conn: sqlite3.Connection) -> None:
+    """Forget all indexed rows and queue every searchable row again."""
+    conn.execute("DELETE FROM search_docs")
+    conn.execute(
+        "INSERT OR IGNORE INTO search_pending (kind, ref_id) SELECT 'input', input_id FROM tagger_outputs"
+    )
+    conn.execute(
+        "INSERT OR IGNORE INTO search_pending (kind, ref_id) SELECT 'scene', scene_id FROM scenes"
+    )
+    conn.execute("INSERT OR IGNORE INTO search_pending (kind, ref_id) SELECT 'insight', id FROM insights")
+    _commit(conn)
+
+
+# Snippet highlight markers (control characters never present in note text).
+FTS_MARK_START = "\x02"
+FTS_MARK_END = "\x03"
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word must match (``word*`` = prefix)."""
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return " ".join(terms)
+
+
+def search_fts(
+    conn: sqlite3.Connection,
+    query: str,
+    kinds: tuple[str, ...] = ("input", "insight"),
+    limit: int = 10,
+) -> list[dict]:
+    """BM25-ranked keyword matches across inputs and insight cards, best first.
+
+    Each hit has ``kind``, ``ref_id``, ``title``, ``snippet`` (matches wrapped in
+    ``FTS_MARK_START``/``FTS_MARK_END``) and ``score`` (negated BM25, higher is better).
+    """
+    match = fts_query(query)
+    if not match:
+        return []
+    hits: list[dict] = []
+    if "input" in kinds:
+        cur = conn.execute(
+            """SELECT 'input' AS kind, i.id AS ref_id, inputs_fts.title AS title,
+                      snippet(inputs_fts, -1, ?, ?, '…', 16) AS snippet,
+                      -bm25(inputs_fts, 2.0, 1.0, 4.0) AS score
+               FROM inputs_fts JOIN inputs i ON i.rowid = inputs_fts.rowid
+               WHERE inputs_fts MATCH ? ORDER BY bm25(inputs_fts, 2.0, 1.0, 4.0) LIMIT ?""",
+            (FTS_MARK_START, FTS_MARK_END, match, limit),
+        )
+        hits.extend(dict(r) for r in cur.fetchall())
+    if "insight" in kinds:
+        cur = conn.execute(
+            """SELECT 'insight' AS kind, n.id AS ref_id, insights_fts.title AS title,
+                      snippet(insights_fts, -1, ?, ?, '…', 16) AS snippet,
+                      -bm25(insights_fts, 2.0, 1.0) AS score
+               FROM insights_fts JOIN insights n ON n.rowid = insights_fts.rowid
+               WHERE insights_fts MATCH ? ORDER BY bm25(insights_fts, 2.0, 1.0) LIMIT ?""",
+            (FTS_MARK_START, FTS_MARK_END, match, limit),
+        )
+        hits.extend(dict(r) for r in cur.fetchall())
+    hits.sort(key=lambda h: h["score"], reverse=True)
+    return hits[:limit]
+
+
 def get_all_insights(conn: sqlite3.Connection) -> list[dict]:
     """Get all insight cards with input_id info."""
     cur = conn.execute(
@@ -294,13 +952,45 @@ def get_all_insights(conn: sqlite3.Connection) -> list[dict]:
     return result
 
 
-def get_insights(
+def iter_insights(
     conn: sqlite3.Connection,
+    since: str | None = None,
+    input_id: str | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[dict]:
+    """Yield insight cards newest first, fetching ``batch_size`` rows at a time.
+
+    ``since`` is compared against ``created_at`` (``YYYY-MM-DD[ HH:MM:SS]``).
+    The cursor is consumed lazily, so memory use does not grow with the library.
+    """
+    sql = "SELECT input_id, card_json FROM insights WHERE 1=1"
+    params: list = []
+    if since:
+        sql += " AND created_at >= ?"
+        params.append(since)
+    if input_id:
+        sql += " AND input_id = ?"
+        params.append(input_id)
+    sql += " ORDER BY created_at DESC"
+    cur = conn.execute(sql, params)
+    try:
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                return
+            for r in rows:
+                card = json.loads(r["card_json"])
+                card["_input_id"] = r["input_id"]
+                yield card
+    finally:
+        cur.close()
+
+
+def _insights_query(
     input_id: str | None = None,
     insight_type: str | None = None,
     min_intensity: int | None = None,
-) -> list[dict]:
-    """Query insight cards."""
+) -> tuple[str, list]:
     sql = "SELECT card_json FROM insights WHERE 1=1"
     params: list = []
     if input_id:
@@ -313,6 +1003,519 @@ def get_insights(
         sql += " AND intensity >= ?"
         params.append(min_intensity)
     sql += " ORDER BY created_at DESC"
+    return sql, params
+
+
+def get_insights(
+    conn: sqlite3.Connection,
+    input_id: str | None = None,
+    insight_type: str | None = None,
+    min_intensity: int | None = None,
+) -> list[dict]:
+    """Query insight cards."""
+    sql, params = _insights_query(input_id, insight_type, min_intensity)
     cur = conn.execute(sql, params)
     rows = cur.fetchall()
     return [json.loads(r["card_json"]) for r in rows]
+
+
+def get_review_state(conn: sqlite3.Connection, scene_id: str) -> ReviewState | None:
+    row = conn.execute(
+        "SELECT * FROM review_schedule WHERE scene_id = ?", (scene_id,)
+    ).fetchone()
+    if row is None:
+        return None
+    return ReviewState.model_validate({k: row[k] for k in ReviewState.model_fields})
+
+
+def save_review_state(conn: sqlite3.Connection, state: ReviewState) -> None:
+    """Insert or replace the schedule row for ``state.scene_id``."""
+    conn.execute(
+        """INSERT INTO review_schedule
+               (scene_id, input_id, reps, lapses, stability, difficulty, last_grade,
+                next_due, last_reviewed_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(scene_id) DO UPDATE SET
+             reps = excluded.reps,
+             lapses = excluded.lapses,
+             stability = excluded.stability,
+             difficulty = excluded.difficulty,
+             last_grade = excluded.last_grade,
+             next_due = excluded.next_due,
+             last_reviewed_at = excluded.last_reviewed_at,
+             updated_at = datetime('now')""",
+        (
+            state.scene_id,
+            state.input_id,
+            state.reps,
+            state.lapses,
+            state.stability,
+            state.difficulty,
+            state.last_grade,
+            state.next_due,
+            state.last_reviewed_at,
+        ),
+    )
+    _commit(conn)
+
+
+def get_due_reviews(conn: sqlite3.Connection, now: str, limit: int = 20) -> list[dict]:
+    """Scenes due at ``now``, most overdue first (index range scan, ``limit`` rows read).
+
+    Each item has the ``ReviewState`` fields plus ``scene`` (a PracticeScene).
+    """
+    cur = conn.execute(
+        """SELECT r.*, s.scene_json FROM review_schedule r
+           JOIN scenes s ON s.scene_id = r.scene_id
+           WHERE r.next_due <= ? ORDER BY r.next_due LIMIT ?""",
+        (now, limit),
+    )
+    result = []
+    for row in cur.fetchall():
+        item = {k: row[k] for k in ReviewState.model_fields}
+        item["scene"] = PracticeScene.model_validate_json(row["scene_json"])
+        result.append(item)
+    return result
+
+
+def count_due_reviews(conn: sqlite3.Connection, now: str) -> int:
+    cur = conn.execute("SELECT COUNT(*) FROM review_schedule WHERE next_due <= ?", (now,))
+    return cur.fetchone()[0]
+
+
+def get_review_forecast(conn: sqlite3.Connection, now: str, until: str) -> list[tuple[str, int]]:
+    """``(YYYY-MM-DD, scenes due)`` for each day with reviews in ``(now, until]``."""
+    cur = conn.execute(
+        """SELECT substr(next_due, 1, 10) AS day, COUNT(*) FROM review_schedule
+           WHERE next_due > ? AND next_due <= ? GROUP BY day ORDER BY day""",
+        (now, until),
+    )
+    return [(r[0], r[1]) for r in cur.fetchall()]
+
+
+def save_pooled_scene(
+    conn: sqlite3.Connection,
+    input_id: str,
+    scene: PracticeScene,
+    opening: str | None,
+    prompt_version: str | None = None,
+    coach_version: str | None = None,
+) -> None:
+    conn.execute(
+        """INSERT INTO scene_pool
+               (scene_id, input_id, scene_json, opening, prompt_version, coach_version)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        (scene.scene_id, input_id, scene.model_dump_json(), opening, prompt_version, coach_version),
+    )
+    _commit(conn)
+
+
+def pop_pooled_scene(
+    conn: sqlite3.Connection,
+    input_id: str,
+    versions: tuple[str, str] | None = None,
+) -> dict | None:
+    """Remove and return the oldest pooled scene for ``input_id``.
+
+    With ``versions`` (generator, coach), only scenes made by those prompt
+    versions are taken.  Returns ``scene`` (PracticeScene), ``opening`` and
+    ``prompt_version``, or None if the pool is empty.
+    """
+    sql = "SELECT * FROM scene_pool WHERE input_id = ?"
+    params: list = [input_id]
+    if versions is not None:
+        sql += " AND prompt_version = ? AND coach_version = ?"
+        params.extend(versions)
+    sql += " ORDER BY created_at, rowid LIMIT 1"
+    with transaction(conn):
+        row = conn.execute(sql, params).fetchone()
+        if row is None:
+            return None
+        conn.execute("DELETE FROM scene_pool WHERE scene_id = ?", (row["scene_id"],))
+    return {
+        "scene": PracticeScene.model_validate_json(row["scene_json"]),
+        "opening": row["opening"],
+        "prompt_version": row["prompt_version"],
+    }
+
+
+def count_pooled_scenes(
+    conn: sqlite3.Connection,
+    input_ids: list[str],
+    versions: tuple[str, str] | None = None,
+) -> dict[str, int]:
+    """Ready scenes per input (inputs with none are omitted)."""
+    counts: dict[str, int] = {}
+    unique = list(dict.fromkeys(input_ids))
+    for start in range(0, len(unique), _HASH_BATCH_SIZE):
+        batch = unique[start : start + _HASH_BATCH_SIZE]
+        placeholders = ", ".join("?" for _ in batch)
+        sql = f"SELECT input_id, COUNT(*) FROM scene_pool WHERE input_id IN ({placeholders})"
+        params: list = list(batch)
+        if versions is not None:
+            sql += " AND prompt_version = ? AND coach_version = ?"
+            params.extend(versions)
+        for row in conn.execute(sql + " GROUP BY input_id", params):
+            counts[row[0]] = row[1]
+    return counts
+
+
+def evict_pooled_scenes(
+    conn: sqlite3.Connection,
+    keep_versions: tuple[str, str] | None = None,
+    older_than: str | None = None,
+) -> int:
+    """Delete pooled scenes from other prompt versions or created before ``older_than``."""
+    removed = 0
+    if keep_versions is not None:
+        removed += conn.execute(
+            """DELETE FROM scene_pool WHERE prompt_version IS NOT ?
+               OR coach_version IS NOT ?""",
+            keep_versions,
+        ).rowcount
+    if older_than is not None:
+        removed += conn.execute(
+            "DELETE FROM scene_pool WHERE created_at < ?", (older_than,)
+        ).rowcount
+    _commit(conn)
+    return removed
+
+
+def request_pool_refill(conn: sqlite3.Connection, input_ids: list[str]) -> None:
+    conn.executemany(
+        "INSERT OR IGNORE INTO scene_pool_requests (input_id) VALUES (?)",
+        [(i,) for i in input_ids],
+    )
+    _commit(conn)
+
+
+def get_pool_requests(conn: sqlite3.Connection) -> list[str]:
+    cur = conn.execute("SELECT input_id FROM scene_pool_requests ORDER BY requested_at")
+    return [r[0] for r in cur.fetchall()]
+
+
+def clear_pool_requests(conn: sqlite3.Connection, input_ids: list[str]) -> None:
+    conn.executemany(
+        "DELETE FROM scene_pool_requests WHERE input_id = ?", [(i,) for i in input_ids]
+    )
+    _commit(conn)
+
+
+def get_pool_stats(conn: sqlite3.Connection) -> dict[str, int]:
+    row = conn.execute(
+        """SELECT (SELECT COUNT(*) FROM scene_pool),
+                  (SELECT COUNT(DISTINCT input_id) FROM scene_pool),
+                  (SELECT COUNT(*) FROM scene_pool_requests)"""
+    ).fetchone()
+    return {"scenes": row[0], "inputs": row[1], "requests": row[2]}
+
+
+def enqueue_job(
+    conn: sqlite3.Connection,
+    kind: str,
+    payload: dict,
+    max_attempts: int = 5,
+    available_at: str | None = None,
+) -> int:
+    """Queue a background job; return its id."""
+    cur = conn.execute(
+        """INSERT INTO jobs (kind, payload, max_attempts, available_at)
+           VALUES (?, ?, ?, COALESCE(?, datetime('now')))""",
+        (kind, json.dumps(payload), max_attempts, available_at),
+    )
+    _commit(conn)
+    return cur.lastrowid
+
+
+def lease_jobs(
+    conn: sqlite3.Connection,
+    owner: str,
+    now: str,
+    leased_until: str,
+    limit: int = 1,
+    kinds: tuple[str, ...] | None = None,
+) -> list[dict]:
+    """Lease up to ``limit`` ready jobs to ``owner`` until ``leased_until``.
+
+    Ready means queued and available by ``now``, or leased by a worker whose
+    lease expired (it crashed or was killed).  An expired job that has used
+    all its attempts is dead-lettered instead.  Leasing counts an attempt.
+    The claim is one ``UPDATE ... RETURNING`` under the write lock, so
+    concurrent workers never lease the same job.
+    """
+    kind_sql, kind_params = "", []
+    if kinds:
+        kind_sql = f" AND kind IN ({', '.join('?' for _ in kinds)})"
+        kind_params = list(kinds)
+    with transaction(conn):
+        conn.execute(
+            """UPDATE jobs SET status = 'dead', lease_owner = NULL, leased_until = NULL,
+                   last_error = COALESCE(last_error, 'lease expired'), updated_at = ?
+               WHERE status = 'leased' AND leased_until <= ? AND attempts >= max_attempts""",
+            (now, now),
+        )
+        rows = conn.execute(
+            f"""UPDATE jobs SET status = 'leased', lease_owner = ?, leased_until = ?,
+                    attempts = attempts + 1, updated_at = ?
+                WHERE id IN (
+                    SELECT id FROM jobs
+                    WHERE ((status = 'queued' AND available_at <= ?)
+                           OR (status = 'leased' AND leased_until <= ?)){kind_sql}
+                    ORDER BY available_at, id
+                    LIMIT ?
+                )
+                RETURNING id, kind, payload, attempts, max_attempts""",
+            [owner, leased_until, now, now, now, *kind_params, limit],
+        ).fetchall()
+    jobs = [
+        {
+            "id": row["id"],
+            "kind": row["kind"],
+            "payload": json.loads(row["payload"]),
+            "attempts": row["attempts"],
+            "max_attempts": row["max_attempts"],
+        }
+        for row in rows
+    ]
+    return sorted(jobs, key=lambda job: job["id"])
+
+
+def extend_job_leases(
+    conn: sqlite3.Connection, owner: str, job_ids: list[int], leased_until: str
+) -> int:
+    """Push back the lease expiry of jobs ``owner`` still holds; return how many."""
+    if not job_ids:
+        return 0
+    placeholders = ", ".join("?" for _ in job_ids)
+    extended = conn.execute(
+        f"""UPDATE jobs SET leased_until = ?
+            WHERE status = 'leased' AND lease_owner = ? AND id IN ({placeholders})""",
+        [leased_until, owner, *job_ids],
+    ).rowcount
+    _commit(conn)
+    return extended
+
+
+def complete_job(conn: sqlite3.Connection, job_id: int, owner: str) -> bool:
+    """Delete a finished job.  False if ``owner`` no longer holds its lease."""
+    done = conn.execute(
+        "DELETE FROM jobs WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+        (job_id, owner),
+    ).rowcount
+    _commit(conn)
+    return done == 1
+
+
+def fail_job(
+    conn: sqlite3.Connection,
+    job_id: int,
+    owner: str,
+    error: str,
+    retry_at: str | None,
+) -> bool:
+    """Re-queue a failed job for ``retry_at``, or dead-letter it when ``retry_at`` is None.
+
+    False if ``owner`` no longer holds the lease (the job is left alone).
+    """
+    failed = conn.execute(
+        """UPDATE jobs SET status = ?, available_at = COALESCE(?, available_at),
+               lease_owner = NULL, leased_until = NULL, last_error = ?,
+               updated_at = datetime('now')
+           WHERE id = ? AND status = 'leased' AND lease_owner = ?""",
+        ("queued" if retry_at else "dead", retry_at, error, job_id, owner),
+    ).rowcount
+    _commit(conn)
+    return failed == 1
+
+
+def release_jobs(conn: sqlite3.Connection, owner: str) -> int:
+    """Hand back every job ``owner`` holds (a clean shutdown); the attempt is not counted."""
+    released = conn.execute(
+        """UPDATE jobs SET status = 'queued', lease_owner = NULL, leased_until = NULL,
+               attempts = MAX(attempts - 1, 0), updated_at = datetime('now')
+           WHERE status = 'leased' AND lease_owner = ?""",
+        (owner,),
+    ).rowcount
+    _commit(conn)
+    return released
+
+
+def get_job_counts(conn: sqlite3.Connection) -> dict[str, int]:
+    """Jobs per status (statuses with none are omitted)."""
+    cur = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+    return {row[0]: row[1] for row in cur.fetchall()}
+
+
+def get_dead_jobs(conn: sqlite3.Connection, limit: int = 20) -> list[sqlite3.Row]:
+    cur = conn.execute(
+        """SELECT id, kind, payload, attempts, last_error, updated_at FROM jobs
+           WHERE status = 'dead' ORDER BY updated_at DESC, id DESC LIMIT ?""",
+        (limit,),
+    )
+    return cur.fetchall()
+
+
+def retry_dead_jobs(conn: sqlite3.Connection, job_ids: list[int] | None = None) -> int:
+    """Re-queue dead jobs (all, or ``job_ids``) with a fresh set of attempts."""
+    sql = """UPDATE jobs SET status = 'queued', attempts = 0, available_at = datetime('now'),
+                 updated_at = datetime('now')
+             WHERE status = 'dead'"""
+    params: list = []
+    if job_ids:
+        sql += f" AND id IN ({', '.join('?' for _ in job_ids)})"
+        params.extend(job_ids)
+    retried = conn.execute(sql, params).rowcount
+    _commit(conn)
+    return retried
+
+
+def _job_input_sql(input_ids: list[str]) -> str:
+    return f"json_extract(payload, '$.input_id') IN ({', '.join('?' for _ in input_ids)})"
+
+
+def get_job_input_ids(conn: sqlite3.Connection, kind: str, status: str) -> set[str]:
+    """Inputs with a ``kind`` job in ``status``."""
+    cur = conn.execute(
+        """SELECT DISTINCT json_extract(payload, '$.input_id') FROM jobs
+           WHERE kind = ? AND status = ?""",
+        (kind, status),
+    )
+    return {r[0] for r in cur.fetchall()}
+
+
+def park_batched_jobs(conn: sqlite3.Connection, kind: str, input_ids: list[str]) -> int:
+    """Take queued ``kind`` jobs for ``input_ids`` off the queue while a batch does their work."""
+    if not input_ids:
+        return 0
+    parked = conn.execute(
+        f"""UPDATE jobs SET status = 'batched', updated_at = datetime('now')
+            WHERE kind = ? AND status = 'queued' AND {_job_input_sql(input_ids)}""",
+        [kind, *input_ids],
+    ).rowcount
+    _commit(conn)
+    return parked
+
+
+def finish_batched_jobs(conn: sqlite3.Connection, kind: str, input_ids: list[str]) -> list[dict]:
+    """Delete the parked ``kind`` jobs for ``input_ids``; return their payloads."""
+    if not input_ids:
+        return []
+    rows = conn.execute(
+        f"""DELETE FROM jobs WHERE kind = ? AND status = 'batched' AND {_job_input_sql(input_ids)}
+            RETURNING payload""",
+        [kind, *input_ids],
+    ).fetchall()
+    _commit(conn)
+    return [json.loads(row["payload"]) for row in rows]
+
+
+def requeue_batched_jobs(conn: sqlite3.Connection, kind: str, input_ids: list[str]) -> int:
+    """Hand parked ``kind`` jobs for ``input_ids`` back to the queue (their batch failed them)."""
+    if not input_ids:
+        return 0
+    requeued = conn.execute(
+        f"""UPDATE jobs SET status = 'queued', available_at = datetime('now'),
+                updated_at = datetime('now')
+            WHERE kind = ? AND status = 'batched' AND {_job_input_sql(input_ids)}""",
+        [kind, *input_ids],
+    ).rowcount
+    _commit(conn)
+    return requeued
+
+
+def get_untagged_input_ids(conn: sqlite3.Connection) -> list[str]:
+    """Ids of inputs without a stored TaggerOutput (e.g. queued by ``praxis add --async``)."""
+    cur = conn.execute(
+        """SELECT i.id FROM inputs i
+           WHERE NOT EXISTS (SELECT 1 FROM tagger_outputs t WHERE t.input_id = i.id)
+           ORDER BY i.created_at"""
+    )
+    return [r[0] for r in cur.fetchall()]
+
+
+def create_batch_job(
+    conn: sqlite3.Connection,
+    batch_id: str,
+    kind: str,
+    provider: str,
+    model: str,
+    input_file_id: str,
+    status: str,
+    requests: list[tuple[str, str]],
+    prompt_version: str | None = None,
+    coach_version: str | None = None,
+) -> None:
+    """Record a submitted batch and its ``(custom_id, input_id)`` requests."""
+    conn.execute(
+        """INSERT INTO batch_jobs
+               (id, kind, provider, model, prompt_version, coach_version, status,
+                input_file_id, request_count)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (
+            batch_id, kind, provider, model, prompt_version, coach_version, status,
+            input_file_id, len(requests),
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO batch_requests (batch_id, custom_id, input_id) VALUES (?, ?, ?)",
+        [(batch_id, custom_id, input_id) for custom_id, input_id in requests],
+    )
+    _commit(conn)
+
+
+def update_batch_job(
+    conn: sqlite3.Connection,
+    batch_id: str,
+    status: str,
+    output_file_id: str | None = None,
+    error_file_id: str | None = None,
+    completed_count: int = 0,
+    failed_count: int = 0,
+) -> None:
+    """Store the provider's latest view of a batch."""
+    conn.execute(
+        """UPDATE batch_jobs SET status = ?, output_file_id = ?, error_file_id = ?,
+               completed_count = ?, failed_count = ?, updated_at = datetime('now')
+           WHERE id = ?""",
+        (status, output_file_id, error_file_id, completed_count, failed_count, batch_id),
+    )
+    _commit(conn)
+
+
+def mark_batch_collected(conn: sqlite3.Connection, batch_id: str, collected_at: str) -> None:
+    conn.execute(
+        "UPDATE batch_jobs SET collected_at = ?, updated_at = ? WHERE id = ?",
+        (collected_at, collected_at, batch_id),
+    )
+    _commit(conn)
+
+
+def get_batch_job(conn: sqlite3.Connection, batch_id: str) -> sqlite3.Row | None:
+    return conn.execute("SELECT * FROM batch_jobs WHERE id = ?", (batch_id,)).fetchone()
+
+
+def list_batch_jobs(conn: sqlite3.Connection, uncollected_only: bool = False) -> list[sqlite3.Row]:
+    """Batch jobs, oldest first (optionally only those not collected yet)."""
+    sql = "SELECT * FROM batch_jobs"
+    if uncollected_only:
+        sql += " WHERE collected_at IS NULL"
+    return conn.execute(sql + " ORDER BY created_at, rowid").fetchall()
+
+
+def get_batch_requests(conn: sqlite3.Connection, batch_id: str) -> dict[str, str]:
+    """``custom_id`` -> input id for the requests of a batch."""
+    cur = conn.execute(
+        "SELECT custom_id, input_id FROM batch_requests WHERE batch_id = ?", (batch_id,)
+    )
+    return {r["custom_id"]: r["input_id"] for r in cur.fetchall()}
+
+
+def get_batched_input_ids(conn: sqlite3.Connection, kind: str) -> set[str]:
+    """Inputs with a ``kind`` request in a batch that has not been collected yet."""
+    cur = conn.execute(
+        """SELECT DISTINCT r.input_id FROM batch_requests r
+           JOIN batch_jobs b ON b.id = r.batch_id
+           WHERE b.kind = ? AND b.collected_at IS NULL""",
+        (kind,),
+    )
+    return {r[0] for r in cur.fetchall()}
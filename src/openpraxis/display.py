@@ -2,10 +2,14 @@
 
 from rich import box
 from rich.console import Console, Group
+from rich.live import Live
+from rich.markup import escape
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+from openpraxis.db import FTS_MARK_END, FTS_MARK_START
+
 _console = Console()
 
 
@@ -46,6 +50,59 @@ def show_scene(role: str, task: str, constraints: list[str], hint: list[str]) ->
     )
 
 
+def _coach_panel(text: str) -> Panel:
+    return Panel(Text(text, style="white"), title="Coach", border_style="magenta", box=box.ROUNDED)
+
+
+def show_coach_message(text: str) -> None:
+    """Display a complete coach message."""
+    _console.print(_coach_panel(text))
+
+
+class CoachStream:
+    """Render a coach message token by token while it streams in.
+
+    ``update`` takes the message text so far.  A text that does not continue
+    the current one starts a new panel; ``close`` leaves the final text on
+    screen.  When output is not a terminal, only the final text is printed.
+    """
+
+    def __init__(self) -> None:
+        self._live: Live | None = None
+        self._open = False
+        self.text = ""
+
+    def update(self, text: str) -> None:
+        if self._open and not text.startswith(self.text):
+            self.close()
+        self.text = text
+        self._open = True
+        if not _console.is_terminal:
+            return
+        if self._live is None:
+            self._live = Live(_coach_panel(text), console=_console, refresh_per_second=12)
+            self._live.start()
+        else:
+            self._live.update(_coach_panel(text))
+
+    def close(self) -> None:
+        if not self._open:
+            return
+        self._open = False
+        if self._live is None:
+            show_coach_message(self.text)
+            return
+        self._live.update(_coach_panel(self.text), refresh=True)
+        self._live.stop()
+        self._live = None
+
+    def __enter__(self) -> "CoachStream":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
 def show_tagger_summary(summary: str, capability_map: dict) -> None:
     """Display Tagger summary and capability map."""
     summary_text = Text(summary, style="white")
@@ -121,3 +178,195 @@ def show_performance(signal: dict, improvement_vectors: list[str]) -> None:
                 padding=(0, 1),
             )
         )
+
+
+def show_ingest_summary(
+    imported: int,
+    skipped: int,
+    failed: int,
+    failures: list[tuple[str, str]],
+) -> None:
+    """Display bulk import counts and any per-file failures."""
+    table = Table(title="Import summary", box=box.SIMPLE_HEAD, show_lines=False)
+    table.add_column("Status", style="bold cyan")
+    table.add_column("Files", justify="right")
+    table.add_row("Imported", f"[bold green]{imported}[/bold green]")
+    table.add_row("Skipped", f"[bold yellow]{skipped}[/bold yellow]")
+    table.add_row("Failed", f"[bold red]{failed}[/bold red]")
+    _console.print(table)
+    if failures:
+        lines = "\n".join(f"[red]•[/red] {path}: {error}" for path, error in failures)
+        _console.print(
+            Panel(
+                lines,
+                title="Failures",
+                border_style="red",
+                box=box.ROUNDED,
+                padding=(0, 1),
+            )
+        )
+
+
+def show_reprocess_summary(
+    updated: dict[str, int],
+    failures: list[tuple[str, str]],
+) -> None:
+    """Display per-stage reprocess counts and any failures."""
+    table = Table(title="Reprocess summary", box=box.SIMPLE_HEAD, show_lines=False)
+    table.add_column("Stage", style="bold cyan")
+    table.add_column("Updated", justify="right")
+    for stage, count in updated.items():
+        table.add_row(stage, f"[bold green]{count}[/bold green]")
+    table.add_row("Failed", f"[bold red]{len(failures)}[/bold red]")
+    _console.print(table)
+    if failures:
+        lines = "\n".join(f"[red]•[/red] {row}: {error}" for row, error in failures)
+        _console.print(
+            Panel(
+                lines,
+                title="Failures",
+                border_style="red",
+                box=box.ROUNDED,
+                padding=(0, 1),
+            )
+        )
+
+
+def show_pool_refill_summary(
+    generated: int,
+    evicted: int,
+    failures: list[tuple[str, str]],
+) -> None:
+    """Display scene pool refill counts and any failures."""
+    table = Table(title="Scene pool refill", box=box.SIMPLE_HEAD, show_lines=False)
+    table.add_column("Status", style="bold")
+    table.add_column("Count", justify="right")
+    table.add_row("Generated", f"[bold green]{generated}[/bold green]")
+    table.add_row("Evicted", f"[yellow]{evicted}[/yellow]")
+    table.add_row("Failed", f"[bold red]{len(failures)}[/bold red]")
+    _console.print(table)
+    if failures:
+        lines = "\n".join(f"[red]•[/red] {input_id}: {escape(error)}" for input_id, error in failures)
+        _console.print(
+            Panel(
+                lines,
+                title="Failures",
+                border_style="red",
+                box=box.ROUNDED,
+                padding=(0, 1),
+            )
+        )
+
+
+def show_batch_collect_summary(
+    batch_id: str,
+    saved: int,
+    failures: list[tuple[str, str]],
+) -> None:
+    """Display the results stored from one provider batch and any failures."""
+    table = Table(title=f"Batch {batch_id}", box=box.SIMPLE_HEAD, show_lines=False)
+    table.add_column("Status", style="bold")
+    table.add_column("Count", justify="right")
+    table.add_row("Saved", f"[bold green]{saved}[/bold green]")
+    table.add_row("Failed", f"[bold red]{len(failures)}[/bold red]")
+    _console.print(table)
+    if failures:
+        lines = "\n".join(f"[red]•[/red] {input_id}: {escape(error)}" for input_id, error in failures)
+        _console.print(
+            Panel(
+                lines,
+                title="Failures",
+                border_style="red",
+                box=box.ROUNDED,
+                padding=(0, 1),
+            )
+        )
+
+
+def show_worker_summary(
+    done: int,
+    retried: int,
+    dead: int,
+    failures: list[tuple[str, str]],
+) -> None:
+    """Display background job counts and any failures."""
+    table = Table(title="Worker", box=box.SIMPLE_HEAD, show_lines=False)
+    table.add_column("Status", style="bold")
+    table.add_column("Count", justify="right")
+    table.add_row("Done", f"[bold green]{done}[/bold green]")
+    table.add_row("Retrying", f"[yellow]{retried}[/yellow]")
+    table.add_row("Dead", f"[bold red]{dead}[/bold red]")
+    _console.print(table)
+    if failures:
+        lines = "\n".join(f"[red]•[/red] {job}: {escape(error)}" for job, error in failures)
+        _console.print(
+            Panel(
+                lines,
+                title="Failures",
+                border_style="red",
+                box=box.ROUNDED,
+                padding=(0, 1),
+            )
+        )
+
+
+def show_search_results(query: str, hits: list[dict]) -> None:
+    """Display ranked search hits."""
+    if not hits:
+        _console.print(f"[dim]No results for: {query}[/dim]")
+        return
+    table = Table(title=f"Search: {query}", box=box.SIMPLE_HEAD, row_styles=["none", "dim"])
+    table.add_column("score", justify="right", style="bold green")
+    table.add_column("kind", style="magenta")
+    table.add_column("id", style="cyan", no_wrap=True)
+    table.add_column("title", style="bold")
+    table.add_column("snippet", style="white")
+    for hit in hits:
+        snippet = (
+            escape(hit["snippet"])
+            .replace(FTS_MARK_START, "[bold yellow]")
+            .replace(FTS_MARK_END, "[/bold yellow]")
+        )
+        table.add_row(
+            f"{hit['score']:.3f}",
+            hit["kind"],
+            escape(hit["ref_id"]),
+            escape(hit["title"]),
+            snippet,
+        )
+    _console.print(table)
+
+
+def show_review_queue(items: list[dict], total_due: int) -> None:
+    """Display the batch of scenes due for review."""
+    if not items:
+        _console.print("[dim]Nothing due for review.[/dim]")
+        return
+    title = f"Due for review ({len(items)} of {total_due})" if total_due > len(items) else "Due for review"
+    table = Table(title=title, box=box.SIMPLE_HEAD, row_styles=["none", "dim"])
+    table.add_column("scene", style="cyan", no_wrap=True)
+    table.add_column("due", style="yellow", no_wrap=True)
+    table.add_column("reps", justify="right")
+    table.add_column("lapses", justify="right", style="red")
+    table.add_column("task", style="white")
+    for item in items:
+        scene = item["scene"]
+        table.add_row(
+            item["scene_id"],
+            item["next_due"][:16],
+            str(item["reps"]),
+            str(item["lapses"]),
+            escape(f"{scene.role}: {scene.task}"),
+        )
+    _console.print(table)
+
+
+def show_review_plan(due_now: int, forecast: list[tuple[str, int]]) -> None:
+    """Display how many reviews are due now and on each upcoming day."""
+    table = Table(title="Review plan", box=box.SIMPLE_HEAD, show_lines=False)
+    table.add_column("Day", style="bold cyan")
+    table.add_column("Scenes", justify="right")
+    table.add_row("Due now", f"[bold yellow]{due_now}[/bold yellow]")
+    for day, count in forecast:
+        table.add_row(day, str(count))
+    _console.print(table)
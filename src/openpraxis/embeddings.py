@@ -0,0 +1,104 @@
+"""Text embedders for the semantic search index.
+
+Two implementations are provided behind the ``Embedder`` interface:
+
+* ``HashingEmbedder`` (``[search] embedder = "local"``) — offline signed
+  feature hashing of words and word bigrams.  No model download or API key.
+* ``ProviderEmbedder`` (``embedder = "provider"``) — the configured LLM
+  provider's embeddings endpoint, called in batches.
+
+Vectors are returned as L2-normalized ``float32`` NumPy rows, so a dot
+product is the cosine similarity.  NumPy is an optional dependency
+(``pip install "openpraxis[search]"``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from openpraxis.config import Settings
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def require_numpy():
+    """Import NumPy or raise a RuntimeError explaining how to install it."""
+    try:
+        import numpy
+    except ModuleNotFoundError as exc:
+        raise RuntimeError(
+            'Semantic search requires NumPy. Install it with `pip install "openpraxis[search]"`.'
+        ) from exc
+    return numpy
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    np = require_numpy()
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+class Embedder(ABC):
+    """Maps texts to unit-length vectors of a fixed dimension."""
+
+    #: Identity recorded with the index; vectors from different names are not comparable.
+    name: str
+
+    @abstractmethod
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Return a ``(len(texts), dim)`` float32 array of L2-normalized rows."""
+
+
+class HashingEmbedder(Embedder):
+    """Signed feature hashing of lower-cased words and word bigrams."""
+
+    def __init__(self, dim: int = 512) -> None:
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str) -> list[str]:
+        words = [w.lower() for w in _TOKEN_RE.findall(text)]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        np = require_numpy()
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                out[i, value % self.dim] += 1.0 if (value >> 63) & 1 else -1.0
+        return _normalize(out)
+
+
+class ProviderEmbedder(Embedder):
+    """Embeddings from the configured LLM provider, ``batch_size`` texts per request."""
+
+    def __init__(self, provider: str, model: str, batch_size: int = 64) -> None:
+        self.model = model
+        self.batch_size = batch_size
+        self.name = f"{provider}/{model}"
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        np = require_numpy()
+        from openpraxis.llm import embed_texts
+
+        rows: list[list[float]] = []
+        for start in range(0, len(texts), self.batch_size):
+            rows.extend(embed_texts(texts[start : start + self.batch_size], self.model))
+        return _normalize(np.asarray(rows, dtype=np.float32))
+
+
+def get_embedder(settings: Settings) -> Embedder:
+    if settings.search_embedder == "provider":
+        return ProviderEmbedder(
+            settings.llm_provider, settings.search_embedding_model, settings.search_batch_size
+        )
+    return HashingEmbedder()
@@ -0,0 +1,68 @@
+"""Streaming writers for ``praxis export``.
+
+Each writer consumes an iterator of insight cards and writes them one at a
+time, so memory use stays constant regardless of how many cards are exported.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterable
+from typing import TextIO
+
+EXPORT_FORMATS = ("md", "json", "jsonl")
+
+
+def _public(card: dict) -> dict:
+    """Strip internal metadata keys (``_input_id`` etc.)."""
+    return {k: v for k, v in card.items() if not k.startswith("_")}
+
+
+def write_markdown(cards: Iterable[dict], out: TextIO) -> int:
+    out.write("# OpenPraxis Insight Cards\n\n")
+    count = 0
+    for count, card in enumerate(cards, 1):
+        lines = [
+            f"## {count}. {card.get('insight_title', 'Untitled')}",
+            f"**Type:** {card.get('insight_type', '')}  ",
+            f"**Intensity:** {card.get('intensity', '')}  \n",
+            f"**What happened:** {card.get('what_happened', '')}\n",
+            f"**Why it matters:** {card.get('why_it_matters', '')}\n",
+            f"**Upgrade pattern:** {card.get('upgrade_pattern', '')}\n",
+            f"**Micro practice:** {card.get('micro_practice', '')}\n",
+        ]
+        if card.get("concepts"):
+            lines.append(f"**Concepts:** {', '.join(card['concepts'])}\n")
+        if card.get("skills"):
+            lines.append(f"**Skills:** {', '.join(card['skills'])}\n")
+        lines.append("---\n")
+        out.write("\n".join(lines) + "\n")
+    return count
+
+
+def write_json(cards: Iterable[dict], out: TextIO) -> int:
+    """Write a JSON array incrementally, formatted like ``json.dumps(..., indent=2)``."""
+    count = 0
+    for card in cards:
+        body = json.dumps(_public(card), indent=2, ensure_ascii=False)
+        out.write("[\n" if count == 0 else ",\n")
+        out.write("\n".join("  " + line for line in body.splitlines()))
+        count += 1
+    out.write("\n]\n" if count else "[]\n")
+    return count
+
+
+def write_jsonl(cards: Iterable[dict], out: TextIO) -> int:
+    count = 0
+    for card in cards:
+        out.write(json.dumps(_public(card), ensure_ascii=False))
+        out.write("\n")
+        count += 1
+    return count
+
+
+WRITERS: dict[str, Callable[[Iterable[dict], TextIO], int]] = {
+    "md": write_markdown,
+    "json": write_json,
+    "jsonl": write_jsonl,
+}
@@ -1,13 +1,20 @@
 """LangGraph StateGraph definition."""
 
+import atexit
 import operator
+import os
 import sqlite3
+import threading
 from typing import Annotated, TypedDict
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.checkpoint.sqlite import SqliteSaver
 from langgraph.graph import END, START, StateGraph
 
+from openpraxis.config import StorageSettings
+from openpraxis.db import connect
 from openpraxis.models import (
+    Chunk,
     InsightCard,
     PracticeMessage,
     PracticePerformance,
@@ -21,6 +28,8 @@ class PraxisState(TypedDict, total=False):
     raw_text: str
     type_hint: str | None
     tagger_output: TaggerOutput
+    # Set for long inputs that were tagged chunk by chunk
+    chunks: list[Chunk]
     scene: PracticeScene
     # Multi-turn practice conversation
     practice_messages: Annotated[list[PracticeMessage], operator.add]
@@ -33,6 +42,19 @@ class PraxisState(TypedDict, total=False):
     should_practice: bool
 
 
+def route_from_start(state: PraxisState) -> str:
+    """Entry edge: skip the Tagger when a stored ``tagger_output`` is supplied.
+
+    A supplied ``scene`` (a review attempt) goes straight to the coach, or to
+    the user if the coach's opening message is supplied too (a pooled scene).
+    """
+    if state.get("scene") is not None:
+        return "human_turn" if state.get("practice_messages") else "coach_turn"
+    if state.get("tagger_output") is not None:
+        return route_after_tagger(state)
+    return "tagger"
+
+
 def route_after_tagger(state: PraxisState) -> str:
     """Conditional edge: enter Practice based on should_practice."""
     if state.get("should_practice"):
@@ -51,26 +73,57 @@ def route_after_coach(state: PraxisState) -> str:
     return "human_turn"
 
 
+def _dual_node(name: str, func, afunc) -> RunnableLambda:
+    """Node that runs ``func`` under ``invoke`` and awaits ``afunc`` under ``ainvoke``."""
+    return RunnableLambda(func, afunc=afunc, name=name)
+
+
 def build_graph():
-    """Build StateGraph (no checkpointer)."""
+    """Build StateGraph (no checkpointer).
+
+    LLM nodes carry both sync and async implementations, so the compiled graph
+    supports ``invoke`` as well as ``ainvoke`` without thread-per-call overhead.
+    """
     from openpraxis.nodes.practice import (
+        acoach_turn_node,
+        apractice_evaluator_node,
+        apractice_generator_node,
         coach_turn_node,
         human_turn_node,
         practice_evaluator_node,
         practice_generator_node,
     )
-    from openpraxis.nodes.insight import insight_generator_node
-    from openpraxis.nodes.tagger import tagger_node
+    from openpraxis.nodes.insight import ainsight_generator_node, insight_generator_node
+    from openpraxis.nodes.tagger import atagger_node, tagger_node
 
     builder = StateGraph(PraxisState)
-    builder.add_node("tagger", tagger_node)
-    builder.add_node("practice_generator", practice_generator_node)
-    builder.add_node("coach_turn", coach_turn_node)
+    builder.add_node("tagger", _dual_node("tagger", tagger_node, atagger_node))
+    builder.add_node(
+        "practice_generator",
+        _dual_node("practice_generator", practice_generator_node, apractice_generator_node),
+    )
+    builder.add_node("coach_turn", _dual_node("coach_turn", coach_turn_node, acoach_turn_node))
     builder.add_node("human_turn", human_turn_node)
-    builder.add_node("practice_evaluator", practice_evaluator_node)
-    builder.add_node("insight_generator", insight_generator_node)
+    builder.add_node(
+        "practice_evaluator",
+        _dual_node("practice_evaluator", practice_evaluator_node, apractice_evaluator_node),
+    )
+    builder.add_node(
+        "insight_generator",
+        _dual_node("insight_generator", insight_generator_node, ainsight_generator_node),
+    )
 
-    builder.add_edge(START, "tagger")
+    builder.add_conditional_edges(
+        START,
+        route_from_start,
+        {
+            "tagger": "tagger",
+            "practice_generator": "practice_generator",
+            "coach_turn": "coach_turn",
+            "human_turn": "human_turn",
+            END: END,
+        },
+    )
     builder.add_conditional_edges(
         "tagger",
         route_after_tagger,
@@ -92,11 +145,67 @@ def build_graph():
     return builder
 
 
-def get_compiled_graph(db_path: str):
-    """Compiled graph with SqliteSaver. thread_id = input_id."""
-    conn = sqlite3.connect(
-        str(db_path) + ".checkpoints",
-        check_same_thread=False,
-    )
-    checkpointer = SqliteSaver(conn)
-    return build_graph().compile(checkpointer=checkpointer)
+# Compiled graphs (and their checkpoint connections) per checkpoint DB, reused for
+# the life of the process, with the storage settings the connection was opened
+# with.  See get_compiled_graph / close_compiled_graphs.
+_compiled_graphs: dict[str, tuple[object, StorageSettings]] = {}
+_compiled_graphs_lock = threading.Lock()
+
+
+def _graph_key(db_path: str) -> str:
+    return os.path.realpath(str(db_path))
+
+
+def get_compiled_graph(db_path: str, storage: StorageSettings | None = None):
+    """Compiled graph with SqliteSaver. thread_id = input_id.
+
+    The checkpoint DB is opened through ``db.connect`` so it gets the same WAL
+    and busy-timeout settings as the app DB.  The graph is compiled once per
+    resolved ``db_path`` and cached for the process.  The connection is shared
+    by every caller (``SqliteSaver`` serializes access), and
+    ``close_compiled_graph`` / ``close_compiled_graphs`` close it.  Without
+    ``storage`` the cached graph is returned whatever it was opened with; a
+    ``storage`` that differs from the cached one raises ValueError (close the
+    graph first to reopen it).
+    """
+    key = _graph_key(db_path)
+    with _compiled_graphs_lock:
+        cached = _compiled_graphs.get(key)
+        if cached is not None:
+            graph, opened_with = cached
+            if storage is not None and storage != opened_with:
+                raise ValueError(
+                    f"checkpoint DB for {db_path} is already open with other storage "
+                    "settings; call close_compiled_graph() first"
+                )
+            return graph
+        opened_with = storage or StorageSettings()
+        conn = connect(
+            str(db_path) + ".checkpoints",
+            opened_with,
+            check_same_thread=False,
+            factory=sqlite3.Connection,
+        )
+        graph = build_graph().compile(checkpointer=SqliteSaver(conn))
+        _compiled_graphs[key] = (graph, opened_with)
+        return graph
+
+
+def close_compiled_graph(db_path: str) -> None:
+    """Drop the cached graph for ``db_path`` and close its checkpoint connection."""
+    with _compiled_graphs_lock:
+        cached = _compiled_graphs.pop(_graph_key(db_path), None)
+    if cached is not None:
+        cached[0].checkpointer.conn.close()
+
+
+def close_compiled_graphs() -> None:
+    """Close every cached graph's checkpoint connection (also run at interpreter exit)."""
+    with _compiled_graphs_lock:
+        graphs = [graph for graph, _storage in _compiled_graphs.values()]
+        _compiled_graphs.clear()
+    for graph in graphs:
+        graph.checkpointer.conn.close()
+
+
+atexit.register(close_compiled_graphs)
@@ -0,0 +1,114 @@
+"""Latency histograms and hedge delays for hedged LLM requests.
+
+``llm_backends.hedged_backend.HedgedBackend`` sends a call, and if no output
+has arrived after the hedge delay, sends a duplicate (to the same or a
+secondary provider/model) and keeps whichever answers first.  The delay is a
+percentile of the latency recently observed for the primary target.  Waiting
+for, say, p95 means about one call in twenty is duplicated, and those are the
+calls that would otherwise have been the slowest.
+
+Latency is measured to the first output: the first partial of a streamed
+reply, or the whole reply otherwise.  For an interactive coach turn that is
+the wait the user notices.  Samples are kept in one ``LatencyHistogram`` per
+(provider/model, streamed).
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+# Bucket i holds latencies in (_MIN * _FACTOR**(i-1), _MIN * _FACTOR**i]; the
+# last bucket (~9 minutes) also takes everything slower.
+_MIN_BUCKET_SECONDS = 0.01
+_BUCKET_FACTOR = 1.2
+_BUCKETS = 60
+
+
+def _bucket(seconds: float) -> int:
+    if seconds <= _MIN_BUCKET_SECONDS:
+        return 0
+    index = math.ceil(math.log(seconds / _MIN_BUCKET_SECONDS, _BUCKET_FACTOR))
+    return min(_BUCKETS - 1, index)
+
+
+def _bucket_upper(index: int) -> float:
+    return _MIN_BUCKET_SECONDS * _BUCKET_FACTOR**index
+
+
+class HedgeCancelled(Exception):
+    """Raised inside the attempt that lost a hedged race, to stop its stream."""
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of the last ``window`` latencies (20% bucket width)."""
+
+    def __init__(self, window: int = 500) -> None:
+        self.window = window
+        self.counts = [0] * _BUCKETS
+        self._recent: deque[int] = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def observe(self, seconds: float) -> None:
+        index = _bucket(seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self._recent.append(index)
+            if len(self._recent) > self.window:
+                self.counts[self._recent.popleft()] -= 1
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding quantile ``q`` (0-1); None when empty."""
+        with self._lock:
+            total = len(self._recent)
+            if not total:
+                return None
+            rank = max(1, math.ceil(q * total))
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= rank:
+                    return _bucket_upper(index)
+        return _bucket_upper(_BUCKETS - 1)  # pragma: no cover - counts always sum to total
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """When to send the duplicate request."""
+
+    percentile: float = 95.0
+    min_delay_seconds: float = 0.3
+    max_delay_seconds: float = 5.0
+    # Below this many samples the percentile is noise; wait max_delay_seconds.
+    min_samples: int = 20
+
+    def delay(self, histogram: LatencyHistogram) -> float:
+        if len(histogram) < self.min_samples:
+            return self.max_delay_seconds
+        observed = histogram.quantile(self.percentile / 100) or self.max_delay_seconds
+        return min(self.max_delay_seconds, max(self.min_delay_seconds, observed))
+
+
+_histograms: dict[tuple[str, bool], LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def get_histogram(target: str, streamed: bool) -> LatencyHistogram:
+    """The process-wide histogram for ``target`` ("provider/model")."""
+    key = (target, streamed)
+    with _histograms_lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = LatencyHistogram()
+        return histogram
+
+
+def reset_histograms() -> None:
+    """Forget every histogram (after a config change, and in tests)."""
+    with _histograms_lock:
+        _histograms.clear()
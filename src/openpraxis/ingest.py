@@ -0,0 +1,227 @@
+"""File ingestion helpers and bulk directory import.
+
+Bulk import fans ``tagger_node`` calls out over a bounded thread pool while the
+calling thread is the single writer that persists results in batched
+transactions.  SQLite connections are never shared with worker threads.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from uuid import uuid4
+
+from pydantic import BaseModel, Field
+
+from openpraxis.db import (
+    create_input,
+    get_existing_hashes,
+    get_tagger_versions,
+    save_chunks,
+    save_tagger_output,
+    transaction,
+)
+from openpraxis.models import Chunk, TaggerOutput
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp", ".tiff", ".tif"}
+TEXT_SUFFIXES = {".md", ".markdown", ".txt", ".text", ".rst"}
+
+# The writer commits tagged files in batches rather than once per file.
+WRITE_BATCH_SIZE = 50
+WRITE_BATCH_SECONDS = 1.0
+
+_VISION_PROMPT = (
+    "Extract all readable text from the image. Preserve headings, paragraphs, bullet points, and tables. "
+    "If the image is code, keep formatting. If there is little/no text, describe the image clearly. "
+    "Return plain text only."
+)
+
+
+class IngestResult(BaseModel):
+    """Outcome for a single file in a bulk import."""
+
+    path: str
+    status: str  # "imported" | "skipped" | "failed"
+    input_id: str | None = None
+    error: str | None = None
+
+
+class IngestSummary(BaseModel):
+    """Aggregated counts for a bulk import run."""
+
+    imported: int = 0
+    skipped: int = 0
+    failed: int = 0
+    failures: list[IngestResult] = Field(default_factory=list)
+
+    def record(self, result: IngestResult) -> None:
+        if result.status == "imported":
+            self.imported += 1
+        elif result.status == "skipped":
+            self.skipped += 1
+        else:
+            self.failed += 1
+            self.failures.append(result)
+
+
+def hash_file(path: Path) -> str:
+    h = hashlib.sha256()
+    h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def is_image_file(path: Path) -> bool:
+    return path.suffix.lower() in IMAGE_SUFFIXES
+
+
+def image_to_text(path: Path, type_hint: str | None) -> str:
+    from openpraxis.runtime import get_backend
+
+    prompt = _VISION_PROMPT
+    if type_hint:
+        prompt = f"[User type hint: {type_hint}]\n\n{prompt}"
+    return get_backend().call_vision_text(path, prompt=prompt, temperature=0.0)
+
+
+def read_input_text(path: Path, type_hint: str | None) -> str:
+    """Return raw text for a file, running vision extraction for images."""
+    if is_image_file(path):
+        return image_to_text(path, type_hint)
+    return path.read_text(encoding="utf-8", errors="replace")
+
+
+def collect_files(root: Path, recursive: bool = False) -> list[Path]:
+    """List importable files under ``root`` (hidden files and dirs are ignored)."""
+    pattern = "**/*" if recursive else "*"
+    supported = TEXT_SUFFIXES | IMAGE_SUFFIXES
+    files = []
+    for path in root.glob(pattern):
+        rel_parts = path.relative_to(root).parts
+        if any(part.startswith(".") for part in rel_parts):
+            continue
+        if path.is_file() and path.suffix.lower() in supported:
+            files.append(path)
+    return sorted(files)
+
+
+def _tag_file(
+    path: Path, type_hint: str | None, input_id: str
+) -> tuple[str, TaggerOutput, list[Chunk]]:
+    """Worker: read/extract text and run the Tagger node (no DB access)."""
+    from openpraxis.nodes.tagger import tagger_node
+
+    raw_text = read_input_text(path, type_hint)
+    out = tagger_node({"input_id": input_id, "raw_text": raw_text, "type_hint": type_hint})
+    return raw_text, out["tagger_output"], out.get("chunks", [])
+
+
+def run_bulk_ingest(
+    conn: sqlite3.Connection,
+    files: list[Path],
+    type_hint: str | None = None,
+    jobs: int = 4,
+    force: bool = False,
+    on_result: Callable[[IngestResult], None] | None = None,
+    retag: bool = False,
+) -> IngestSummary:
+    """Import many files: dedup by hash in one pass, tag concurrently, write serially.
+
+    At most ``2 * jobs`` files are in flight so memory stays bounded for large
+    trees.  With ``force``, already-imported content is re-tagged in place
+    unless its stored TaggerOutput came from the current model and prompt
+    version (``retag`` re-tags regardless).
+    """
+    from openpraxis.nodes.tagger import tagger_version
+
+    summary = IngestSummary()
+    current_version = tagger_version()
+
+    def _emit(result: IngestResult) -> None:
+        summary.record(result)
+        if on_result is not None:
+            on_result(result)
+
+    hashed: list[tuple[Path, str]] = []
+    for path in files:
+        try:
+            hashed.append((path, hash_file(path)))
+        except OSError as exc:
+            _emit(IngestResult(path=str(path), status="failed", error=str(exc)))
+
+    existing = get_existing_hashes(conn, [h for _, h in hashed])
+    up_to_date: set[str] = set()
+    if force and not retag:
+        versions = get_tagger_versions(conn, list(existing.values()))
+        up_to_date = {i for i, v in versions.items() if v == current_version}
+    # (path, file_hash, input_id, is_new); ids are assigned up front so chunk ids are stable.
+    pending: list[tuple[Path, str, str, bool]] = []
+    seen: set[str] = set()
+    for path, file_hash in hashed:
+        existing_id = existing.get(file_hash)
+        if (
+            file_hash in seen
+            or (existing_id is not None and not force)
+            or existing_id in up_to_date
+        ):
+            _emit(IngestResult(path=str(path), status="skipped", input_id=existing.get(file_hash)))
+            continue
+        seen.add(file_hash)
+        pending.append((path, file_hash, existing_id or str(uuid4()), existing_id is None))
+
+    max_in_flight = max(1, jobs) * 2
+    queue = iter(pending)
+    in_flight: dict[Future, tuple[Path, str, str, bool]] = {}
+    ready: list[tuple[Path, str, str, bool, str, TaggerOutput, list[Chunk]]] = []
+    last_flush = time.monotonic()
+
+    def _flush() -> None:
+        """Persist tagged files in one transaction; each file is its own savepoint."""
+        nonlocal last_flush
+        with transaction(conn):
+            for path, file_hash, input_id, is_new, raw_text, tagger_output, chunks in ready:
+                try:
+                    with transaction(conn):
+                        if is_new:
+                            create_input(conn, input_id, str(path), file_hash, raw_text, type_hint)
+                        save_tagger_output(conn, input_id, tagger_output, *current_version)
+                        save_chunks(conn, input_id, chunks)
+                except sqlite3.Error as exc:
+                    _emit(IngestResult(path=str(path), status="failed", error=str(exc)))
+                else:
+                    _emit(IngestResult(path=str(path), status="imported", input_id=input_id))
+        ready.clear()
+        last_flush = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="praxis-tag") as pool:
+
+        def _fill() -> None:
+            while len(in_flight) < max_in_flight:
+                item = next(queue, None)
+                if item is None:
+                    return
+                in_flight[pool.submit(_tag_file, item[0], type_hint, item[2])] = item
+
+        _fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, file_hash, input_id, is_new = in_flight.pop(future)
+                try:
+                    raw_text, tagger_output, chunks = future.result()
+                except Exception as exc:
+                    _emit(IngestResult(path=str(path), status="failed", error=str(exc)))
+                else:
+                    ready.append((path, file_hash, input_id, is_new, raw_text, tagger_output, chunks))
+            _fill()
+            if ready and (
+                len(ready) >= WRITE_BATCH_SIZE
+                or not in_flight
+                or time.monotonic() - last_flush >= WRITE_BATCH_SECONDS
+            ):
+                _flush()
+
+    return summary
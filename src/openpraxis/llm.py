@@ -1,52 +1,167 @@
-"""OpenAI client wrapper."""
+"""OpenAI client wrapper.
 
+Every provider call holds a slot of the (provider, model) rate limiter
+(``ratelimit.py``) while it runs; the clients' httpx response hook reports
+rate-limit headers and 429s back to it.
+
+Calls run under ``resilience.py``'s retry policy (applied by
+``ResilientBackend``).  While it is enabled the SDK's own retries are turned
+off, and ``get_client()`` caps each request at what is left of the current
+attempt's deadline.  Empty, refused and schema-invalid output raises
+``LLMOutputError`` so the policy can tell it apart from transport failures.
+"""
+
+import asyncio
 import base64
+import copy
 import json
 import mimetypes
+from collections.abc import Callable
+from contextlib import nullcontext
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel
 
 from openpraxis.config import get_settings
+from openpraxis.ratelimit import (
+    aobserve_response,
+    estimate_tokens,
+    get_limiter,
+    observe_response,
+)
+from openpraxis.resilience import LLMOutputError, attempt_timeout, queued
 
 if TYPE_CHECKING:
-    from openai import OpenAI
+    from openai import AsyncOpenAI, OpenAI
 
-_client: "OpenAI | None" = None
-_client_signature: tuple[str, str | None, str] | None = None
-_SUPPORTED_PROVIDERS = {"openai", "doubao", "kimi", "deepseek"}
+    from openpraxis.ratelimit import RateLimiter
 
+# One client per endpoint, so calls that alternate providers (hedged requests,
+# per-call overrides) each keep a warm connection pool.
+_clients: "dict[tuple, OpenAI]" = {}
+_async_clients: "dict[tuple, AsyncOpenAI]" = {}
+_SUPPORTED_PROVIDERS = {"openai", "doubao", "kimi", "deepseek"}
 
-def get_client():  # -> OpenAI
-    global _client
-    global _client_signature
 
-    settings = get_settings()
+def _client_signature(settings) -> tuple:
     provider = settings.llm_provider
-    signature = (provider, settings.llm_base_url, settings.llm_api_key)
-
     if provider not in _SUPPORTED_PROVIDERS:
         raise ValueError(f"Unsupported llm provider: {provider}")
+    return (provider, settings.llm_base_url, settings.llm_api_key, *_retry_options(settings))
 
-    if _client is None or _client_signature != signature:
-        from openai import OpenAI
 
-        kwargs = {"api_key": settings.llm_api_key}
+def get_client():  # -> OpenAI
+    settings = get_settings()
+    signature = _client_signature(settings)
+
+    client = _clients.get(signature)
+    if client is None:
+        from openai import DefaultHttpxClient, OpenAI
+
+        kwargs = {
+            "api_key": settings.llm_api_key,
+            "http_client": DefaultHttpxClient(event_hooks={"response": [observe_response]}),
+            **_client_options(settings),
+        }
+        if settings.llm_base_url:
+            kwargs["base_url"] = settings.llm_base_url
+        client = _clients[signature] = OpenAI(**kwargs)
+    return _with_attempt_timeout(client)
+
+
+def get_async_client():  # -> AsyncOpenAI
+    """Shared AsyncOpenAI client (one HTTP connection pool per event loop)."""
+    global _async_clients
+
+    settings = get_settings()
+    # httpx async pools are bound to the loop they were first used on.
+    loop_id = id(asyncio.get_running_loop())
+    signature = (*_client_signature(settings), loop_id)
+
+    client = _async_clients.get(signature)
+    if client is None:
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        kwargs = {
+            "api_key": settings.llm_api_key,
+            "http_client": DefaultAsyncHttpxClient(event_hooks={"response": [aobserve_response]}),
+            **_client_options(settings),
+        }
         if settings.llm_base_url:
             kwargs["base_url"] = settings.llm_base_url
-        _client = OpenAI(**kwargs)
-        _client_signature = signature
-    return _client
+        # Drop clients bound to earlier event loops.
+        _async_clients = {k: v for k, v in _async_clients.items() if k[-1] == loop_id}
+        client = _async_clients[signature] = AsyncOpenAI(**kwargs)
+    return _with_attempt_timeout(client)
+
+
+def _retry_options(settings) -> tuple[bool, float]:
+    return settings.resilience_enabled, settings.resilience_timeout_seconds
+
+
+def _client_options(settings) -> dict:
+    """No SDK retries under the resilience policy (it retries, classified, itself)."""
+    if not settings.resilience_enabled:
+        return {}
+    return {"max_retries": 0, "timeout": settings.resilience_timeout_seconds}
+
+
+def _with_attempt_timeout(client):
+    """``client`` limited to the time left for the current attempt (or the per-call timeout)."""
+    timeout = attempt_timeout()
+    if timeout is None:
+        timeout = get_settings().llm_timeout_seconds
+    return client if timeout is None else client.with_options(timeout=timeout)
+
+
+def _output_limit(api: str) -> dict:
+    """Request kwargs capping the reply at ``llm_max_output_tokens`` (none when unset)."""
+    settings = get_settings()
+    limit = settings.llm_max_output_tokens
+    if limit is None:
+        return {}
+    if api == "responses":
+        return {"max_output_tokens": limit}
+    # OpenAI deprecated max_tokens for chat completions; the compatible APIs still use it.
+    if settings.llm_provider == "openai":
+        return {"max_completion_tokens": limit}
+    return {"max_tokens": limit}
+
+
+def _rate_limiter(model_name: str) -> "RateLimiter | None":
+    settings = get_settings()
+    if not settings.rate_limit_enabled:
+        return None
+    return get_limiter(
+        settings.llm_provider,
+        model_name,
+        rpm=settings.rate_limit_rpm,
+        tpm=settings.rate_limit_tpm,
+        initial_concurrency=settings.rate_limit_initial_concurrency,
+        max_concurrency=settings.rate_limit_max_concurrency,
+    )
+
+
+def _limited(model_name: str, tokens: int):
+    """Rate-limiter slot for one call to ``model_name`` (a no-op when disabled)."""
+    limiter = _rate_limiter(model_name)
+    return limiter.slot(tokens, queued()) if limiter is not None else nullcontext()
+
+
+def _alimited(model_name: str, tokens: int):
+    """``_limited`` for ``async with``."""
+    limiter = _rate_limiter(model_name)
+    return limiter.aslot(tokens, queued()) if limiter is not None else nullcontext()
 
 
 def _parse_or_raise(content: str | None, response_model: type[BaseModel]) -> BaseModel:
     if not content:
-        raise RuntimeError("LLM returned empty JSON content.")
+        raise LLMOutputError("LLM returned empty JSON content.")
     try:
         return response_model.model_validate_json(content)
     except Exception as exc:  # pragma: no cover - exact exception types vary by SDK version
-        raise RuntimeError(
+        raise LLMOutputError(
             f"LLM JSON output does not match {response_model.__name__}: {content}"
         ) from exc
 
@@ -59,6 +174,55 @@ def _json_schema_instruction(response_model: type[BaseModel]) -> str:
     )
 
 
+def _strict_schema(node: Any, root: dict) -> Any:
+    """Make a JSON schema node fit OpenAI's strict Structured Outputs subset (in place).
+
+    Objects forbid extra keys and require every property, ``None`` defaults are
+    dropped, a one-entry ``allOf`` is inlined, and a ``$ref`` with sibling keys
+    is replaced by the definition it points to.
+    """
+    if isinstance(node, list):
+        return [_strict_schema(item, root) for item in node]
+    if not isinstance(node, dict):
+        return node
+    for key in ("$defs", "definitions", "properties"):
+        if isinstance(node.get(key), dict):
+            node[key] = {name: _strict_schema(sub, root) for name, sub in node[key].items()}
+    if node.get("type") == "object":
+        node.setdefault("additionalProperties", False)
+    if isinstance(node.get("properties"), dict):
+        node["required"] = list(node["properties"])
+    for key in ("items", "anyOf", "allOf"):
+        if key in node:
+            node[key] = _strict_schema(node[key], root)
+    if isinstance(node.get("allOf"), list) and len(node["allOf"]) == 1:
+        node.update(node.pop("allOf")[0])
+    if "default" in node and node["default"] is None:
+        del node["default"]
+    ref = node.get("$ref")
+    if isinstance(ref, str) and len(node) > 1:
+        target: Any = root
+        for part in ref.removeprefix("#/").split("/"):
+            target = target[part]
+        node.update({**copy.deepcopy(target), **node})
+        del node["$ref"]
+        return _strict_schema(node, root)
+    return node
+
+
+def _response_format(response_model: type[BaseModel]) -> dict:
+    """The strict ``json_schema`` response format for ``response_model``."""
+    schema = response_model.model_json_schema()
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": response_model.__name__,
+            "schema": _strict_schema(schema, schema),
+            "strict": True,
+        },
+    }
+
+
 def _as_responses_input(messages: list[dict]) -> list[dict]:
     converted: list[dict] = []
     for message in messages:
@@ -103,7 +267,7 @@ def _response_text(response) -> str:
     # Best-effort fallback across SDK variants.
     output = getattr(response, "output", None)
     if not isinstance(output, list):
-        raise RuntimeError("LLM returned empty text output.")
+        raise LLMOutputError("LLM returned empty text output.")
     chunks: list[str] = []
     for item in output:
         content = getattr(item, "content", None) or item.get("content") if isinstance(item, dict) else None
@@ -117,17 +281,11 @@ def _response_text(response) -> str:
                     chunks.append(val)
     combined = "\n".join([c for c in chunks if c.strip()]).strip()
     if not combined:
-        raise RuntimeError("LLM returned empty text output.")
+        raise LLMOutputError("LLM returned empty text output.")
     return combined
 
 
-def call_vision_text(
-    image: str | Path,
-    prompt: str,
-    model: str | None = None,
-    temperature: float = 0.0,
-) -> str:
-    """Call a vision-capable model with an image + prompt, return plain text."""
+def _vision_request(image: str | Path, prompt: str, model: str | None, temperature: float) -> dict:
     settings = get_settings()
     if settings.llm_provider not in {"openai", "doubao"}:
         raise ValueError(
@@ -139,10 +297,9 @@ def call_vision_text(
     else:
         image_url = str(image)
 
-    client = get_client()
-    response = client.responses.create(
-        model=model or settings.model_name,
-        input=[
+    return {
+        "model": model or settings.model_name,
+        "input": [
             {
                 "role": "user",
                 "content": [
@@ -151,11 +308,69 @@ def call_vision_text(
                 ],
             }
         ],
-        temperature=temperature,
-    )
+        "temperature": temperature,
+        **_output_limit("responses"),
+    }
+
+
+def call_vision_text(
+    image: str | Path,
+    prompt: str,
+    model: str | None = None,
+    temperature: float = 0.0,
+) -> str:
+    """Call a vision-capable model with an image + prompt, return plain text."""
+    request = _vision_request(image, prompt, model, temperature)
+    client = get_client()
+    with _limited(request["model"], estimate_tokens([{"content": prompt}])):
+        response = client.responses.create(**request)
+    return _response_text(response)
+
+
+async def acall_vision_text(
+    image: str | Path,
+    prompt: str,
+    model: str | None = None,
+    temperature: float = 0.0,
+) -> str:
+    """Async counterpart of ``call_vision_text``."""
+    request = _vision_request(image, prompt, model, temperature)
+    client = get_async_client()
+    async with _alimited(request["model"], estimate_tokens([{"content": prompt}])):
+        response = await client.responses.create(**request)
     return _response_text(response)
 
 
+def embed_texts(texts: list[str], model: str) -> list[list[float]]:
+    """Embed ``texts`` with the provider's embeddings endpoint (one request)."""
+    client = get_client()
+    tokens = estimate_tokens([{"content": text} for text in texts], reserve=0)
+    with _limited(model, tokens):
+        response = client.embeddings.create(model=model, input=texts)
+    return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+
+def _openai_parsed_or_raise(completion) -> BaseModel:
+    parsed = completion.choices[0].message.parsed
+    if parsed is None:
+        refusal = getattr(
+            completion.choices[0].message, "refusal", None
+        ) or "(unknown)"
+        raise LLMOutputError(f"LLM did not return valid output. Refusal: {refusal}")
+    return parsed
+
+
+def _doubao_parsed_or_raise(response) -> BaseModel:
+    parsed = getattr(response, "output_parsed", None)
+    if parsed is None:
+        raise LLMOutputError("Doubao did not return valid structured output.")
+    return parsed
+
+
+def _json_mode_messages(messages: list[dict], response_model: type[BaseModel]) -> list[dict]:
+    return [{"role": "system", "content": _json_schema_instruction(response_model)}, *messages]
+
+
 def _call_openai_parse(
     messages: list[dict],
     response_model: type[BaseModel],
@@ -168,14 +383,9 @@ def _call_openai_parse(
         messages=messages,
         response_format=response_model,
         temperature=temperature,
+        **_output_limit("chat"),
     )
-    parsed = completion.choices[0].message.parsed
-    if parsed is None:
-        refusal = getattr(
-            completion.choices[0].message, "refusal", None
-        ) or "(unknown)"
-        raise RuntimeError(f"LLM did not return valid output. Refusal: {refusal}")
-    return parsed
+    return _openai_parsed_or_raise(completion)
 
 
 def _call_doubao_parse(
@@ -190,11 +400,9 @@ def _call_doubao_parse(
         input=_as_responses_input(messages),
         text_format=response_model,
         temperature=temperature,
+        **_output_limit("responses"),
     )
-    parsed = getattr(response, "output_parsed", None)
-    if parsed is None:
-        raise RuntimeError("Doubao did not return valid structured output.")
-    return parsed
+    return _doubao_parsed_or_raise(response)
 
 
 def _call_json_mode(
@@ -206,9 +414,62 @@ def _call_json_mode(
     client = get_client()
     completion = client.chat.completions.create(
         model=model_name,
-        messages=[{"role": "system", "content": _json_schema_instruction(response_model)}, *messages],
+        messages=_json_mode_messages(messages, response_model),
+        response_format={"type": "json_object"},
+        temperature=temperature,
+        **_output_limit("chat"),
+    )
+    content = completion.choices[0].message.content
+    return _parse_or_raise(content, response_model)
+
+
+async def _acall_openai_parse(
+    messages: list[dict],
+    response_model: type[BaseModel],
+    model_name: str,
+    temperature: float,
+) -> BaseModel:
+    client = get_async_client()
+    completion = await client.beta.chat.completions.parse(
+        model=model_name,
+        messages=messages,
+        response_format=response_model,
+        temperature=temperature,
+        **_output_limit("chat"),
+    )
+    return _openai_parsed_or_raise(completion)
+
+
+async def _acall_doubao_parse(
+    messages: list[dict],
+    response_model: type[BaseModel],
+    model_name: str,
+    temperature: float,
+) -> BaseModel:
+    client = get_async_client()
+    response = await client.responses.parse(
+        model=model_name,
+        input=_as_responses_input(messages),
+        text_format=response_model,
+        temperature=temperature,
+        **_output_limit("responses"),
+    )
+    return _doubao_parsed_or_raise(response)
+
+
+async def _acall_json_mode(
+    messages: list[dict],
+    response_model: type[BaseModel],
+    model_name: str,
+    temperature: float,
+) -> BaseModel:
+    client = get_async_client()
+    completion = await client.chat.completions.create(
+        model=model_name,
+        messages=_json_mode_messages(messages, response_model),
         response_format={"type": "json_object"},
         temperature=temperature,
+        **_output_limit("chat"),
     )
     content = completion.choices[0].message.content
     return _parse_or_raise(content, response_model)
@@ -223,12 +484,216 @@ def _call_provider_structured(
     settings = get_settings()
     provider = settings.llm_provider
     if provider == "openai":
-        return _call_openai_parse(messages, response_model, model_name, temperature)
-    if provider == "doubao":
-        return _call_doubao_parse(messages, response_model, model_name, temperature)
-    if provider in {"kimi", "deepseek"}:
-        return _call_json_mode(messages, response_model, model_name, temperature)
-    raise ValueError(f"Unsupported llm provider: {provider}")
+        call = _call_openai_parse
+    elif provider == "doubao":
+        call = _call_doubao_parse
+    elif provider in {"kimi", "deepseek"}:
+        call = _call_json_mode
+    else:
+        raise ValueError(f"Unsupported llm provider: {provider}")
+    with _limited(model_name, estimate_tokens(messages)):
+        return call(messages, response_model, model_name, temperature)
+
+
+async def _acall_provider_structured(
+    messages: list[dict],
+    response_model: type[BaseModel],
+    model_name: str,
+    temperature: float,
+) -> BaseModel:
+    settings = get_settings()
+    provider = settings.llm_provider
+    if provider == "openai":
+        call = _acall_openai_parse
+    elif provider == "doubao":
+        call = _acall_doubao_parse
+    elif provider in {"kimi", "deepseek"}:
+        call = _acall_json_mode
+    else:
+        raise ValueError(f"Unsupported llm provider: {provider}")
+    async with _alimited(model_name, estimate_tokens(messages)):
+        return await call(messages, response_model, model_name, temperature)
+
+
+def _partial_json(text: str) -> dict | None:
+    """Decode an incomplete JSON object; the trailing string value may be cut short."""
+    try:
+        from jiter import from_json
+    except ModuleNotFoundError:  # older openai SDKs do not ship jiter
+        return None
+    try:
+        value = from_json(text.encode("utf-8"), partial_mode="trailing-strings")
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def _partial_emitter(on_partial: Callable[[dict], None]) -> Callable[[str], None]:
+    """Wrap ``on_partial`` to take raw JSON snapshots and skip unchanged decodes."""
+    last: dict | None = None
+
+    def emit(snapshot: str) -> None:
+        nonlocal last
+        partial = _partial_json(snapshot)
+        if partial and partial != last:
+            last = partial
+            on_partial(partial)
+
+    return emit
+
+
+def _stream_openai_parse(
+    messages: list[dict],
+    response_model: type[BaseModel],
+    model_name: str,
+    temperature: float,
+    on_partial: Callable[[dict], None],
+) -> BaseModel:
+    client = get_client()
+    emit = _partial_emitter(on_partial)
+    with client.beta.chat.completions.stream(
+        model=model_name,
+        messages=messages,
+        response_format=response_model,
+        temperature=temperature,
+        **_output_limit("chat"),
+    ) as stream:
+        for event in stream:
+            if event.type == "content.delta":
+                emit(event.snapshot)
+        completion = stream.get_final_completion()
+    return _openai_parsed_or_raise(completion)
+
+
+def _stream_json_mode(
+    messages: list[dict],
+    response_model: type[BaseModel],
+    model_name: str,
+    temperature: float,
+    on_partial: Callable[[dict], None],
+) -> BaseModel:
+    client = get_client()
+    emit = _partial_emitter(on_partial)
+    stream = client.chat.completions.create(
+        model=model_name,
+        messages=_json_mode_messages(messages, response_model),
+        response_format={"type": "json_object"},
+        temperature=temperature,
+        **_output_limit("chat"),
+        stream=True,
+    )
+    parts: list[str] = []
+    for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            parts.append(delta)
+            emit("".join(parts))
+    return _parse_or_raise("".join(parts), response_model)
+
+
+async def _astream_openai_parse(
+    messages: list[dict],
+    response_model: type[BaseModel],
+    model_name: str,
+    temperature: float,
+    on_partial: Callable[[dict], None],
+) -> BaseModel:
+    client = get_async_client()
+    emit = _partial_emitter(on_partial)
+    async with client.beta.chat.completions.stream(
+        model=model_name,
+        messages=messages,
+        response_format=response_model,
+        temperature=temperature,
+        **_output_limit("chat"),
+    ) as stream:
+        async for event in stream:
+            if event.type == "content.delta":
+                emit(event.snapshot)
+        completion = await stream.get_final_completion()
+    return _openai_parsed_or_raise(completion)
+
+
+async def _astream_json_mode(
+    messages: list[dict],
+    response_model: type[BaseModel],
+    model_name: str,
+    temperature: float,
+    on_partial: Callable[[dict], None],
+) -> BaseModel:
+    client = get_async_client()
+    emit = _partial_emitter(on_partial)
+    stream = await client.chat.completions.create(
+        model=model_name,
+        messages=_json_mode_messages(messages, response_model),
+        response_format={"type": "json_object"},
+        temperature=temperature,
+        **_output_limit("chat"),
+        stream=True,
+    )
+    parts: list[str] = []
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            parts.append(delta)
+            emit("".join(parts))
+    return _parse_or_raise("".join(parts), response_model)
+
+
+def _stream_provider_structured(
+    messages: list[dict],
+    response_model: type[BaseModel],
+    model_name: str,
+    temperature: float,
+    on_partial: Callable[[dict], None],
+) -> BaseModel:
+    provider = get_settings().llm_provider
+    stream = {"openai": _stream_openai_parse, "kimi": _stream_json_mode, "deepseek": _stream_json_mode}
+    if provider in stream:
+        # The slot is held until the stream is fully read.
+        with _limited(model_name, estimate_tokens(messages)):
+            return stream[provider](messages, response_model, model_name, temperature, on_partial)
+    # Doubao's Responses parse API is not streamed here; report the result once.
+    result = _call_provider_structured(messages, response_model, model_name, temperature)
+    on_partial(result.model_dump(mode="json"))
+    return result
+
+
+async def _astream_provider_structured(
+    messages: list[dict],
+    response_model: type[BaseModel],
+    model_name: str,
+    temperature: float,
+    on_partial: Callable[[dict], None],
+) -> BaseModel:
+    provider = get_settings().llm_provider
+    stream = {
+        "openai": _astream_openai_parse,
+        "kimi": _astream_json_mode,
+        "deepseek": _astream_json_mode,
+    }
+    if provider in stream:
+        async with _alimited(model_name, estimate_tokens(messages)):
+            return await stream[provider](
+                messages, response_model, model_name, temperature, on_partial
+            )
+    result = await _acall_provider_structured(messages, response_model, model_name, temperature)
+    on_partial(result.model_dump(mode="json"))
+    return result
+
+
+def _system_user_messages(system_prompt: str, user_content: str) -> list[dict]:
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_content},
+    ]
+
+
+def _normalize_messages(messages: list[dict]) -> list[dict]:
+    return [
+        {"role": str(message.get("role", "")), "content": message.get("content", "")}
+        for message in messages
+    ]
 
 
 def call_structured(
@@ -241,10 +706,7 @@ def call_structured(
     """Call configured LLM with structured output, return parsed Pydantic model."""
     settings = get_settings()
     return _call_provider_structured(
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_content},
-        ],
+        messages=_system_user_messages(system_prompt, user_content),
         response_model=response_model,
         model_name=model or settings.model_name,
         temperature=temperature,
@@ -260,11 +722,77 @@ def call_chat_structured(
     """Call configured LLM with a full message list and structured output."""
     settings = get_settings()
     return _call_provider_structured(
-        messages=[
-            {"role": str(message.get("role", "")), "content": message.get("content", "")}
-            for message in messages
-        ],
+        messages=_normalize_messages(messages),
+        response_model=response_model,
+        model_name=model or settings.model_name,
+        temperature=temperature,
+    )
+
+
+def call_chat_structured_stream(
+    messages: list[dict],
+    response_model: type[BaseModel],
+    on_partial: Callable[[dict], None],
+    model: str | None = None,
+    temperature: float = 0.7,
+) -> BaseModel:
+    """``call_chat_structured`` that streams tokens and reports partially decoded output."""
+    settings = get_settings()
+    return _stream_provider_structured(
+        messages=_normalize_messages(messages),
+        response_model=response_model,
+        model_name=model or settings.model_name,
+        temperature=temperature,
+        on_partial=on_partial,
+    )
+
+
+async def acall_structured(
+    system_prompt: str,
+    user_content: str,
+    response_model: type[BaseModel],
+    model: str | None = None,
+    temperature: float = 0.7,
+) -> BaseModel:
+    """Async counterpart of ``call_structured`` (uses the shared AsyncOpenAI client)."""
+    settings = get_settings()
+    return await _acall_provider_structured(
+        messages=_system_user_messages(system_prompt, user_content),
+        response_model=response_model,
+        model_name=model or settings.model_name,
+        temperature=temperature,
+    )
+
+
+async def acall_chat_structured(
+    messages: list[dict],
+    response_model: type[BaseModel],
+    model: str | None = None,
+    temperature: float = 0.7,
+) -> BaseModel:
+    """Async counterpart of ``call_chat_structured``."""
+    settings = get_settings()
+    return await _acall_provider_structured(
+        messages=_normalize_messages(messages),
+        response_model=response_model,
+        model_name=model or settings.model_name,
+        temperature=temperature,
+    )
+
+
+async def acall_chat_structured_stream(
+    messages: list[dict],
+    response_model: type[BaseModel],
+    on_partial: Callable[[dict], None],
+    model: str | None = None,
+    temperature: float = 0.7,
+) -> BaseModel:
+    """Async counterpart of ``call_chat_structured_stream``."""
+    settings = get_settings()
+    return await _astream_provider_structured(
+        messages=_normalize_messages(messages),
         response_model=response_model,
         model_name=model or settings.model_name,
         temperature=temperature,
+        on_partial=on_partial,
     )
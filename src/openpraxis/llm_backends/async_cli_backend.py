@@ -0,0 +1,77 @@
+"""Async CLI backend – native ``AsyncOpenAI`` calls for event-loop concurrency."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from openpraxis.llm_backends.base import PartialCallback
+from openpraxis.llm_backends.cli_backend import CLIBackend
+
+
+class AsyncCLIBackend(CLIBackend):
+    """CLI backend whose ``acall_*`` methods await a shared ``AsyncOpenAI`` client.
+
+    Blocking methods are inherited from ``CLIBackend``.  Use this backend when
+    driving the graph with ``ainvoke`` so many inputs can be processed on one
+    event loop over a single HTTP connection pool::
+
+        runtime.set_backend(AsyncCLIBackend())
+        await asyncio.gather(*(graph.ainvoke(state, config) for state, config in jobs))
+    """
+
+    async def acall_structured(
+        self,
+        system_prompt: str,
+        user_content: str,
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        from openpraxis.llm import acall_structured
+
+        return await acall_structured(
+            system_prompt, user_content, response_model,
+            model=model, temperature=temperature,
+        )
+
+    async def acall_chat_structured(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        from openpraxis.llm import acall_chat_structured
+
+        return await acall_chat_structured(
+            messages, response_model,
+            model=model, temperature=temperature,
+        )
+
+    async def acall_chat_structured_stream(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        on_partial: PartialCallback,
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        from openpraxis.llm import acall_chat_structured_stream
+
+        return await acall_chat_structured_stream(
+            messages, response_model, on_partial,
+            model=model, temperature=temperature,
+        )
+
+    async def acall_vision_text(
+        self,
+        image: str | Path,
+        prompt: str,
+        model: str | None = None,
+        temperature: float = 0.0,
+    ) -> str:
+        from openpraxis.llm import acall_vision_text
+
+        return await acall_vision_text(image, prompt, model=model, temperature=temperature)
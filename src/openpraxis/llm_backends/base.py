@@ -2,20 +2,33 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from pathlib import Path
 
 from pydantic import BaseModel
 
+# Receives the fields decoded so far from a streamed structured response.
+PartialCallback = Callable[[dict], None]
+
 
 class LLMBackend(ABC):
     """Unified interface for LLM calls.
 
     Decouples business workflow (nodes, graph) from the concrete model provider.
-    Two implementations ship today:
+    Three implementations ship today:
 
     * ``CLIBackend``  – uses local provider config (config.toml / env vars).
+    * ``AsyncCLIBackend`` – same config, with native ``AsyncOpenAI`` awaitables.
     * ``OpenClawBackend`` – placeholder for host-managed LLM in OpenClaw skill mode.
+
+    The ``acall_*`` coroutines default to running the blocking method in a
+    worker thread, so synchronous backends work unchanged under ``ainvoke``.
+    Backends with a native async client should override them.
+
+    ``call_chat_structured_stream`` defaults to a normal call whose result is
+    reported once; backends that can stream tokens override it.
     """
 
     @abstractmethod
@@ -48,3 +61,92 @@ class LLMBackend(ABC):
         temperature: float = 0.0,
     ) -> str:
         """Call a vision-capable model with an image + prompt, return plain text."""
+
+    def call_chat_structured_stream(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        on_partial: PartialCallback,
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        """``call_chat_structured`` that reports partial output while it is generated.
+
+        ``on_partial`` receives the fields decoded so far (the last string field
+        may be cut mid-value) each time the output grows.  The return value is the
+        complete, validated model.
+        """
+        result = self.call_chat_structured(
+            messages, response_model, model=model, temperature=temperature
+        )
+        on_partial(result.model_dump(mode="json"))
+        return result
+
+    async def acall_structured(
+        self,
+        system_prompt: str,
+        user_content: str,
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        """Awaitable ``call_structured``."""
+        return await asyncio.to_thread(
+            self.call_structured,
+            system_prompt,
+            user_content,
+            response_model,
+            model=model,
+            temperature=temperature,
+        )
+
+    async def acall_chat_structured(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        """Awaitable ``call_chat_structured``."""
+        return await asyncio.to_thread(
+            self.call_chat_structured,
+            messages,
+            response_model,
+            model=model,
+            temperature=temperature,
+        )
+
+    async def acall_vision_text(
+        self,
+        image: str | Path,
+        prompt: str,
+        model: str | None = None,
+        temperature: float = 0.0,
+    ) -> str:
+        """Awaitable ``call_vision_text``."""
+        return await asyncio.to_thread(
+            self.call_vision_text,
+            image,
+            prompt,
+            model=model,
+            temperature=temperature,
+        )
+
+    async def acall_chat_structured_stream(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        on_partial: PartialCallback,
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        """Awaitable ``call_chat_structured_stream``.
+
+        The default awaits ``acall_chat_structured`` and reports the result once,
+        so ``on_partial`` always runs on the event loop thread.
+        """
+        result = await self.acall_chat_structured(
+            messages, response_model, model=model, temperature=temperature
+        )
+        on_partial(result.model_dump(mode="json"))
+        return result
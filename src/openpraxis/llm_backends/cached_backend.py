@@ -0,0 +1,362 @@
+"""Content-addressed response cache wrapping any ``LLMBackend``.
+
+Responses are keyed on a SHA-256 of (namespace, provider, model, temperature,
+messages, response schema) and stored as validated JSON in a local SQLite
+file.  Only calls at or below ``max_temperature`` are cached, so sampling
+calls (e.g. practice scene generation) still produce fresh output.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+from openpraxis.llm_backends.base import LLMBackend, PartialCallback
+
+if TYPE_CHECKING:
+    from openpraxis.config import StorageSettings
+
+_CACHE_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed_at ON llm_cache(accessed_at);
+"""
+
+
+def cache_key(**parts) -> str:
+    """Stable hash of the request parts."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed key/value store with TTL and size-based LRU eviction.
+
+    The connection is opened lazily and shared across threads behind a lock.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        max_bytes: int,
+        ttl_seconds: int,
+        storage: StorageSettings | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.storage = storage
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            from openpraxis.db import connect
+
+            self._conn = connect(
+                self.path, self.storage, check_same_thread=False, factory=sqlite3.Connection
+            )
+            self._conn.executescript(_CACHE_SCHEMA_SQL)
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl_seconds > 0 and now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                """INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (key, value, size, now, now),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least-recently-used entries until the store fits ``max_bytes``."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        victims: list[tuple[str]] = []
+        for key, size in conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM llm_cache WHERE key = ?", victims)
+
+    def stats(self) -> dict:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        return {"entries": row[0], "bytes": row[1], "max_bytes": self.max_bytes}
+
+    def clear(self) -> int:
+        with self._lock:
+            conn = self._connection()
+            cur = conn.execute("DELETE FROM llm_cache")
+            conn.commit()
+            return cur.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CachedBackend(LLMBackend):
+    """Wrap another backend and serve repeated deterministic calls from ``ResponseCache``."""
+
+    def __init__(
+        self,
+        inner: LLMBackend,
+        cache: ResponseCache,
+        namespace: str = "",
+        max_temperature: float = 0.0,
+    ) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.namespace = namespace
+        self.max_temperature = max_temperature
+
+    def _key(self, kind: str, model: str | None, temperature: float, **parts) -> str | None:
+        if temperature > self.max_temperature:
+            return None
+        from openpraxis.config import get_settings
+
+        settings = get_settings()
+        return cache_key(
+            kind=kind,
+            namespace=self.namespace,
+            provider=settings.llm_provider,
+            model=model or settings.model_name,
+            temperature=temperature,
+            **parts,
+        )
+
+    def _structured_key(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        model: str | None,
+        temperature: float,
+    ) -> str | None:
+        return self._key(
+            "structured",
+            model,
+            temperature,
+            messages=messages,
+            schema=response_model.model_json_schema(),
+        )
+
+    def _vision_key(
+        self, image: str | Path, prompt: str, model: str | None, temperature: float
+    ) -> str | None:
+        if isinstance(image, Path):
+            image_ref = hashlib.sha256(image.read_bytes()).hexdigest()
+        else:
+            image_ref = str(image)
+        return self._key("vision", model, temperature, image=image_ref, prompt=prompt)
+
+    def _lookup(self, key: str | None, response_model: type[BaseModel]) -> BaseModel | None:
+        if key is None:
+            return None
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        try:
+            return response_model.model_validate_json(cached)
+        except ValueError:
+            # Schema drifted under the same key (e.g. validator change); refetch.
+            return None
+
+    def _store(self, key: str | None, result: BaseModel) -> None:
+        if key is not None:
+            self.cache.put(key, result.model_dump_json())
+
+    def call_structured(
+        self,
+        system_prompt: str,
+        user_content: str,
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content},
+        ]
+        key = self._structured_key(messages, response_model, model, temperature)
+        hit = self._lookup(key, response_model)
+        if hit is not None:
+            return hit
+        result = self.inner.call_structured(
+            system_prompt, user_content, response_model, model=model, temperature=temperature
+        )
+        self._store(key, result)
+        return result
+
+    def call_chat_structured(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        key = self._structured_key(messages, response_model, model, temperature)
+        hit = self._lookup(key, response_model)
+        if hit is not None:
+            return hit
+        result = self.inner.call_chat_structured(
+            messages, response_model, model=model, temperature=temperature
+        )
+        self._store(key, result)
+        return result
+
+    def call_chat_structured_stream(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        on_partial: PartialCallback,
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        key = self._structured_key(messages, response_model, model, temperature)
+        hit = self._lookup(key, response_model)
+        if hit is not None:
+            on_partial(hit.model_dump(mode="json"))
+            return hit
+        result = self.inner.call_chat_structured_stream(
+            messages, response_model, on_partial, model=model, temperature=temperature
+        )
+        self._store(key, result)
+        return result
+
+    def call_vision_text(
+        self,
+        image: str | Path,
+        prompt: str,
+        model: str | None = None,
+        temperature: float = 0.0,
+    ) -> str:
+        key = self._vision_key(image, prompt, model, temperature)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        text = self.inner.call_vision_text(image, prompt, model=model, temperature=temperature)
+        if key is not None:
+            self.cache.put(key, text)
+        return text
+
+    async def acall_structured(
+        self,
+        system_prompt: str,
+        user_content: str,
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content},
+        ]
+        key = self._structured_key(messages, response_model, model, temperature)
+        hit = self._lookup(key, response_model)
+        if hit is not None:
+            return hit
+        result = await self.inner.acall_structured(
+            system_prompt, user_content, response_model, model=model, temperature=temperature
+        )
+        self._store(key, result)
+        return result
+
+    async def acall_chat_structured(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        key = self._structured_key(messages, response_model, model, temperature)
+        hit = self._lookup(key, response_model)
+        if hit is not None:
+            return hit
+        result = await self.inner.acall_chat_structured(
+            messages, response_model, model=model, temperature=temperature
+        )
+        self._store(key, result)
+        return result
+
+    async def acall_chat_structured_stream(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        on_partial: PartialCallback,
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        key = self._structured_key(messages, response_model, model, temperature)
+        hit = self._lookup(key, response_model)
+        if hit is not None:
+            on_partial(hit.model_dump(mode="json"))
+            return hit
+        result = await self.inner.acall_chat_structured_stream(
+            messages, response_model, on_partial, model=model, temperature=temperature
+        )
+        self._store(key, result)
+        return result
+
+    async def acall_vision_text(
+        self,
+        image: str | Path,
+        prompt: str,
+        model: str | None = None,
+        temperature: float = 0.0,
+    ) -> str:
+        key = self._vision_key(image, prompt, model, temperature)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        text = await self.inner.acall_vision_text(
+            image, prompt, model=model, temperature=temperature
+        )
+        if key is not None:
+            self.cache.put(key, text)
+        return text
@@ -6,7 +6,7 @@ from pathlib import Path
 
 from pydantic import BaseModel
 
-from openpraxis.llm_backends.base import LLMBackend
+from openpraxis.llm_backends.base import LLMBackend, PartialCallback
 
 
 class CLIBackend(LLMBackend):
@@ -45,6 +45,21 @@ class CLIBackend(LLMBackend):
             model=model, temperature=temperature,
         )
 
+    def call_chat_structured_stream(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        on_partial: PartialCallback,
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        from openpraxis.llm import call_chat_structured_stream
+
+        return call_chat_structured_stream(
+            messages, response_model, on_partial,
+            model=model, temperature=temperature,
+        )
+
     def call_vision_text(
         self,
         image: str | Path,
@@ -0,0 +1,389 @@
+"""Hedged requests: race a duplicate call against a slow one.
+
+See ``openpraxis.hedging`` for when the duplicate is sent.  The first attempt
+to produce output wins: for a streamed reply that is its first partial, so
+only the winner's text ever reaches ``on_partial``.  The loser is cancelled:
+an asyncio task is cancelled outright, and a blocking stream stops at its next
+chunk.  A blocking non-streamed call cannot be interrupted; its thread
+finishes in the background and the result is dropped.
+
+Attempts run in copies of the caller's context, so per-call state (LangGraph
+stream writers, rate-limiter permits, retry deadlines) follows them.  An
+attempt for a secondary provider runs under ``config.llm_overrides``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from openpraxis.hedging import HedgeCancelled, HedgePolicy, get_histogram
+from openpraxis.llm_backends.base import LLMBackend, PartialCallback
+
+# (model, on_partial or None) -> result
+_Call = Callable[[str | None, PartialCallback | None], Any]
+_ACall = Callable[[str | None, PartialCallback | None], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class _Target:
+    """Where one attempt goes; ``provider`` None keeps the configured provider."""
+
+    provider: str | None
+    model: str | None
+    label: str
+
+    def settings(self):
+        if self.provider is None:
+            return nullcontext()
+        from openpraxis.config import llm_overrides
+
+        return llm_overrides(provider=self.provider, model=self.model)
+
+
+class _Race:
+    """The attempts of one hedged call; the first to produce output wins."""
+
+    def __init__(self, on_partial: PartialCallback | None) -> None:
+        self.on_partial = on_partial
+        self._cond = threading.Condition()
+        self.started: list[str] = []
+        self.winner: str | None = None
+        self.results: dict[str, Any] = {}
+        self.errors: dict[str, Exception] = {}
+
+    def _changed(self) -> None:
+        self._cond.notify_all()
+
+    def start(self, name: str) -> None:
+        with self._cond:
+            self.started.append(name)
+
+    def claim(self, name: str) -> bool:
+        with self._cond:
+            if self.winner is None:
+                self.winner = name
+                self._changed()
+            return self.winner == name
+
+    def finish(self, name: str, result: Any = None, error: Exception | None = None) -> None:
+        with self._cond:
+            if error is not None:
+                self.errors[name] = error
+            else:
+                self.results[name] = result
+                if self.winner is None:
+                    self.winner = name
+            self._changed()
+
+    def decided(self) -> bool:
+        """A winner is known, or every attempt sent so far has failed."""
+        return self.winner is not None or len(self.errors) == len(self.started)
+
+    def settled(self) -> bool:
+        """The winner has finished, or every attempt has failed."""
+        if self.winner is None:
+            return len(self.errors) == len(self.started)
+        return self.winner in self.results or self.winner in self.errors
+
+    def outcome(self) -> Any:
+        if self.winner is None:
+            raise self.errors[self.started[0]]
+        if self.winner in self.errors:
+            raise self.errors[self.winner]
+        return self.results[self.winner]
+
+    def wait(self, predicate: Callable[[], bool], timeout: float | None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(predicate, timeout)
+
+
+class _AsyncRace(_Race):
+    """``_Race`` whose waiters are coroutines on the caller's event loop."""
+
+    def __init__(self, on_partial: PartialCallback | None) -> None:
+        super().__init__(on_partial)
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    def _changed(self) -> None:
+        # Attempts may report from worker threads (sync backends under to_thread).
+        self._loop.call_soon_threadsafe(self._event.set)
+
+    async def await_(self, predicate: Callable[[], bool], timeout: float | None) -> bool:
+        deadline = None if timeout is None else self._loop.time() + timeout
+        while not predicate():
+            self._event.clear()
+            if predicate():
+                break
+            remaining = None if deadline is None else deadline - self._loop.time()
+            if remaining is not None and remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._event.wait(), remaining)
+            except TimeoutError:
+                return predicate()
+        return True
+
+
+class _Attempt:
+    """One request of a race; records its latency to first output once."""
+
+    def __init__(self, race: _Race, name: str, target: _Target, streamed: bool) -> None:
+        self.race = race
+        self.name = name
+        self.target = target
+        self.histogram = get_histogram(target.label, streamed)
+        self.started = time.monotonic()
+        self._observed = False
+        self.emit = self._emit if streamed else None
+
+    def mark(self) -> None:
+        if not self._observed:
+            self._observed = True
+            self.histogram.observe(time.monotonic() - self.started)
+
+    def _emit(self, partial: dict) -> None:
+        self.mark()
+        if not self.race.claim(self.name):
+            raise HedgeCancelled(f"the {self.name} request lost the hedge race")
+        self.race.on_partial(partial)
+
+
+class HedgedBackend(LLMBackend):
+    """Duplicate slow calls of ``inner`` and keep the first answer.
+
+    ``scope`` "stream" hedges only streamed calls (interactive coach turns);
+    "all" hedges every call.  ``provider`` / ``model`` pick the secondary
+    target; left empty, the duplicate goes where the original went.
+    """
+
+    def __init__(
+        self,
+        inner: LLMBackend,
+        policy: HedgePolicy | None = None,
+        scope: str = "stream",
+        provider: str | None = None,
+        model: str | None = None,
+    ) -> None:
+        self.inner = inner
+        self.policy = policy or HedgePolicy()
+        self.scope = scope
+        self.provider = provider or None
+        self.model = model or None
+
+    def _targets(self, model: str | None) -> tuple[_Target, _Target]:
+        from openpraxis.config import get_provider_default_model, get_settings
+
+        settings = get_settings()
+        current = settings.llm_provider
+        primary = _Target(None, model, f"{current}/{model or settings.model_name}")
+        if self.provider and self.provider != current:
+            hedge_model = self.model or get_provider_default_model(self.provider)
+            return primary, _Target(self.provider, hedge_model, f"{self.provider}/{hedge_model}")
+        hedge_model = self.model or model
+        return primary, _Target(None, hedge_model, f"{current}/{hedge_model or settings.model_name}")
+
+    def _hedges(self, streamed: bool) -> bool:
+        return streamed or self.scope == "all"
+
+    def _run(self, call: _Call, model: str | None, on_partial: PartialCallback | None = None):
+        streamed = on_partial is not None
+        if not self._hedges(streamed):
+            return call(model, None)
+        primary, hedge = self._targets(model)
+        delay = self.policy.delay(get_histogram(primary.label, streamed))
+        race = _Race(on_partial)
+        self._start(_Attempt(race, "primary", primary, streamed), call)
+        if not race.wait(race.decided, delay):
+            self._start(_Attempt(race, "hedge", hedge, streamed), call)
+        race.wait(race.settled, None)
+        return race.outcome()
+
+    def _start(self, attempt: _Attempt, call: _Call) -> None:
+        attempt.race.start(attempt.name)
+        context = contextvars.copy_context()
+        threading.Thread(
+            target=context.run,
+            args=(self._attempt, attempt, call),
+            name=f"praxis-hedge-{attempt.name}",
+            daemon=True,
+        ).start()
+
+    @staticmethod
+    def _attempt(attempt: _Attempt, call: _Call) -> None:
+        try:
+            with attempt.target.settings():
+                result = call(attempt.target.model, attempt.emit)
+        except Exception as exc:
+            attempt.race.finish(attempt.name, error=exc)
+            return
+        attempt.mark()
+        attempt.race.finish(attempt.name, result)
+
+    async def _arun(
+        self, call: _ACall, model: str | None, on_partial: PartialCallback | None = None
+    ):
+        streamed = on_partial is not None
+        if not self._hedges(streamed):
+            return await call(model, None)
+        primary, hedge = self._targets(model)
+        delay = self.policy.delay(get_histogram(primary.label, streamed))
+        race = _AsyncRace(on_partial)
+        tasks = {"primary": self._astart(_Attempt(race, "primary", primary, streamed), call)}
+        try:
+            if not await race.await_(race.decided, delay):
+                tasks["hedge"] = self._astart(_Attempt(race, "hedge", hedge, streamed), call)
+                await race.await_(race.decided, None)
+            for name, task in tasks.items():
+                if name != race.winner:
+                    task.cancel()
+            await race.await_(race.settled, None)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        return race.outcome()
+
+    def _astart(self, attempt: _Attempt, call: _ACall) -> asyncio.Task:
+        attempt.race.start(attempt.name)
+        return asyncio.create_task(self._aattempt(attempt, call))
+
+    @staticmethod
+    async def _aattempt(attempt: _Attempt, call: _ACall) -> None:
+        try:
+            with attempt.target.settings():
+                result = await call(attempt.target.model, attempt.emit)
+        except asyncio.CancelledError:
+            # A lower bound, but still a sample: it took at least this long.
+            attempt.mark()
+            raise
+        except Exception as exc:
+            attempt.race.finish(attempt.name, error=exc)
+            return
+        attempt.mark()
+        attempt.race.finish(attempt.name, result)
+
+    def call_structured(
+        self,
+        system_prompt: str,
+        user_content: str,
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return self._run(
+            lambda m, _: self.inner.call_structured(
+                system_prompt, user_content, response_model, model=m, temperature=temperature
+            ),
+            model,
+        )
+
+    def call_chat_structured(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return self._run(
+            lambda m, _: self.inner.call_chat_structured(
+                messages, response_model, model=m, temperature=temperature
+            ),
+            model,
+        )
+
+    def call_chat_structured_stream(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        on_partial: PartialCallback,
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return self._run(
+            lambda m, emit: self.inner.call_chat_structured_stream(
+                messages, response_model, emit, model=m, temperature=temperature
+            ),
+            model,
+            on_partial,
+        )
+
+    def call_vision_text(
+        self,
+        image: str | Path,
+        prompt: str,
+        model: str | None = None,
+        temperature: float = 0.0,
+    ) -> str:
+        return self._run(
+            lambda m, _: self.inner.call_vision_text(image, prompt, model=m, temperature=temperature),
+            model,
+        )
+
+    async def acall_structured(
+        self,
+        system_prompt: str,
+        user_content: str,
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return await self._arun(
+            lambda m, _: self.inner.acall_structured(
+                system_prompt, user_content, response_model, model=m, temperature=temperature
+            ),
+            model,
+        )
+
+    async def acall_chat_structured(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return await self._arun(
+            lambda m, _: self.inner.acall_chat_structured(
+                messages, response_model, model=m, temperature=temperature
+            ),
+            model,
+        )
+
+    async def acall_chat_structured_stream(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        on_partial: PartialCallback,
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return await self._arun(
+            lambda m, emit: self.inner.acall_chat_structured_stream(
+                messages, response_model, emit, model=m, temperature=temperature
+            ),
+            model,
+            on_partial,
+        )
+
+    async def acall_vision_text(
+        self,
+        image: str | Path,
+        prompt: str,
+        model: str | None = None,
+        temperature: float = 0.0,
+    ) -> str:
+        return await self._arun(
+            lambda m, _: self.inner.acall_vision_text(
+                image, prompt, model=m, temperature=temperature
+            ),
+            model,
+        )
@@ -0,0 +1,190 @@
+"""Per-node routing: apply ``[llm.nodes.<name>]`` to one node's calls.
+
+``runtime.get_backend(node)`` wraps the shared backend in a ``NodeBackend``
+when the node has a config section.  The node's model and temperature replace
+the call's; its provider, reply-token cap and timeout are applied with
+``config.llm_overrides`` for the duration of the call.  The wrapper is
+outermost, so the response cache, hedging, retries and rate limiter all see
+the routed provider and model.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from contextlib import nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+from openpraxis.llm_backends.base import LLMBackend, PartialCallback
+
+if TYPE_CHECKING:
+    from openpraxis.config import NodeLLMSettings
+
+# (model, temperature) -> result (or an awaitable of it)
+_Call = Callable[[str | None, float], Any]
+
+
+class NodeBackend(LLMBackend):
+    """``inner`` with the provider / model / sampling settings of graph node ``node``."""
+
+    def __init__(self, inner: LLMBackend, node: str, route: NodeLLMSettings) -> None:
+        self.inner = inner
+        self.node = node
+        self.route = route
+
+    def _model(self, model: str | None) -> str | None:
+        from openpraxis.config import get_provider_default_model
+
+        if self.route.model:
+            return self.route.model
+        if self.route.provider:
+            return get_provider_default_model(self.route.provider)
+        return model
+
+    def _temperature(self, temperature: float) -> float:
+        return temperature if self.route.temperature is None else self.route.temperature
+
+    def _settings(self, model: str | None):
+        route = self.route
+        if not (route.provider or route.max_output_tokens or route.timeout_seconds):
+            return nullcontext()
+        from openpraxis.config import llm_overrides
+
+        return llm_overrides(
+            provider=route.provider,
+            model=model if route.provider else None,
+            max_output_tokens=route.max_output_tokens,
+            timeout_seconds=route.timeout_seconds,
+        )
+
+    def _run(self, call: _Call, model: str | None, temperature: float):
+        model = self._model(model)
+        with self._settings(model):
+            return call(model, self._temperature(temperature))
+
+    async def _arun(self, call: _Call, model: str | None, temperature: float):
+        model = self._model(model)
+        with self._settings(model):
+            return await call(model, self._temperature(temperature))
+
+    def call_structured(
+        self,
+        system_prompt: str,
+        user_content: str,
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return self._run(
+            lambda m, t: self.inner.call_structured(
+                system_prompt, user_content, response_model, model=m, temperature=t
+            ),
+            model,
+            temperature,
+        )
+
+    def call_chat_structured(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return self._run(
+            lambda m, t: self.inner.call_chat_structured(
+                messages, response_model, model=m, temperature=t
+            ),
+            model,
+            temperature,
+        )
+
+    def call_chat_structured_stream(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        on_partial: PartialCallback,
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return self._run(
+            lambda m, t: self.inner.call_chat_structured_stream(
+                messages, response_model, on_partial, model=m, temperature=t
+            ),
+            model,
+            temperature,
+        )
+
+    def call_vision_text(
+        self,
+        image: str | Path,
+        prompt: str,
+        model: str | None = None,
+        temperature: float = 0.0,
+    ) -> str:
+        return self._run(
+            lambda m, t: self.inner.call_vision_text(image, prompt, model=m, temperature=t),
+            model,
+            temperature,
+        )
+
+    async def acall_structured(
+        self,
+        system_prompt: str,
+        user_content: str,
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return await self._arun(
+            lambda m, t: self.inner.acall_structured(
+                system_prompt, user_content, response_model, model=m, temperature=t
+            ),
+            model,
+            temperature,
+        )
+
+    async def acall_chat_structured(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return await self._arun(
+            lambda m, t: self.inner.acall_chat_structured(
+                messages, response_model, model=m, temperature=t
+            ),
+            model,
+            temperature,
+        )
+
+    async def acall_chat_structured_stream(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        on_partial: PartialCallback,
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return await self._arun(
+            lambda m, t: self.inner.acall_chat_structured_stream(
+                messages, response_model, on_partial, model=m, temperature=t
+            ),
+            model,
+            temperature,
+        )
+
+    async def acall_vision_text(
+        self,
+        image: str | Path,
+        prompt: str,
+        model: str | None = None,
+        temperature: float = 0.0,
+    ) -> str:
+        return await self._arun(
+            lambda m, t: self.inner.acall_vision_text(image, prompt, model=m, temperature=t),
+            model,
+            temperature,
+        )
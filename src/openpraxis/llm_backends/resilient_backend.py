@@ -0,0 +1,196 @@
+"""Retry / deadline / circuit-breaker wrapper around any ``LLMBackend``.
+
+See ``openpraxis.resilience`` for the policy.  Streaming calls are retried
+only while nothing has been reported to ``on_partial``: once the user has seen
+part of a reply, starting it over would show them a different one.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import replace
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from openpraxis.llm_backends.base import LLMBackend, PartialCallback
+from openpraxis.resilience import (
+    CircuitBreaker,
+    RetryPolicy,
+    acall_with_retries,
+    call_with_retries,
+    get_breaker,
+)
+
+
+class _StreamGuard:
+    """Forward partial output, remembering whether any was sent."""
+
+    def __init__(self, on_partial: PartialCallback) -> None:
+        self.on_partial = on_partial
+        self.emitted = False
+
+    def __call__(self, partial: dict) -> None:
+        self.emitted = True
+        self.on_partial(partial)
+
+    def retryable(self) -> bool:
+        return not self.emitted
+
+
+class ResilientBackend(LLMBackend):
+    """Run every call of ``inner`` under ``policy`` and a per-provider circuit breaker.
+
+    ``breaker_name`` picks the breaker; by default it is the configured
+    provider, looked up at call time so ``praxis --provider`` and per-node
+    routing switch breakers.  A per-call ``llm_timeout_seconds`` (from
+    ``[llm.nodes.<name>] timeout_seconds``) replaces the policy's attempt
+    timeout.
+    """
+
+    def __init__(
+        self,
+        inner: LLMBackend,
+        policy: RetryPolicy | None = None,
+        breaker_name: str | None = None,
+        breaker_failures: int = 5,
+        breaker_reset_seconds: float = 30.0,
+    ) -> None:
+        self.inner = inner
+        self.policy = policy or RetryPolicy()
+        self.breaker_name = breaker_name
+        self.breaker_failures = breaker_failures
+        self.breaker_reset_seconds = breaker_reset_seconds
+
+    def _breaker(self) -> CircuitBreaker:
+        name = self.breaker_name
+        if name is None:
+            from openpraxis.config import get_settings
+
+            name = get_settings().llm_provider
+        return get_breaker(name, self.breaker_failures, self.breaker_reset_seconds)
+
+    def _policy(self) -> RetryPolicy:
+        """``policy``, with the attempt timeout of the current call's settings if it has one."""
+        from openpraxis.config import get_settings
+
+        timeout = get_settings().llm_timeout_seconds
+        if timeout is None:
+            return self.policy
+        return replace(self.policy, attempt_timeout_seconds=timeout)
+
+    def _run(self, fn: Callable, retryable: Callable[[], bool] | None = None):
+        return call_with_retries(fn, self._policy(), self._breaker(), retryable)
+
+    async def _arun(self, fn: Callable, retryable: Callable[[], bool] | None = None):
+        return await acall_with_retries(fn, self._policy(), self._breaker(), retryable)
+
+    def call_structured(
+        self,
+        system_prompt: str,
+        user_content: str,
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return self._run(
+            lambda: self.inner.call_structured(
+                system_prompt, user_content, response_model, model=model, temperature=temperature
+            )
+        )
+
+    def call_chat_structured(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return self._run(
+            lambda: self.inner.call_chat_structured(
+                messages, response_model, model=model, temperature=temperature
+            )
+        )
+
+    def call_chat_structured_stream(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        on_partial: PartialCallback,
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        guard = _StreamGuard(on_partial)
+        return self._run(
+            lambda: self.inner.call_chat_structured_stream(
+                messages, response_model, guard, model=model, temperature=temperature
+            ),
+            guard.retryable,
+        )
+
+    def call_vision_text(
+        self,
+        image: str | Path,
+        prompt: str,
+        model: str | None = None,
+        temperature: float = 0.0,
+    ) -> str:
+        return self._run(
+            lambda: self.inner.call_vision_text(image, prompt, model=model, temperature=temperature)
+        )
+
+    async def acall_structured(
+        self,
+        system_prompt: str,
+        user_content: str,
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return await self._arun(
+            lambda: self.inner.acall_structured(
+                system_prompt, user_content, response_model, model=model, temperature=temperature
+            )
+        )
+
+    async def acall_chat_structured(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        return await self._arun(
+            lambda: self.inner.acall_chat_structured(
+                messages, response_model, model=model, temperature=temperature
+            )
+        )
+
+    async def acall_chat_structured_stream(
+        self,
+        messages: list[dict],
+        response_model: type[BaseModel],
+        on_partial: PartialCallback,
+        model: str | None = None,
+        temperature: float = 0.7,
+    ) -> BaseModel:
+        guard = _StreamGuard(on_partial)
+        return await self._arun(
+            lambda: self.inner.acall_chat_structured_stream(
+                messages, response_model, guard, model=model, temperature=temperature
+            ),
+            guard.retryable,
+        )
+
+    async def acall_vision_text(
+        self,
+        image: str | Path,
+        prompt: str,
+        model: str | None = None,
+        temperature: float = 0.0,
+    ) -> str:
+        return await self._arun(
+            lambda: self.inner.acall_vision_text(
+                image, prompt, model=model, temperature=temperature
+            )
+        )
@@ -84,6 +84,14 @@ class TaggerOutput(BaseModel):
     practice_seed: PracticeSeed
 
 
+class Chunk(BaseModel):
+    """Slice of a long input; ``chunk_id`` is ``<input_id>#chunk-NNN``."""
+
+    chunk_id: str
+    seq: int
+    text: str
+
+
 # ============================================================
 # Practice models
 # ============================================================
@@ -163,3 +171,22 @@ class InsightList(BaseModel):
     """Wrapper model returned by LLM (OpenAI structured output requires top-level object)."""
 
     cards: list[InsightCard]
+
+
+# ============================================================
+# Review models
+# ============================================================
+
+
+class ReviewState(BaseModel):
+    """Spaced-repetition state of one scene (a ``review_schedule`` row)."""
+
+    scene_id: str
+    input_id: str
+    reps: int = 0
+    lapses: int = 0
+    stability: float = 0.0  # current interval, in days
+    difficulty: float = 5.0  # 1 (easy) .. 10 (hard)
+    last_grade: int | None = None
+    next_due: str = ""
+    last_reviewed_at: str | None = None
@@ -1,13 +1,16 @@
 """LangGraph nodes: Tagger / Practice / Insight."""
 
-from openpraxis.nodes.tagger import tagger_node
+from openpraxis.nodes.tagger import atagger_node, tagger_node
 from openpraxis.nodes.practice import (
+    acoach_turn_node,
+    apractice_evaluator_node,
+    apractice_generator_node,
     coach_turn_node,
     human_turn_node,
     practice_evaluator_node,
     practice_generator_node,
 )
-from openpraxis.nodes.insight import insight_generator_node
+from openpraxis.nodes.insight import ainsight_generator_node, insight_generator_node
 
 __all__ = [
     "tagger_node",
@@ -16,4 +19,9 @@ __all__ = [
     "human_turn_node",
     "practice_evaluator_node",
     "insight_generator_node",
+    "atagger_node",
+    "apractice_generator_node",
+    "acoach_turn_node",
+    "apractice_evaluator_node",
+    "ainsight_generator_node",
 ]
@@ -5,13 +5,12 @@ from openpraxis.prompts import get_insight_generator_system_prompt
 from openpraxis.runtime import get_backend
 
 
-def insight_generator_node(state: dict) -> dict:
-    """Generate insight cards from Tagger + scene + answer + evaluation."""
+def _insight_user_content(state: dict) -> str:
     tagger_output = state["tagger_output"]
     scene = state["scene"]
     user_answer = state["user_answer"]
     performance = state["performance"]
-    user_content = (
+    return (
         f"Input summary: {tagger_output.summary}\n"
         f"Capability map: {tagger_output.capability_map.model_dump()}\n\n"
         f"Scene: {scene.role} — {scene.task}\n"
@@ -20,10 +19,25 @@ def insight_generator_node(state: dict) -> dict:
         f"Improvement vectors: {performance.improvement_vectors}\n\n"
         f"scene_id: {scene.scene_id}"
     )
-    backend = get_backend()
+
+
+def insight_generator_node(state: dict) -> dict:
+    """Generate insight cards from Tagger + scene + answer + evaluation."""
+    backend = get_backend("insight_generator")
     result: InsightList = backend.call_structured(
         get_insight_generator_system_prompt(),
-        user_content,
+        _insight_user_content(state),
+        InsightList,
+    )
+    return {"insights": result.cards}
+
+
+async def ainsight_generator_node(state: dict) -> dict:
+    """Async ``insight_generator_node``."""
+    backend = get_backend("insight_generator")
+    result: InsightList = await backend.acall_structured(
+        get_insight_generator_system_prompt(),
+        _insight_user_content(state),
         InsightList,
     )
     return {"insights": result.cards}
@@ -1,9 +1,12 @@
 """Practice generation + multi-turn coaching + evaluation nodes."""
 
+from collections.abc import Callable
 from uuid import uuid4
 
+from langgraph.config import get_stream_writer
 from langgraph.types import interrupt
 
+from openpraxis.chunking import reference_text
 from openpraxis.models import (
     CoachReply,
     PracticeMessage,
@@ -21,24 +24,21 @@ from openpraxis.runtime import get_backend
 MAX_PRACTICE_ROUNDS = 3
 
 
-def practice_generator_node(state: dict) -> dict:
-    """Generate practice scene."""
+def _generator_user_content(state: dict) -> str:
     tagger_output = state["tagger_output"]
-    raw_text = state["raw_text"]
     seed = tagger_output.practice_seed
-    user_content = (
+    query = " ".join([tagger_output.summary, *seed.concepts, *seed.skills, *tagger_output.tags.topics])
+    raw_text = reference_text(state, query)
+    return (
         f"Summary: {tagger_output.summary}\n\n"
         f"Raw content:\n{raw_text}\n\n"
         f"Preferred scene type: {seed.preferred_scene.value}\n"
         f"Skills: {seed.skills}\nConcepts: {seed.concepts}\nConstraints: {seed.constraints}"
     )
-    backend = get_backend()
-    llm_scene: PracticeSceneLLM = backend.call_structured(
-        get_practice_generator_system_prompt(),
-        user_content,
-        PracticeSceneLLM,
-    )
-    scene = PracticeScene(
+
+
+def _scene_from_llm(llm_scene: PracticeSceneLLM) -> PracticeScene:
+    return PracticeScene(
         scene_id=str(uuid4()),
         scene_type=llm_scene.scene_type,
         role=llm_scene.role,
@@ -47,7 +47,28 @@ def practice_generator_node(state: dict) -> dict:
         rubric=llm_scene.rubric,
         expected_structure_hint=llm_scene.expected_structure_hint,
     )
-    return {"scene": scene}
+
+
+def practice_generator_node(state: dict) -> dict:
+    """Generate practice scene."""
+    backend = get_backend("practice_generator")
+    llm_scene: PracticeSceneLLM = backend.call_structured(
+        get_practice_generator_system_prompt(),
+        _generator_user_content(state),
+        PracticeSceneLLM,
+    )
+    return {"scene": _scene_from_llm(llm_scene)}
+
+
+async def apractice_generator_node(state: dict) -> dict:
+    """Async ``practice_generator_node``."""
+    backend = get_backend("practice_generator")
+    llm_scene: PracticeSceneLLM = await backend.acall_structured(
+        get_practice_generator_system_prompt(),
+        _generator_user_content(state),
+        PracticeSceneLLM,
+    )
+    return {"scene": _scene_from_llm(llm_scene)}
 
 
 def _build_coach_messages(
@@ -72,15 +93,26 @@ def _build_coach_messages(
     return messages
 
 
-def coach_turn_node(state: dict) -> dict:
-    """Coach generates a message (question / follow-up / wrap-up)."""
-    scene = state["scene"]
-    practice_messages: list[PracticeMessage] = state.get("practice_messages", [])
+def _coach_partial_writer() -> Callable[[dict], None]:
+    """Forward the coach ``message`` decoded so far as ``{"coach_message": text}`` events.
 
-    messages = _build_coach_messages(scene, practice_messages)
-    backend = get_backend()
-    reply: CoachReply = backend.call_chat_structured(messages, CoachReply)
+    The events reach callers of ``graph.stream(..., stream_mode="custom")``; outside
+    a graph run (e.g. scene pool generation) they are dropped.
+    """
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return lambda partial: None
+
+    def on_partial(partial: dict) -> None:
+        message = partial.get("message")
+        if isinstance(message, str):
+            writer({"coach_message": message})
 
+    return on_partial
+
+
+def _coach_update(reply: CoachReply) -> dict:
     coach_msg = PracticeMessage(role="coach", content=reply.message)
     return {
         "practice_messages": [coach_msg],
@@ -88,6 +120,36 @@ def coach_turn_node(state: dict) -> dict:
     }
 
 
+def coach_turn_node(state: dict) -> dict:
+    """Coach generates a message (question / follow-up / wrap-up).
+
+    The reply is streamed: the message text is emitted as it is generated and
+    ``ready_for_evaluation`` is read from the completed reply.
+    """
+    scene = state["scene"]
+    practice_messages: list[PracticeMessage] = state.get("practice_messages", [])
+
+    messages = _build_coach_messages(scene, practice_messages)
+    backend = get_backend("coach_turn")
+    reply: CoachReply = backend.call_chat_structured_stream(
+        messages, CoachReply, _coach_partial_writer()
+    )
+    return _coach_update(reply)
+
+
+async def acoach_turn_node(state: dict) -> dict:
+    """Async ``coach_turn_node``."""
+    scene = state["scene"]
+    practice_messages: list[PracticeMessage] = state.get("practice_messages", [])
+
+    messages = _build_coach_messages(scene, practice_messages)
+    backend = get_backend("coach_turn")
+    reply: CoachReply = await backend.acall_chat_structured_stream(
+        messages, CoachReply, _coach_partial_writer()
+    )
+    return _coach_update(reply)
+
+
 def human_turn_node(state: dict) -> dict:
     """Interrupt to collect user reply, append to practice_messages."""
     practice_messages: list[PracticeMessage] = state.get("practice_messages", [])
@@ -122,10 +184,9 @@ def _format_conversation(practice_messages: list[PracticeMessage]) -> str:
     return "\n\n".join(lines)
 
 
-def practice_evaluator_node(state: dict) -> dict:
-    """Score user answer based on full conversation transcript."""
+def _evaluator_inputs(state: dict) -> tuple[str, str]:
+    """Return (evaluator user content, formatted conversation)."""
     scene = state["scene"]
-    raw_text = state.get("raw_text", "")
     practice_messages: list[PracticeMessage] = state.get("practice_messages", [])
 
     # Format full conversation for evaluator
@@ -134,6 +195,10 @@ def practice_evaluator_node(state: dict) -> dict:
     else:
         # Fallback for legacy single-turn user_answer
         conversation = state.get("user_answer", "")
+    # Long inputs: only the chunks relevant to this scene go in as reference.
+    raw_text = reference_text(
+        state, " ".join([scene.task, *scene.rubric, *scene.constraints, conversation])
+    )
 
     user_content = (
         f"Scene task: {scene.task}\nConstraints: {scene.constraints}\n"
@@ -141,7 +206,13 @@ def practice_evaluator_node(state: dict) -> dict:
         f"Practice conversation:\n{conversation}\n\n"
         f"Raw learning content (reference):\n{raw_text}"
     )
-    backend = get_backend()
+    return user_content, conversation
+
+
+def practice_evaluator_node(state: dict) -> dict:
+    """Score user answer based on full conversation transcript."""
+    user_content, conversation = _evaluator_inputs(state)
+    backend = get_backend("practice_evaluator")
     performance: PracticePerformance = backend.call_structured(
         get_practice_evaluator_system_prompt(),
         user_content,
@@ -151,3 +222,18 @@ def practice_evaluator_node(state: dict) -> dict:
         "performance": performance,
         "user_answer": conversation,
     }
+
+
+async def apractice_evaluator_node(state: dict) -> dict:
+    """Async ``practice_evaluator_node``."""
+    user_content, conversation = _evaluator_inputs(state)
+    backend = get_backend("practice_evaluator")
+    performance: PracticePerformance = await backend.acall_structured(
+        get_practice_evaluator_system_prompt(),
+        user_content,
+        PracticePerformance,
+    )
+    return {
+        "performance": performance,
+        "user_answer": conversation,
+    }
@@ -1,23 +1,149 @@
 """Tagger Agent node."""
 
-from openpraxis.models import RoutingPolicy, TaggerOutput
-from openpraxis.prompts import get_tagger_system_prompt
-from openpraxis.runtime import get_backend
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
 
+from openpraxis.chunking import chunk_input, needs_chunking
+from openpraxis.models import Chunk, RoutingPolicy, TaggerOutput
+from openpraxis.prompts import (
+    get_prompt_version,
+    get_tagger_reduce_system_prompt,
+    get_tagger_system_prompt,
+)
+from openpraxis.runtime import current_model_id, get_backend
 
-def tagger_node(state: dict) -> dict:
-    """Call LLM to classify and map capabilities; return tagger_output and should_practice."""
+# Classification should be reproducible (and therefore cacheable) across re-imports.
+TAGGER_TEMPERATURE = 0.0
+# Concurrent per-chunk Tagger calls for long inputs.
+TAGGER_MAP_CONCURRENCY = 8
+
+
+def tagger_version() -> tuple[str, str]:
+    """``(model, prompt_version)`` a freshly produced TaggerOutput is stamped with."""
+    return current_model_id("tagger"), get_prompt_version("tagger")
+
+
+def _tagger_user_content(state: dict) -> str:
     raw_text = state["raw_text"]
     type_hint = state.get("type_hint")
-    user_content = raw_text
     if type_hint:
-        user_content = f"[User type hint: {type_hint}]\n\n{raw_text}"
+        return f"[User type hint: {type_hint}]\n\n{raw_text}"
+    return raw_text
+
+
+def _chunk_user_content(state: dict, chunk: Chunk, total: int) -> str:
+    content = f"[Chunk {chunk.seq}/{total} of a longer input]\n\n{chunk.text}"
+    type_hint = state.get("type_hint")
+    if type_hint:
+        return f"[User type hint: {type_hint}]\n\n{content}"
+    return content
+
+
+def _reduce_user_content(state: dict, partials: list[TaggerOutput]) -> str:
+    body = "\n\n".join(
+        f"Chunk {i}:\n{json.dumps(p.model_dump(mode='json'), ensure_ascii=False)}"
+        for i, p in enumerate(partials, 1)
+    )
+    type_hint = state.get("type_hint")
+    if type_hint:
+        return f"[User type hint: {type_hint}]\n\n{body}"
+    return body
+
+
+def tagger_update(output: TaggerOutput) -> dict:
+    """State update for a TaggerOutput (also used to seed the graph with a stored one)."""
+    should = output.routing_policy != RoutingPolicy.NONE
+    return {"tagger_output": output, "should_practice": should}
+
+
+def _chunks(state: dict) -> list[Chunk]:
+    """Chunks to tag separately (none for short inputs).
+
+    Long whitespace-only text also chunks to nothing and gets the single-call Tagger.
+    """
+    if not needs_chunking(state["raw_text"]):
+        return []
+    return chunk_input(state.get("input_id", "input"), state["raw_text"])
+
 
-    backend = get_backend()
+def _tag_chunked(state: dict, chunks: list[Chunk]) -> dict:
+    """Map: tag chunks in parallel. Reduce: merge the partial outputs in one call."""
+    backend = get_backend("tagger")
+
+    def tag(chunk: Chunk) -> TaggerOutput:
+        return backend.call_structured(
+            get_tagger_system_prompt(),
+            _chunk_user_content(state, chunk, len(chunks)),
+            TaggerOutput,
+            temperature=TAGGER_TEMPERATURE,
+        )
+
+    with ThreadPoolExecutor(
+        max_workers=min(TAGGER_MAP_CONCURRENCY, len(chunks)), thread_name_prefix="praxis-chunk"
+    ) as pool:
+        partials = list(pool.map(tag, chunks))
+    output: TaggerOutput = backend.call_structured(
+        get_tagger_reduce_system_prompt(),
+        _reduce_user_content(state, partials),
+        TaggerOutput,
+        temperature=TAGGER_TEMPERATURE,
+    )
+    return {**tagger_update(output), "chunks": chunks}
+
+
+async def _atag_chunked(state: dict, chunks: list[Chunk]) -> dict:
+    backend = get_backend("tagger")
+    limit = asyncio.Semaphore(TAGGER_MAP_CONCURRENCY)
+
+    async def tag(chunk: Chunk) -> TaggerOutput:
+        async with limit:
+            return await backend.acall_structured(
+                get_tagger_system_prompt(),
+                _chunk_user_content(state, chunk, len(chunks)),
+                TaggerOutput,
+                temperature=TAGGER_TEMPERATURE,
+            )
+
+    partials = await asyncio.gather(*(tag(c) for c in chunks))
+    output: TaggerOutput = await backend.acall_structured(
+        get_tagger_reduce_system_prompt(),
+        _reduce_user_content(state, list(partials)),
+        TaggerOutput,
+        temperature=TAGGER_TEMPERATURE,
+    )
+    return {**tagger_update(output), "chunks": chunks}
+
+
+def tagger_node(state: dict) -> dict:
+    """Call LLM to classify and map capabilities; return tagger_output and should_practice.
+
+    Long inputs are split into chunks that are tagged concurrently and then
+    reduced into one TaggerOutput; the chunks are returned in ``chunks``.
+    """
+    chunks = _chunks(state)
+    if chunks:
+        return _tag_chunked(state, chunks)
+    backend = get_backend("tagger")
     output: TaggerOutput = backend.call_structured(
         get_tagger_system_prompt(),
-        user_content,
+        _tagger_user_content(state),
         TaggerOutput,
+        temperature=TAGGER_TEMPERATURE,
     )
-    should = output.routing_policy != RoutingPolicy.NONE
-    return {"tagger_output": output, "should_practice": should}
+    return tagger_update(output)
+
+
+async def atagger_node(state: dict) -> dict:
+    """Async ``tagger_node`` (used by ``graph.ainvoke``)."""
+    chunks = _chunks(state)
+    if chunks:
+        return await _atag_chunked(state, chunks)
+    backend = get_backend("tagger")
+    output: TaggerOutput = await backend.acall_structured(
+        get_tagger_system_prompt(),
+        _tagger_user_content(state),
+        TaggerOutput,
+        temperature=TAGGER_TEMPERATURE,
+    )
+    return tagger_update(output)
@@ -0,0 +1,23 @@
+"""Where ``praxis serve`` listens.
+
+Shared by the settings loader (``config.py``) and the daemon client
+(``client.py``).  Standard library only, so importing it keeps the client's
+forwarding path fast.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+SOCKET_NAME = "praxis.sock"
+
+
+def socket_path_from_config(config: dict, default_data_dir: Path) -> Path:
+    """Socket path: ``OPENPRAXIS_SOCKET``, then ``[serve] socket``, then ``data_dir/praxis.sock``."""
+    if os.environ.get("OPENPRAXIS_SOCKET"):
+        return Path(os.environ["OPENPRAXIS_SOCKET"]).expanduser()
+    if config.get("serve", {}).get("socket"):
+        return Path(config["serve"]["socket"]).expanduser()
+    data_dir = config.get("storage", {}).get("data_dir", str(default_data_dir))
+    return Path(data_dir).expanduser() / SOCKET_NAME
@@ -0,0 +1,163 @@
+"""Pool of pre-generated practice scenes.
+
+``praxis practice`` takes a ready scene (with the coach's opening message) from
+``scene_pool`` instead of waiting on the generator and coach LLM calls, then
+queues the input in ``scene_pool_requests``.  ``refill_pool`` tops every
+queued input back up to ``size`` scenes.  Generation runs on a thread pool, and
+the calling thread is the only one that writes to the database (as in
+``ingest.run_bulk_ingest``).
+
+Pooled scenes record the generator and coach prompt versions.  Scenes from
+older prompts (and, optionally, scenes past a maximum age) are evicted before
+each refill.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from pydantic import BaseModel, Field
+
+from openpraxis.db import (
+    clear_pool_requests,
+    count_pooled_scenes,
+    evict_pooled_scenes,
+    get_chunks,
+    get_input_by_id,
+    get_pool_requests,
+    get_tagger_output,
+    save_pooled_scene,
+    transaction,
+)
+from openpraxis.models import PracticeScene
+from openpraxis.prompts import get_prompt_version
+from openpraxis.scheduler import format_timestamp, utc_now
+
+
+class PoolRefillResult(BaseModel):
+    """Outcome for one scene generation."""
+
+    input_id: str
+    ok: bool
+    scene_id: str | None = None
+    error: str | None = None
+
+
+class PoolRefillSummary(BaseModel):
+    """Counts for a refill run."""
+
+    generated: int = 0
+    evicted: int = 0
+    failed: int = 0
+    failures: list[PoolRefillResult] = Field(default_factory=list)
+
+    def record(self, result: PoolRefillResult) -> None:
+        if result.ok:
+            self.generated += 1
+        else:
+            self.failed += 1
+            self.failures.append(result)
+
+
+def pool_versions() -> tuple[str, str]:
+    """``(generator, coach)`` prompt versions a freshly pooled scene is stamped with."""
+    return get_prompt_version("practice_generator"), get_prompt_version("practice_coach")
+
+
+def practice_state(conn: sqlite3.Connection, input_id: str) -> dict:
+    """Graph state the practice generator needs for ``input_id``."""
+    row = get_input_by_id(conn, input_id)
+    if row is None:
+        raise LookupError(f"input {input_id} not found")
+    tagger_output = get_tagger_output(conn, input_id)
+    if tagger_output is None:
+        raise LookupError(f"input {input_id} has no tagger output")
+    state = {
+        "input_id": input_id,
+        "raw_text": row["raw_text"],
+        "type_hint": row["type_hint"],
+        "tagger_output": tagger_output,
+    }
+    chunks = get_chunks(conn, input_id)
+    if chunks:
+        state["chunks"] = chunks
+    return state
+
+
+def generate_pooled_scene(state: dict) -> tuple[PracticeScene, str]:
+    """Run the practice generator and the coach's first turn (no DB access)."""
+    from openpraxis.nodes.practice import coach_turn_node, practice_generator_node
+
+    scene = practice_generator_node(state)["scene"]
+    opening = coach_turn_node({**state, "scene": scene, "practice_messages": []})
+    return scene, opening["practice_messages"][0].content
+
+
+def refill_pool(
+    conn: sqlite3.Connection,
+    size: int,
+    input_ids: list[str] | None = None,
+    jobs: int = 4,
+    evict_stale: bool = True,
+    max_age_seconds: int = 0,
+    on_result: Callable[[PoolRefillResult], None] | None = None,
+) -> PoolRefillSummary:
+    """Top up the pool to ``size`` scenes for ``input_ids`` (default: queued inputs).
+
+    Processed inputs are removed from the refill queue, except those with a
+    failed generation, which stay queued for the next run.
+    """
+    summary = PoolRefillSummary()
+    versions = pool_versions()
+    older_than = None
+    if max_age_seconds:
+        older_than = format_timestamp(utc_now() - timedelta(seconds=max_age_seconds))
+    summary.evicted = evict_pooled_scenes(
+        conn, keep_versions=versions if evict_stale else None, older_than=older_than
+    )
+    targets = input_ids if input_ids is not None else get_pool_requests(conn)
+    counts = count_pooled_scenes(conn, targets, versions if evict_stale else None)
+
+    def _emit(result: PoolRefillResult) -> None:
+        summary.record(result)
+        if on_result is not None:
+            on_result(result)
+
+    work: list[tuple[str, dict]] = []
+    failed_inputs: set[str] = set()
+    for input_id in targets:
+        missing = size - counts.get(input_id, 0)
+        if missing <= 0:
+            continue
+        try:
+            state = practice_state(conn, input_id)
+        except LookupError as exc:
+            # Nothing a later refill could fix; the request is dropped.
+            _emit(PoolRefillResult(input_id=input_id, ok=False, error=str(exc)))
+            continue
+        work.extend((input_id, state) for _ in range(missing))
+
+    if work:
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(jobs, len(work))), thread_name_prefix="praxis-pool"
+        ) as pool:
+            futures = {
+                pool.submit(generate_pooled_scene, state): input_id for input_id, state in work
+            }
+            for future in as_completed(futures):
+                input_id = futures[future]
+                try:
+                    scene, opening = future.result()
+                    with transaction(conn):
+                        save_pooled_scene(conn, input_id, scene, opening, *versions)
+                except Exception as exc:
+                    failed_inputs.add(input_id)
+                    _emit(PoolRefillResult(input_id=input_id, ok=False, error=str(exc)))
+                else:
+                    _emit(PoolRefillResult(input_id=input_id, ok=True, scene_id=scene.scene_id))
+
+    clear_pool_requests(conn, [i for i in targets if i not in failed_inputs])
+    return summary
@@ -1,4 +1,12 @@
-"""System prompts for the four agents."""
+"""System prompts for the four agents (plus the Tagger's chunk reduce step)."""
+
+import hashlib
+from collections.abc import Callable
+
+
+def prompt_version(prompt: str) -> str:
+    """Short content fingerprint of a prompt, stored alongside LLM outputs."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
 
 
 def get_tagger_system_prompt() -> str:
@@ -36,6 +44,20 @@ Apply these rules to determine routing_policy:
 - constraints: practical constraints for the practice (e.g. "3 minutes", "include 1 failure mode", "audience is non-technical PM")."""
 
 
+def get_tagger_reduce_system_prompt() -> str:
+    """Tagger reduce step: merge per-chunk Tagger outputs of one long input."""
+    return """\
+You are a cognitive analyst merging the classifications of consecutive chunks of ONE long learning input into a single result.
+
+You receive one JSON Tagger output per chunk, in document order. Produce one Tagger output for the whole input:
+- input_type: the type that best describes the input as a whole.
+- summary: 1–3 sentences covering the core knowledge of the entire input, not just the first chunk.
+- tags: merge topics and domains, dropping duplicates and keeping the most important; difficulty reflects the hardest substantial part; sensitivity is "private" if any chunk is private.
+- capability_map: score each dimension for the input as a whole (0–10); a dimension deeply exercised in any substantial chunk scores high.
+- routing_policy: apply the same rules as for a single input, based on the whole input.
+- practice_seed: choose the scene type, skills, concepts and constraints most valuable for the input as a whole."""
+
+
 def get_practice_generator_system_prompt() -> str:
     """Practice Generator: generate structured practice scenes."""
     return """\
@@ -142,3 +164,30 @@ You are a cognitive pattern analyst who extracts transferable learning insights
 - intensity: reflects how fundamental the gap is (1 = minor stylistic tweak, 5 = core reasoning or structural issue).
 - concepts and skills: tag relevant concepts and skills for future cross-referencing.
 - scenes: must back-link to the current scene_id."""
+
+
+def _tagger_stage_prompts() -> str:
+    # Long inputs are tagged with both prompts, so either one changing makes a
+    # TaggerOutput stale.
+    return get_tagger_system_prompt() + "\n\n" + get_tagger_reduce_system_prompt()
+
+
+# Registry of named prompts; the name is the pipeline stage whose outputs the
+# prompt(s) produce.
+PROMPTS: dict[str, Callable[[], str]] = {
+    "tagger": _tagger_stage_prompts,
+    "practice_generator": get_practice_generator_system_prompt,
+    "practice_coach": get_practice_coach_system_prompt,
+    "practice_evaluator": get_practice_evaluator_system_prompt,
+    "insight_generator": get_insight_generator_system_prompt,
+}
+
+
+def get_prompt_version(name: str) -> str:
+    """Current fingerprint of the registered prompt ``name``."""
+    return prompt_version(PROMPTS[name]())
+
+
+def get_prompt_versions() -> dict[str, str]:
+    """Current fingerprint of every registered prompt."""
+    return {name: prompt_version(fn()) for name, fn in PROMPTS.items()}
@@ -0,0 +1,324 @@
+"""Client-side rate limiting for LLM provider calls.
+
+There is one ``RateLimiter`` per (provider, model).  Before each request it
+waits for three things:
+
+* a free concurrency slot;
+* a request from the requests-per-minute bucket;
+* the request's estimated tokens from the tokens-per-minute bucket.
+
+Bucket sizes come from ``[llm.rate_limit]`` and are corrected from the
+provider's ``x-ratelimit-*`` response headers as they arrive.  A limit that is
+not configured starts unbounded and is learned from those headers.
+
+The concurrency limit follows AIMD (additive increase, multiplicative
+decrease).  Every successful call adds ``1 / limit``, so the limit grows by
+about one per round of calls.  A 429 halves the limit, at most once per
+throttling episode.  It also pauses every caller of that limiter until the
+provider's ``retry-after``.  Bulk work can therefore use as many threads as it
+likes: the number of requests actually in flight settles just under what the
+provider sustains.
+
+``llm.py`` installs ``observe_response`` as an httpx response hook.  The hook
+finds the limiter of the call that is running through a context variable, so
+it works for threads and asyncio tasks alike.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator, Mapping
+from contextlib import AbstractContextManager, asynccontextmanager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+# Tokens reserved for the reply when estimating a request's cost.
+OUTPUT_TOKEN_RESERVE = 512
+_CHARS_PER_TOKEN = 4
+# Pause after a 429 that carries no retry-after / reset header.
+DEFAULT_THROTTLE_SECONDS = 1.0
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def estimate_tokens(messages: list[dict], reserve: int = OUTPUT_TOKEN_RESERVE) -> int:
+    """Rough token cost of a request: prompt characters / 4 plus room for the reply."""
+    chars = 0
+    for message in messages:
+        content = message.get("content", "")
+        chars += len(content) if isinstance(content, str) else len(json.dumps(content, default=str))
+    return chars // _CHARS_PER_TOKEN + reserve
+
+
+def parse_duration(value: str | None) -> float | None:
+    """Seconds in a rate-limit header value: ``"20"``, ``"1.5s"``, ``"250ms"``, ``"6m0s"``."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> int | None:
+    value = headers.get(name)
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> float | None:
+    """How long the provider asks us to wait (``retry-after-ms``, ``retry-after``, resets)."""
+    retry_ms = headers.get("retry-after-ms")
+    if retry_ms is not None:
+        try:
+            return float(retry_ms) / 1000
+        except ValueError:
+            pass
+    for name in ("retry-after", "x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        seconds = parse_duration(headers.get(name))
+        if seconds is not None:
+            return seconds
+    return None
+
+
+class TokenBucket:
+    """``capacity`` units refilled evenly over ``period`` seconds; capacity 0 is unbounded."""
+
+    def __init__(self, capacity: float = 0, period: float = 60.0, now: float = 0.0) -> None:
+        self.capacity = float(capacity)
+        self.period = period
+        self.level = float(capacity)
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        if self.capacity and now > self.updated:
+            rate = self.capacity / self.period
+            self.level = min(self.capacity, self.level + (now - self.updated) * rate)
+        self.updated = max(self.updated, now)
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` can be taken (a request bigger than the bucket waits for a full one)."""
+        self._refill(now)
+        if not self.capacity:
+            return 0.0
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) * self.period / self.capacity
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        if self.capacity:
+            self.level -= min(amount, self.capacity)
+
+    def set_limit(self, capacity: int | None, remaining: int | None, now: float) -> None:
+        """Adopt the provider's view: its limit, and no more than what it says is left."""
+        self._refill(now)
+        if capacity and capacity != self.capacity:
+            self.level = capacity if not self.capacity else min(self.level, capacity)
+            self.capacity = float(capacity)
+        if remaining is not None and self.capacity:
+            self.level = min(self.level, float(remaining))
+
+
+@dataclass
+class Permit:
+    """One admitted request; ``throttled`` is set when the provider answered 429."""
+
+    limiter: RateLimiter
+    tokens: int
+    throttled: bool = False
+
+
+_current_permit: ContextVar[Permit | None] = ContextVar("praxis_rate_permit", default=None)
+
+
+class RateLimiter:
+    """Request / token buckets plus an AIMD concurrency limit for one provider model."""
+
+    def __init__(
+        self,
+        rpm: int = 0,
+        tpm: int = 0,
+        initial_concurrency: int = 4,
+        max_concurrency: int = 32,
+        min_concurrency: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self._cond = threading.Condition()
+        now = clock()
+        self.requests = TokenBucket(rpm, now=now)
+        self.tokens = TokenBucket(tpm, now=now)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max(max_concurrency, min_concurrency)
+        self.concurrency = float(
+            min(max(initial_concurrency, min_concurrency), self.max_concurrency)
+        )
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._decrease_blocked_until = 0.0
+
+    def _try_admit(self, tokens: int) -> float | None:
+        """Admit now (0.0), or return the wait in seconds (None: until a slot is released)."""
+        if self.in_flight >= int(self.concurrency):
+            return None
+        now = self._clock()
+        wait = max(
+            self.paused_until - now,
+            self.requests.wait_time(1, now),
+            self.tokens.wait_time(tokens, now),
+        )
+        if wait > 0:
+            return wait
+        self.requests.take(1, now)
+        self.tokens.take(tokens, now)
+        self.in_flight += 1
+        return 0.0
+
+    def acquire(self, tokens: int) -> Permit:
+        """Block until a request of ``tokens`` estimated tokens may be sent."""
+        with self._cond:
+            while True:
+                wait = self._try_admit(tokens)
+                if wait == 0.0:
+                    return Permit(self, tokens)
+                self._cond.wait(timeout=wait)
+
+    async def aacquire(self, tokens: int, poll_seconds: float = 0.05) -> Permit:
+        """``acquire`` for coroutines (polls instead of blocking the event loop)."""
+        while True:
+            with self._cond:
+                wait = self._try_admit(tokens)
+            if wait == 0.0:
+                return Permit(self, tokens)
+            await asyncio.sleep(poll_seconds if wait is None else min(wait, 1.0))
+
+    def release(self, permit: Permit) -> None:
+        """Free the slot; an unthrottled call grows the concurrency limit."""
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            if not permit.throttled:
+                self.concurrency = min(
+                    self.max_concurrency, self.concurrency + 1 / self.concurrency
+                )
+            self._cond.notify_all()
+
+    def throttle(self, retry_after: float | None = None) -> None:
+        """React to a 429: pause every caller, and halve the limit once per episode."""
+        with self._cond:
+            now = self._clock()
+            pause = retry_after if retry_after is not None else DEFAULT_THROTTLE_SECONDS
+            self.paused_until = max(self.paused_until, now + pause)
+            if now >= self._decrease_blocked_until:
+                self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+                # Other requests already in flight will 429 too; count the episode once.
+                self._decrease_blocked_until = now + max(pause, DEFAULT_THROTTLE_SECONDS)
+            self._cond.notify_all()
+
+    def apply_headers(self, headers: Mapping[str, str]) -> None:
+        """Adopt the limits and remaining budget reported in ``x-ratelimit-*`` headers."""
+        with self._cond:
+            now = self._clock()
+            self.requests.set_limit(
+                _header_int(headers, "x-ratelimit-limit-requests"),
+                _header_int(headers, "x-ratelimit-remaining-requests"),
+                now,
+            )
+            self.tokens.set_limit(
+                _header_int(headers, "x-ratelimit-limit-tokens"),
+                _header_int(headers, "x-ratelimit-remaining-tokens"),
+                now,
+            )
+
+    @contextmanager
+    def slot(
+        self, tokens: int, queued: AbstractContextManager | None = None
+    ) -> Iterator[Permit]:
+        """Hold a slot for one call; the response hook sees it as the current permit.
+
+        The wait for the slot runs inside ``queued`` (e.g. ``resilience.queued()``,
+        which keeps it out of the attempt's timeout).
+        """
+        with queued or nullcontext():
+            permit = self.acquire(tokens)
+        reset = _current_permit.set(permit)
+        try:
+            yield permit
+        except Exception as exc:
+            _note_failure(permit, exc)
+            raise
+        finally:
+            _current_permit.reset(reset)
+            self.release(permit)
+
+    @asynccontextmanager
+    async def aslot(
+        self, tokens: int, queued: AbstractContextManager | None = None
+    ) -> AsyncIterator[Permit]:
+        with queued or nullcontext():
+            permit = await self.aacquire(tokens)
+        reset = _current_permit.set(permit)
+        try:
+            yield permit
+        except Exception as exc:
+            _note_failure(permit, exc)
+            raise
+        finally:
+            _current_permit.reset(reset)
+            self.release(permit)
+
+
+def _note_failure(permit: Permit, exc: Exception) -> None:
+    """Count a 429 raised by the SDK that the response hook did not see."""
+    if getattr(exc, "status_code", None) == 429 and not permit.throttled:
+        permit.throttled = True
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+        permit.limiter.throttle(retry_after_seconds(headers))
+
+
+def observe_response(response) -> None:
+    """httpx response hook: feed rate-limit headers and 429s to the current call's limiter."""
+    permit = _current_permit.get()
+    if permit is None:
+        return
+    permit.limiter.apply_headers(response.headers)
+    if response.status_code == 429:
+        permit.throttled = True
+        permit.limiter.throttle(retry_after_seconds(response.headers))
+
+
+async def aobserve_response(response) -> None:
+    """Async httpx response hook (httpx awaits hooks on ``AsyncClient``)."""
+    observe_response(response)
+
+
+_limiters: dict[tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str, model: str, **defaults) -> RateLimiter:
+    """The process-wide limiter for ``(provider, model)``, created with ``defaults``."""
+    key = (provider, model)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = RateLimiter(**defaults)
+        return limiter
+
+
+def reset_limiters() -> None:
+    """Forget every limiter (after a config change, and in tests)."""
+    with _limiters_lock:
+        _limiters.clear()
@@ -0,0 +1,166 @@
+"""Recompute stored LLM outputs after a prompt change.
+
+Every Tagger output and insight card records the fingerprint of the prompt
+that produced it (``prompts.get_prompt_version``).  ``run_reprocess`` re-runs
+only the rows whose fingerprint no longer matches, so a prompt change can be
+rolled out incrementally.  Each row is rewritten in its own transaction, so an
+interrupted run can simply be restarted.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Callable
+
+from pydantic import BaseModel, Field
+
+from openpraxis.db import (
+    delete_insights_for_response,
+    get_input_by_id,
+    get_insight_response_ids,
+    get_response,
+    get_scene,
+    get_scene_input_id,
+    get_tagger_input_ids,
+    get_tagger_output,
+    save_chunks,
+    save_insights_many,
+    save_tagger_output,
+    transaction,
+)
+from openpraxis.models import PracticePerformance
+from openpraxis.prompts import get_prompt_version
+
+# Stages ``run_reprocess`` can recompute from stored rows.  Scenes and
+# evaluations are tied to a user's practice conversation and are not replayed.
+REPROCESS_STAGES = ("tagger", "insight_generator")
+
+
+class ReprocessResult(BaseModel):
+    """Outcome for a single recomputed row."""
+
+    stage: str
+    row_id: str
+    ok: bool
+    error: str | None = None
+
+
+class ReprocessSummary(BaseModel):
+    """Per-stage counts for a reprocess run."""
+
+    updated: dict[str, int] = Field(default_factory=dict)
+    failed: int = 0
+    failures: list[ReprocessResult] = Field(default_factory=list)
+
+    def record(self, result: ReprocessResult) -> None:
+        if result.ok:
+            self.updated[result.stage] = self.updated.get(result.stage, 0) + 1
+        else:
+            self.failed += 1
+            self.failures.append(result)
+
+
+def plan_reprocess(
+    conn: sqlite3.Connection,
+    stages: tuple[str, ...] = REPROCESS_STAGES,
+    stale_only: bool = True,
+) -> dict[str, list[str]]:
+    """Row ids to recompute per stage (input ids for the Tagger, response ids for insights)."""
+    plan: dict[str, list[str]] = {}
+    if "tagger" in stages:
+        stale_for = get_prompt_version("tagger") if stale_only else None
+        plan["tagger"] = get_tagger_input_ids(conn, stale_for=stale_for)
+    if "insight_generator" in stages:
+        stale_for = get_prompt_version("insight_generator") if stale_only else None
+        plan["insight_generator"] = get_insight_response_ids(conn, stale_for=stale_for)
+    return plan
+
+
+def _retag(conn: sqlite3.Connection, input_id: str) -> None:
+    from openpraxis.nodes.tagger import tagger_node, tagger_version
+
+    row = get_input_by_id(conn, input_id)
+    if row is None:
+        raise LookupError(f"input {input_id} not found")
+    out = tagger_node(
+        {"input_id": input_id, "raw_text": row["raw_text"], "type_hint": row["type_hint"]}
+    )
+    with transaction(conn):
+        save_tagger_output(conn, input_id, out["tagger_output"], *tagger_version())
+        save_chunks(conn, input_id, out.get("chunks", []))
+
+
+def insight_state(conn: sqlite3.Connection, response_id: str) -> dict:
+    """Graph state the insight generator needs to (re)write cards for ``response_id``."""
+    response = get_response(conn, response_id)
+    if response is None or not response["perf_json"]:
+        raise LookupError(f"response {response_id} has no evaluation")
+    scene = get_scene(conn, response["scene_id"])
+    if scene is None:
+        raise LookupError(f"scene {response['scene_id']} not found")
+    input_id = get_scene_input_id(conn, scene.scene_id)
+    tagger_output = get_tagger_output(conn, input_id)
+    if tagger_output is None:
+        raise LookupError(f"input {input_id} has no tagger output")
+    return {
+        "input_id": input_id,
+        "tagger_output": tagger_output,
+        "scene": scene,
+        "user_answer": response["answer_text"],
+        "performance": PracticePerformance.model_validate_json(response["perf_json"]),
+    }
+
+
+def replace_insights(
+    conn: sqlite3.Connection, state: dict, response_id: str, insights: list
+) -> None:
+    """Swap the cards stored for ``response_id`` for freshly generated ones."""
+    with transaction(conn):
+        delete_insights_for_response(conn, response_id)
+        save_insights_many(
+            conn,
+            state["input_id"],
+            state["scene"].scene_id,
+            response_id,
+            insights,
+            get_prompt_version("insight_generator"),
+        )
+
+
+def _regenerate_insights(conn: sqlite3.Connection, response_id: str) -> None:
+    from openpraxis.nodes.insight import insight_generator_node
+
+    state = insight_state(conn, response_id)
+    out = insight_generator_node(state)
+    replace_insights(conn, state, response_id, out["insights"])
+
+
+_RUNNERS: dict[str, Callable[[sqlite3.Connection, str], None]] = {
+    "tagger": _retag,
+    "insight_generator": _regenerate_insights,
+}
+
+
+def run_reprocess(
+    conn: sqlite3.Connection,
+    plan: dict[str, list[str]],
+    on_result: Callable[[ReprocessResult], None] | None = None,
+) -> ReprocessSummary:
+    """Recompute every row in ``plan``; failures are recorded and skipped.
+
+    Tagger outputs are recomputed before insights so regenerated cards see the
+    refreshed summary and capability map.
+    """
+    summary = ReprocessSummary()
+    for stage in REPROCESS_STAGES:
+        for row_id in plan.get(stage, []):
+            try:
+                _RUNNERS[stage](conn, row_id)
+            except Exception as exc:
+                result = ReprocessResult(stage=stage, row_id=row_id, ok=False, error=str(exc))
+            else:
+                result = ReprocessResult(stage=stage, row_id=row_id, ok=True)
+            summary.record(result)
+            if on_result is not None:
+                on_result(result)
+    return summary
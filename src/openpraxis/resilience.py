@@ -0,0 +1,380 @@
+"""Retry, deadline and circuit-breaker policy for LLM calls.
+
+``llm_backends.resilient_backend.ResilientBackend`` runs every backend call
+through ``call_with_retries`` / ``acall_with_retries``:
+
+* Failures are classified (``classify_error``).  Transport errors and
+  timeouts, 429s, 5xx responses and unusable output (``LLMOutputError``) are
+  retried.  Other 4xx responses and configuration errors fail at once.
+* Retries wait a jittered exponential backoff ("full jitter"), or the
+  provider's ``retry-after`` if that is longer.
+* Each call has an overall deadline, and each attempt a timeout capped by what
+  is left of it.  ``llm.get_client`` applies ``attempt_timeout()`` to the HTTP
+  request, so a hung connection is abandoned rather than waited on.  Time
+  queued on the rate limiter (``queued()``) counts against neither.
+* One ``CircuitBreaker`` per provider counts consecutive transport/5xx
+  failures.  Past the threshold it opens, and calls fail fast with
+  ``CircuitOpenError`` until ``reset_seconds`` have passed.  Then one trial
+  call is let through: a success closes the breaker, a failure opens it again.
+
+The OpenAI SDK's own retries are disabled while this layer is on
+(``max_retries=0``), so a request is never retried twice over.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import Enum
+from typing import TypeVar
+
+from openpraxis.ratelimit import retry_after_seconds
+
+T = TypeVar("T")
+
+
+class LLMOutputError(RuntimeError):
+    """The provider answered, but with empty, refused or schema-invalid output."""
+
+
+class CircuitOpenError(RuntimeError):
+    """The provider's circuit breaker is open; the call was not attempted."""
+
+
+class ErrorKind(str, Enum):
+    TRANSPORT = "transport"
+    RATE_LIMIT = "rate_limit"
+    SERVER = "server"
+    OUTPUT = "output"
+    FATAL = "fatal"
+
+
+# Failures that say the endpoint itself is unhealthy (they trip the breaker).
+_ENDPOINT_FAILURES = {ErrorKind.TRANSPORT, ErrorKind.SERVER}
+
+
+def classify_error(exc: BaseException) -> ErrorKind:
+    """Map an exception from a backend call to the retry class it belongs to."""
+    if isinstance(exc, LLMOutputError):
+        return ErrorKind.OUTPUT
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return ErrorKind.TRANSPORT
+    status = getattr(exc, "status_code", None)
+    if status == 429:
+        return ErrorKind.RATE_LIMIT
+    if isinstance(status, int):
+        return ErrorKind.SERVER if status >= 500 or status == 408 else ErrorKind.FATAL
+    try:
+        import openai
+        import pydantic
+    except ModuleNotFoundError:  # pragma: no cover - both are core dependencies
+        return ErrorKind.FATAL
+    if isinstance(exc, openai.APIConnectionError):  # includes APITimeoutError
+        return ErrorKind.TRANSPORT
+    if isinstance(
+        exc,
+        (
+            pydantic.ValidationError,
+            openai.LengthFinishReasonError,
+            openai.ContentFilterFinishReasonError,
+        ),
+    ):
+        return ErrorKind.OUTPUT
+    return ErrorKind.FATAL
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often, how patiently and for how long a call is retried."""
+
+    max_attempts: int = 4
+    # Attempts allowed for unusable output (re-asking rarely helps more than once).
+    output_attempts: int = 2
+    backoff_base_seconds: float = 0.5
+    backoff_max_seconds: float = 20.0
+    attempt_timeout_seconds: float = 60.0
+    deadline_seconds: float = 180.0
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Jittered delay after failed attempt number ``attempt`` (1-based)."""
+        ceiling = min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (attempt - 1))
+        delay = random.uniform(0, ceiling)
+        return max(delay, retry_after or 0.0)
+
+    def allows_retry(self, kind: ErrorKind, attempt: int) -> bool:
+        if kind == ErrorKind.FATAL:
+            return False
+        limit = self.output_attempts if kind == ErrorKind.OUTPUT else self.max_attempts
+        return attempt < limit
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open (one trial) -> closed."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._clock() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> bool:
+        """Raise ``CircuitOpenError`` unless a call may go through now.
+
+        Returns True when the call is the half-open trial.
+        """
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return False
+            if state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            retry_in = max(0.0, self.reset_seconds - (self._clock() - self.opened_at))
+            raise CircuitOpenError(
+                f"provider circuit is open after {self.failures} consecutive failures; "
+                f"retrying in {retry_in:.0f}s"
+            )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_abandoned(self, trial: bool) -> None:
+        """A call ended without a result (cancelled, interrupted).
+
+        If it was the trial, the next call gets to be the trial instead.
+        """
+        if trial:
+            with self._lock:
+                self._trial_running = False
+
+    def record_failure(self, kind: ErrorKind) -> None:
+        with self._lock:
+            if kind not in _ENDPOINT_FAILURES:
+                # The endpoint answered; a trial call that got this far proves it is up.
+                if self._trial_running:
+                    self.failures = 0
+                    self.opened_at = None
+                    self._trial_running = False
+                return
+            self.failures += 1
+            if self._trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = self._clock()
+            self._trial_running = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(
+    name: str, failure_threshold: int = 5, reset_seconds: float = 30.0
+) -> CircuitBreaker:
+    """The process-wide breaker for provider ``name``."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(failure_threshold, reset_seconds)
+        return breaker
+
+
+def reset_breakers() -> None:
+    """Forget every breaker (after a config change, and in tests)."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+class _AttemptClock:
+    """Time budget of one attempt.
+
+    Time spent queued on the rate limiter (``queued()``) is not charged to the
+    attempt, and pushes the call deadline back by as much: a call waiting for
+    a slot has not reached the provider yet.
+    """
+
+    def __init__(self, budget: float, call_deadline: float) -> None:
+        now = time.monotonic()
+        self.call_deadline = call_deadline
+        self.ends = min(call_deadline, now + budget)
+        self._paused_at: float | None = None
+
+    def left(self) -> float:
+        """Seconds of budget left (while paused: what was left when the pause began)."""
+        now = time.monotonic() if self._paused_at is None else self._paused_at
+        return self.ends - now
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        if self._paused_at is not None:
+            yield
+            return
+        self._paused_at = time.monotonic()
+        try:
+            yield
+        finally:
+            waited = time.monotonic() - self._paused_at
+            self._paused_at = None
+            self.ends += waited
+            self.call_deadline += waited
+
+
+# Budget of the attempt in progress (None outside a call).
+_attempt_clock: ContextVar[_AttemptClock | None] = ContextVar(
+    "praxis_attempt_clock", default=None
+)
+
+
+def attempt_timeout() -> float | None:
+    """Seconds left for the HTTP request of the attempt in progress, if any."""
+    clock = _attempt_clock.get()
+    if clock is None:
+        return None
+    return max(0.1, clock.left())
+
+
+def queued():
+    """Context for waiting on the rate limiter: the wait is not charged to the attempt."""
+    clock = _attempt_clock.get()
+    return clock.paused() if clock is not None else nullcontext()
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    return retry_after_seconds(headers) if headers is not None else None
+
+
+def _next_delay(
+    exc: Exception,
+    attempt: int,
+    policy: RetryPolicy,
+    breaker: CircuitBreaker | None,
+    call_deadline: float,
+) -> float | None:
+    """Record the failure; return the wait before the next attempt, or None to give up."""
+    kind = classify_error(exc)
+    if breaker is not None:
+        breaker.record_failure(kind)
+    if not policy.allows_retry(kind, attempt):
+        return None
+    delay = policy.backoff(attempt, _retry_after(exc) if kind == ErrorKind.RATE_LIMIT else None)
+    if time.monotonic() + delay >= call_deadline:
+        return None
+    return delay
+
+
+def call_with_retries(
+    fn: Callable[[], T],
+    policy: RetryPolicy,
+    breaker: CircuitBreaker | None = None,
+    retryable: Callable[[], bool] | None = None,
+) -> T:
+    """Run ``fn`` under ``policy``; ``retryable()`` can veto a retry (e.g. output was streamed)."""
+    call_deadline = time.monotonic() + policy.deadline_seconds
+    attempt = 0
+    while True:
+        attempt += 1
+        trial = breaker.before_call() if breaker is not None else False
+        clock = _AttemptClock(policy.attempt_timeout_seconds, call_deadline)
+        token = _attempt_clock.set(clock)
+        try:
+            result = fn()
+        except Exception as exc:
+            call_deadline = clock.call_deadline
+            delay = _next_delay(exc, attempt, policy, breaker, call_deadline)
+            if delay is None or (retryable is not None and not retryable()):
+                raise
+        except BaseException:
+            # Cancelled (e.g. a hedge that lost the race) or interrupted: no verdict.
+            if breaker is not None:
+                breaker.record_abandoned(trial)
+            raise
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
+        finally:
+            _attempt_clock.reset(token)
+        time.sleep(delay)
+
+
+async def acall_with_retries(
+    fn: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    breaker: CircuitBreaker | None = None,
+    retryable: Callable[[], bool] | None = None,
+) -> T:
+    """Async ``call_with_retries``; each attempt is also cut off when its budget runs out."""
+    call_deadline = time.monotonic() + policy.deadline_seconds
+    attempt = 0
+    while True:
+        attempt += 1
+        trial = breaker.before_call() if breaker is not None else False
+        clock = _AttemptClock(policy.attempt_timeout_seconds, call_deadline)
+        token = _attempt_clock.set(clock)
+        try:
+            result = await _bounded(fn(), clock)
+        except Exception as exc:
+            call_deadline = clock.call_deadline
+            delay = _next_delay(exc, attempt, policy, breaker, call_deadline)
+            if delay is None or (retryable is not None and not retryable()):
+                raise
+        except BaseException:
+            # Cancelled (e.g. a hedge that lost the race) or interrupted: no verdict.
+            if breaker is not None:
+                breaker.record_abandoned(trial)
+            raise
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
+        finally:
+            _attempt_clock.reset(token)
+        await asyncio.sleep(delay)
+
+
+async def _bounded(awaitable: Awaitable[T], clock: _AttemptClock) -> T:
+    """Await ``awaitable``, cancelling it once ``clock`` runs out.
+
+    Like ``asyncio.wait_for``, but the deadline moves back while the call is queued.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=max(0.01, clock.left()))
+            if done:
+                return task.result()
+            if clock.left() <= 0:
+                task.cancel()
+                await asyncio.wait({task})
+                raise TimeoutError
+    except BaseException:
+        task.cancel()
+        raise
@@ -13,6 +13,21 @@ Two execution modes are supported:
 
 The mode can be set explicitly via ``set_execution_mode()`` or auto-detected
 from the ``OPENPRAXIS_MODE`` environment variable (value ``openclaw``).
+
+The auto-selected backend is wrapped in layers, innermost first:
+
+* ``ResilientBackend`` — retries, deadlines and a per-provider circuit
+  breaker (``[llm.resilience]``);
+* ``HedgedBackend`` — when ``[llm.hedge]`` is enabled, duplicates slow calls;
+  each hedged attempt is retried on its own;
+* ``CachedBackend`` — unless ``[cache] enabled = false``, serves repeated
+  deterministic calls from the local response cache, skipping both.
+
+``get_backend(node)`` adds a ``NodeBackend`` on top when ``[llm.nodes.<node>]``
+routes that node to its own provider / model / temperature.
+
+Backends installed with ``set_backend()`` are used as-is, and so is the
+OpenClaw backend (the host agent picks the model): neither is routed.
 """
 
 from __future__ import annotations
@@ -22,6 +37,7 @@ from enum import Enum
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from openpraxis.config import NodeLLMSettings
     from openpraxis.llm_backends.base import LLMBackend
 
 
@@ -31,6 +47,8 @@ class ExecutionMode(str, Enum):
 
 
 _backend: LLMBackend | None = None
+# True while ``_backend`` was installed with ``set_backend()``.
+_installed: bool = False
 _execution_mode: ExecutionMode = ExecutionMode.STANDALONE_CLI
 _mode_initialized: bool = False
 
@@ -52,38 +70,165 @@ def get_execution_mode() -> ExecutionMode:
 
 
 def set_execution_mode(mode: ExecutionMode) -> None:
-    global _execution_mode, _mode_initialized, _backend
+    global _execution_mode, _mode_initialized, _backend, _installed
     _execution_mode = mode
     _mode_initialized = True
     # Reset backend so the next get_backend() picks the right one.
     _backend = None
+    _installed = False
+
+
+def get_backend(node: str | None = None) -> LLMBackend:
+    """The backend for LLM calls; ``node`` applies that node's ``[llm.nodes.<name>]`` routing."""
+    backend = _shared_backend()
+    route = _node_route(node)
+    if route is None:
+        return backend
+    from openpraxis.llm_backends.node_backend import NodeBackend
+
+    return NodeBackend(backend, node, route)
 
 
-def get_backend() -> LLMBackend:
+def _node_route(node: str | None) -> NodeLLMSettings | None:
+    if node is None or _installed or get_execution_mode() == ExecutionMode.OPENCLAW:
+        return None
+    from openpraxis.config import get_settings
+
+    return get_settings().llm_nodes.get(node)
+
+
+def _shared_backend() -> LLMBackend:
     global _backend
     if _backend is not None:
         return _backend
 
     mode = get_execution_mode()
+    backend: LLMBackend
     if mode == ExecutionMode.OPENCLAW:
         from openpraxis.llm_backends.openclaw_backend import OpenClawBackend
 
-        _backend = OpenClawBackend()
+        backend = OpenClawBackend()
     else:
         from openpraxis.llm_backends.cli_backend import CLIBackend
 
-        _backend = CLIBackend()
+        backend = CLIBackend()
+    _backend = _with_response_cache(_with_hedging(_with_resilience(backend, mode)), mode)
     return _backend
 
 
+def _with_hedging(backend: LLMBackend) -> LLMBackend:
+    from openpraxis.config import get_settings, provider_api_key
+
+    settings = get_settings()
+    if not settings.hedge_enabled:
+        return backend
+    if settings.hedge_provider and settings.hedge_provider != settings.llm_provider:
+        # Refuse up front rather than fail (or leak the [llm] key) on the first duplicate.
+        try:
+            provider_api_key(settings.hedge_provider)
+        except ValueError as exc:
+            raise ValueError(f"[llm.hedge] cannot be enabled: {exc}") from exc
+    from openpraxis.hedging import HedgePolicy
+    from openpraxis.llm_backends.hedged_backend import HedgedBackend
+
+    policy = HedgePolicy(
+        percentile=settings.hedge_percentile,
+        min_delay_seconds=settings.hedge_min_delay_seconds,
+        max_delay_seconds=settings.hedge_max_delay_seconds,
+        min_samples=settings.hedge_min_samples,
+    )
+    return HedgedBackend(
+        backend,
+        policy,
+        scope=settings.hedge_scope,
+        provider=settings.hedge_provider,
+        model=settings.hedge_model,
+    )
+
+
+def _with_resilience(backend: LLMBackend, mode: ExecutionMode) -> LLMBackend:
+    from openpraxis.config import get_settings
+
+    settings = get_settings()
+    if not settings.resilience_enabled:
+        return backend
+    from openpraxis.llm_backends.resilient_backend import ResilientBackend
+    from openpraxis.resilience import RetryPolicy
+
+    policy = RetryPolicy(
+        max_attempts=settings.resilience_max_attempts,
+        output_attempts=settings.resilience_output_attempts,
+        backoff_base_seconds=settings.resilience_backoff_seconds,
+        backoff_max_seconds=settings.resilience_backoff_max_seconds,
+        attempt_timeout_seconds=settings.resilience_timeout_seconds,
+        deadline_seconds=settings.resilience_deadline_seconds,
+    )
+    return ResilientBackend(
+        backend,
+        policy,
+        # The host agent is one endpoint whichever provider is configured locally.
+        breaker_name=mode.value if mode == ExecutionMode.OPENCLAW else None,
+        breaker_failures=settings.resilience_breaker_failures,
+        breaker_reset_seconds=settings.resilience_breaker_reset_seconds,
+    )
+
+
+def _with_response_cache(backend: LLMBackend, mode: ExecutionMode) -> LLMBackend:
+    from openpraxis.config import get_settings
+
+    settings = get_settings()
+    if not settings.cache_enabled:
+        return backend
+    from openpraxis.llm_backends.cached_backend import CachedBackend, ResponseCache
+
+    cache = ResponseCache(
+        settings.cache_path,
+        max_bytes=settings.cache_max_bytes,
+        ttl_seconds=settings.cache_ttl_seconds,
+        storage=settings.storage,
+    )
+    return CachedBackend(
+        backend,
+        cache,
+        namespace=mode.value,
+        max_temperature=settings.cache_max_temperature,
+    )
+
+
+def current_model_id(node: str | None = None) -> str:
+    """Identifier of the model that ``get_backend(node)`` calls go to, for provenance."""
+    if get_execution_mode() == ExecutionMode.OPENCLAW:
+        return ExecutionMode.OPENCLAW.value
+    from openpraxis.config import get_provider_default_model, get_settings
+
+    settings = get_settings()
+    provider, model = settings.llm_provider, settings.model_name
+    route = _node_route(node)
+    if route is not None and route.provider:
+        provider, model = route.provider, get_provider_default_model(route.provider)
+    if route is not None and route.model:
+        model = route.model
+    return f"{provider}/{model}"
+
+
+def unwrap_backend(backend: LLMBackend) -> LLMBackend:
+    """Return the innermost backend beneath any wrapper layers."""
+    while hasattr(backend, "inner"):
+        backend = backend.inner
+    return backend
+
+
 def set_backend(backend: LLMBackend | None) -> None:
-    global _backend
+    """Install ``backend`` for every call (None restores the auto-selected one)."""
+    global _backend, _installed
     _backend = backend
+    _installed = backend is not None
 
 
 def reset() -> None:
     """Reset runtime state. Useful for testing."""
-    global _backend, _execution_mode, _mode_initialized
+    global _backend, _execution_mode, _mode_initialized, _installed
     _backend = None
+    _installed = False
     _execution_mode = ExecutionMode.STANDALONE_CLI
     _mode_initialized = False
@@ -0,0 +1,104 @@
+"""Spaced-repetition scheduling for practice scenes.
+
+Every evaluated answer turns the four ``PerformanceSignal`` scores into a
+0-5 recall grade and moves the scene's review state forward:
+
+* The first successful reviews follow the fixed ``REVIEW_STEPS_DAYS`` windows
+  (day 1, 3, 7, 14).
+* After that, ``stability`` (the interval in days) grows by a factor that
+  shrinks as ``difficulty`` rises, as in SM-2 / FSRS.
+* A failing grade is a lapse.  The scene goes back to a one-day interval and
+  becomes harder.
+
+The scheduling work happens when an answer is saved.  ``praxis review`` then
+only reads ``review_schedule`` through its ``next_due`` index.
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from openpraxis.db import get_review_state, save_review_state
+from openpraxis.models import PracticePerformance, ReviewState
+
+REVIEW_STEPS_DAYS = (1, 3, 7, 14)
+# Grades below this are lapses.
+PASSING_GRADE = 3
+MIN_DIFFICULTY = 1.0
+MAX_DIFFICULTY = 10.0
+MAX_INTERVAL_DAYS = 365.0
+
+# Same text format as SQLite's ``datetime('now')`` so due dates compare as strings.
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def format_timestamp(moment: datetime) -> str:
+    return moment.strftime(TIMESTAMP_FORMAT)
+
+
+def review_grade(performance: PracticePerformance) -> int:
+    """Map the four 0-10 evaluator scores to a 0-5 recall grade (halves round up)."""
+    signal = performance.performance_signal
+    mean = (
+        signal.clarity + signal.reasoning_depth + signal.decision_quality + signal.communication
+    ) / 4
+    # Not round(): banker's rounding would grade a mean of 5 as 2 and 7 as 4.
+    return max(0, min(5, math.floor(mean / 2 + 0.5)))
+
+
+def _growth(difficulty: float, grade: int) -> float:
+    """Interval multiplier after the fixed steps: easy scenes and high grades grow faster."""
+    ease = (MAX_DIFFICULTY + 1 - difficulty) / 4
+    return 1 + ease * (0.6 + 0.2 * (grade - PASSING_GRADE))
+
+
+def next_review(
+    state: ReviewState, grade: int, now: datetime | None = None
+) -> ReviewState:
+    """Return ``state`` advanced by one review graded ``grade`` at ``now``."""
+    now = now or utc_now()
+    difficulty = min(
+        MAX_DIFFICULTY, max(MIN_DIFFICULTY, state.difficulty - 0.8 * (grade - PASSING_GRADE))
+    )
+    reps, lapses = state.reps, state.lapses
+    if grade < PASSING_GRADE:
+        lapses += 1
+        reps = 0
+        stability = float(REVIEW_STEPS_DAYS[0])
+    else:
+        reps += 1
+        if reps <= len(REVIEW_STEPS_DAYS):
+            stability = float(REVIEW_STEPS_DAYS[reps - 1])
+        else:
+            stability = min(MAX_INTERVAL_DAYS, state.stability * _growth(difficulty, grade))
+    return state.model_copy(
+        update={
+            "reps": reps,
+            "lapses": lapses,
+            "stability": stability,
+            "difficulty": difficulty,
+            "last_grade": grade,
+            "next_due": format_timestamp(now + timedelta(days=stability)),
+            "last_reviewed_at": format_timestamp(now),
+        }
+    )
+
+
+def record_review(
+    conn: sqlite3.Connection,
+    scene_id: str,
+    input_id: str,
+    performance: PracticePerformance,
+    now: datetime | None = None,
+) -> ReviewState:
+    """Grade an evaluated answer and store the scene's next due date."""
+    state = get_review_state(conn, scene_id) or ReviewState(scene_id=scene_id, input_id=input_id)
+    state = next_review(state, review_grade(performance), now)
+    save_review_state(conn, state)
+    return state
@@ -0,0 +1,326 @@
+"""Semantic search over inputs, scenes and insight cards.
+
+Vectors live in ``data_dir/search`` as one append-only ``float32`` matrix
+(``vectors.f32``) that is memory-mapped for queries.  The app DB holds the
+bookkeeping: triggers queue every new Tagger output, scene and insight card in
+``search_pending``, and ``search_docs`` maps matrix rows back to their source
+rows.  ``sync_index`` embeds the queue in batches before a query.
+
+Queries are a brute-force dot product over the matrix.  Once the index holds
+``ivf_min_rows`` vectors an IVF partition (spherical k-means centroids plus a
+per-row list assignment) is built, and queries scan only the ``nprobe``
+closest lists.
+
+``search_text`` is the keyword alternative: BM25 ranking over the FTS5 tables
+that triggers keep in step with ``inputs`` and ``insights`` (no NumPy needed).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sqlite3
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+from openpraxis.db import (
+    get_input_by_id,
+    get_insight_card,
+    get_scene,
+    get_search_docs,
+    get_search_pending,
+    get_tagger_output,
+    record_search_docs,
+    reset_search_docs,
+    search_fts,
+    transaction,
+)
+from openpraxis.embeddings import Embedder, require_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SEARCH_KINDS = ("input", "scene", "insight")
+# Kinds covered by the FTS5 keyword index (``search_text``).
+TEXT_SEARCH_KINDS = ("input", "insight")
+# IVF training: centroids are fitted on a sample, then every row is assigned.
+IVF_TRAIN_SAMPLE = 50_000
+IVF_TRAIN_ITERS = 10
+_ASSIGN_BLOCK_ROWS = 65_536
+
+
+class SearchHit(BaseModel):
+    kind: str
+    ref_id: str
+    score: float
+    title: str
+    snippet: str
+
+
+class VectorIndex:
+    """Append-only, memory-mapped matrix of unit vectors with optional IVF lists."""
+
+    def __init__(self, directory: Path | str) -> None:
+        self.directory = Path(directory)
+        self._meta_path = self.directory / "meta.json"
+        self._vectors_path = self.directory / "vectors.f32"
+        self._centroids_path = self.directory / "ivf_centroids.npy"
+        self._assign_path = self.directory / "ivf_assign.i32"
+        self.meta: dict = {}
+        if self._meta_path.exists():
+            self.meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+
+    @property
+    def embedder_name(self) -> str | None:
+        return self.meta.get("embedder")
+
+    @property
+    def dim(self) -> int:
+        return int(self.meta.get("dim", 0))
+
+    @property
+    def rows(self) -> int:
+        if not self.dim or not self._vectors_path.exists():
+            return 0
+        return self._vectors_path.stat().st_size // (self.dim * 4)
+
+    @property
+    def has_ivf(self) -> bool:
+        return self._centroids_path.exists()
+
+    def reset(self, embedder_name: str, dim: int) -> None:
+        """Drop all vectors and start a fresh index for ``embedder_name``."""
+        if self.directory.exists():
+            shutil.rmtree(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.meta = {"embedder": embedder_name, "dim": dim}
+        self._meta_path.write_text(json.dumps(self.meta), encoding="utf-8")
+
+    def vectors(self) -> np.ndarray:
+        np = require_numpy()
+        if self.rows == 0:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(self.rows, self.dim))
+
+    def append(self, vectors: np.ndarray) -> int:
+        """Append rows (flushed to disk); return the row number of the first one."""
+        np = require_numpy()
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        first = self.rows
+        with open(self._vectors_path, "ab") as fh:
+            fh.write(vectors.tobytes())
+            fh.flush()
+            os.fsync(fh.fileno())
+        if self.has_ivf:
+            with open(self._assign_path, "ab") as fh:
+                fh.write(self._assign(vectors).tobytes())
+        return first
+
+    def _centroids(self) -> np.ndarray:
+        np = require_numpy()
+        return np.load(self._centroids_path)
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        np = require_numpy()
+        return np.argmax(vectors @ self._centroids().T, axis=1).astype(np.int32)
+
+    def build_ivf(self, nlist: int | None = None, seed: int = 0) -> None:
+        """Fit spherical k-means centroids and assign every row to its list."""
+        np = require_numpy()
+        matrix = self.vectors()
+        n = matrix.shape[0]
+        if n == 0:
+            return
+        nlist = nlist or max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(seed)
+        sample_idx = np.sort(rng.choice(n, size=min(n, IVF_TRAIN_SAMPLE), replace=False))
+        sample = np.asarray(matrix[sample_idx])
+        nlist = min(nlist, sample.shape[0])
+        centroids = sample[rng.choice(sample.shape[0], size=nlist, replace=False)].copy()
+        for _ in range(IVF_TRAIN_ITERS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[labels == c]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[c] = centroid / (np.linalg.norm(centroid) or 1.0)
+        np.save(self._centroids_path, centroids.astype(np.float32))
+        with open(self._assign_path, "wb") as fh:
+            for start in range(0, n, _ASSIGN_BLOCK_ROWS):
+                fh.write(self._assign(np.asarray(matrix[start : start + _ASSIGN_BLOCK_ROWS])).tobytes())
+
+    def search(self, query: np.ndarray, k: int, nprobe: int = 8) -> list[tuple[int, float]]:
+        """Top-``k`` ``(row, score)`` pairs by dot product, best first."""
+        np = require_numpy()
+        matrix = self.vectors()
+        n = matrix.shape[0]
+        if n == 0 or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        if self.has_ivf:
+            centroids = self._centroids()
+            probed = np.zeros(len(centroids), dtype=bool)
+            probed[np.argsort(-(centroids @ query))[:nprobe]] = True
+            # An interrupted append can leave the assignment file short; ignore the tail.
+            assigned = min(n, self._assign_path.stat().st_size // 4)
+            assign = np.memmap(self._assign_path, dtype=np.int32, mode="r", shape=(assigned,))
+            candidates = np.flatnonzero(probed[assign])
+            scores = matrix[candidates] @ query
+        else:
+            candidates = None
+            scores = matrix @ query
+        k = min(k, scores.shape[0])
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        rows = candidates[top] if candidates is not None else top
+        return [(int(r), float(scores[i])) for r, i in zip(rows, top)]
+
+
+def _document(conn: sqlite3.Connection, kind: str, ref_id: str) -> tuple[str, str] | None:
+    """``(title, text to embed)`` for a searchable row, or None if it is gone."""
+    if kind == "input":
+        tagger_output = get_tagger_output(conn, ref_id)
+        row = get_input_by_id(conn, ref_id)
+        if tagger_output is None or row is None:
+            return None
+        title = Path(row["file_path"]).name if row["file_path"] else tagger_output.summary[:60]
+        text = (
+            f"{tagger_output.summary}\nTopics: {', '.join(tagger_output.tags.topics)}\n"
+            f"Domains: {', '.join(tagger_output.tags.domains)}"
+        )
+        return title, text
+    if kind == "scene":
+        scene = get_scene(conn, ref_id)
+        if scene is None:
+            return None
+        text = f"{scene.role}: {scene.task}\nConstraints: {'; '.join(scene.constraints)}"
+        return scene.role, text
+    card = get_insight_card(conn, ref_id)
+    if card is None:
+        return None
+    text = "\n".join(
+        [
+            card.get("insight_title", ""),
+            card.get("what_happened", ""),
+            card.get("why_it_matters", ""),
+            card.get("upgrade_pattern", ""),
+            "Concepts: " + ", ".join(card.get("concepts", [])),
+            "Skills: " + ", ".join(card.get("skills", [])),
+        ]
+    )
+    return card.get("insight_title", "Untitled"), text
+
+
+def open_index(directory: Path | str, embedder: Embedder, conn: sqlite3.Connection) -> VectorIndex:
+    """Open the index, resetting it (and re-queuing every row) if the embedder changed."""
+    index = VectorIndex(directory)
+    if index.embedder_name != embedder.name:
+        dim = embedder.embed(["dimension probe"]).shape[1]
+        index.reset(embedder.name, dim)
+        reset_search_docs(conn)
+    return index
+
+
+def rebuild_index(directory: Path | str, embedder: Embedder, conn: sqlite3.Connection) -> VectorIndex:
+    """Discard all vectors and queue every searchable row for embedding."""
+    index = VectorIndex(directory)
+    index.reset(embedder.name, embedder.embed(["dimension probe"]).shape[1])
+    reset_search_docs(conn)
+    return index
+
+
+def sync_index(
+    conn: sqlite3.Connection,
+    index: VectorIndex,
+    embedder: Embedder,
+    batch_size: int = 64,
+    ivf_min_rows: int = 0,
+    on_batch: Callable[[int], None] | None = None,
+) -> int:
+    """Embed queued rows in batches; return how many were indexed.
+
+    Embedding runs outside the write lock; vectors are appended and the batch
+    recorded inside one transaction so concurrent syncs cannot interleave rows.
+    """
+    indexed = 0
+    while True:
+        pending = get_search_pending(conn, batch_size)
+        if not pending:
+            break
+        items: list[tuple[str, str]] = []
+        texts: list[str] = []
+        for kind, ref_id in pending:
+            doc = _document(conn, kind, ref_id)
+            if doc is not None:
+                items.append((kind, ref_id))
+                texts.append(doc[1])
+        vectors = embedder.embed(texts) if texts else None
+        with transaction(conn):
+            docs: list[tuple[int, str, str]] = []
+            if vectors is not None:
+                first = index.append(vectors)
+                docs = [(first + i, kind, ref_id) for i, (kind, ref_id) in enumerate(items)]
+            record_search_docs(conn, docs, pending)
+        indexed += len(docs)
+        if on_batch is not None:
+            on_batch(len(pending))
+    if ivf_min_rows and not index.has_ivf and index.rows >= ivf_min_rows:
+        index.build_ivf()
+    return indexed
+
+
+def search(
+    conn: sqlite3.Connection,
+    index: VectorIndex,
+    embedder: Embedder,
+    query: str,
+    limit: int = 10,
+    kinds: tuple[str, ...] = SEARCH_KINDS,
+    nprobe: int = 8,
+) -> list[SearchHit]:
+    """Rank indexed rows by cosine similarity to ``query``."""
+    query_vec = embedder.embed([query])[0]
+    # Over-fetch: superseded rows and filtered kinds are dropped below.
+    candidates = index.search(query_vec, limit * 4 + 10, nprobe=nprobe)
+    docs = get_search_docs(conn, [row for row, _ in candidates])
+    hits: list[SearchHit] = []
+    for row, score in candidates:
+        if row not in docs:
+            continue
+        kind, ref_id = docs[row]
+        if kind not in kinds:
+            continue
+        doc = _document(conn, kind, ref_id)
+        if doc is None:
+            continue
+        title, text = doc
+        snippet = " ".join(text.split())[:160]
+        hits.append(SearchHit(kind=kind, ref_id=ref_id, score=score, title=title, snippet=snippet))
+        if len(hits) >= limit:
+            break
+    return hits
+
+
+def search_text(
+    conn: sqlite3.Connection,
+    query: str,
+    limit: int = 10,
+    kinds: tuple[str, ...] = TEXT_SEARCH_KINDS,
+) -> list[SearchHit]:
+    """Keyword search (FTS5, BM25-ranked); snippets carry ``db.FTS_MARK_*`` highlights."""
+    return [
+        SearchHit(
+            kind=hit["kind"],
+            ref_id=hit["ref_id"],
+            score=hit["score"],
+            title=hit["title"] or "",
+            snippet=" ".join((hit["snippet"] or "").split()),
+        )
+        for hit in search_fts(conn, query, kinds=kinds, limit=limit)
+    ]
@@ -0,0 +1,224 @@
+"""``praxis serve``: a long-running daemon that runs CLI commands in-process.
+
+A warm process keeps everything that a fresh ``praxis`` invocation pays for
+on every call: imports, settings, the compiled graph and its checkpoint
+connection (``graph.get_compiled_graph``), and the LLM HTTP client.
+
+The API is JSON over HTTP, on a Unix socket (default) or on a loopback TCP port:
+
+* ``GET /v1/health``: ``{"ok": true, "pid": ...}``
+* ``POST /v1/run`` with ``{"args": [...], "stdin": str | null, "cwd": str,
+  "columns": int, "env": {...}}`` returns ``{"exit_code": int, "output": str}``.
+  ``args`` is a ``praxis`` command line whose first item is one of
+  ``client.SERVED_COMMANDS``.  ``env`` is the caller's ``client.caller_env()``;
+  when it differs from the daemon's (another ``OPENPRAXIS_MODE`` or provider
+  key) the reply is ``{"status": "run_locally", "reason": str}`` and the
+  command is not run.
+
+Commands run one at a time.  Each one redirects stdout/stderr/stdin and
+changes into the caller's working directory, and all of that is process-wide
+state.  Health checks are answered while a command is running.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from openpraxis.client import API_PREFIX, SERVED_COMMANDS, caller_env
+
+_run_lock = threading.Lock()
+_cli_command = None
+# Request bodies are small JSON documents; anything larger is rejected.
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+
+@contextmanager
+def _command_context(stdin: str | None, cwd: str | None, columns: int | None):
+    """Point stdio, the working directory and the Rich consoles' width at one request."""
+    from openpraxis import cli, display
+
+    consoles = (cli.console, display._console)
+    saved_stdin, saved_cwd = sys.stdin, os.getcwd()
+    saved_widths = [c._width for c in consoles]
+    sys.stdin = io.StringIO(stdin or "")
+    try:
+        if cwd:
+            os.chdir(cwd)
+        for console in consoles:
+            console.width = columns or 100
+        yield
+    finally:
+        sys.stdin = saved_stdin
+        os.chdir(saved_cwd)
+        for console, width in zip(consoles, saved_widths):
+            console._width = width
+
+
+def _command():
+    """The click command behind ``cli.app``, built once (Typer rebuilds it per ``app()`` call)."""
+    global _cli_command
+    if _cli_command is None:
+        import typer
+
+        from openpraxis.cli import app
+
+        _cli_command = typer.main.get_command(app)
+    return _cli_command
+
+
+def run_command(
+    args: list[str],
+    stdin: str | None = None,
+    cwd: str | None = None,
+    columns: int | None = None,
+) -> tuple[int, str]:
+    """Run ``praxis <args>`` in this process; return ``(exit_code, output)``."""
+    if not args or args[0] not in SERVED_COMMANDS:
+        raise ValueError(f"command not served: {' '.join(args[:1]) or '(none)'}")
+
+    command = _command()
+    output = io.StringIO()
+    with _run_lock, _command_context(stdin, cwd, columns):
+        with redirect_stdout(output), redirect_stderr(output):
+            try:
+                command.main(args=args, prog_name="praxis")
+                exit_code = 0
+            except SystemExit as exc:
+                if exc.code is None or isinstance(exc.code, int):
+                    exit_code = exc.code or 0
+                else:
+                    print(exc.code)
+                    exit_code = 1
+            except Exception:
+                traceback.print_exc()
+                exit_code = 1
+    return exit_code, output.getvalue()
+
+
+def _env_differences(env: dict | None) -> list[str]:
+    """Variables of the caller's ``env`` that this daemon does not share (none if not sent)."""
+    if env is None:
+        return []
+    own = caller_env()
+    return sorted(name for name in own.keys() | env.keys() if own.get(name) != env.get(name))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "praxis-serve"
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == API_PREFIX + "/health":
+            self._reply(200, {"ok": True, "pid": os.getpid()})
+        else:
+            self._reply(404, {"error": f"unknown endpoint {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != API_PREFIX + "/run":
+            self._reply(404, {"error": f"unknown endpoint {self.path}"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._reply(413, {"error": "request body too large"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            args = [str(a) for a in payload.get("args", [])]
+            differ = _env_differences(payload.get("env"))
+            if differ:
+                reason = f"caller environment differs: {', '.join(differ)}"
+                self._reply(200, {"status": "run_locally", "reason": reason})
+                return
+            exit_code, output = run_command(
+                args, payload.get("stdin"), payload.get("cwd"), payload.get("columns")
+            )
+        except (ValueError, AttributeError) as exc:
+            self._reply(400, {"error": str(exc)})
+            return
+        self._reply(200, {"exit_code": exit_code, "output": output})
+
+    def address_string(self) -> str:
+        # Unix-socket peers have no (host, port) address.
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("unix", 0)
+
+
+def _claim_socket(path: Path) -> None:
+    """Remove a stale socket file; refuse if another daemon is still listening."""
+    if not path.exists():
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except (ConnectionRefusedError, FileNotFoundError):
+        path.unlink(missing_ok=True)
+    else:
+        raise RuntimeError(f"a praxis daemon is already listening on {path}")
+    finally:
+        probe.close()
+
+
+def make_server(socket_path: Path | None = None, port: int | None = None):
+    """Bind the daemon to ``socket_path`` (mode 0600) or to ``127.0.0.1:port``."""
+    if port is not None:
+        return ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    _claim_socket(socket_path)
+    old_umask = os.umask(0o177)
+    try:
+        return UnixHTTPServer(str(socket_path), _Handler)
+    finally:
+        os.umask(old_umask)
+
+
+def warm_up() -> None:
+    """Load what the first request would otherwise pay for."""
+    from openpraxis.cli import get_compiled_graph
+    from openpraxis.config import get_settings
+
+    _command()
+    settings = get_settings()
+    get_compiled_graph(str(settings.db_path), settings.storage)
+
+
+def serve(server) -> None:
+    """Serve until interrupted, then release the socket and graph connections."""
+    from openpraxis.graph import close_compiled_graphs
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if isinstance(server, UnixHTTPServer):
+            Path(server.server_address).unlink(missing_ok=True)
+        close_compiled_graphs()
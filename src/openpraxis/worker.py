@@ -0,0 +1,318 @@
+"""Background LLM work: the ``jobs`` queue and ``praxis worker``.
+
+Commands such as ``praxis add --async`` only write the input row and enqueue a
+job; one or more ``praxis worker`` processes on the same data dir drain the
+queue.  Job kinds:
+
+* ``tag`` (``input_id``): run the Tagger and store its output and chunks, then
+  enqueue ``generate`` when the payload asks for it.
+* ``generate`` (``input_id``): add one practice scene, with the coach's
+  opening, to the scene pool, so ``praxis practice`` starts instantly.
+* ``evaluate`` (``scene_id``, ``answer``, optional ``thread_id``): score a
+  one-shot answer, schedule the scene's review, then enqueue ``insight``.
+* ``insight`` (``response_id``): (re)write the insight cards for a response.
+
+Each worker leases jobs (``db.lease_jobs``) for a visibility timeout, runs
+their LLM calls on a thread pool, and is the only thread that writes to its
+connection, as in ``ingest.run_bulk_ingest``.  A job's results, its follow-up
+jobs and its deletion from the queue commit together, and only while the
+worker still holds the lease.  Failures are retried with exponential backoff
+and dead-lettered after ``max_attempts``; a worker that dies leaves its jobs to
+be leased again once their visibility timeout passes.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import sqlite3
+import threading
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+from uuid import uuid4
+
+from pydantic import BaseModel, Field
+
+from openpraxis.config import get_settings
+from openpraxis.db import (
+    complete_job,
+    create_response,
+    enqueue_job,
+    extend_job_leases,
+    fail_job,
+    get_input_by_id,
+    get_scene,
+    get_scene_input_id,
+    lease_jobs,
+    release_jobs,
+    save_chunks,
+    save_pooled_scene,
+    save_tagger_output,
+    transaction,
+    update_response_performance,
+    upsert_graph_thread,
+)
+from openpraxis.pool import generate_pooled_scene, pool_versions, practice_state
+from openpraxis.prompts import get_prompt_version
+from openpraxis.reprocess import insight_state, replace_insights
+from openpraxis.scheduler import format_timestamp, record_review, utc_now
+
+JOB_KINDS = ("tag", "generate", "evaluate", "insight")
+
+
+class JobLeaseLost(RuntimeError):
+    """The job's lease expired and another worker took it; its results were discarded."""
+
+
+class JobResult(BaseModel):
+    """Outcome for one leased job."""
+
+    job_id: int
+    kind: str
+    ok: bool
+    # "done" | "retry" (re-queued with backoff) | "dead" | "lost" (lease taken over)
+    status: str
+    error: str | None = None
+
+
+class WorkerSummary(BaseModel):
+    """Counts for a worker run."""
+
+    done: int = 0
+    retried: int = 0
+    dead: int = 0
+    lost: int = 0
+    failures: list[JobResult] = Field(default_factory=list)
+
+    def record(self, result: JobResult) -> None:
+        if result.status == "done":
+            self.done += 1
+            return
+        if result.status == "retry":
+            self.retried += 1
+        elif result.status == "dead":
+            self.dead += 1
+        else:
+            self.lost += 1
+        self.failures.append(result)
+
+
+@dataclass(frozen=True)
+class _Handler:
+    """A job kind in three steps: ``load`` reads the DB, ``run`` calls the LLM
+    on a pool thread (no DB access) and ``save`` writes the results."""
+
+    load: Callable[[sqlite3.Connection, dict], dict]
+    run: Callable[[dict], Any]
+    save: Callable[[sqlite3.Connection, dict, dict, Any], None]
+
+
+def _follow_up(conn: sqlite3.Connection, kind: str, payload: dict) -> None:
+    """Queue the next job of a chain, with the configured attempt budget."""
+    enqueue_job(conn, kind, payload, max_attempts=get_settings().worker_max_attempts)
+
+
+def _load_tag(conn: sqlite3.Connection, payload: dict) -> dict:
+    row = get_input_by_id(conn, payload["input_id"])
+    if row is None:
+        raise LookupError(f"input {payload['input_id']} not found")
+    return {"input_id": row["id"], "raw_text": row["raw_text"], "type_hint": row["type_hint"]}
+
+
+def _run_tag(state: dict) -> dict:
+    from openpraxis.nodes.tagger import tagger_node
+
+    return tagger_node(state)
+
+
+def _save_tag(conn: sqlite3.Connection, payload: dict, state: dict, out: dict) -> None:
+    from openpraxis.nodes.tagger import tagger_version
+
+    input_id = payload["input_id"]
+    save_tagger_output(conn, input_id, out["tagger_output"], *tagger_version())
+    save_chunks(conn, input_id, out.get("chunks", []))
+    if payload.get("generate"):
+        _follow_up(conn, "generate", {"input_id": input_id})
+
+
+def _load_generate(conn: sqlite3.Connection, payload: dict) -> dict:
+    return practice_state(conn, payload["input_id"])
+
+
+def _save_generate(conn: sqlite3.Connection, payload: dict, state: dict, out: tuple) -> None:
+    scene, opening = out
+    save_pooled_scene(conn, payload["input_id"], scene, opening, *pool_versions())
+
+
+def _load_evaluate(conn: sqlite3.Connection, payload: dict) -> dict:
+    scene = get_scene(conn, payload["scene_id"])
+    if scene is None:
+        raise LookupError(f"scene {payload['scene_id']} not found")
+    state = practice_state(conn, get_scene_input_id(conn, scene.scene_id))
+    return {**state, "scene": scene, "user_answer": payload["answer"]}
+
+
+def _run_evaluate(state: dict) -> dict:
+    from openpraxis.nodes.practice import practice_evaluator_node
+
+    return practice_evaluator_node(state)
+
+
+def _save_evaluate(conn: sqlite3.Connection, payload: dict, state: dict, out: dict) -> None:
+    scene_id, input_id = payload["scene_id"], state["input_id"]
+    performance = out["performance"]
+    resp_id = create_response(conn, scene_id, payload["answer"])
+    update_response_performance(
+        conn, resp_id, performance, get_prompt_version("practice_evaluator")
+    )
+    record_review(conn, scene_id, input_id, performance)
+    if payload.get("thread_id"):
+        upsert_graph_thread(
+            conn, payload["thread_id"], input_id, scene_id=scene_id, status="completed"
+        )
+    _follow_up(conn, "insight", {"response_id": resp_id})
+
+
+def _load_insight(conn: sqlite3.Connection, payload: dict) -> dict:
+    return insight_state(conn, payload["response_id"])
+
+
+def _run_insight(state: dict) -> dict:
+    from openpraxis.nodes.insight import insight_generator_node
+
+    return insight_generator_node(state)
+
+
+def _save_insight(conn: sqlite3.Connection, payload: dict, state: dict, out: dict) -> None:
+    replace_insights(conn, state, payload["response_id"], out["insights"])
+
+
+_HANDLERS: dict[str, _Handler] = {
+    "tag": _Handler(_load_tag, _run_tag, _save_tag),
+    "generate": _Handler(_load_generate, generate_pooled_scene, _save_generate),
+    "evaluate": _Handler(_load_evaluate, _run_evaluate, _save_evaluate),
+    "insight": _Handler(_load_insight, _run_insight, _save_insight),
+}
+
+
+def worker_id() -> str:
+    """Lease owner name: host, pid and a random suffix (pids are reused)."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+def backoff_seconds(attempts: int, base: float, cap: float) -> float:
+    """Delay before retrying a job that has failed ``attempts`` times."""
+    return min(cap, base * 2 ** max(attempts - 1, 0))
+
+
+def run_worker(
+    conn: sqlite3.Connection,
+    concurrency: int = 2,
+    visibility_seconds: int = 300,
+    backoff_base_seconds: float = 30.0,
+    backoff_max_seconds: float = 3600.0,
+    poll_seconds: float = 2.0,
+    once: bool = False,
+    kinds: tuple[str, ...] | None = None,
+    owner: str | None = None,
+    stop: threading.Event | None = None,
+    on_result: Callable[[JobResult], None] | None = None,
+) -> WorkerSummary:
+    """Lease and run jobs until ``stop`` is set (or, with ``once``, the queue is idle).
+
+    At most ``concurrency`` jobs are leased at a time, so a worker never holds
+    more work than it can run.  Leases of running jobs are extended every half
+    visibility timeout.  On exit (including Ctrl-C) leases that were not
+    finished are released for other workers.
+    """
+    owner = owner or worker_id()
+    stop = stop or threading.Event()
+    summary = WorkerSummary()
+    running: dict[Future, tuple[dict, dict]] = {}
+    visibility = timedelta(seconds=visibility_seconds)
+    next_extend = utc_now() + visibility / 2
+
+    def _emit(job: dict, status: str, error: str | None = None) -> None:
+        result = JobResult(
+            job_id=job["id"], kind=job["kind"], ok=status == "done", status=status, error=error
+        )
+        summary.record(result)
+        if on_result is not None:
+            on_result(result)
+
+    def _fail(job: dict, exc: Exception) -> None:
+        error = f"{type(exc).__name__}: {exc}"
+        retry_at = None
+        # A missing row or an unknown kind will not fix itself; dead-letter at once.
+        retryable = not isinstance(exc, (LookupError, KeyError))
+        if retryable and job["attempts"] < job["max_attempts"]:
+            delay = backoff_seconds(job["attempts"], backoff_base_seconds, backoff_max_seconds)
+            retry_at = format_timestamp(utc_now() + timedelta(seconds=delay))
+        if not fail_job(conn, job["id"], owner, error, retry_at):
+            status = "lost"
+        else:
+            status = "retry" if retry_at else "dead"
+        _emit(job, status, error)
+
+    def _finish(job: dict, state: dict, out: Any) -> None:
+        with transaction(conn):
+            _HANDLERS[job["kind"]].save(conn, job["payload"], state, out)
+            if not complete_job(conn, job["id"], owner):
+                raise JobLeaseLost(f"job {job['id']} was leased by another worker")
+
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="praxis-worker")
+    try:
+        while True:
+            free = concurrency - len(running)
+            if free > 0 and not stop.is_set():
+                now = utc_now()
+                leased = lease_jobs(
+                    conn,
+                    owner,
+                    format_timestamp(now),
+                    format_timestamp(now + visibility),
+                    limit=free,
+                    kinds=kinds,
+                )
+                for job in leased:
+                    try:
+                        handler = _HANDLERS[job["kind"]]
+                        state = handler.load(conn, job["payload"])
+                    except Exception as exc:
+                        _fail(job, exc)
+                        continue
+                    running[pool.submit(handler.run, state)] = (job, state)
+            if not running:
+                if stop.is_set() or once:
+                    break
+                stop.wait(poll_seconds)
+                continue
+
+            finished, _ = wait(running, timeout=poll_seconds, return_when=FIRST_COMPLETED)
+            for future in finished:
+                job, state = running.pop(future)
+                try:
+                    _finish(job, state, future.result())
+                except JobLeaseLost as exc:
+                    _emit(job, "lost", str(exc))
+                except Exception as exc:
+                    _fail(job, exc)
+                else:
+                    _emit(job, "done")
+
+            if running and utc_now() >= next_extend:
+                now = utc_now()
+                extend_job_leases(
+                    conn,
+                    owner,
+                    [job["id"] for job, _ in running.values()],
+                    format_timestamp(now + visibility),
+                )
+                next_extend = now + visibility / 2
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        release_jobs(conn, owner)
+    return summary
@@ -0,0 +1,323 @@
+"""Provider Batch API workflow tests, against a local stand-in for the batch endpoints."""
+
+import json
+import re
+import sqlite3
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+import openpraxis.config as config_module
+from openpraxis import runtime
+from openpraxis.batch import collect_batch, collect_batches, refresh_batches, submit_batch
+from openpraxis.config import Settings
+from openpraxis.db import (
+    count_pooled_scenes,
+    create_input,
+    enqueue_job,
+    ensure_schema,
+    get_batch_job,
+    get_connection,
+    get_job_counts,
+    get_pool_requests,
+    get_tagger_output,
+    get_tagger_versions,
+    lease_jobs,
+    pop_pooled_scene,
+    request_pool_refill,
+    save_tagger_output,
+)
+from openpraxis.models import PracticeSceneLLM, SceneType
+from openpraxis.pool import pool_versions
+from openpraxis.prompts import get_prompt_version
+from openpraxis.runtime import ExecutionMode
+
+
+class _BatchStandIn(ThreadingHTTPServer):
+    """Files + Batches endpoints, enough for the OpenAI SDK.
+
+    Batches stay ``in_progress`` until ``finish`` runs them through
+    ``reply(custom_id, body)``, which returns the message content, or a
+    ``(status_code, message)`` tuple for a failed request.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.files: dict[str, bytes] = {}
+        self.batches: dict[str, dict] = {}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def add_file(self, content: bytes, purpose: str) -> dict:
+        file_id = f"file-{len(self.files) + 1}"
+        self.files[file_id] = content
+        return {
+            "id": file_id, "object": "file", "bytes": len(content), "created_at": 0,
+            "filename": f"{file_id}.jsonl", "purpose": purpose, "status": "processed",
+        }
+
+    def requests_of(self, batch_id: str) -> list[dict]:
+        content = self.files[self.batches[batch_id]["input_file_id"]]
+        return [json.loads(line) for line in content.decode().splitlines()]
+
+    def finish(self, batch_id: str, reply) -> None:
+        output, errors = [], []
+        for request in self.requests_of(batch_id):
+            result = reply(request["custom_id"], request["body"])
+            if isinstance(result, tuple):
+                status, message = result
+                errors.append(_result_line(request, status, {"error": {"message": message}}))
+            else:
+                body = {
+                    "id": "chatcmpl-1", "object": "chat.completion",
+                    "model": request["body"]["model"],
+                    "choices": [
+                        {
+                            "index": 0, "finish_reason": "stop",
+                            "message": {"role": "assistant", "content": result},
+                        }
+                    ],
+                }
+                output.append(_result_line(request, 200, body))
+        batch = self.batches[batch_id]
+        batch["status"] = "completed"
+        batch["request_counts"] = {
+            "total": len(output) + len(errors), "completed": len(output), "failed": len(errors)
+        }
+        if output:
+            batch["output_file_id"] = self.add_file(_jsonl(output), "batch_output")["id"]
+        if errors:
+            batch["error_file_id"] = self.add_file(_jsonl(errors), "batch_output")["id"]
+
+
+def _result_line(request: dict, status: int, body: dict) -> dict:
+    return {
+        "id": f"batch_req_{request['custom_id']}",
+        "custom_id": request["custom_id"],
+        "response": {"status_code": status, "request_id": "req-1", "body": body},
+        "error": None,
+    }
+
+
+def _jsonl(lines: list[dict]) -> bytes:
+    return "".join(json.dumps(line) + "\n" for line in lines).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _BatchStandIn
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, payload: dict | bytes, status: int = 200) -> None:
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        raw = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path == "/v1/files":
+            message = BytesParser(policy=HTTP).parsebytes(
+                f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + raw
+            )
+            parts = {
+                part.get_param("name", header="content-disposition"): part
+                for part in message.iter_parts()
+            }
+            purpose = parts["purpose"].get_content().strip()
+            self._send(self.server.add_file(parts["file"].get_payload(decode=True), purpose))
+        elif self.path == "/v1/batches":
+            request = json.loads(raw)
+            batch_id = f"batch_{len(self.server.batches) + 1}"
+            batch = self.server.batches[batch_id] = {
+                "id": batch_id, "object": "batch", "created_at": 0, "status": "in_progress",
+                "endpoint": request["endpoint"], "input_file_id": request["input_file_id"],
+                "completion_window": request["completion_window"],
+                "request_counts": {"total": 0, "completed": 0, "failed": 0},
+            }
+            self._send(batch)
+        else:
+            self._send({"error": {"message": "not found"}}, 404)
+
+    def do_GET(self) -> None:
+        if match := re.fullmatch(r"/v1/batches/([\w-]+)", self.path):
+            self._send(self.server.batches[match[1]])
+        elif match := re.fullmatch(r"/v1/files/([\w-]+)/content", self.path):
+            self._send(self.server.files[match[1]])
+        else:
+            self._send({"error": {"message": "not found"}}, 404)
+
+
+@pytest.fixture
+def provider(monkeypatch: pytest.MonkeyPatch):
+    server = _BatchStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        config_module,
+        "_settings",
+        Settings(llm_provider="openai", llm_api_key="test", llm_base_url=server.base_url),
+    )
+    runtime.set_execution_mode(ExecutionMode.STANDALONE_CLI)
+    yield server
+    runtime.reset()
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def conn() -> sqlite3.Connection:
+    conn = get_connection(Path(":memory:"))
+    ensure_schema(conn)
+    return conn
+
+
+def _scene_json(task: str) -> str:
+    return PracticeSceneLLM(
+        scene_type=SceneType.EXPLAIN,
+        role="Tech Lead",
+        task=task,
+        constraints=["3 minutes"],
+        rubric=["clarity"],
+        expected_structure_hint=["Definition"],
+    ).model_dump_json()
+
+
+def test_tag_batch_round_trip(provider, conn, mock_tagger_output) -> None:
+    create_input(conn, "in-1", None, "hash-1", "RAG report")
+    create_input(conn, "in-2", None, "hash-2", "Design review notes")
+    create_input(conn, "in-long", None, "hash-3", "word " * 5_000)
+
+    result = submit_batch(conn, "tag")
+    assert (result.requests, result.skipped[0][0]) == (2, "in-long")
+    request = provider.requests_of(result.batch_id)[0]
+    assert request["url"] == "/v1/chat/completions"
+    assert request["body"]["model"] == "gpt-4o"
+    assert request["body"]["temperature"] == 0.0
+    assert request["body"]["response_format"]["type"] == "json_schema"
+    # Inputs in an unfinished batch are not submitted twice.
+    assert submit_batch(conn, "tag").batch_id is None
+
+    assert refresh_batches(conn)[0]["status"] == "in_progress"
+    with pytest.raises(ValueError, match="still in_progress"):
+        collect_batch(conn, result.batch_id)
+
+    provider.finish(
+        result.batch_id,
+        lambda custom_id, body: (
+            mock_tagger_output.model_dump_json() if custom_id == "tag-in-1" else '{"summary": 1}'
+        ),
+    )
+    [summary] = collect_batches(conn)
+    assert (summary.saved, summary.failed) == (1, 1)
+    assert summary.failures[0].input_id == "in-2"
+    assert get_tagger_output(conn, "in-1") == mock_tagger_output
+    assert get_tagger_versions(conn, ["in-1"])["in-1"] == (
+        "openai/gpt-4o", get_prompt_version("tagger")
+    )
+    assert get_batch_job(conn, result.batch_id)["collected_at"] is not None
+    with pytest.raises(ValueError, match="already collected"):
+        collect_batch(conn, result.batch_id)
+
+    # The failed input is pending again.
+    retry = submit_batch(conn, "tag")
+    assert [r["custom_id"] for r in provider.requests_of(retry.batch_id)] == ["tag-in-2"]
+
+
+def _jobs(conn: sqlite3.Connection) -> list[tuple[str, str, str]]:
+    rows = conn.execute("SELECT kind, status, payload FROM jobs ORDER BY id").fetchall()
+    return [(r["kind"], r["status"], json.loads(r["payload"])["input_id"]) for r in rows]
+
+
+def test_batch_takes_over_queued_worker_jobs(provider, conn, mock_tagger_output) -> None:
+    for n in (1, 2, 3):
+        create_input(conn, f"in-{n}", None, f"hash-{n}", "RAG report")
+        enqueue_job(conn, "tag", {"input_id": f"in-{n}", "generate": True})
+    lease_jobs(conn, "worker-1", "9999-01-01 00:00:00", "9999-01-01 00:05:00", kinds=("tag",))
+
+    result = submit_batch(conn, "tag")
+    assert result.skipped == [("in-1", "a worker is tagging it")]
+    assert _jobs(conn) == [
+        ("tag", "leased", "in-1"), ("tag", "batched", "in-2"), ("tag", "batched", "in-3")
+    ]
+    # Parked jobs are not handed to workers.
+    assert lease_jobs(conn, "worker-2", "9999-01-01 00:00:00", "9999-01-01 00:05:00") == []
+
+    provider.finish(
+        result.batch_id,
+        lambda custom_id, body: (
+            mock_tagger_output.model_dump_json() if custom_id == "tag-in-2" else (500, "oops")
+        ),
+    )
+    collect_batches(conn)
+    assert _jobs(conn) == [
+        ("tag", "leased", "in-1"), ("tag", "queued", "in-3"), ("generate", "queued", "in-2")
+    ]
+    max_attempts = conn.execute("SELECT max_attempts FROM jobs WHERE kind = 'generate'")
+    assert max_attempts.fetchone()[0] == config_module._settings.worker_max_attempts
+    assert "batched" not in get_job_counts(conn)
+
+
+def test_stale_tagger_outputs_are_resubmitted(provider, conn, mock_tagger_output) -> None:
+    create_input(conn, "in-1", None, "hash-1", "RAG report")
+    save_tagger_output(conn, "in-1", mock_tagger_output, "openai/gpt-4o", "old-prompt")
+    assert submit_batch(conn, "tag").batch_id is None
+    assert submit_batch(conn, "tag", stale=True).requests == 1
+
+
+def test_generate_batch_fills_the_pool(provider, conn, mock_tagger_output) -> None:
+    create_input(conn, "in-1", None, "hash-1", "RAG report")
+    save_tagger_output(conn, "in-1", mock_tagger_output)
+    request_pool_refill(conn, ["in-1"])
+
+    result = submit_batch(conn, "generate", pool_size=2)
+    assert result.requests == 2
+    provider.finish(result.batch_id, lambda custom_id, body: _scene_json(custom_id))
+    refresh_batches(conn, result.batch_id)
+    summary = collect_batch(conn, result.batch_id)
+
+    assert summary.saved == 2
+    assert count_pooled_scenes(conn, ["in-1"], pool_versions()) == {"in-1": 2}
+    assert get_pool_requests(conn) == []
+    pooled = pop_pooled_scene(conn, "in-1", pool_versions())
+    assert pooled["opening"] is None
+    assert pooled["scene"].task == "generate-in-1-0"
+
+
+def test_provider_errors_are_reported_per_request(provider, conn) -> None:
+    create_input(conn, "in-1", None, "hash-1", "RAG report")
+    result = submit_batch(conn, "tag")
+    provider.finish(result.batch_id, lambda custom_id, body: (400, "context too long"))
+    [summary] = collect_batches(conn)
+    assert summary.failures[0].error == "HTTP 400: context too long"
+
+
+def test_node_route_applies_to_batch_requests(provider, conn) -> None:
+    config_module._settings.llm_nodes = {
+        "tagger": config_module.NodeLLMSettings(
+            model="gpt-4o-mini", temperature=0.2, max_output_tokens=500
+        )
+    }
+    create_input(conn, "in-1", None, "hash-1", "RAG report")
+    result = submit_batch(conn, "tag")
+    body = provider.requests_of(result.batch_id)[0]["body"]
+    assert (body["model"], body["temperature"], body["max_completion_tokens"]) == (
+        "gpt-4o-mini", 0.2, 500
+    )
+    assert get_batch_job(conn, result.batch_id)["model"] == "gpt-4o-mini"
+
+
+def test_providers_without_a_batch_api_are_rejected(provider, conn) -> None:
+    config_module._settings.llm_provider = "deepseek"
+    with pytest.raises(ValueError, match="no Batch API"):
+        submit_batch(conn, "tag")
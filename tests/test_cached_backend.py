@@ -0,0 +1,146 @@
+"""LLM response cache tests."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from openpraxis.llm_backends.base import LLMBackend
+from openpraxis.llm_backends.cached_backend import CachedBackend, ResponseCache, cache_key
+
+
+class DummyModel(BaseModel):
+    text: str
+
+
+class CountingBackend(LLMBackend):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def call_structured(self, system_prompt, user_content, response_model, **kw):
+        self.calls += 1
+        return response_model(text=f"{user_content}#{self.calls}")
+
+    def call_chat_structured(self, messages, response_model, **kw):
+        self.calls += 1
+        return response_model(text=f"chat#{self.calls}")
+
+    def call_vision_text(self, image, prompt, **kw):
+        self.calls += 1
+        return f"vision#{self.calls}"
+
+
+@pytest.fixture(autouse=True)
+def _settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        "openpraxis.config.get_settings",
+        lambda: SimpleNamespace(llm_provider="openai", model_name="test-model"),
+    )
+
+
+@pytest.fixture
+def cache(tmp_path) -> ResponseCache:
+    c = ResponseCache(tmp_path / "cache.db", max_bytes=1024 * 1024, ttl_seconds=3600)
+    yield c
+    c.close()
+
+
+def test_cache_key_is_order_insensitive_and_content_sensitive() -> None:
+    assert cache_key(a=1, b=[1, 2]) == cache_key(b=[1, 2], a=1)
+    assert cache_key(a=1) != cache_key(a=2)
+
+
+def test_deterministic_call_hits_cache(cache: ResponseCache) -> None:
+    inner = CountingBackend()
+    backend = CachedBackend(inner, cache)
+
+    first = backend.call_structured("sys", "note", DummyModel, temperature=0.0)
+    second = backend.call_structured("sys", "note", DummyModel, temperature=0.0)
+
+    assert first == second
+    assert inner.calls == 1
+
+
+def test_key_includes_prompt_model_and_schema(cache: ResponseCache) -> None:
+    class OtherModel(BaseModel):
+        text: str
+        extra: int = 0
+
+    inner = CountingBackend()
+    backend = CachedBackend(inner, cache)
+    backend.call_structured("sys", "note", DummyModel, temperature=0.0)
+    backend.call_structured("sys v2", "note", DummyModel, temperature=0.0)
+    backend.call_structured("sys", "note", DummyModel, model="other", temperature=0.0)
+    backend.call_structured("sys", "note", OtherModel, temperature=0.0)
+    assert inner.calls == 4
+
+
+def test_sampling_calls_bypass_cache(cache: ResponseCache) -> None:
+    inner = CountingBackend()
+    backend = CachedBackend(inner, cache, max_temperature=0.0)
+    backend.call_chat_structured([{"role": "user", "content": "x"}], DummyModel, temperature=0.7)
+    backend.call_chat_structured([{"role": "user", "content": "x"}], DummyModel, temperature=0.7)
+    assert inner.calls == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_vision_cache_keys_on_image_bytes(cache: ResponseCache, tmp_path) -> None:
+    img = tmp_path / "a.png"
+    img.write_bytes(b"one")
+    inner = CountingBackend()
+    backend = CachedBackend(inner, cache)
+
+    assert backend.call_vision_text(img, "ocr") == backend.call_vision_text(img, "ocr")
+    img.write_bytes(b"two")
+    backend.call_vision_text(img, "ocr")
+    assert inner.calls == 2
+
+
+def test_ttl_expiry(tmp_path) -> None:
+    cache = ResponseCache(tmp_path / "ttl.db", max_bytes=1024, ttl_seconds=1)
+    cache.put("k", "v")
+    cache._connection().execute("UPDATE llm_cache SET created_at = ?", (time.time() - 10,))
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+    cache.close()
+
+
+def test_lru_eviction_by_size(tmp_path) -> None:
+    cache = ResponseCache(tmp_path / "lru.db", max_bytes=25, ttl_seconds=0)
+    cache.put("a", "x" * 10)
+    cache.put("b", "y" * 10)
+    cache._connection().execute("UPDATE llm_cache SET accessed_at = accessed_at - 100 WHERE key = 'b'")
+    assert cache.get("a") == "x" * 10  # refresh a; b is now least recently used
+    cache.put("c", "z" * 10)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_async_calls_share_cache(cache: ResponseCache) -> None:
+    inner = CountingBackend()
+    backend = CachedBackend(inner, cache)
+    first = await backend.acall_structured("sys", "note", DummyModel, temperature=0.0)
+    second = backend.call_structured("sys", "note", DummyModel, temperature=0.0)
+    assert first == second
+    assert inner.calls == 1
+
+
+def test_stream_call_shares_cache_and_reports_hit(cache: ResponseCache) -> None:
+    inner = CountingBackend()
+    backend = CachedBackend(inner, cache)
+    messages = [{"role": "user", "content": "hi"}]
+
+    partials: list[dict] = []
+    first, second = (
+        backend.call_chat_structured_stream(messages, DummyModel, partials.append, temperature=0.0)
+        for _ in range(2)
+    )
+    plain = backend.call_chat_structured(messages, DummyModel, temperature=0.0)
+
+    assert inner.calls == 1
+    assert first == second == plain
+    assert partials == [first.model_dump(), first.model_dump()]
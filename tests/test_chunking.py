@@ -0,0 +1,64 @@
+"""Chunking and relevant-chunk selection tests."""
+
+from openpraxis.chunking import (
+    CHUNK_THRESHOLD_CHARS,
+    chunk_input,
+    needs_chunking,
+    reference_text,
+    select_relevant_chunks,
+    split_text,
+)
+
+
+def _long_text() -> str:
+    paras = [f"Section {i} discusses topic{i} " + ("filler words here " * 40) for i in range(40)]
+    paras[7] = "Retrieval augmented generation needs reranking and chunk overlap tuning. " * 5
+    return "\n\n".join(paras)
+
+
+def test_split_text_respects_max_chars_and_keeps_content() -> None:
+    text = _long_text()
+    pieces = split_text(text, max_chars=2000)
+    assert len(pieces) > 1
+    assert all(len(p) <= 2000 for p in pieces)
+    assert "".join(pieces).replace("\n", "").replace(" ", "") == text.replace("\n", "").replace(" ", "")
+
+
+def test_split_text_hard_splits_oversized_paragraph() -> None:
+    pieces = split_text("x" * 5000, max_chars=2000)
+    assert [len(p) for p in pieces] == [2000, 2000, 1000]
+
+
+def test_chunk_ids_are_stable() -> None:
+    text = _long_text()
+    first = chunk_input("doc-1", text, max_chars=2000)
+    second = chunk_input("doc-1", text, max_chars=2000)
+    assert [c.chunk_id for c in first] == [c.chunk_id for c in second]
+    assert first[0].chunk_id == "doc-1#chunk-001"
+    assert [c.seq for c in first] == list(range(1, len(first) + 1))
+
+
+def test_select_relevant_chunks_prefers_matching_chunk() -> None:
+    chunks = chunk_input("doc", _long_text(), max_chars=2000)
+    selected = select_relevant_chunks(chunks, "reranking retrieval augmented generation", max_chars=2000)
+    assert len(selected) == 1
+    assert "reranking" in selected[0].text
+
+
+def test_select_relevant_chunks_returns_document_order() -> None:
+    chunks = chunk_input("doc", _long_text(), max_chars=2000)
+    selected = select_relevant_chunks(chunks, "topic30 topic2", max_chars=4000)
+    assert [c.seq for c in selected] == sorted(c.seq for c in selected)
+
+
+def test_reference_text_short_input_is_unchanged() -> None:
+    assert not needs_chunking("short")
+    assert reference_text({"raw_text": "short"}, "anything") == "short"
+
+
+def test_reference_text_long_input_is_bounded() -> None:
+    text = _long_text() * 3
+    assert needs_chunking(text) and len(text) > CHUNK_THRESHOLD_CHARS
+    ref = reference_text({"input_id": "doc", "raw_text": text}, "reranking", max_chars=3000)
+    assert len(ref) < len(text) // 4
+    assert "[doc#chunk-" in ref
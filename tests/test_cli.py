@@ -1,6 +1,7 @@
 """CLI command parsing and output tests."""
 
 import json
+import re
 import tomllib
 from unittest.mock import MagicMock, patch
 from uuid import uuid4
@@ -9,18 +10,29 @@ import pytest
 from typer.testing import CliRunner
 
 import openpraxis.config as config_module
+from openpraxis.config import StorageSettings
 from openpraxis.cli import app
 from openpraxis.db import (
     create_input,
     create_response,
     ensure_schema,
     get_connection,
+    get_pool_requests,
+    get_pool_stats,
+    get_response_by_scene,
+    get_review_state,
+    get_scene,
+    get_thread_by_scene_id,
+    request_pool_refill,
     save_insight,
+    save_pooled_scene,
+    save_review_state,
     save_scene,
     save_tagger_output,
     update_response_performance,
     upsert_graph_thread,
 )
+from openpraxis.ingest import hash_file
 from openpraxis.models import (
     CapabilityMap,
     InputType,
@@ -30,6 +42,8 @@ from openpraxis.models import (
     PracticeScene,
     PracticeSeed,
     PerformanceSignal,
+    PracticeMessage,
+    ReviewState,
     RoutingPolicy,
     SceneType,
     Sensitivity,
@@ -243,6 +257,15 @@ def _make_performance() -> PracticePerformance:
     )
 
 
+def _graph_returning(result: dict, *updates: tuple[str, dict]) -> MagicMock:
+    """Compiled-graph mock streaming ``(node, update)`` pairs, then ending in ``result``."""
+    graph = MagicMock()
+    graph.stream.return_value = [("updates", {node: update}) for node, update in updates] + [
+        ("values", result)
+    ]
+    return graph
+
+
 def _make_insight_card() -> InsightCard:
     return InsightCard(
         insight_title="Structured expression gap",
@@ -269,7 +292,21 @@ def tmp_db(tmp_path):
     mock_settings = MagicMock()
     mock_settings.db_path = db_path
     mock_settings.data_dir = tmp_path
+    mock_settings.storage = StorageSettings()
     mock_settings.color = True
+    mock_settings.pool_size = 2
+    mock_settings.pool_fill_on_import = False
+    mock_settings.pool_jobs = 2
+    mock_settings.pool_evict_stale = True
+    mock_settings.pool_max_age_seconds = 0
+    mock_settings.rate_limit_enabled = True
+    mock_settings.rate_limit_max_concurrency = 4
+    mock_settings.worker_concurrency = 2
+    mock_settings.worker_visibility_seconds = 300
+    mock_settings.worker_max_attempts = 3
+    mock_settings.worker_backoff_seconds = 0
+    mock_settings.worker_backoff_max_seconds = 0
+    mock_settings.worker_poll_seconds = 0.01
 
     with patch("openpraxis.cli.get_settings", return_value=mock_settings):
         yield db_path
@@ -300,6 +337,223 @@ def populated_db(tmp_db):
     return tmp_db
 
 
+def test_reprocess_dry_run(populated_db) -> None:
+    result = runner.invoke(app, ["reprocess", "--dry-run"])
+    assert result.exit_code == 0
+    assert "Prompt versions" in result.output
+    assert "Reprocess summary" not in result.output
+
+
+def test_reprocess_stale_only(populated_db, mock_llm) -> None:
+    result = runner.invoke(app, ["reprocess", "--stale-only"])
+    assert result.exit_code == 0
+    assert "Reprocess summary" in result.output
+
+    result = runner.invoke(app, ["reprocess", "--stale-only"])
+    assert result.exit_code == 0
+    assert "Nothing to reprocess" in result.output
+
+
+def test_reprocess_unknown_stage(tmp_db) -> None:
+    result = runner.invoke(app, ["reprocess", "--stage", "scenes"])
+    assert result.exit_code == 1
+
+
+def test_search(populated_db, tmp_path) -> None:
+    pytest.importorskip("numpy")
+    from openpraxis.cli import get_settings
+
+    settings = get_settings()
+    settings.search_embedder = "local"
+    settings.search_index_dir = tmp_path / "search"
+    settings.search_batch_size = 16
+    settings.search_ivf_min_rows = 0
+    settings.search_ivf_nprobe = 4
+
+    result = runner.invoke(app, ["search", "structured expression", "--kind", "insight"])
+    assert result.exit_code == 0
+    assert "Search: structured expression" in result.output
+    assert "insight" in result.output
+    assert "No results" not in result.output
+
+
+def test_search_text(populated_db) -> None:
+    result = runner.invoke(app, ["search", "--text", "structured"])
+    assert result.exit_code == 0
+    assert "No results" not in result.output
+
+
+def test_search_text_rejects_scenes(tmp_db) -> None:
+    result = runner.invoke(app, ["search", "--text", "x", "--kind", "scene"])
+    assert result.exit_code == 1
+
+
+def test_search_unknown_kind(tmp_db) -> None:
+    result = runner.invoke(app, ["search", "x", "--kind", "tweet"])
+    assert result.exit_code == 1
+
+
+def test_review_empty(tmp_db) -> None:
+    result = runner.invoke(app, ["review", "--due"])
+    assert result.exit_code == 0
+    assert "Nothing due" in result.output
+
+
+def test_review_due_and_plan(populated_db) -> None:
+    conn = get_connection(populated_db)
+    save_review_state(
+        conn,
+        ReviewState(
+            scene_id="test-scene-001", input_id="test-input-001", reps=1, next_due="2020-01-01 00:00:00"
+        ),
+    )
+    conn.close()
+    result = runner.invoke(app, ["review", "--due"])
+    assert result.exit_code == 0
+    assert "test-scene-001" in result.output
+    result = runner.invoke(app, ["review", "--plan"])
+    assert result.exit_code == 0
+    assert "Due now" in result.output
+
+
+def test_review_starts_new_thread(populated_db) -> None:
+    mock_graph = _graph_returning({})
+    with patch("openpraxis.cli.get_compiled_graph", return_value=mock_graph):
+        result = runner.invoke(app, ["review", "test-scene-001"])
+    assert result.exit_code == 0
+    initial = mock_graph.stream.call_args.args[0]
+    assert initial["scene"].scene_id == "test-scene-001"
+    conn = get_connection(populated_db)
+    thread = get_thread_by_scene_id(conn, "test-scene-001")
+    conn.close()
+    assert thread["thread_id"] != "thread-001"
+
+
+def test_answer_schedules_review(populated_db) -> None:
+    mock_graph = _graph_returning({"performance": _make_performance(), "insights": []})
+    with patch("openpraxis.cli.get_compiled_graph", return_value=mock_graph):
+        result = runner.invoke(app, ["answer", "test-scene-001"], input="my answer\n")
+    assert result.exit_code == 0
+    conn = get_connection(populated_db)
+    state = get_review_state(conn, "test-scene-001")
+    conn.close()
+    assert state is not None and state.reps == 1
+
+
+def _follow_up(round_: int) -> tuple[str, dict]:
+    from langgraph.types import Interrupt
+
+    payload = {"scene_id": "test-scene-001", "round": round_, "coach_message": "Why?"}
+    return ("updates", {"__interrupt__": (Interrupt(value=payload),)})
+
+
+def test_answer_follow_up_keeps_thread_interrupted(populated_db) -> None:
+    conn = get_connection(populated_db)
+    responses_before = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    conn.close()
+    mock_graph = MagicMock()
+    mock_graph.stream.return_value = [_follow_up(2), ("values", {})]
+    with patch("openpraxis.cli.get_compiled_graph", return_value=mock_graph):
+        result = runner.invoke(app, ["answer", "test-scene-001"], input="my answer\n")
+    assert result.exit_code == 0
+    assert "praxis answer test-scene-001" in result.output
+    conn = get_connection(populated_db)
+    assert get_thread_by_scene_id(conn, "test-scene-001")["status"] == "interrupted"
+    assert conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == responses_before
+    conn.close()
+
+
+def test_answer_session_answers_every_round_in_one_process(populated_db) -> None:
+    messages = [
+        PracticeMessage(role="coach", content="Q1"),
+        PracticeMessage(role="user", content="first\n"),
+        PracticeMessage(role="coach", content="Q2"),
+        PracticeMessage(role="user", content="second\n"),
+    ]
+    final = {"performance": _make_performance(), "insights": [], "practice_messages": messages}
+    mock_graph = MagicMock()
+    mock_graph.stream.side_effect = [[_follow_up(2), ("values", {})], [("values", final)]]
+    with patch("openpraxis.cli.get_compiled_graph", return_value=mock_graph) as compiled:
+        result = runner.invoke(
+            app, ["answer", "test-scene-001", "--session"], input="first\n.\nsecond\n.\n"
+        )
+    assert result.exit_code == 0
+    assert compiled.call_count == 1
+    resumes = [c.args[0].resume for c in mock_graph.stream.call_args_list]
+    assert resumes == ["first\n", "second\n"]
+    assert "Round 2 of" in result.output
+    conn = get_connection(populated_db)
+    assert get_thread_by_scene_id(conn, "test-scene-001")["status"] == "completed"
+    assert get_response_by_scene(conn, "test-scene-001")["answer_text"] == "first\n\nsecond"
+    conn.close()
+
+
+def test_practice_uses_pooled_scene(populated_db, mock_scene) -> None:
+    from openpraxis.pool import pool_versions
+
+    conn = get_connection(populated_db)
+    pooled = mock_scene.model_copy(update={"scene_id": "pooled-scene"})
+    save_pooled_scene(conn, "test-input-001", pooled, "Walk me through it.", *pool_versions())
+    conn.close()
+
+    mock_graph = _graph_returning({"scene": pooled})
+    with patch("openpraxis.cli.get_compiled_graph", return_value=mock_graph):
+        result = runner.invoke(app, ["practice", "test-input-001"])
+    assert result.exit_code == 0
+    initial = mock_graph.stream.call_args.args[0]
+    assert initial["scene"].scene_id == "pooled-scene"
+    assert initial["practice_messages"][0].content == "Walk me through it."
+    assert "Walk me through it." in result.output
+    conn = get_connection(populated_db)
+    assert get_scene(conn, "pooled-scene") is not None
+    assert get_pool_requests(conn) == ["test-input-001"]
+    conn.close()
+
+
+def test_practice_streams_coach_reply(populated_db, mock_scene) -> None:
+    from openpraxis.models import PracticeMessage
+
+    reply = PracticeMessage(role="coach", content="What would you measure first?")
+    mock_graph = MagicMock()
+    mock_graph.stream.return_value = [
+        ("updates", {"practice_generator": {"scene": mock_scene}}),
+        ("custom", {"coach_message": "What would"}),
+        ("custom", {"coach_message": "What would you measure"}),
+        ("updates", {"coach_turn": {"practice_messages": [reply]}}),
+        ("updates", {"__interrupt__": ()}),
+        ("values", {"scene": mock_scene, "practice_messages": [reply]}),
+    ]
+    with patch("openpraxis.cli.get_compiled_graph", return_value=mock_graph):
+        result = runner.invoke(app, ["practice", "test-input-001"])
+    assert result.exit_code == 0
+    assert "custom" in mock_graph.stream.call_args.kwargs["stream_mode"]
+    assert result.output.index("Practice scene") < result.output.index("Coach")
+    assert "What would you measure first?" in result.output
+
+
+def test_practice_without_pooled_scene_generates(populated_db, mock_scene) -> None:
+    mock_graph = _graph_returning({"scene": mock_scene})
+    with patch("openpraxis.cli.get_compiled_graph", return_value=mock_graph):
+        result = runner.invoke(app, ["practice", "test-input-001"])
+    assert result.exit_code == 0
+    assert "scene" not in mock_graph.stream.call_args.args[0]
+
+
+def test_pool_refill_and_status(populated_db, mock_llm) -> None:
+    conn = get_connection(populated_db)
+    request_pool_refill(conn, ["test-input-001"])
+    conn.close()
+    result = runner.invoke(app, ["pool", "refill"])
+    assert result.exit_code == 0
+    assert "Generated" in result.output
+    result = runner.invoke(app, ["pool", "status"])
+    assert result.exit_code == 0
+    assert "ready scenes" in result.output
+    conn = get_connection(populated_db)
+    assert get_pool_stats(conn)["scenes"] == 2
+    conn.close()
+
+
 def test_list_empty(tmp_db) -> None:
     result = runner.invoke(app, ["list"])
     assert result.exit_code == 0
@@ -384,6 +638,31 @@ def test_export_empty(tmp_db) -> None:
     assert "No insight cards to export" in result.output
 
 
+def test_export_jsonl(populated_db) -> None:
+    result = runner.invoke(app, ["export", "--format", "jsonl"])
+    assert result.exit_code == 0
+    lines = [json.loads(line) for line in result.output.splitlines() if line.strip()]
+    assert lines[0]["insight_title"] == "Structured expression gap"
+    assert not any(k.startswith("_") for k in lines[0])
+
+
+def test_export_filters(populated_db) -> None:
+    result = runner.invoke(app, ["export", "--format", "json", "--input-id", "test-input-001"])
+    assert result.exit_code == 0
+    assert len(json.loads(result.output)) == 1
+
+    result = runner.invoke(app, ["export", "--input-id", "other-input"])
+    assert "No insight cards to export" in result.output
+
+    result = runner.invoke(app, ["export", "--since", "2999-01-01"])
+    assert "No insight cards to export" in result.output
+
+
+def test_export_invalid_options(tmp_db) -> None:
+    assert runner.invoke(app, ["export", "--format", "csv"]).exit_code == 1
+    assert runner.invoke(app, ["export", "--since", "yesterday"]).exit_code == 1
+
+
 def test_add_with_mock_graph(tmp_db, tmp_path, mock_llm, mock_tagger_output, mock_scene) -> None:
     """Test add command with mocked graph invocation."""
     test_file = tmp_path / "input.md"
@@ -394,14 +673,17 @@ def test_add_with_mock_graph(tmp_db, tmp_path, mock_llm, mock_tagger_output, moc
         "tagger_output": mock_tagger_output,
         "scene": mock_scene,
     }
-    mock_graph = MagicMock()
-    mock_graph.invoke.return_value = mock_result
+    mock_graph = _graph_returning(
+        mock_result,
+        ("tagger", {"tagger_output": mock_tagger_output}),
+        ("practice_generator", {"scene": mock_scene}),
+    )
 
     with patch("openpraxis.cli.get_compiled_graph", return_value=mock_graph):
         result = runner.invoke(app, ["add", str(test_file)])
 
     assert result.exit_code == 0
-    assert "Summary" in result.output or "Practice scene" in result.output
+    assert "Summary" in result.output and "Practice scene" in result.output
 
 
 def test_add_image_with_mock_graph(tmp_db, tmp_path, mock_llm, mock_tagger_output, mock_scene) -> None:
@@ -413,14 +695,17 @@ def test_add_image_with_mock_graph(tmp_db, tmp_path, mock_llm, mock_tagger_outpu
         "tagger_output": mock_tagger_output,
         "scene": mock_scene,
     }
-    mock_graph = MagicMock()
-    mock_graph.invoke.return_value = mock_result
+    mock_graph = _graph_returning(
+        mock_result,
+        ("tagger", {"tagger_output": mock_tagger_output}),
+        ("practice_generator", {"scene": mock_scene}),
+    )
 
     with patch("openpraxis.cli.get_compiled_graph", return_value=mock_graph):
         result = runner.invoke(app, ["add", str(test_file)])
 
     assert result.exit_code == 0
-    assert "Summary" in result.output or "Practice scene" in result.output
+    assert "Summary" in result.output and "Practice scene" in result.output
 
 
 def test_add_duplicate(tmp_db, tmp_path) -> None:
@@ -444,12 +729,56 @@ def test_add_duplicate(tmp_db, tmp_path) -> None:
     assert "already exists" in result.output
 
 
+def test_add_force_reuses_stored_tagger_output(tmp_db, tmp_path, mock_tagger_output, mock_scene) -> None:
+    from openpraxis.nodes.tagger import tagger_version
+
+    test_file = tmp_path / "same.md"
+    test_file.write_text("Unchanged note")
+    conn = get_connection(tmp_db)
+    create_input(conn, "orig-input", str(test_file), hash_file(test_file), "Unchanged note")
+    save_tagger_output(conn, "orig-input", mock_tagger_output, *tagger_version())
+    conn.close()
+
+    mock_graph = _graph_returning({"tagger_output": mock_tagger_output, "scene": mock_scene})
+    with patch("openpraxis.cli.get_compiled_graph", return_value=mock_graph):
+        result = runner.invoke(app, ["add", str(test_file), "--force"])
+
+    assert result.exit_code == 0
+    assert "Reused stored Tagger output" in result.output
+    initial = mock_graph.stream.call_args.args[0]
+    assert initial["input_id"] == "orig-input"
+    assert initial["tagger_output"] == mock_tagger_output
+    conn = get_connection(tmp_db)
+    assert conn.execute("SELECT COUNT(*) FROM inputs").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM scenes WHERE input_id = 'orig-input'").fetchone()[0] == 1
+    conn.close()
+
+
+def test_add_force_retag_runs_tagger(tmp_db, tmp_path, mock_tagger_output) -> None:
+    test_file = tmp_path / "same.md"
+    test_file.write_text("Unchanged note")
+    conn = get_connection(tmp_db)
+    create_input(conn, "orig-input", str(test_file), hash_file(test_file), "Unchanged note")
+    save_tagger_output(conn, "orig-input", mock_tagger_output, "old/model", "stale")
+    conn.close()
+
+    mock_graph = _graph_returning({"tagger_output": mock_tagger_output})
+    with patch("openpraxis.cli.get_compiled_graph", return_value=mock_graph):
+        result = runner.invoke(app, ["add", str(test_file), "--force"])
+
+    assert result.exit_code == 0
+    assert "tagger_output" not in mock_graph.stream.call_args.args[0]
+    conn = get_connection(tmp_db)
+    row = conn.execute("SELECT model FROM tagger_outputs WHERE input_id = 'orig-input'").fetchone()
+    assert row["model"] != "old/model"
+    conn.close()
+
+
 def test_global_provider_override_option(tmp_db, tmp_path, mock_tagger_output, mock_scene) -> None:
     test_file = tmp_path / "provider.md"
     test_file.write_text("Provider override test")
 
-    mock_graph = MagicMock()
-    mock_graph.invoke.return_value = {"tagger_output": mock_tagger_output, "scene": mock_scene}
+    mock_graph = _graph_returning({"tagger_output": mock_tagger_output, "scene": mock_scene})
 
     with patch("openpraxis.cli.get_compiled_graph", return_value=mock_graph), \
          patch("openpraxis.cli.set_runtime_llm_overrides") as mock_overrides:
@@ -462,3 +791,96 @@ def test_global_provider_override_option(tmp_db, tmp_path, mock_tagger_output, m
         base_url=None,
         model=None,
     )
+
+
+def test_add_directory_bulk(tmp_db, tmp_path, mock_llm) -> None:
+    vault = tmp_path / "vault"
+    (vault / "nested").mkdir(parents=True)
+    (vault / "one.md").write_text("First note")
+    (vault / "nested" / "two.md").write_text("Second note")
+
+    result = runner.invoke(app, ["add", str(vault), "--recursive", "--jobs", "2"])
+
+    assert result.exit_code == 0
+    assert "Import summary" in result.output
+    conn = get_connection(tmp_db)
+    count = conn.execute("SELECT COUNT(*) FROM tagger_outputs").fetchone()[0]
+    conn.close()
+    assert count == 2
+
+    again = runner.invoke(app, ["add", str(vault), "--recursive"])
+    assert again.exit_code == 0
+    assert "Skipped" in again.output
+
+
+def test_add_async_returns_input_id_and_worker_processes_it(tmp_db, tmp_path, mock_llm) -> None:
+    note = tmp_path / "note.md"
+    note.write_text("RAG report")
+
+    queued = runner.invoke(app, ["add", str(note), "--async"])
+
+    assert queued.exit_code == 0
+    conn = get_connection(tmp_db)
+    input_id = conn.execute("SELECT id FROM inputs").fetchone()[0]
+    assert input_id in queued.output
+    assert conn.execute("SELECT COUNT(*) FROM tagger_outputs").fetchone()[0] == 0
+    conn.close()
+    status = runner.invoke(app, ["jobs", "status"])
+    assert re.search(r"queued\s+1\b", status.output)
+
+    worked = runner.invoke(app, ["worker", "--once"])
+
+    assert worked.exit_code == 0
+    assert "done tag job" in worked.output and "done generate job" in worked.output
+    conn = get_connection(tmp_db)
+    assert conn.execute("SELECT COUNT(*) FROM tagger_outputs").fetchone()[0] == 1
+    assert get_pool_stats(conn)["scenes"] == 1
+    assert conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 0
+    conn.close()
+
+    again = runner.invoke(app, ["add", str(note), "--async"])
+    assert again.exit_code == 1
+    assert "already added" in again.output
+
+
+def test_answer_async_queues_evaluation(tmp_db, mock_llm, mock_tagger_output, mock_scene) -> None:
+    conn = get_connection(tmp_db)
+    create_input(conn, "in-1", None, "hash-1", "RAG report")
+    save_tagger_output(conn, "in-1", mock_tagger_output)
+    save_scene(conn, "in-1", mock_scene)
+    upsert_graph_thread(conn, "t-1", "in-1", scene_id=mock_scene.scene_id, status="interrupted")
+    conn.close()
+
+    queued = runner.invoke(app, ["answer", mock_scene.scene_id, "--async"], input="my answer\n")
+    assert queued.exit_code == 0
+    assert "Queued evaluation" in queued.output
+
+    assert runner.invoke(app, ["worker", "--once", "-c", "1"]).exit_code == 0
+    conn = get_connection(tmp_db)
+    assert get_response_by_scene(conn, mock_scene.scene_id)["answer_text"] == "my answer\n"
+    assert get_thread_by_scene_id(conn, mock_scene.scene_id)["status"] == "completed"
+    conn.close()
+
+
+def test_worker_rejects_unknown_kind(tmp_db) -> None:
+    result = runner.invoke(app, ["worker", "--once", "--kind", "nope"])
+    assert result.exit_code == 1
+    assert "Unknown job kind" in result.output
+
+
+def test_cache_stats_and_clear(tmp_user_config) -> None:
+    from openpraxis.config import get_settings
+    from openpraxis.llm_backends.cached_backend import ResponseCache
+
+    settings = get_settings()
+    cache = ResponseCache(settings.cache_path, settings.cache_max_bytes, settings.cache_ttl_seconds)
+    cache.put("k", "value")
+    cache.close()
+
+    stats = runner.invoke(app, ["cache", "stats"])
+    assert stats.exit_code == 0
+    assert "entries" in stats.output
+
+    cleared = runner.invoke(app, ["cache", "clear"])
+    assert cleared.exit_code == 0
+    assert "Removed 1 cached responses" in cleared.output
@@ -0,0 +1,54 @@
+"""CLI startup budget: read-only commands must not load the graph or LLM stack."""
+
+import os
+import subprocess
+import sys
+
+# Measured around 250-350 ms here, down from ~1.4 s when cli.py imported the graph
+# at module level.  The budget leaves room for slower machines.
+COLD_IMPORT_BUDGET_MS = 600
+HEAVY_MODULES = ("langgraph", "langchain_core", "openai", "numpy")
+
+_READ_ONLY_SCRIPT = """
+import sys
+from openpraxis.cli import app
+
+for args in (["list"], ["show", "missing-id"], ["insight"], ["export"], ["llm", "show"]):
+    try:
+        app(args, standalone_mode=False)
+    except SystemExit:
+        pass
+print("LOADED=" + ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def _run_python(args: list[str], home) -> subprocess.CompletedProcess:
+    env = {**os.environ, "HOME": str(home)}
+    for key in ("OPENAI_API_KEY", "ARK_API_KEY", "MOONSHOT_API_KEY", "DEEPSEEK_API_KEY"):
+        env.pop(key, None)
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, env=env, timeout=60
+    )
+
+
+def _cold_import_ms(home) -> float:
+    proc = _run_python(["-X", "importtime", "-c", "import openpraxis.cli"], home)
+    assert proc.returncode == 0, proc.stderr
+    for line in proc.stderr.splitlines():
+        fields = [f.strip() for f in line.split("|")]
+        if len(fields) == 3 and fields[2] == "openpraxis.cli":
+            return int(fields[1]) / 1000
+    raise AssertionError("openpraxis.cli missing from -X importtime output")
+
+
+def test_read_only_commands_do_not_import_graph_or_llm_stack(tmp_path) -> None:
+    proc = _run_python(["-c", _READ_ONLY_SCRIPT.format(heavy=HEAVY_MODULES)], tmp_path)
+    assert proc.returncode == 0, proc.stderr
+    loaded = proc.stdout.rsplit("LOADED=", 1)[1].strip()
+    assert loaded == ""
+
+
+def test_cli_cold_import_within_budget(tmp_path) -> None:
+    # Best of three, so one slow run on a busy machine does not fail the suite.
+    best = min(_cold_import_ms(tmp_path) for _ in range(3))
+    assert best < COLD_IMPORT_BUDGET_MS, f"cold import of openpraxis.cli took {best:.0f} ms"
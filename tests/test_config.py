@@ -105,3 +105,52 @@ def test_reload_settings_after_persist(tmp_user_config, monkeypatch: pytest.Monk
     assert second.llm_api_key == "sk-deepseek-2"
     assert second.model_name == "deepseek-chat"
     assert second.temperature == 0.3
+
+
+def test_storage_section_parsed_into_settings(tmp_user_config) -> None:
+    tmp_user_config.parent.mkdir(parents=True, exist_ok=True)
+    tmp_user_config.write_text(
+        (
+            "[storage]\n"
+            f"data_dir = \"{tmp_user_config.parent / 'data'}\"\n"
+            "journal_mode = \"delete\"\n"
+            "synchronous = \"full\"\n"
+            "busy_timeout_ms = 250\n"
+        ),
+        encoding="utf-8",
+    )
+    settings = config_module.get_settings()
+    assert settings.storage.journal_mode == "delete"
+    assert settings.storage.synchronous == "full"
+    assert settings.storage.busy_timeout_ms == 250
+    assert settings.storage.mmap_size_mib == 128
+
+
+def test_storage_defaults_to_wal(tmp_user_config) -> None:
+    settings = config_module.get_settings()
+    assert settings.storage.journal_mode == "wal"
+    assert settings.storage.synchronous == "normal"
+
+
+def test_pool_section_parsed_into_settings(tmp_user_config) -> None:
+    tmp_user_config.parent.mkdir(parents=True, exist_ok=True)
+    tmp_user_config.write_text(
+        "[pool]\nsize = 5\nfill_on_import = true\nevict_stale = false\nmax_age_days = 0\n",
+        encoding="utf-8",
+    )
+    settings = config_module.get_settings()
+    assert settings.pool_size == 5
+    assert settings.pool_fill_on_import is True
+    assert settings.pool_evict_stale is False
+    assert settings.pool_max_age_seconds == 0
+    assert settings.pool_jobs == 4
+
+
+def test_serve_socket_follows_the_data_dir(tmp_user_config, monkeypatch) -> None:
+    monkeypatch.delenv("OPENPRAXIS_SOCKET", raising=False)
+    assert config_module.get_settings().serve_socket == (
+        tmp_user_config.parent / "data" / "praxis.sock"
+    )
+    monkeypatch.setenv("OPENPRAXIS_SOCKET", str(tmp_user_config.parent / "other.sock"))
+    config_module._settings = None
+    assert config_module.get_settings().serve_socket == tmp_user_config.parent / "other.sock"
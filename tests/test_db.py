@@ -6,27 +6,42 @@ from uuid import uuid4
 
 import pytest
 
+from openpraxis.config import StorageSettings
 from openpraxis.db import (
+    MIGRATIONS,
+    SCHEMA_SQL,
+    _insights_query,
+    _split_sql,
+    get_schema_version,
     ensure_schema,
     get_connection,
     create_input,
     get_input_by_id,
     get_input_by_hash,
+    get_existing_hashes,
+    save_chunks,
     save_tagger_output,
+    get_chunks,
     get_tagger_output,
+    get_tagger_output_by_hash,
+    get_tagger_versions,
     save_scene,
     get_scene,
     get_scenes_by_input,
     get_response_by_scene,
     get_all_insights,
+    iter_insights,
     create_response,
     save_insight,
+    save_insights_many,
+    transaction,
     upsert_graph_thread,
     get_thread_by_scene_id,
     list_inputs,
     get_insights,
 )
 from openpraxis.models import (
+    Chunk,
     CapabilityMap,
     InsightCard,
     InsightType,
@@ -298,3 +313,228 @@ def test_get_all_insights(memory_conn: sqlite3.Connection) -> None:
     all_cards = get_all_insights(memory_conn)
     assert len(all_cards) >= 1
     assert all_cards[0]["_input_id"] == input_id
+
+
+def test_iter_insights_streams_in_batches(memory_conn: sqlite3.Connection) -> None:
+    create_input(memory_conn, "in-a", None, "h-a", "a")
+    create_input(memory_conn, "in-b", None, "h-b", "b")
+    for i in range(5):
+        card = InsightCard(
+            insight_title=f"Card {i}",
+            insight_type=InsightType.STRUCTURING_GAP,
+            what_happened="x", why_it_matters="y",
+            upgrade_pattern="z", micro_practice="m",
+            concepts=[], skills=[], scenes=[], intensity=1,
+        )
+        save_insight(memory_conn, "in-a" if i < 3 else "in-b", None, None, card)
+    memory_conn.execute(
+        "UPDATE insights SET created_at = '2020-01-01 00:00:00' WHERE input_id = 'in-a'"
+    )
+    memory_conn.commit()
+
+    cards = iter_insights(memory_conn, batch_size=2)
+    assert not isinstance(cards, list)
+    assert len(list(cards)) == 5
+    assert {c["_input_id"] for c in iter_insights(memory_conn, input_id="in-a")} == {"in-a"}
+    recent = list(iter_insights(memory_conn, since="2021-01-01 00:00:00"))
+    assert [c["_input_id"] for c in recent] == ["in-b", "in-b"]
+
+
+def test_tagger_output_versions(
+    memory_conn: sqlite3.Connection, sample_tagger_output: TaggerOutput
+) -> None:
+    create_input(memory_conn, "in-v", None, "hash-v", "v")
+    output = sample_tagger_output
+    save_tagger_output(memory_conn, "in-v", output, "openai/gpt-4o", "abc123")
+
+    assert get_tagger_versions(memory_conn, ["in-v", "missing"]) == {
+        "in-v": ("openai/gpt-4o", "abc123")
+    }
+    found = get_tagger_output_by_hash(memory_conn, "hash-v", "openai/gpt-4o", "abc123")
+    assert found is not None and found[0] == "in-v"
+    assert found[1].summary == output.summary
+    assert get_tagger_output_by_hash(memory_conn, "hash-v", "openai/gpt-4o", "other") is None
+    assert get_tagger_output_by_hash(memory_conn, "hash-v", "kimi/k2", "abc123") is None
+
+
+def test_save_and_get_chunks(memory_conn: sqlite3.Connection) -> None:
+    create_input(memory_conn, "in-c", None, "hash-c", "long")
+    chunks = [
+        Chunk(chunk_id="in-c#chunk-001", seq=1, text="first"),
+        Chunk(chunk_id="in-c#chunk-002", seq=2, text="second"),
+    ]
+    save_chunks(memory_conn, "in-c", chunks)
+    assert get_chunks(memory_conn, "in-c") == chunks
+    save_chunks(memory_conn, "in-c", chunks[:1])
+    assert get_chunks(memory_conn, "in-c") == chunks[:1]
+    assert get_chunks(memory_conn, "missing") == []
+
+
+def test_get_existing_hashes(memory_conn: sqlite3.Connection) -> None:
+    create_input(memory_conn, "in-1", None, "hash-a", "a")
+    create_input(memory_conn, "in-2", None, "hash-b", "b")
+    found = get_existing_hashes(memory_conn, ["hash-a", "hash-b", "hash-c", "hash-a"])
+    assert found == {"hash-a": "in-1", "hash-b": "in-2"}
+
+
+def test_transaction_commits_once_on_exit(tmp_path: Path) -> None:
+    db_path = tmp_path / "tx.db"
+    writer = get_connection(db_path)
+    ensure_schema(writer)
+    reader = get_connection(db_path)
+
+    with transaction(writer):
+        create_input(writer, "tx-1", None, "tx-hash-1", "a")
+        create_input(writer, "tx-2", None, "tx-hash-2", "b")
+        # Helpers must not commit inside the unit of work.
+        assert reader.execute("SELECT COUNT(*) FROM inputs").fetchone()[0] == 0
+
+    assert reader.execute("SELECT COUNT(*) FROM inputs").fetchone()[0] == 2
+    writer.close()
+    reader.close()
+
+
+def test_transaction_rolls_back_on_error(memory_conn: sqlite3.Connection) -> None:
+    with pytest.raises(RuntimeError):
+        with transaction(memory_conn):
+            create_input(memory_conn, "rb-1", None, "rb-hash", "a")
+            raise RuntimeError("boom")
+    assert get_input_by_id(memory_conn, "rb-1") is None
+
+
+def test_nested_transaction_is_a_savepoint(memory_conn: sqlite3.Connection) -> None:
+    with transaction(memory_conn):
+        create_input(memory_conn, "outer", None, "outer-hash", "a")
+        with pytest.raises(sqlite3.IntegrityError):
+            with transaction(memory_conn):
+                create_input(memory_conn, "inner", None, "inner-hash", "b")
+                create_input(memory_conn, "dup", None, "outer-hash", "c")
+    assert get_input_by_id(memory_conn, "outer") is not None
+    assert get_input_by_id(memory_conn, "inner") is None
+
+
+def test_save_insights_many(memory_conn: sqlite3.Connection) -> None:
+    create_input(memory_conn, "many", None, "many-hash", "content")
+    cards = [
+        InsightCard(
+            insight_title=f"Card {i}",
+            insight_type=InsightType.METRIC_GAP,
+            what_happened="x", why_it_matters="y",
+            upgrade_pattern="z", micro_practice="m",
+            concepts=[], skills=[], scenes=[], intensity=i + 1,
+        )
+        for i in range(3)
+    ]
+    with transaction(memory_conn):
+        save_insights_many(memory_conn, "many", None, None, cards)
+    titles = {c["insight_title"] for c in get_insights(memory_conn, input_id="many")}
+    assert titles == {"Card 0", "Card 1", "Card 2"}
+
+
+def test_get_connection_applies_storage_pragmas(tmp_path: Path) -> None:
+    storage = StorageSettings(cache_size_kib=2048, mmap_size_mib=4, busy_timeout_ms=1234)
+    conn = get_connection(tmp_path / "pragmas.db", storage)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -2048
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+    conn.close()
+
+
+def test_wal_allows_reads_during_open_write(tmp_path: Path) -> None:
+    db_path = tmp_path / "wal.db"
+    writer = get_connection(db_path)
+    ensure_schema(writer)
+    create_input(writer, "committed", None, "wal-hash-1", "a")
+    reader = get_connection(db_path)
+
+    with transaction(writer):
+        create_input(writer, "pending", None, "wal-hash-2", "b")
+        rows = reader.execute("SELECT id FROM inputs").fetchall()
+        assert [r["id"] for r in rows] == ["committed"]
+
+    writer.close()
+    reader.close()
+
+
+def test_ensure_schema_applies_migrations_idempotently(memory_conn: sqlite3.Connection) -> None:
+    assert get_schema_version(memory_conn) == len(MIGRATIONS)
+    ensure_schema(memory_conn)
+    assert get_schema_version(memory_conn) == len(MIGRATIONS)
+
+
+def test_ensure_schema_upgrades_baseline_db(tmp_path: Path) -> None:
+    db_path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(db_path)
+    legacy.executescript(SCHEMA_SQL)
+    legacy.execute(
+        "INSERT INTO inputs (id, file_hash, raw_text) VALUES ('old', 'old-hash', 'kept')"
+    )
+    legacy.execute(
+        "INSERT INTO scenes (scene_id, input_id, scene_json) VALUES ('old-scene', 'old', '{}')"
+    )
+    legacy.execute(
+        "INSERT INTO responses (id, scene_id, answer_text, perf_json, created_at) "
+        "VALUES ('old-resp', 'old-scene', 'a', '{}', '2025-01-10 08:00:00')"
+    )
+    legacy.commit()
+    legacy.close()
+
+    conn = get_connection(db_path)
+    ensure_schema(conn)
+    assert get_schema_version(conn) == len(MIGRATIONS)
+    assert get_input_by_id(conn, "old")["raw_text"] == "kept"
+    # Answered scenes enter the review queue one day after their last answer.
+    assert conn.execute(
+        "SELECT next_due FROM review_schedule WHERE scene_id = 'old-scene'"
+    ).fetchone()[0] == "2025-01-11 08:00:00"
+    conn.close()
+
+
+def test_split_sql_keeps_trigger_bodies() -> None:
+    script = """
+    CREATE TABLE t (a);
+    CREATE TRIGGER tr AFTER INSERT ON t BEGIN
+        UPDATE t SET a = 1;
+        UPDATE t SET a = 2;
+    END;
+    """
+    assert len(_split_sql(script)) == 2
+
+
+@pytest.mark.parametrize(
+    ("filters", "index"),
+    [
+        ({"insight_type": "tradeoff_gap", "min_intensity": 4}, "idx_insights_type_intensity"),
+        ({"min_intensity": 4}, "idx_insights_created"),
+        ({"input_id": "x"}, "idx_insights_input_created"),
+    ],
+)
+def test_insight_queries_use_indexes(
+    memory_conn: sqlite3.Connection, filters: dict, index: str
+) -> None:
+    sql, params = _insights_query(**filters)
+    plan = " ".join(
+        row["detail"] for row in memory_conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+    )
+    assert index in plan
+
+
+def test_scene_and_response_lookups_use_indexes(memory_conn: sqlite3.Connection) -> None:
+    scene_plan = " ".join(
+        r["detail"]
+        for r in memory_conn.execute(
+            "EXPLAIN QUERY PLAN SELECT scene_json FROM scenes WHERE input_id = ? ORDER BY created_at",
+            ("x",),
+        )
+    )
+    resp_plan = " ".join(
+        r["detail"]
+        for r in memory_conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM responses WHERE scene_id = ? "
+            "ORDER BY created_at DESC LIMIT 1",
+            ("x",),
+        )
+    )
+    assert "idx_scenes_input_created" in scene_plan
+    assert "idx_responses_scene_created" in resp_plan
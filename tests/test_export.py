@@ -0,0 +1,43 @@
+"""Streaming export writer tests."""
+
+import io
+import json
+
+from openpraxis.export import write_json, write_jsonl, write_markdown
+
+CARDS = [
+    {"insight_title": "First", "insight_type": "tradeoff_gap", "intensity": 3,
+     "concepts": ["a"], "skills": [], "_input_id": "in-1"},
+    {"insight_title": "Second", "insight_type": "metric_gap", "intensity": 2,
+     "concepts": [], "skills": ["s"], "_input_id": "in-2"},
+]
+
+
+def test_write_json_matches_json_dumps() -> None:
+    out = io.StringIO()
+    assert write_json(iter(CARDS), out) == 2
+    expected = [{k: v for k, v in c.items() if not k.startswith("_")} for c in CARDS]
+    assert out.getvalue() == json.dumps(expected, indent=2, ensure_ascii=False) + "\n"
+
+
+def test_write_json_empty() -> None:
+    out = io.StringIO()
+    assert write_json(iter([]), out) == 0
+    assert json.loads(out.getvalue()) == []
+
+
+def test_write_jsonl_one_card_per_line() -> None:
+    out = io.StringIO()
+    assert write_jsonl(iter(CARDS), out) == 2
+    lines = out.getvalue().splitlines()
+    assert [json.loads(line)["insight_title"] for line in lines] == ["First", "Second"]
+    assert "_input_id" not in lines[0]
+
+
+def test_write_markdown_numbers_cards() -> None:
+    out = io.StringIO()
+    assert write_markdown(iter(CARDS), out) == 2
+    text = out.getvalue()
+    assert text.startswith("# OpenPraxis Insight Cards")
+    assert "## 1. First" in text and "## 2. Second" in text
+    assert "**Concepts:** a" in text and "**Skills:** s" in text
@@ -4,7 +4,13 @@ from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END
 from langgraph.types import Command
 
-from openpraxis.graph import build_graph, route_after_tagger, route_after_coach, PraxisState
+from openpraxis.graph import (
+    build_graph,
+    route_after_tagger,
+    route_after_coach,
+    route_from_start,
+    PraxisState,
+)
 from openpraxis.models import (
     CapabilityMap,
     InputType,
@@ -29,6 +35,32 @@ def test_route_after_tagger_no_practice() -> None:
     assert route_after_tagger(state) == END
 
 
+def test_route_from_start_runs_tagger_without_stored_output() -> None:
+    assert route_from_start({"raw_text": "x"}) == "tagger"
+
+
+def test_route_from_start_skips_tagger_with_stored_output() -> None:
+    tagger_output = TaggerOutput(
+        input_type=InputType.REPORT,
+        summary="s",
+        tags=Tags(topics=[], domains=[], difficulty=1, sensitivity=Sensitivity.NORMAL),
+        capability_map=CapabilityMap(
+            concept_understanding=1, structuring=1, tradeoff_thinking=1,
+            system_thinking=1, communication=1,
+        ),
+        routing_policy=RoutingPolicy.RECOMMEND,
+        practice_seed=PracticeSeed(
+            preferred_scene=SceneType.EXPLAIN, skills=[], concepts=[], constraints=[]
+        ),
+    )
+    assert route_from_start({"tagger_output": tagger_output, "should_practice": True}) == "practice_generator"
+    assert route_from_start({"tagger_output": tagger_output, "should_practice": False}) == END
+
+
+def test_route_from_start_review_goes_to_coach(mock_scene) -> None:
+    assert route_from_start({"scene": mock_scene, "should_practice": True}) == "coach_turn"
+
+
 def test_route_after_coach_ready() -> None:
     state: PraxisState = {"coach_ready": True, "practice_round": 1}
     assert route_after_coach(state) == "practice_evaluator"
@@ -100,6 +132,26 @@ def test_graph_practice_path_first_interrupt() -> None:
     assert "performance" not in result
 
 
+@pytest.mark.usefixtures("mock_llm")
+def test_graph_streams_coach_message(mock_coach_reply_sequence) -> None:
+    """Coach text is emitted on the custom stream before the turn completes."""
+    graph = build_graph().compile(checkpointer=MemorySaver())
+    initial: PraxisState = {
+        "input_id": "test-stream",
+        "raw_text": "A technical report on RAG.",
+        "type_hint": "report",
+    }
+    config = {"configurable": {"thread_id": "thread-stream"}}
+    events = list(graph.stream(initial, config=config, stream_mode=["custom", "updates"]))
+
+    custom = [chunk for mode, chunk in events if mode == "custom"]
+    assert custom == [{"coach_message": mock_coach_reply_sequence[0].message}]
+    modes_nodes = [(mode, next(iter(chunk))) for mode, chunk in events]
+    assert modes_nodes.index(("custom", "coach_message")) < modes_nodes.index(
+        ("updates", "coach_turn")
+    )
+
+
 @pytest.mark.usefixtures("mock_llm")
 def test_graph_multi_turn_full_resume() -> None:
     """Test full multi-turn flow: coach asks -> user replies -> coach follows up -> ... -> evaluator -> insight."""
@@ -187,3 +239,73 @@ def test_graph_forced_practice_with_cached_tagger() -> None:
     assert "practice_messages" in result
     assert len(result["practice_messages"]) == 1
     assert result["practice_messages"][0].role == "coach"
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("mock_llm")
+async def test_graph_ainvoke_multi_turn() -> None:
+    """The compiled graph runs end-to-end under ainvoke using the async node variants."""
+    graph = build_graph().compile(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": "thread-async"}}
+
+    result = await graph.ainvoke(
+        {"input_id": "test-async", "raw_text": "A report.", "type_hint": "report"},
+        config=config,
+    )
+    assert "scene" in result
+    assert result["practice_messages"][0].role == "coach"
+
+    result = await graph.ainvoke(Command(resume="First reply."), config=config)
+    result = await graph.ainvoke(Command(resume="Second reply."), config=config)
+    assert "performance" in result
+    assert result["insights"][0].insight_title == "Structured expression gap"
+
+
+def test_get_compiled_graph_checkpointer_uses_wal(tmp_path) -> None:
+    from openpraxis.graph import close_compiled_graph, get_compiled_graph
+
+    graph = get_compiled_graph(str(tmp_path / "praxis.db"))
+    conn = graph.checkpointer.conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    close_compiled_graph(str(tmp_path / "praxis.db"))
+
+
+def test_get_compiled_graph_is_cached_until_closed(tmp_path) -> None:
+    import sqlite3
+
+    from openpraxis.graph import close_compiled_graphs, get_compiled_graph
+
+    db_path = str(tmp_path / "praxis.db")
+    graph = get_compiled_graph(db_path)
+    assert get_compiled_graph(db_path) is graph
+    assert get_compiled_graph(str(tmp_path / "other.db")) is not graph
+
+    close_compiled_graphs()
+    with pytest.raises(sqlite3.ProgrammingError):
+        graph.checkpointer.conn.execute("SELECT 1")
+    reopened = get_compiled_graph(db_path)
+    assert reopened is not graph
+    assert reopened.checkpointer.conn.execute("SELECT 1").fetchone() == (1,)
+    close_compiled_graphs()
+
+
+def test_close_compiled_graph_finds_a_graph_opened_with_storage_settings(tmp_path) -> None:
+    import sqlite3
+
+    from openpraxis.config import StorageSettings
+    from openpraxis.graph import close_compiled_graph, get_compiled_graph
+
+    db_path = tmp_path / "praxis.db"
+    storage = StorageSettings(busy_timeout_ms=1234)
+    graph = get_compiled_graph(str(db_path), storage)
+    # Same file through another spelling of the path, with or without settings.
+    assert get_compiled_graph(str(tmp_path / "." / "praxis.db")) is graph
+    assert get_compiled_graph(str(db_path), storage) is graph
+    with pytest.raises(ValueError, match="other storage settings"):
+        get_compiled_graph(str(db_path), StorageSettings())
+
+    close_compiled_graph(str(db_path))
+    with pytest.raises(sqlite3.ProgrammingError):
+        graph.checkpointer.conn.execute("SELECT 1")
+    assert get_compiled_graph(str(db_path), StorageSettings()) is not graph
+    close_compiled_graph(str(db_path))
@@ -0,0 +1,191 @@
+"""Latency histogram and HedgedBackend tests."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from pydantic import BaseModel
+
+import openpraxis.config as config_module
+from openpraxis.config import Settings, get_settings
+from openpraxis.hedging import HedgePolicy, LatencyHistogram, get_histogram, reset_histograms
+from openpraxis.llm_backends.base import LLMBackend
+from openpraxis.llm_backends.hedged_backend import HedgedBackend
+from openpraxis.llm_backends.resilient_backend import ResilientBackend
+from openpraxis.resilience import ErrorKind, get_breaker, reset_breakers
+
+FAST = HedgePolicy(min_delay_seconds=0.05, max_delay_seconds=0.05)
+
+
+class _Reply(BaseModel):
+    text: str
+
+
+class _Timed(LLMBackend):
+    """Answers after ``delays[n]`` seconds on its n-th call, naming the call and model."""
+
+    def __init__(self, *delays: float) -> None:
+        self.delays = list(delays)
+        self.calls: list[tuple[str, str | None]] = []
+        self.cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    def _next(self, model: str | None) -> tuple[int, float]:
+        with self._lock:
+            n = len(self.calls)
+            self.calls.append((get_settings().llm_provider, model))
+        return n, self.delays[n]
+
+    def call_structured(self, *args, model=None, **kwargs):
+        n, delay = self._next(model)
+        time.sleep(delay)
+        return _Reply(text=f"call {n}")
+
+    def call_chat_structured(self, messages, response_model, model=None, **kwargs):
+        return self.call_structured(model=model)
+
+    def call_chat_structured_stream(self, messages, response_model, on_partial, model=None, **kw):
+        n, delay = self._next(model)
+        time.sleep(delay)
+        try:
+            for i in range(3):
+                on_partial({"text": f"call {n} part {i}"})
+                time.sleep(0.01)
+        except Exception:
+            self.cancelled.set()
+            raise
+        return _Reply(text=f"call {n}")
+
+    def call_vision_text(self, *args, **kwargs):
+        return self.call_structured(**kwargs).text
+
+    async def acall_chat_structured(self, messages, response_model, model=None, **kwargs):
+        n, delay = self._next(model)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+        return _Reply(text=f"call {n}")
+
+
+@pytest.fixture(autouse=True)
+def _openai_settings(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config_module, "_settings", Settings(llm_provider="openai"))
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "sk-deepseek")
+    reset_histograms()
+    yield
+    reset_histograms()
+
+
+def test_histogram_quantiles_follow_recent_samples() -> None:
+    histogram = LatencyHistogram(window=100)
+    for _ in range(90):
+        histogram.observe(1.0)
+    for _ in range(10):
+        histogram.observe(8.0)
+    assert 1.0 <= histogram.quantile(0.5) < 1.2
+    assert 8.0 <= histogram.quantile(0.95) < 9.6
+
+    # Old samples leave the window.
+    for _ in range(100):
+        histogram.observe(0.2)
+    assert histogram.quantile(0.95) < 0.25
+
+
+def test_hedge_delay_adapts_once_enough_samples_are_seen() -> None:
+    policy = HedgePolicy(percentile=90, min_delay_seconds=0.1, max_delay_seconds=5, min_samples=5)
+    histogram = LatencyHistogram()
+    assert policy.delay(histogram) == 5
+    for _ in range(10):
+        histogram.observe(0.5)
+    assert 0.5 <= policy.delay(histogram) < 0.6
+    fast = LatencyHistogram()
+    for _ in range(10):
+        fast.observe(0.001)
+    assert policy.delay(fast) == 0.1
+
+
+def test_fast_call_is_not_hedged() -> None:
+    inner = _Timed(0.0)
+    backend = HedgedBackend(inner, FAST, scope="all")
+    assert backend.call_chat_structured([], _Reply).text == "call 0"
+    assert len(inner.calls) == 1
+    assert len(get_histogram("openai/gpt-4o", False)) == 1
+
+
+def test_slow_call_loses_to_the_hedge() -> None:
+    inner = _Timed(2.0, 0.0)
+    backend = HedgedBackend(inner, FAST, scope="all")
+    started = time.monotonic()
+    assert backend.call_chat_structured([], _Reply).text == "call 1"
+    assert time.monotonic() - started < 1.0
+
+
+def test_only_streams_are_hedged_by_default() -> None:
+    inner = _Timed(0.2)
+    HedgedBackend(inner, FAST).call_chat_structured([], _Reply)
+    assert len(inner.calls) == 1
+
+
+def test_stream_shows_only_the_winner_and_stops_the_loser() -> None:
+    inner = _Timed(0.3, 0.0)
+    seen: list[dict] = []
+    reply = HedgedBackend(inner, FAST).call_chat_structured_stream([], _Reply, seen.append)
+    assert reply.text == "call 1"
+    assert seen == [{"text": f"call 1 part {i}"} for i in range(3)]
+    assert inner.cancelled.wait(2)
+
+
+def test_hedge_goes_to_the_secondary_provider() -> None:
+    inner = _Timed(2.0, 0.0)
+    backend = HedgedBackend(inner, FAST, scope="all", provider="deepseek")
+    assert backend.call_structured("s", "u", _Reply).text == "call 1"
+    assert inner.calls == [("openai", None), ("deepseek", "deepseek-chat")]
+    assert get_settings().llm_provider == "openai"
+
+
+def test_hedge_never_sends_the_primary_key_to_the_secondary(monkeypatch) -> None:
+    config_module._settings.llm_api_key = "sk-openai-secret"
+    monkeypatch.delenv("MOONSHOT_API_KEY", raising=False)
+    inner = _Timed(0.3)
+    backend = HedgedBackend(inner, FAST, scope="all", provider="kimi")
+    assert backend.call_structured("s", "u", _Reply).text == "call 0"
+    # The duplicate failed before reaching the backend instead of borrowing the key.
+    assert inner.calls == [("openai", None)]
+
+
+def test_primary_failure_before_the_delay_is_not_hedged() -> None:
+    class _Broken(_Timed):
+        def call_chat_structured(self, *args, **kwargs):
+            self._next(None)
+            raise ValueError("bad request")
+
+    inner = _Broken(0.0)
+    with pytest.raises(ValueError, match="bad request"):
+        HedgedBackend(inner, FAST, scope="all").call_chat_structured([], _Reply)
+    assert len(inner.calls) == 1
+
+
+def test_async_loser_is_cancelled() -> None:
+    inner = _Timed(2.0, 0.0)
+    backend = HedgedBackend(inner, FAST, scope="all")
+    reply = asyncio.run(backend.acall_chat_structured([], _Reply))
+    assert reply.text == "call 1"
+    assert inner.cancelled.is_set()
+
+
+def test_losing_hedge_that_was_the_breaker_trial_does_not_wedge_the_breaker() -> None:
+    reset_breakers()
+    breaker = get_breaker("deepseek", failure_threshold=1, reset_seconds=0)
+    breaker.record_failure(ErrorKind.SERVER)
+    assert breaker.state == "half-open"
+    # The hedge goes to deepseek, becomes its trial call, and loses to the primary.
+    inner = ResilientBackend(_Timed(0.3, 2.0), breaker_failures=1, breaker_reset_seconds=0)
+    backend = HedgedBackend(inner, FAST, scope="all", provider="deepseek")
+    try:
+        assert asyncio.run(backend.acall_chat_structured([], _Reply)).text == "call 0"
+        assert breaker.before_call() is True
+    finally:
+        reset_breakers()
@@ -0,0 +1,133 @@
+"""Bulk directory ingestion tests."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from openpraxis.db import (
+    create_input,
+    ensure_schema,
+    get_chunks,
+    get_connection,
+    get_tagger_output,
+    get_tagger_versions,
+    save_tagger_output,
+)
+from openpraxis.ingest import collect_files, hash_file, run_bulk_ingest
+
+
+@pytest.fixture
+def memory_conn() -> sqlite3.Connection:
+    conn = get_connection(Path(":memory:"))
+    ensure_schema(conn)
+    return conn
+
+
+@pytest.fixture
+def vault(tmp_path: Path) -> Path:
+    root = tmp_path / "vault"
+    (root / "sub").mkdir(parents=True)
+    (root / ".obsidian").mkdir()
+    (root / "a.md").write_text("Note A")
+    (root / "b.txt").write_text("Note B")
+    (root / "dup.md").write_text("Note A")
+    (root / "ignore.bin").write_bytes(b"\x00\x01")
+    (root / "sub" / "c.md").write_text("Note C")
+    (root / ".obsidian" / "workspace.md").write_text("hidden")
+    return root
+
+
+def test_collect_files_flat(vault: Path) -> None:
+    names = [p.name for p in collect_files(vault)]
+    assert names == ["a.md", "b.txt", "dup.md"]
+
+
+def test_collect_files_recursive_skips_hidden(vault: Path) -> None:
+    names = [p.relative_to(vault).as_posix() for p in collect_files(vault, recursive=True)]
+    assert names == ["a.md", "b.txt", "dup.md", "sub/c.md"]
+
+
+@pytest.mark.usefixtures("mock_llm")
+def test_run_bulk_ingest_counts_and_dedup(memory_conn: sqlite3.Connection, vault: Path) -> None:
+    create_input(memory_conn, "existing", None, hash_file(vault / "b.txt"), "Note B")
+
+    files = collect_files(vault, recursive=True)
+    summary = run_bulk_ingest(memory_conn, files, jobs=3)
+
+    # a.md + sub/c.md imported; b.txt already stored; dup.md duplicates a.md in-batch.
+    assert summary.imported == 2
+    assert summary.skipped == 2
+    assert summary.failed == 0
+    rows = memory_conn.execute("SELECT id FROM inputs WHERE id != 'existing'").fetchall()
+    assert len(rows) == 2
+    for row in rows:
+        assert get_tagger_output(memory_conn, row["id"]) is not None
+
+
+@pytest.mark.usefixtures("mock_llm")
+def test_run_bulk_ingest_force_retags_existing(memory_conn: sqlite3.Connection, vault: Path) -> None:
+    create_input(memory_conn, "existing", None, hash_file(vault / "a.md"), "Note A")
+
+    summary = run_bulk_ingest(memory_conn, [vault / "a.md"], force=True)
+
+    assert summary.imported == 1
+    assert get_tagger_output(memory_conn, "existing") is not None
+
+
+@pytest.mark.usefixtures("mock_llm")
+def test_run_bulk_ingest_force_reuses_current_tagger_output(
+    memory_conn: sqlite3.Connection, vault: Path, mock_tagger_output
+) -> None:
+    from openpraxis.nodes.tagger import tagger_version
+
+    create_input(memory_conn, "current", None, hash_file(vault / "a.md"), "Note A")
+    save_tagger_output(memory_conn, "current", mock_tagger_output, *tagger_version())
+    create_input(memory_conn, "stale", None, hash_file(vault / "b.txt"), "Note B")
+    save_tagger_output(memory_conn, "stale", mock_tagger_output, "old/model", "0ld")
+
+    files = [vault / "a.md", vault / "b.txt"]
+    summary = run_bulk_ingest(memory_conn, files, force=True)
+    assert (summary.imported, summary.skipped) == (1, 1)
+    assert get_tagger_versions(memory_conn, ["stale"])["stale"] == tagger_version()
+
+    summary = run_bulk_ingest(memory_conn, files, force=True, retag=True)
+    assert summary.imported == 2
+
+
+@pytest.mark.usefixtures("mock_llm")
+def test_run_bulk_ingest_stores_chunks_for_long_files(
+    memory_conn: sqlite3.Connection, tmp_path: Path
+) -> None:
+    from openpraxis.chunking import CHUNK_THRESHOLD_CHARS
+
+    long_file = tmp_path / "long.md"
+    long_file.write_text("\n\n".join(["Paragraph of notes. " * 50] * (CHUNK_THRESHOLD_CHARS // 500)))
+
+    summary = run_bulk_ingest(memory_conn, [long_file])
+
+    assert summary.imported == 1
+    input_id = memory_conn.execute("SELECT id FROM inputs").fetchone()["id"]
+    chunks = get_chunks(memory_conn, input_id)
+    assert len(chunks) > 1
+    assert chunks[0].chunk_id == f"{input_id}#chunk-001"
+
+
+def test_run_bulk_ingest_records_failures(memory_conn: sqlite3.Connection, vault: Path) -> None:
+    import openpraxis.runtime as runtime
+    from tests.conftest import _MockBackend
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("provider down")
+
+    runtime.set_backend(_MockBackend(boom, boom))
+    try:
+        results = []
+        summary = run_bulk_ingest(memory_conn, [vault / "a.md"], on_result=results.append)
+    finally:
+        runtime.reset()
+
+    assert summary.failed == 1
+    assert summary.failures[0].error == "provider down"
+    assert [r.status for r in results] == ["failed"]
+    assert memory_conn.execute("SELECT COUNT(*) FROM inputs").fetchone()[0] == 0
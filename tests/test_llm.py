@@ -5,9 +5,17 @@ from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from openpraxis.llm import call_chat_structured, call_structured, call_vision_text
+from openpraxis.llm import (
+    _output_limit,
+    _response_format,
+    call_chat_structured,
+    call_structured,
+    call_vision_text,
+)
+from openpraxis.models import TaggerOutput
+from openpraxis.ratelimit import get_limiter, reset_limiters
 
 
 class DemoResponse(BaseModel):
@@ -20,9 +28,25 @@ def _settings(provider: str) -> SimpleNamespace:
         llm_api_key="test-key",
         llm_base_url=None,
         model_name="test-model",
+        rate_limit_enabled=True,
+        rate_limit_rpm=0,
+        rate_limit_tpm=0,
+        rate_limit_initial_concurrency=4,
+        rate_limit_max_concurrency=32,
+        resilience_enabled=True,
+        resilience_timeout_seconds=60.0,
+        llm_max_output_tokens=None,
+        llm_timeout_seconds=None,
     )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_limiters():
+    reset_limiters()
+    yield
+    reset_limiters()
+
+
 def test_call_structured_openai_parse(monkeypatch: pytest.MonkeyPatch) -> None:
     parsed = DemoResponse(text="ok")
     completion = SimpleNamespace(
@@ -43,6 +67,26 @@ def test_call_structured_openai_parse(monkeypatch: pytest.MonkeyPatch) -> None:
     assert kwargs["messages"][1]["role"] == "user"
 
 
+def test_call_structured_holds_a_rate_limiter_slot(monkeypatch: pytest.MonkeyPatch) -> None:
+    limiter = get_limiter("openai", "test-model")
+    seen: list[int] = []
+
+    def _parse(**kwargs):
+        seen.append(limiter.in_flight)
+        raise RuntimeError("boom")
+
+    client = MagicMock()
+    client.beta.chat.completions.parse.side_effect = _parse
+    monkeypatch.setattr("openpraxis.llm.get_settings", lambda: _settings("openai"))
+    monkeypatch.setattr("openpraxis.llm.get_client", lambda: client)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        call_structured("system", "user", DemoResponse)
+
+    assert seen == [1]
+    assert limiter.in_flight == 0
+
+
 def test_call_structured_doubao_parse(monkeypatch: pytest.MonkeyPatch) -> None:
     parsed = DemoResponse(text="doubao")
     client = MagicMock()
@@ -84,6 +128,24 @@ def test_call_chat_structured_kimi_json_mapping(monkeypatch: pytest.MonkeyPatch)
     assert kwargs["messages"][1:] == messages
 
 
+def test_output_token_cap_uses_each_api_parameter(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = MagicMock()
+    client.chat.completions.create.return_value = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content='{"text":"kimi"}'))]
+    )
+    settings = _settings("kimi")
+    settings.llm_max_output_tokens = 300
+    monkeypatch.setattr("openpraxis.llm.get_settings", lambda: settings)
+    monkeypatch.setattr("openpraxis.llm.get_client", lambda: client)
+
+    call_structured("system", "user", DemoResponse)
+
+    assert client.chat.completions.create.call_args.kwargs["max_tokens"] == 300
+    settings.llm_provider = "openai"
+    assert _output_limit("chat") == {"max_completion_tokens": 300}
+    assert _output_limit("responses") == {"max_output_tokens": 300}
+
+
 def test_call_structured_deepseek_invalid_json_raises(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -121,3 +183,192 @@ def test_call_vision_text_openai_uses_responses_create(
     assert kwargs["input"][0]["role"] == "user"
     assert kwargs["input"][0]["content"][0]["type"] == "input_image"
     assert kwargs["input"][0]["content"][1]["type"] == "input_text"
+
+
+@pytest.mark.asyncio
+async def test_acall_structured_openai_parse(monkeypatch: pytest.MonkeyPatch) -> None:
+    from unittest.mock import AsyncMock
+
+    from openpraxis.llm import acall_structured
+
+    parsed = DemoResponse(text="async ok")
+    completion = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(parsed=parsed, refusal=None))]
+    )
+    client = MagicMock()
+    client.beta.chat.completions.parse = AsyncMock(return_value=completion)
+
+    monkeypatch.setattr("openpraxis.llm.get_settings", lambda: _settings("openai"))
+    monkeypatch.setattr("openpraxis.llm.get_async_client", lambda: client)
+
+    result = await acall_structured("system", "user", DemoResponse)
+
+    assert result == parsed
+    kwargs = client.beta.chat.completions.parse.call_args.kwargs
+    assert kwargs["response_format"] is DemoResponse
+    assert kwargs["model"] == "test-model"
+
+
+@pytest.mark.asyncio
+async def test_acall_chat_structured_deepseek_json_mode(monkeypatch: pytest.MonkeyPatch) -> None:
+    from unittest.mock import AsyncMock
+
+    from openpraxis.llm import acall_chat_structured
+
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(
+        return_value=SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content='{"text":"deep"}'))]
+        )
+    )
+
+    monkeypatch.setattr("openpraxis.llm.get_settings", lambda: _settings("deepseek"))
+    monkeypatch.setattr("openpraxis.llm.get_async_client", lambda: client)
+
+    result = await acall_chat_structured([{"role": "user", "content": "hi"}], DemoResponse)
+
+    assert result == DemoResponse(text="deep")
+    assert client.chat.completions.create.call_args.kwargs["response_format"] == {
+        "type": "json_object"
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_async_client_is_shared_within_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    import openpraxis.llm as llm_module
+
+    monkeypatch.setattr("openpraxis.llm.get_settings", lambda: _settings("openai"))
+    monkeypatch.setattr(llm_module, "_async_clients", {})
+
+    first = llm_module.get_async_client()
+    second = llm_module.get_async_client()
+
+    assert first is second
+
+
+class _FakeParseStream:
+    """Stands in for the ``beta.chat.completions.stream`` context manager."""
+
+    def __init__(self, snapshots: list[str], parsed: BaseModel) -> None:
+        self._events = [SimpleNamespace(type="content.delta", snapshot=s) for s in snapshots]
+        self._completion = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(parsed=parsed, refusal=None))]
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def __iter__(self):
+        return iter(self._events)
+
+    def get_final_completion(self):
+        return self._completion
+
+
+def test_call_chat_structured_stream_openai_reports_partials(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from openpraxis.llm import call_chat_structured_stream
+
+    parsed = DemoResponse(text="Hello there")
+    client = MagicMock()
+    client.beta.chat.completions.stream.return_value = _FakeParseStream(
+        ['{"te', '{"text": "Hel', '{"text": "Hel', '{"text": "Hello there"}'], parsed
+    )
+    monkeypatch.setattr("openpraxis.llm.get_settings", lambda: _settings("openai"))
+    monkeypatch.setattr("openpraxis.llm.get_client", lambda: client)
+
+    partials: list[dict] = []
+    result = call_chat_structured_stream(
+        [{"role": "user", "content": "hi"}], DemoResponse, partials.append
+    )
+
+    assert result == parsed
+    # Unchanged decodes (the repeated snapshot) are not reported twice.
+    assert partials == [{"text": "Hel"}, {"text": "Hello there"}]
+    assert client.beta.chat.completions.stream.call_args.kwargs["response_format"] is DemoResponse
+
+
+def test_call_chat_structured_stream_kimi_json_mode(monkeypatch: pytest.MonkeyPatch) -> None:
+    from openpraxis.llm import call_chat_structured_stream
+
+    def _chunk(text: str) -> SimpleNamespace:
+        return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+    client = MagicMock()
+    client.chat.completions.create.return_value = iter(
+        [_chunk('{"text": "ki'), _chunk("mi"), _chunk('"}')]
+    )
+    monkeypatch.setattr("openpraxis.llm.get_settings", lambda: _settings("kimi"))
+    monkeypatch.setattr("openpraxis.llm.get_client", lambda: client)
+
+    partials: list[dict] = []
+    result = call_chat_structured_stream(
+        [{"role": "user", "content": "hi"}], DemoResponse, partials.append
+    )
+
+    assert result == DemoResponse(text="kimi")
+    assert partials == [{"text": "ki"}, {"text": "kimi"}]
+    kwargs = client.chat.completions.create.call_args.kwargs
+    assert kwargs["stream"] is True
+    assert kwargs["response_format"] == {"type": "json_object"}
+
+
+def test_call_chat_structured_stream_doubao_reports_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    from openpraxis.llm import call_chat_structured_stream
+
+    parsed = DemoResponse(text="doubao")
+    client = MagicMock()
+    client.responses.parse.return_value = SimpleNamespace(output_parsed=parsed)
+    monkeypatch.setattr("openpraxis.llm.get_settings", lambda: _settings("doubao"))
+    monkeypatch.setattr("openpraxis.llm.get_client", lambda: client)
+
+    partials: list[dict] = []
+    result = call_chat_structured_stream(
+        [{"role": "user", "content": "hi"}], DemoResponse, partials.append
+    )
+
+    assert result == parsed
+    assert partials == [{"text": "doubao"}]
+
+
+def _objects(node):
+    if isinstance(node, dict):
+        if node.get("type") == "object":
+            yield node
+        for value in node.values():
+            yield from _objects(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _objects(value)
+
+
+def test_response_format_is_a_strict_json_schema() -> None:
+    class Note(BaseModel):
+        """A note."""
+
+        text: str
+        source: str | None = None
+
+    class Wrapper(BaseModel):
+        note: Note = Field(description="The note.")
+        notes: list[Note] = []
+
+    response_format = _response_format(Wrapper)
+    assert response_format["type"] == "json_schema"
+    assert (response_format["json_schema"]["name"], response_format["json_schema"]["strict"]) == (
+        "Wrapper", True
+    )
+    schema = response_format["json_schema"]["schema"]
+    # A $ref with a description is inlined, since strict mode rejects siblings of $ref.
+    assert "$ref" not in schema["properties"]["note"]
+    assert schema["properties"]["note"]["description"] == "The note."
+    assert schema["properties"]["notes"]["items"] == {"$ref": "#/$defs/Note"}
+    assert "default" not in schema["$defs"]["Note"]["properties"]["source"]
+    tagger_schema = _response_format(TaggerOutput)["json_schema"]["schema"]
+    for obj in [*_objects(schema), *_objects(tagger_schema)]:
+        assert obj["additionalProperties"] is False
+        assert obj["required"] == list(obj["properties"])
@@ -55,3 +55,60 @@ def test_custom_backend_works() -> None:
     assert b.call_structured("", "", DummyModel).text == "custom"
     assert b.call_chat_structured([], DummyModel).text == "chat"
     assert b.call_vision_text("img", "prompt") == "vision"
+
+
+def test_async_cli_backend_is_cli_backend() -> None:
+    from openpraxis.llm_backends.async_cli_backend import AsyncCLIBackend
+
+    assert issubclass(AsyncCLIBackend, CLIBackend)
+
+
+@pytest.mark.asyncio
+async def test_default_async_methods_delegate_to_sync() -> None:
+    class SyncOnly(LLMBackend):
+        def call_structured(self, system_prompt, user_content, response_model, **kw):
+            return response_model(text=f"{system_prompt}/{user_content}")
+
+        def call_chat_structured(self, messages, response_model, **kw):
+            return response_model(text=str(len(messages)))
+
+        def call_vision_text(self, image, prompt, **kw):
+            return f"vision:{prompt}"
+
+    b = SyncOnly()
+    assert (await b.acall_structured("s", "u", DummyModel)).text == "s/u"
+    assert (await b.acall_chat_structured([{}, {}], DummyModel)).text == "2"
+    assert await b.acall_vision_text("img", "p") == "vision:p"
+
+
+@pytest.mark.asyncio
+async def test_async_cli_backend_awaits_llm_module(monkeypatch: pytest.MonkeyPatch) -> None:
+    from openpraxis.llm_backends.async_cli_backend import AsyncCLIBackend
+
+    async def fake_acall(system_prompt, user_content, response_model, **kw):
+        return response_model(text="native async")
+
+    monkeypatch.setattr("openpraxis.llm.acall_structured", fake_acall)
+    result = await AsyncCLIBackend().acall_structured("s", "u", DummyModel)
+    assert result.text == "native async"
+
+
+@pytest.mark.asyncio
+async def test_default_stream_methods_report_result_once() -> None:
+    class NoStreaming(LLMBackend):
+        def call_structured(self, system_prompt, user_content, response_model, **kw):
+            return response_model(text="s")
+
+        def call_chat_structured(self, messages, response_model, **kw):
+            return response_model(text="whole reply")
+
+        def call_vision_text(self, image, prompt, **kw):
+            return "vision"
+
+    b = NoStreaming()
+    partials: list[dict] = []
+    assert b.call_chat_structured_stream([], DummyModel, partials.append).text == "whole reply"
+    assert (await b.acall_chat_structured_stream([], DummyModel, partials.append)).text == (
+        "whole reply"
+    )
+    assert partials == [{"text": "whole reply"}, {"text": "whole reply"}]
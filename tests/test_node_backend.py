@@ -0,0 +1,162 @@
+"""Per-node LLM routing ([llm.nodes.<name>]) tests."""
+
+import pytest
+from pydantic import BaseModel
+
+import openpraxis.config as config_module
+from openpraxis import runtime
+from openpraxis.config import get_settings
+from openpraxis.llm_backends.base import LLMBackend
+from openpraxis.llm_backends.node_backend import NodeBackend
+
+
+class _Reply(BaseModel):
+    text: str
+
+
+class _Recording(LLMBackend):
+    """Records, per call, the arguments and the settings in effect."""
+
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+
+    def _record(self, model, temperature) -> _Reply:
+        settings = get_settings()
+        self.calls.append(
+            {
+                "model": model,
+                "temperature": temperature,
+                "provider": settings.llm_provider,
+                "max_output_tokens": settings.llm_max_output_tokens,
+                "timeout": settings.llm_timeout_seconds,
+            }
+        )
+        return _Reply(text="ok")
+
+    def call_structured(self, system_prompt, user_content, response_model, **kwargs):
+        return self._record(kwargs.get("model"), kwargs.get("temperature", 0.7))
+
+    def call_chat_structured(self, messages, response_model, model=None, temperature=0.7):
+        return self._record(model, temperature)
+
+    def call_vision_text(self, image, prompt, model=None, temperature=0.0):
+        return self._record(model, temperature).text
+
+
+@pytest.fixture
+def routed(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    cfg_dir = tmp_path / ".openpraxis"
+    cfg_dir.mkdir()
+    (cfg_dir / "config.toml").write_text(
+        "[llm.nodes.tagger]\n"
+        'model = "gpt-4o-mini"\n'
+        "temperature = 0.2\n"
+        "max_output_tokens = 800\n"
+        "timeout_seconds = 15\n"
+        "\n"
+        "[llm.nodes.practice_evaluator]\n"
+        'provider = "deepseek"\n'
+    )
+    monkeypatch.setattr(config_module, "_DEFAULT_CONFIG_DIR", cfg_dir)
+    monkeypatch.setattr(config_module, "_DEFAULT_CONFIG_PATH", cfg_dir / "config.toml")
+    monkeypatch.setattr(config_module, "_DEFAULT_DATA_DIR", cfg_dir / "data")
+    monkeypatch.setattr(config_module, "_settings", None)
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "sk-deepseek")
+    runtime.reset()
+    inner = _Recording()
+    # Stands in for the auto-selected backend stack (set_backend() skips routing).
+    monkeypatch.setattr(runtime, "_backend", inner)
+    yield inner
+    runtime.reset()
+
+
+def test_routed_node_gets_its_model_and_sampling_settings(routed) -> None:
+    backend = runtime.get_backend("tagger")
+    assert isinstance(backend, NodeBackend)
+    backend.call_structured("s", "u", _Reply, temperature=0.0)
+
+    assert routed.calls == [
+        {
+            "model": "gpt-4o-mini",
+            "temperature": 0.2,
+            "provider": "openai",
+            "max_output_tokens": 800,
+            "timeout": 15.0,
+        }
+    ]
+    # The overrides only last for the call.
+    assert get_settings().llm_max_output_tokens is None
+
+
+def test_node_can_use_another_provider(routed) -> None:
+    runtime.get_backend("practice_evaluator").call_chat_structured([], _Reply, temperature=0.5)
+
+    call = routed.calls[0]
+    assert (call["provider"], call["model"], call["temperature"]) == (
+        "deepseek", "deepseek-chat", 0.5
+    )
+    assert get_settings().llm_provider == "openai"
+    assert runtime.current_model_id("practice_evaluator") == "deepseek/deepseek-chat"
+    assert runtime.current_model_id("tagger") == "openai/gpt-4o-mini"
+    assert runtime.current_model_id() == "openai/gpt-4o"
+
+
+def test_routed_provider_never_gets_the_llm_api_key(routed, monkeypatch) -> None:
+    config_module._DEFAULT_CONFIG_PATH.write_text(
+        '[llm]\nprovider = "openai"\napi_key = "sk-openai-secret"\n'
+        '\n[llm.nodes.tagger]\nprovider = "deepseek"\n'
+    )
+    config_module._settings = None
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("DEEPSEEK_API_KEY")
+    with pytest.raises(ValueError, match="DEEPSEEK_API_KEY"):
+        runtime.get_backend("tagger").call_structured("s", "u", _Reply)
+    assert routed.calls == []
+
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "sk-deepseek")
+    with config_module.llm_overrides(provider="deepseek") as settings:
+        assert settings.llm_api_key == "sk-deepseek"
+
+
+def test_unrouted_nodes_use_the_shared_backend(routed) -> None:
+    assert runtime.get_backend("coach_turn") is routed
+    assert runtime.get_backend() is routed
+
+
+def test_installed_and_openclaw_backends_are_not_routed(routed) -> None:
+    runtime.set_backend(routed)
+    assert runtime.get_backend("tagger") is routed
+    assert runtime.current_model_id("practice_evaluator") == "openai/gpt-4o"
+
+    runtime.set_execution_mode(runtime.ExecutionMode.OPENCLAW)
+    runtime._backend = routed
+    assert runtime.get_backend("tagger") is routed
+    assert runtime.current_model_id("tagger") == "openclaw"
+
+
+def test_unknown_node_section_is_rejected(routed) -> None:
+    config_module._DEFAULT_CONFIG_PATH.write_text('[llm.nodes.tager]\nmodel = "x"\n')
+    config_module._settings = None
+    with pytest.raises(ValueError, match="Unknown node"):
+        get_settings()
+
+
+def test_misspelt_node_key_is_rejected(routed) -> None:
+    config_module._DEFAULT_CONFIG_PATH.write_text("[llm.nodes.tagger]\ntemprature = 0.2\n")
+    config_module._settings = None
+    with pytest.raises(ValueError, match="temprature"):
+        get_settings()
+
+
+def test_global_max_output_tokens_is_coerced(routed) -> None:
+    config_module._DEFAULT_CONFIG_PATH.write_text('[llm]\nmax_output_tokens = "800"\n')
+    config_module._settings = None
+    assert get_settings().llm_max_output_tokens == 800
+
+
+@pytest.mark.parametrize("value", [0, -5])
+def test_global_max_output_tokens_must_be_positive(routed, value) -> None:
+    config_module._DEFAULT_CONFIG_PATH.write_text(f"[llm]\nmax_output_tokens = {value}\n")
+    config_module._settings = None
+    with pytest.raises(ValueError, match="llm_max_output_tokens"):
+        get_settings()
@@ -171,3 +171,92 @@ def test_insight_generator_node() -> None:
     assert "insights" in out
     assert len(out["insights"]) >= 1
     assert out["insights"][0].insight_title == "Structured expression gap"
+
+
+def test_tagger_node_maps_chunks_then_reduces(mock_tagger_output) -> None:
+    import openpraxis.runtime as runtime
+    from openpraxis.chunking import CHUNK_THRESHOLD_CHARS
+    from openpraxis.prompts import get_tagger_reduce_system_prompt
+    from tests.conftest import _MockBackend
+
+    calls = []
+
+    def fake_call(system_prompt, user_content, response_model, **kwargs):
+        calls.append((system_prompt, user_content))
+        return mock_tagger_output
+
+    runtime.set_backend(_MockBackend(fake_call, fake_call))
+    try:
+        para = "A paragraph about retrieval pipelines. " * 50
+        raw_text = "\n\n".join([para] * (CHUNK_THRESHOLD_CHARS // len(para) + 4))
+        out = tagger_node({"input_id": "doc", "raw_text": raw_text, "type_hint": None})
+    finally:
+        runtime.reset()
+
+    chunks = out["chunks"]
+    assert len(chunks) > 1
+    assert chunks[0].chunk_id == "doc#chunk-001"
+    assert len(calls) == len(chunks) + 1
+    reduce_calls = [c for c in calls if c[0] == get_tagger_reduce_system_prompt()]
+    assert len(reduce_calls) == 1
+    assert all(len(user) < len(raw_text) for _, user in calls)
+    assert out["tagger_output"] == mock_tagger_output
+
+
+def test_long_blank_input_gets_a_single_tagger_call(mock_tagger_output) -> None:
+    import asyncio
+
+    import openpraxis.runtime as runtime
+    from openpraxis.chunking import CHUNK_THRESHOLD_CHARS
+    from openpraxis.nodes.tagger import atagger_node
+    from tests.conftest import _MockBackend
+
+    calls = []
+
+    def fake_call(system_prompt, user_content, response_model, **kwargs):
+        calls.append(system_prompt)
+        return mock_tagger_output
+
+    runtime.set_backend(_MockBackend(fake_call, fake_call))
+    state = {"input_id": "blank", "raw_text": " \n" * CHUNK_THRESHOLD_CHARS, "type_hint": None}
+    try:
+        out = tagger_node(state)
+        aout = asyncio.run(atagger_node(state))
+    finally:
+        runtime.reset()
+    assert out["tagger_output"] == aout["tagger_output"] == mock_tagger_output
+    assert "chunks" not in out and "chunks" not in aout
+    assert len(calls) == 2
+
+
+def test_practice_generator_sends_relevant_chunks_only(mock_tagger_output, mock_scene) -> None:
+    import openpraxis.runtime as runtime
+    from openpraxis.chunking import CHUNK_THRESHOLD_CHARS
+    from openpraxis.models import PracticeSceneLLM
+    from tests.conftest import _MockBackend
+
+    seen = {}
+
+    def fake_call(system_prompt, user_content, response_model, **kwargs):
+        seen["user"] = user_content
+        return PracticeSceneLLM(
+            scene_type=mock_scene.scene_type,
+            role=mock_scene.role,
+            task=mock_scene.task,
+            constraints=mock_scene.constraints,
+            rubric=mock_scene.rubric,
+            expected_structure_hint=mock_scene.expected_structure_hint,
+        )
+
+    filler = "Unrelated gardening notes about tomatoes. " * 100
+    raw_text = "\n\n".join([filler] * (3 * CHUNK_THRESHOLD_CHARS // len(filler)))
+    runtime.set_backend(_MockBackend(fake_call, fake_call))
+    try:
+        practice_generator_node(
+            {"input_id": "doc", "tagger_output": mock_tagger_output, "raw_text": raw_text}
+        )
+    finally:
+        runtime.reset()
+
+    assert "[doc#chunk-" in seen["user"]
+    assert len(seen["user"]) < len(raw_text) // 2
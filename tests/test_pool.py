@@ -0,0 +1,120 @@
+"""Pre-generated scene pool tests."""
+
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Command
+
+from openpraxis.db import (
+    count_pooled_scenes,
+    create_input,
+    ensure_schema,
+    get_connection,
+    get_pool_requests,
+    get_pool_stats,
+    pop_pooled_scene,
+    request_pool_refill,
+    save_pooled_scene,
+    save_tagger_output,
+)
+from openpraxis.graph import build_graph
+from openpraxis.models import PracticeMessage
+from openpraxis.pool import pool_versions, refill_pool
+
+
+@pytest.fixture
+def memory_conn() -> sqlite3.Connection:
+    conn = get_connection(Path(":memory:"))
+    ensure_schema(conn)
+    return conn
+
+
+@pytest.fixture
+def tagged_input(memory_conn, mock_tagger_output) -> str:
+    create_input(memory_conn, "in-1", None, "hash-1", "RAG report")
+    save_tagger_output(memory_conn, "in-1", mock_tagger_output)
+    return "in-1"
+
+
+@pytest.mark.usefixtures("mock_llm")
+def test_refill_tops_up_queued_inputs(memory_conn, tagged_input) -> None:
+    request_pool_refill(memory_conn, [tagged_input])
+    summary = refill_pool(memory_conn, size=3, jobs=2)
+    assert (summary.generated, summary.failed) == (3, 0)
+    assert count_pooled_scenes(memory_conn, [tagged_input], pool_versions()) == {tagged_input: 3}
+    assert get_pool_requests(memory_conn) == []
+
+    # Already full: nothing to generate.
+    assert refill_pool(memory_conn, size=3, input_ids=[tagged_input]).generated == 0
+
+
+def test_refill_keeps_request_when_generation_fails(memory_conn, tagged_input) -> None:
+    request_pool_refill(memory_conn, [tagged_input, "missing"])
+    with patch("openpraxis.pool.generate_pooled_scene", side_effect=RuntimeError("boom")):
+        summary = refill_pool(memory_conn, size=1)
+    assert summary.failed == 2
+    # The unknown input is dropped; the failed generation is retried next time.
+    assert get_pool_requests(memory_conn) == [tagged_input]
+
+
+def test_pop_takes_oldest_current_scene(memory_conn, tagged_input, mock_scene) -> None:
+    versions = pool_versions()
+    for scene_id, scene_versions in [("old", ("v0", "c0")), ("a", versions), ("b", versions)]:
+        scene = mock_scene.model_copy(update={"scene_id": scene_id})
+        save_pooled_scene(memory_conn, tagged_input, scene, "hi", *scene_versions)
+
+    popped = pop_pooled_scene(memory_conn, tagged_input, versions)
+    assert popped["scene"].scene_id == "a"
+    assert popped["opening"] == "hi"
+    assert popped["prompt_version"] == versions[0]
+    assert get_pool_stats(memory_conn)["scenes"] == 2
+
+
+def test_refill_evicts_stale_prompt_versions(memory_conn, tagged_input, mock_scene) -> None:
+    save_pooled_scene(memory_conn, tagged_input, mock_scene, "hi", "v0", "c0")
+    fresh = mock_scene.model_copy(update={"scene_id": "new"})
+    with patch("openpraxis.pool.generate_pooled_scene", return_value=(fresh, "hi")):
+        summary = refill_pool(memory_conn, size=1, input_ids=[tagged_input])
+    assert (summary.evicted, summary.generated) == (1, 1)
+    assert pop_pooled_scene(memory_conn, tagged_input)["scene"].scene_id == "new"
+
+
+def test_pooled_scene_interrupts_without_llm_calls(mock_scene, mock_tagger_output) -> None:
+    graph = build_graph().compile(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": "pooled"}}
+    with patch("openpraxis.nodes.practice.get_backend", side_effect=AssertionError("no LLM call")):
+        result = graph.invoke(
+            {
+                "input_id": "in-1",
+                "raw_text": "RAG report",
+                "tagger_output": mock_tagger_output,
+                "should_practice": True,
+                "scene": mock_scene,
+                "practice_messages": [PracticeMessage(role="coach", content="Walk me through it.")],
+            },
+            config=config,
+        )
+    assert result["__interrupt__"][0].value["coach_message"] == "Walk me through it."
+    assert graph.get_state(config).next == ("human_turn",)
+
+
+@pytest.mark.usefixtures("mock_llm")
+def test_pooled_scene_resumes_to_coach(mock_scene, mock_tagger_output) -> None:
+    graph = build_graph().compile(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": "pooled-resume"}}
+    graph.invoke(
+        {
+            "input_id": "in-1",
+            "raw_text": "RAG report",
+            "tagger_output": mock_tagger_output,
+            "should_practice": True,
+            "scene": mock_scene,
+            "practice_messages": [PracticeMessage(role="coach", content="Walk me through it.")],
+        },
+        config=config,
+    )
+    result = graph.invoke(Command(resume="my answer"), config=config)
+    assert [m.role for m in result["practice_messages"]] == ["coach", "user", "coach"]
@@ -0,0 +1,117 @@
+"""Provider rate limiter tests (fake clock, no network)."""
+
+import threading
+import time
+
+import httpx
+import pytest
+
+from openpraxis.ratelimit import (
+    RateLimiter,
+    TokenBucket,
+    estimate_tokens,
+    observe_response,
+    parse_duration,
+    retry_after_seconds,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_parse_duration_and_retry_after() -> None:
+    assert parse_duration("20") == 20
+    assert parse_duration("6m0s") == 360
+    assert parse_duration("1.5s") == 1.5
+    assert parse_duration("250ms") == 0.25
+    assert parse_duration("soon") is None
+    assert retry_after_seconds({"retry-after-ms": "1500", "retry-after": "9"}) == 1.5
+    assert retry_after_seconds({"x-ratelimit-reset-requests": "2s"}) == 2
+    assert retry_after_seconds({}) is None
+
+
+def test_estimate_tokens_counts_prompt_and_reply_reserve() -> None:
+    assert estimate_tokens([{"role": "user", "content": "x" * 400}], reserve=0) == 100
+    assert estimate_tokens([], reserve=512) == 512
+
+
+def test_token_bucket_refills_and_adopts_provider_limits() -> None:
+    bucket = TokenBucket(60, period=60.0, now=0.0)
+    bucket.take(60, 0.0)
+    assert bucket.wait_time(1, 0.0) == pytest.approx(1.0)
+    assert bucket.wait_time(1, 1.0) == 0.0
+    # Unknown limit: unbounded until the headers say otherwise.
+    learned = TokenBucket(now=0.0)
+    assert learned.wait_time(10_000, 0.0) == 0.0
+    learned.set_limit(500, remaining=2, now=0.0)
+    assert (learned.capacity, learned.level) == (500, 2)
+
+
+def test_requests_wait_for_the_rpm_bucket() -> None:
+    clock = _Clock()
+    limiter = RateLimiter(rpm=2, clock=clock)
+    limiter.release(limiter.acquire(10))
+    limiter.release(limiter.acquire(10))
+    with limiter._cond:
+        assert limiter._try_admit(10) == pytest.approx(30.0)
+    clock.now += 30
+    limiter.release(limiter.acquire(10))
+
+
+def test_aimd_grows_on_success_and_halves_once_per_throttle_episode() -> None:
+    clock = _Clock()
+    limiter = RateLimiter(initial_concurrency=4, max_concurrency=8, clock=clock)
+    for _ in range(8):
+        limiter.release(limiter.acquire(1))
+    assert 5 < limiter.concurrency < 6
+
+    grown = limiter.concurrency
+    limiter.throttle(retry_after=2.0)
+    limiter.throttle(retry_after=2.0)  # a second 429 from the same burst
+    assert limiter.concurrency == pytest.approx(grown / 2)
+    assert limiter.paused_until == clock.now + 2.0
+    with limiter._cond:
+        assert limiter._try_admit(1) == pytest.approx(2.0)
+    clock.now += 2.0
+    limiter.throttle()
+    assert limiter.concurrency == pytest.approx(grown / 4)
+
+
+def test_concurrency_limit_blocks_until_a_slot_is_released() -> None:
+    limiter = RateLimiter(initial_concurrency=1, max_concurrency=1)
+    first = limiter.acquire(1)
+    admitted = threading.Event()
+    thread = threading.Thread(target=lambda: (limiter.acquire(1), admitted.set()))
+    thread.start()
+    time.sleep(0.05)
+    assert not admitted.is_set()
+    limiter.release(first)
+    thread.join(timeout=2)
+    assert admitted.is_set()
+
+
+def test_response_hook_feeds_headers_and_429s_to_the_current_call() -> None:
+    limiter = RateLimiter(initial_concurrency=4)
+    headers = {
+        "x-ratelimit-limit-requests": "500",
+        "x-ratelimit-remaining-requests": "499",
+        "x-ratelimit-limit-tokens": "30000",
+        "x-ratelimit-remaining-tokens": "29000",
+    }
+    with limiter.slot(100):
+        observe_response(httpx.Response(200, headers=headers))
+    assert (limiter.requests.capacity, limiter.tokens.capacity) == (500, 30000)
+    assert limiter.tokens.level <= 29000
+
+    with pytest.raises(RuntimeError), limiter.slot(100) as permit:
+        observe_response(httpx.Response(429, headers={"retry-after": "3"}))
+        raise RuntimeError("rate limited")
+    assert permit.throttled
+    assert limiter.concurrency < 4
+    # Outside a limited call the hook does nothing.
+    observe_response(httpx.Response(429))
@@ -0,0 +1,122 @@
+"""Prompt-version tracking and stale-row reprocessing tests."""
+
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from openpraxis.db import (
+    count_stale_rows,
+    create_input,
+    create_response,
+    ensure_schema,
+    get_connection,
+    get_insight_response_ids,
+    get_insights,
+    get_tagger_input_ids,
+    save_insight,
+    save_scene,
+    save_tagger_output,
+    update_response_performance,
+)
+from openpraxis.prompts import PROMPTS, get_prompt_version, get_prompt_versions, prompt_version
+from openpraxis.reprocess import plan_reprocess, run_reprocess
+
+
+@pytest.fixture
+def memory_conn() -> sqlite3.Connection:
+    conn = get_connection(Path(":memory:"))
+    ensure_schema(conn)
+    return conn
+
+
+@pytest.fixture
+def stored_run(memory_conn, mock_tagger_output, mock_scene, mock_performance, mock_insight_list):
+    """One input with a tagger output, scene, evaluated response and insight card (no versions)."""
+    create_input(memory_conn, "in-1", None, "hash-1", "RAG report")
+    save_tagger_output(memory_conn, "in-1", mock_tagger_output)
+    save_scene(memory_conn, "in-1", mock_scene)
+    resp_id = create_response(memory_conn, mock_scene.scene_id, "my answer")
+    update_response_performance(memory_conn, resp_id, mock_performance)
+    save_insight(memory_conn, "in-1", mock_scene.scene_id, resp_id, mock_insight_list.cards[0])
+    return resp_id
+
+
+def test_prompt_versions_are_stable_fingerprints() -> None:
+    versions = get_prompt_versions()
+    assert set(versions) == set(PROMPTS)
+    assert versions["tagger"] == get_prompt_version("tagger")
+    assert len(set(versions.values())) == len(versions)
+    assert prompt_version("a") != prompt_version("b")
+
+
+def test_tagger_version_covers_the_reduce_prompt(monkeypatch: pytest.MonkeyPatch) -> None:
+    import openpraxis.prompts as prompts_module
+
+    before = get_prompt_version("tagger")
+    monkeypatch.setattr(prompts_module, "get_tagger_reduce_system_prompt", lambda: "changed")
+    assert get_prompt_version("tagger") != before
+
+
+def test_stale_queries(memory_conn, stored_run, mock_tagger_output) -> None:
+    current = get_prompt_versions()
+    assert get_tagger_input_ids(memory_conn, stale_for=current["tagger"]) == ["in-1"]
+    assert get_insight_response_ids(memory_conn, stale_for=current["insight_generator"]) == [stored_run]
+    assert count_stale_rows(memory_conn, current) == {
+        "tagger": 1,
+        "practice_generator": 1,
+        "practice_evaluator": 1,
+        "insight_generator": 1,
+    }
+
+    save_tagger_output(memory_conn, "in-1", mock_tagger_output, "m", current["tagger"])
+    assert get_tagger_input_ids(memory_conn, stale_for=current["tagger"]) == []
+    assert get_tagger_input_ids(memory_conn) == ["in-1"]
+
+
+@pytest.mark.usefixtures("mock_llm")
+def test_run_reprocess_refreshes_stale_rows(memory_conn, stored_run) -> None:
+    plan = plan_reprocess(memory_conn)
+    assert plan == {"tagger": ["in-1"], "insight_generator": [stored_run]}
+
+    summary = run_reprocess(memory_conn, plan)
+
+    assert summary.updated == {"tagger": 1, "insight_generator": 1}
+    assert summary.failed == 0
+    assert plan_reprocess(memory_conn) == {"tagger": [], "insight_generator": []}
+    versions = {
+        r["prompt_version"]
+        for r in memory_conn.execute("SELECT prompt_version FROM insights")
+    }
+    assert versions == {get_prompt_version("insight_generator")}
+    assert len(get_insights(memory_conn, input_id="in-1")) >= 1
+
+
+@pytest.mark.usefixtures("mock_llm")
+def test_run_reprocess_only_touches_stale_stage(memory_conn, stored_run) -> None:
+    plan = plan_reprocess(memory_conn, stages=("insight_generator",))
+    assert "tagger" not in plan
+    with patch("openpraxis.nodes.tagger.tagger_node") as tagger:
+        summary = run_reprocess(memory_conn, plan)
+    tagger.assert_not_called()
+    assert summary.updated == {"insight_generator": 1}
+
+
+def test_run_reprocess_records_failures(memory_conn, stored_run) -> None:
+    import openpraxis.runtime as runtime
+    from tests.conftest import _MockBackend
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("provider down")
+
+    runtime.set_backend(_MockBackend(boom, boom))
+    try:
+        summary = run_reprocess(memory_conn, plan_reprocess(memory_conn))
+    finally:
+        runtime.reset()
+
+    assert summary.failed == 2
+    assert {f.stage for f in summary.failures} == {"tagger", "insight_generator"}
+    # The original cards survive a failed regeneration.
+    assert memory_conn.execute("SELECT COUNT(*) FROM insights").fetchone()[0] == 1
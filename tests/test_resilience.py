@@ -0,0 +1,230 @@
+"""Retry policy, circuit breaker and ResilientBackend tests."""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import httpx
+import openai
+import pytest
+from pydantic import BaseModel
+
+from openpraxis.llm_backends.base import LLMBackend
+from openpraxis.llm_backends.resilient_backend import ResilientBackend
+from openpraxis.ratelimit import RateLimiter
+from openpraxis.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ErrorKind,
+    LLMOutputError,
+    RetryPolicy,
+    acall_with_retries,
+    attempt_timeout,
+    call_with_retries,
+    classify_error,
+    queued,
+    reset_breakers,
+)
+
+FAST = RetryPolicy(backoff_base_seconds=0, backoff_max_seconds=0)
+
+
+class _Reply(BaseModel):
+    text: str
+
+
+def _status_error(status: int, headers: dict | None = None) -> openai.APIStatusError:
+    request = httpx.Request("POST", "https://llm.test/v1/chat/completions")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return openai.APIStatusError(f"HTTP {status}", response=response, body=None)
+
+
+class _Flaky(LLMBackend):
+    """Raises the queued errors in turn, then answers."""
+
+    def __init__(self, *errors: Exception) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    def _next(self) -> _Reply:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return _Reply(text="ok")
+
+    def call_structured(self, *args, **kwargs):
+        return self._next()
+
+    def call_chat_structured(self, *args, **kwargs):
+        return self._next()
+
+    def call_chat_structured_stream(self, messages, response_model, on_partial, **kwargs):
+        on_partial({"text": "o"})
+        return self._next()
+
+    def call_vision_text(self, *args, **kwargs):
+        return self._next().text
+
+
+@pytest.fixture(autouse=True)
+def _fresh_breakers():
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
+def test_errors_are_classified() -> None:
+    request = httpx.Request("POST", "https://llm.test")
+    assert classify_error(openai.APIConnectionError(request=request)) == ErrorKind.TRANSPORT
+    assert classify_error(TimeoutError()) == ErrorKind.TRANSPORT
+    assert classify_error(_status_error(429)) == ErrorKind.RATE_LIMIT
+    assert classify_error(_status_error(503)) == ErrorKind.SERVER
+    assert classify_error(_status_error(400)) == ErrorKind.FATAL
+    assert classify_error(LLMOutputError("empty")) == ErrorKind.OUTPUT
+    assert classify_error(ValueError("bad config")) == ErrorKind.FATAL
+
+
+def test_backoff_is_jittered_below_the_cap_and_honours_retry_after() -> None:
+    policy = RetryPolicy(backoff_base_seconds=1, backoff_max_seconds=4)
+    delays = [policy.backoff(5) for _ in range(50)]
+    assert all(0 <= d <= 4 for d in delays) and len(set(delays)) > 1
+    assert policy.backoff(1, retry_after=7) >= 7
+
+
+def test_server_errors_are_retried_until_success() -> None:
+    inner = _Flaky(_status_error(502), _status_error(503))
+    backend = ResilientBackend(inner, FAST, breaker_name="test")
+    assert backend.call_chat_structured([], _Reply).text == "ok"
+    assert inner.calls == 3
+
+
+def test_client_errors_fail_at_once_and_output_errors_retry_once() -> None:
+    inner = _Flaky(_status_error(400))
+    with pytest.raises(openai.APIStatusError):
+        ResilientBackend(inner, FAST, breaker_name="test").call_chat_structured([], _Reply)
+    assert inner.calls == 1
+
+    inner = _Flaky(LLMOutputError("empty"), LLMOutputError("empty"), LLMOutputError("empty"))
+    with pytest.raises(LLMOutputError):
+        ResilientBackend(inner, FAST, breaker_name="test").call_chat_structured([], _Reply)
+    assert inner.calls == FAST.output_attempts
+
+
+def test_rate_limit_waits_for_retry_after() -> None:
+    inner = _Flaky(_status_error(429, {"retry-after": "3"}))
+    with patch("openpraxis.resilience.time.sleep") as sleep:
+        ResilientBackend(inner, FAST, breaker_name="test").call_chat_structured([], _Reply)
+    sleep.assert_called_once_with(3.0)
+
+
+def test_stream_is_not_retried_after_partial_output() -> None:
+    inner = _Flaky(_status_error(503))
+    seen: list[dict] = []
+    with pytest.raises(openai.APIStatusError):
+        ResilientBackend(inner, FAST, breaker_name="test").call_chat_structured_stream(
+            [], _Reply, seen.append
+        )
+    assert inner.calls == 1 and seen == [{"text": "o"}]
+
+
+def test_breaker_opens_fails_fast_then_recovers_through_a_trial_call() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10, clock=lambda: now[0])
+    policy = RetryPolicy(max_attempts=1)
+    inner = _Flaky(_status_error(503), _status_error(503), _status_error(503))
+
+    for _ in range(2):
+        with pytest.raises(openai.APIStatusError):
+            call_with_retries(lambda: inner.call_structured(), policy, breaker)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        call_with_retries(lambda: inner.call_structured(), policy, breaker)
+    assert inner.calls == 2
+
+    now[0] = 10.0  # half-open: the failed trial re-opens the circuit
+    with pytest.raises(openai.APIStatusError):
+        call_with_retries(lambda: inner.call_structured(), policy, breaker)
+    assert breaker.state == "open"
+
+    now[0] = 20.0
+    assert call_with_retries(lambda: inner.call_structured(), policy, breaker).text == "ok"
+    assert breaker.state == "closed"
+
+
+def test_each_attempt_gets_a_timeout_within_the_call_deadline() -> None:
+    policy = RetryPolicy(attempt_timeout_seconds=30, deadline_seconds=5)
+    seen = call_with_retries(attempt_timeout, policy)
+    assert seen is not None and 4 < seen <= 5
+    assert attempt_timeout() is None
+
+
+def test_async_attempt_is_cut_off_at_its_timeout() -> None:
+    class _Hung(_Flaky):
+        async def acall_chat_structured(self, *args, **kwargs):
+            self.calls += 1
+            await asyncio.sleep(10)
+
+    inner = _Hung()
+    policy = RetryPolicy(
+        max_attempts=2, backoff_base_seconds=0, attempt_timeout_seconds=0.05, deadline_seconds=1
+    )
+    backend = ResilientBackend(inner, policy, breaker_name="test")
+    with pytest.raises(TimeoutError):
+        asyncio.run(backend.acall_chat_structured([], _Reply))
+    assert inner.calls == 2
+
+
+def _busy_limiter(hold_seconds: float) -> RateLimiter:
+    """A one-slot limiter whose slot is taken for ``hold_seconds``."""
+    limiter = RateLimiter(initial_concurrency=1, max_concurrency=1)
+    permit = limiter.acquire(1)
+    threading.Timer(hold_seconds, limiter.release, (permit,)).start()
+    return limiter
+
+
+def test_time_queued_on_the_rate_limiter_is_not_charged_to_the_attempt() -> None:
+    limiter = _busy_limiter(0.3)
+    breaker = CircuitBreaker()
+    policy = RetryPolicy(max_attempts=1, attempt_timeout_seconds=0.2, deadline_seconds=0.25)
+
+    def call() -> float:
+        with limiter.slot(1, queued()):
+            return attempt_timeout()
+
+    assert call_with_retries(call, policy, breaker) > 0.15
+    assert breaker.failures == 0
+
+
+def test_async_attempt_timeout_starts_once_the_limiter_admits_the_call() -> None:
+    limiter = _busy_limiter(0.3)
+    policy = RetryPolicy(max_attempts=1, attempt_timeout_seconds=0.2, deadline_seconds=0.25)
+
+    async def call() -> str:
+        async with limiter.aslot(1, queued()):
+            await asyncio.sleep(0.1)
+        return "ok"
+
+    assert asyncio.run(acall_with_retries(call, policy)) == "ok"
+
+
+def test_cancelled_trial_call_frees_the_trial_slot() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=lambda: now[0])
+    breaker.record_failure(ErrorKind.SERVER)
+    now[0] = 10.0
+
+    async def hang() -> str:
+        await asyncio.sleep(10)
+        return "late"
+
+    async def cancel_trial() -> None:
+        task = asyncio.ensure_future(acall_with_retries(hang, RetryPolicy(), breaker))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_trial())
+    # The next call becomes the trial instead of failing fast forever.
+    assert call_with_retries(lambda: "ok", RetryPolicy(), breaker) == "ok"
+    assert breaker.state == "closed"
@@ -1,19 +1,26 @@
 """Runtime execution mode and backend management tests."""
 
-import os
-
 import pytest
 
+import openpraxis.config as config_module
 from openpraxis import runtime
 from openpraxis.llm_backends.base import LLMBackend
+from openpraxis.llm_backends.cached_backend import CachedBackend
 from openpraxis.llm_backends.cli_backend import CLIBackend
+from openpraxis.llm_backends.hedged_backend import HedgedBackend
 from openpraxis.llm_backends.openclaw_backend import OpenClawBackend
-from openpraxis.runtime import ExecutionMode
+from openpraxis.llm_backends.resilient_backend import ResilientBackend
+from openpraxis.runtime import ExecutionMode, unwrap_backend
 
 
 @pytest.fixture(autouse=True)
-def _reset_runtime():
-    """Ensure clean runtime state for every test."""
+def _reset_runtime(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    """Ensure clean runtime state (and an isolated config dir) for every test."""
+    cfg_dir = tmp_path / ".openpraxis"
+    monkeypatch.setattr(config_module, "_DEFAULT_CONFIG_DIR", cfg_dir)
+    monkeypatch.setattr(config_module, "_DEFAULT_CONFIG_PATH", cfg_dir / "config.toml")
+    monkeypatch.setattr(config_module, "_DEFAULT_DATA_DIR", cfg_dir / "data")
+    monkeypatch.setattr(config_module, "_settings", None)
     runtime.reset()
     yield
     runtime.reset()
@@ -42,13 +49,56 @@ def test_auto_detect_standalone_without_env(monkeypatch: pytest.MonkeyPatch) ->
 
 def test_get_backend_returns_cli_by_default() -> None:
     backend = runtime.get_backend()
-    assert isinstance(backend, CLIBackend)
+    assert isinstance(unwrap_backend(backend), CLIBackend)
 
 
 def test_get_backend_returns_openclaw_when_mode_set() -> None:
     runtime.set_execution_mode(ExecutionMode.OPENCLAW)
     backend = runtime.get_backend()
-    assert isinstance(backend, OpenClawBackend)
+    assert isinstance(unwrap_backend(backend), OpenClawBackend)
+
+
+def test_get_backend_wraps_response_cache_by_default() -> None:
+    backend = runtime.get_backend()
+    assert isinstance(backend, CachedBackend)
+    assert backend.namespace == ExecutionMode.STANDALONE_CLI.value
+
+
+def test_retry_policy_sits_beneath_the_cache() -> None:
+    config_module._DEFAULT_CONFIG_DIR.mkdir(parents=True)
+    config_module._DEFAULT_CONFIG_PATH.write_text("[llm.resilience]\nmax_attempts = 2\n")
+    resilient = runtime.get_backend().inner
+    assert isinstance(resilient, ResilientBackend)
+    assert resilient.policy.max_attempts == 2
+    assert isinstance(resilient.inner, CLIBackend)
+
+
+def test_hedging_is_opt_in_and_wraps_the_retry_policy(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("MOONSHOT_API_KEY", "sk-kimi")
+    config_module._DEFAULT_CONFIG_DIR.mkdir(parents=True)
+    config_module._DEFAULT_CONFIG_PATH.write_text(
+        '[llm.hedge]\nenabled = true\nprovider = "kimi"\n'
+    )
+    hedged = runtime.get_backend().inner
+    assert isinstance(hedged, HedgedBackend)
+    assert hedged.provider == "kimi"
+    assert isinstance(hedged.inner, ResilientBackend)
+
+
+def test_hedging_to_a_provider_without_a_key_is_refused(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("MOONSHOT_API_KEY", raising=False)
+    config_module._DEFAULT_CONFIG_DIR.mkdir(parents=True)
+    config_module._DEFAULT_CONFIG_PATH.write_text(
+        '[llm]\napi_key = "sk-openai-secret"\n\n[llm.hedge]\nenabled = true\nprovider = "kimi"\n'
+    )
+    with pytest.raises(ValueError, match=r"\[llm.hedge\].*MOONSHOT_API_KEY"):
+        runtime.get_backend()
+
+
+def test_get_backend_without_cache_when_disabled() -> None:
+    config_module._DEFAULT_CONFIG_DIR.mkdir(parents=True)
+    config_module._DEFAULT_CONFIG_PATH.write_text("[cache]\nenabled = false\n")
+    assert isinstance(unwrap_backend(runtime.get_backend()), CLIBackend)
 
 
 def test_set_backend_overrides_auto() -> None:
@@ -69,7 +119,7 @@ def test_set_execution_mode_resets_cached_backend() -> None:
     _ = runtime.get_backend()  # cache a CLIBackend
     runtime.set_execution_mode(ExecutionMode.OPENCLAW)
     backend = runtime.get_backend()
-    assert isinstance(backend, OpenClawBackend)
+    assert isinstance(unwrap_backend(backend), OpenClawBackend)
 
 
 def test_reset_clears_everything() -> None:
@@ -77,4 +127,4 @@ def test_reset_clears_everything() -> None:
     _ = runtime.get_backend()
     runtime.reset()
     assert runtime.get_execution_mode() == ExecutionMode.STANDALONE_CLI
-    assert isinstance(runtime.get_backend(), CLIBackend)
+    assert isinstance(unwrap_backend(runtime.get_backend()), CLIBackend)
@@ -0,0 +1,140 @@
+"""Spaced-repetition scheduler and due-queue tests."""
+
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from openpraxis.db import (
+    count_due_reviews,
+    create_input,
+    ensure_schema,
+    get_connection,
+    get_due_reviews,
+    get_review_forecast,
+    get_review_state,
+    save_review_state,
+    save_scene,
+)
+from openpraxis.models import PerformanceSignal, PracticePerformance, ReviewState
+from openpraxis.scheduler import (
+    MAX_DIFFICULTY,
+    REVIEW_STEPS_DAYS,
+    format_timestamp,
+    next_review,
+    record_review,
+    review_grade,
+)
+
+NOW = datetime(2026, 3, 1, 9, 0, 0)
+
+
+def _performance(score: int) -> PracticePerformance:
+    return PracticePerformance(
+        performance_signal=PerformanceSignal(
+            clarity=score, reasoning_depth=score, decision_quality=score, communication=score
+        ),
+        improvement_vectors=[],
+    )
+
+
+@pytest.fixture
+def memory_conn() -> sqlite3.Connection:
+    conn = get_connection(Path(":memory:"))
+    ensure_schema(conn)
+    return conn
+
+
+@pytest.mark.parametrize(
+    ("score", "grade"),
+    [(0, 0), (1, 1), (3, 2), (4, 2), (5, 3), (6, 3), (7, 4), (8, 4), (9, 5), (10, 5)],
+)
+def test_review_grade(score: int, grade: int) -> None:
+    assert review_grade(_performance(score)) == grade
+
+
+def test_review_grade_rounds_a_mixed_mean_half_up() -> None:
+    performance = _performance(5)
+    performance.performance_signal.clarity = 4
+    performance.performance_signal.communication = 6
+    assert review_grade(performance) == 3
+    performance.performance_signal.clarity = 3
+    # Mean 4.75 -> 2.375.
+    assert review_grade(performance) == 2
+
+
+def test_passing_reviews_follow_fixed_steps_then_grow() -> None:
+    state = ReviewState(scene_id="s", input_id="i")
+    intervals = []
+    for _ in range(len(REVIEW_STEPS_DAYS) + 2):
+        state = next_review(state, 4, NOW)
+        intervals.append(state.stability)
+    assert intervals[: len(REVIEW_STEPS_DAYS)] == [float(d) for d in REVIEW_STEPS_DAYS]
+    assert intervals[-2] > REVIEW_STEPS_DAYS[-1]
+    assert intervals[-1] > intervals[-2]
+    assert state.next_due == format_timestamp(NOW + timedelta(days=state.stability))
+    assert state.last_reviewed_at == format_timestamp(NOW)
+
+
+def test_lapse_resets_interval_and_raises_difficulty() -> None:
+    state = ReviewState(scene_id="s", input_id="i", reps=5, stability=40.0, difficulty=5.0)
+    lapsed = next_review(state, 1, NOW)
+    assert (lapsed.reps, lapsed.lapses) == (0, 1)
+    assert lapsed.stability == REVIEW_STEPS_DAYS[0]
+    assert lapsed.difficulty > state.difficulty
+
+    for _ in range(20):
+        lapsed = next_review(lapsed, 0, NOW)
+    assert lapsed.difficulty == MAX_DIFFICULTY
+
+
+def test_harder_scenes_grow_more_slowly() -> None:
+    base = {"scene_id": "s", "input_id": "i", "reps": len(REVIEW_STEPS_DAYS), "stability": 14.0}
+    easy = next_review(ReviewState(**base, difficulty=2.0), 4, NOW)
+    hard = next_review(ReviewState(**base, difficulty=9.0), 4, NOW)
+    assert easy.stability > hard.stability
+
+
+def test_record_review_persists_state(memory_conn, mock_scene) -> None:
+    create_input(memory_conn, "in-1", None, "h1", "text")
+    save_scene(memory_conn, "in-1", mock_scene)
+    record_review(memory_conn, mock_scene.scene_id, "in-1", _performance(8), NOW)
+    record_review(memory_conn, mock_scene.scene_id, "in-1", _performance(8), NOW)
+    state = get_review_state(memory_conn, mock_scene.scene_id)
+    assert state is not None
+    assert (state.reps, state.stability, state.last_grade) == (2, float(REVIEW_STEPS_DAYS[1]), 4)
+
+
+def test_due_queue_orders_by_due_date_and_uses_index(memory_conn, mock_scene) -> None:
+    create_input(memory_conn, "in-1", None, "h1", "text")
+    for i, offset in enumerate([-3, -1, 2, 5]):
+        scene = mock_scene.model_copy(update={"scene_id": f"scene-{i}"})
+        save_scene(memory_conn, "in-1", scene)
+        save_review_state(
+            memory_conn,
+            ReviewState(
+                scene_id=scene.scene_id,
+                input_id="in-1",
+                next_due=format_timestamp(NOW + timedelta(days=offset)),
+            ),
+        )
+    now = format_timestamp(NOW)
+    due = get_due_reviews(memory_conn, now, limit=10)
+    assert [d["scene_id"] for d in due] == ["scene-0", "scene-1"]
+    assert due[0]["scene"].task == mock_scene.task
+    assert count_due_reviews(memory_conn, now) == 2
+    assert get_review_forecast(
+        memory_conn, now, format_timestamp(NOW + timedelta(days=3))
+    ) == [("2026-03-03", 1)]
+
+    plan = " ".join(
+        r["detail"]
+        for r in memory_conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM review_schedule WHERE next_due <= ? "
+            "ORDER BY next_due LIMIT ?",
+            (now, 20),
+        )
+    )
+    assert "idx_review_schedule_due" in plan
+    assert "SCAN review_schedule" not in plan
@@ -0,0 +1,178 @@
+"""Semantic and keyword search tests."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from openpraxis.db import (
+    FTS_MARK_END,
+    FTS_MARK_START,
+    count_search_pending,
+    create_input,
+    create_response,
+    delete_insights_for_response,
+    ensure_schema,
+    fts_query,
+    get_connection,
+    get_search_pending,
+    save_insight,
+    save_scene,
+    save_tagger_output,
+    search_fts,
+)
+from openpraxis.models import InsightCard, InsightType
+
+
+@pytest.fixture
+def memory_conn() -> sqlite3.Connection:
+    conn = get_connection(Path(":memory:"))
+    ensure_schema(conn)
+    return conn
+
+
+@pytest.fixture
+def library(memory_conn, mock_tagger_output, mock_scene):
+    create_input(memory_conn, "in-1", "/notes/rag.md", "h1", "RAG report")
+    save_tagger_output(memory_conn, "in-1", mock_tagger_output)
+    save_scene(memory_conn, "in-1", mock_scene)
+    resp_id = create_response(memory_conn, mock_scene.scene_id, "answer")
+    for title, what in [
+        ("Missing tradeoff framing", "Did not weigh latency against recall when choosing rerankers"),
+        ("Vague metrics", "Claimed the pipeline was better without any evaluation numbers"),
+    ]:
+        card = InsightCard(
+            insight_title=title,
+            insight_type=InsightType.TRADEOFF_GAP,
+            what_happened=what,
+            why_it_matters="m",
+            upgrade_pattern="u",
+            micro_practice="p",
+            concepts=[],
+            skills=[],
+            scenes=[],
+            intensity=3,
+        )
+        save_insight(memory_conn, "in-1", mock_scene.scene_id, resp_id, card)
+    return resp_id
+
+
+def test_writes_are_queued_for_indexing(memory_conn, library) -> None:
+    pending = get_search_pending(memory_conn, 100)
+    assert sorted(kind for kind, _ in pending) == ["input", "insight", "insight", "scene"]
+
+    delete_insights_for_response(memory_conn, library)
+    assert count_search_pending(memory_conn) == 2
+
+
+def test_hashing_embedder_is_deterministic_and_normalized() -> None:
+    np = pytest.importorskip("numpy")
+    from openpraxis.embeddings import HashingEmbedder
+
+    embedder = HashingEmbedder(dim=64)
+    a = embedder.embed(["latency versus recall", ""])
+    b = embedder.embed(["latency versus recall"])
+    assert a.shape == (2, 64) and a.dtype == np.float32
+    assert np.allclose(a[0], b[0])
+    assert np.isclose(np.linalg.norm(a[0]), 1.0)
+
+
+def test_vector_index_brute_force_and_ivf_agree(tmp_path) -> None:
+    np = pytest.importorskip("numpy")
+    from openpraxis.search import VectorIndex
+
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(8, 32))
+    data = np.repeat(centers, 200, axis=0) + 0.05 * rng.normal(size=(1600, 32))
+    data = (data / np.linalg.norm(data, axis=1, keepdims=True)).astype(np.float32)
+
+    index = VectorIndex(tmp_path / "idx")
+    index.reset("test", 32)
+    assert index.append(data[:1000]) == 0
+    assert index.append(data[1000:]) == 1000
+    assert index.rows == 1600
+
+    query = data[1234]
+    exact = index.search(query, 5)
+    assert exact[0][0] == 1234
+    assert [s for _, s in exact] == sorted((s for _, s in exact), reverse=True)
+
+    index.build_ivf(nlist=8)
+    assert index.has_ivf
+    assert index.search(query, 1, nprobe=2)[0][0] == 1234
+    # Rows appended after training are assigned to a list incrementally.
+    row = index.append(data[5:6])
+    assert row in {r for r, _ in index.search(data[5], 3, nprobe=2)}
+
+
+def test_sync_and_search_ranks_relevant_card_first(memory_conn, library, tmp_path) -> None:
+    pytest.importorskip("numpy")
+    from openpraxis.embeddings import HashingEmbedder
+    from openpraxis.search import open_index, search, sync_index
+
+    embedder = HashingEmbedder()
+    index = open_index(tmp_path / "idx", embedder, memory_conn)
+    assert sync_index(memory_conn, index, embedder, batch_size=2) == 4
+    assert count_search_pending(memory_conn) == 0
+
+    hits = search(memory_conn, index, embedder, "latency recall rerankers tradeoff")
+    assert hits[0].kind == "insight"
+    assert hits[0].title == "Missing tradeoff framing"
+
+    only_scenes = search(memory_conn, index, embedder, "latency", kinds=("scene",))
+    assert {h.kind for h in only_scenes} == {"scene"}
+
+    # Deleted cards disappear from results without re-indexing.
+    delete_insights_for_response(memory_conn, library)
+    hits = search(memory_conn, index, embedder, "latency recall rerankers tradeoff")
+    assert all(h.kind != "insight" for h in hits)
+
+
+def test_embedder_change_reindexes(memory_conn, library, tmp_path) -> None:
+    pytest.importorskip("numpy")
+    from openpraxis.embeddings import HashingEmbedder
+    from openpraxis.search import open_index, sync_index
+
+    first = HashingEmbedder(dim=128)
+    index = open_index(tmp_path / "idx", first, memory_conn)
+    sync_index(memory_conn, index, first)
+
+    second = HashingEmbedder(dim=256)
+    index = open_index(tmp_path / "idx", second, memory_conn)
+    assert index.rows == 0 and index.dim == 256
+    assert count_search_pending(memory_conn) == 4
+
+
+def test_fts_query_quotes_words_and_keeps_prefixes() -> None:
+    assert fts_query('rerank* "latency" OR') == '"rerank"* """latency""" "OR"'
+    assert fts_query("  ") == ""
+
+
+def test_fts_index_follows_inserts_and_deletes(memory_conn, library) -> None:
+    hits = search_fts(memory_conn, "latency")
+    assert [h["title"] for h in hits] == ["Missing tradeoff framing"]
+    assert f"{FTS_MARK_START}latency{FTS_MARK_END}" in hits[0]["snippet"]
+
+    # The Tagger summary is indexed with the input; prefix and diacritics fold.
+    hits = search_fts(memory_conn, "pipéline archit*", kinds=("input",))
+    assert [(h["kind"], h["ref_id"]) for h in hits] == [("input", "in-1")]
+
+    delete_insights_for_response(memory_conn, library)
+    assert search_fts(memory_conn, "latency") == []
+    assert memory_conn.execute("SELECT COUNT(*) FROM insights_fts").fetchone()[0] == 0
+
+
+def test_fts_merges_kinds_by_score(memory_conn, library) -> None:
+    # "pipeline" is in the input's raw text and summary and in one card's body.
+    hits = search_fts(memory_conn, "pipeline")
+    assert {h["kind"] for h in hits} == {"input", "insight"}
+    assert hits[0]["kind"] == "input"
+    assert hits == sorted(hits, key=lambda h: h["score"], reverse=True)
+
+
+def test_search_text_without_numpy(memory_conn, library) -> None:
+    from openpraxis.search import search_text
+
+    hits = search_text(memory_conn, "evaluation numbers", kinds=("insight",))
+    assert [h.title for h in hits] == ["Vague metrics"]
+    assert hits[0].score > 0
@@ -0,0 +1,110 @@
+"""praxis serve daemon and thin-client forwarding tests."""
+
+import io
+import socket
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import openpraxis.config as config_module
+from openpraxis import client
+from openpraxis.client import caller_env, request, run_remote
+from openpraxis.config import StorageSettings
+from openpraxis.db import ensure_schema, get_connection
+from openpraxis.server import make_server
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    """A daemon on a temporary socket, serving a temporary DB."""
+    db_path = tmp_path / "praxis.db"
+    conn = get_connection(db_path)
+    ensure_schema(conn)
+    conn.close()
+    settings = MagicMock()
+    settings.db_path = db_path
+    settings.storage = StorageSettings()
+    monkeypatch.delenv("OPENPRAXIS_NO_DAEMON", raising=False)
+
+    socket_path = tmp_path / "praxis.sock"
+    server = make_server(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    with patch("openpraxis.cli.get_settings", return_value=settings):
+        thread.start()
+        yield socket_path
+        server.shutdown()
+        server.server_close()
+    thread.join()
+
+
+def test_health_and_run(daemon) -> None:
+    assert request("GET", "/health", socket_path=daemon)["ok"] is True
+    reply = request("POST", "/run", {"args": ["list"]}, socket_path=daemon)
+    assert reply["exit_code"] == 0
+    assert "Input list" in reply["output"]
+
+
+def test_run_feeds_stdin_and_returns_exit_code(daemon) -> None:
+    reply = request(
+        "POST", "/run", {"args": ["answer", "missing"], "stdin": "my answer\n"}, socket_path=daemon
+    )
+    assert reply["exit_code"] == 1
+    assert "No thread found" in reply["output"]
+
+
+def test_unserved_commands_are_rejected(daemon) -> None:
+    with pytest.raises(RuntimeError, match="not served"):
+        request("POST", "/run", {"args": ["llm", "setup"]}, socket_path=daemon)
+
+
+def test_run_remote_forwards_or_declines(daemon, tmp_path, capsys) -> None:
+    assert run_remote(["list"], daemon) == 0
+    assert "Input list" in capsys.readouterr().out
+    # Global options and unserved commands run locally, as does a missing daemon.
+    assert run_remote(["--provider", "kimi", "list"], daemon) is None
+    assert run_remote(["llm", "show"], daemon) is None
+    assert run_remote(["list"], tmp_path / "absent.sock") is None
+
+
+def test_caller_with_another_environment_runs_locally(
+    daemon, monkeypatch: pytest.MonkeyPatch, capsys
+) -> None:
+    monkeypatch.delenv("OPENPRAXIS_MODE", raising=False)
+    monkeypatch.delenv("DEEPSEEK_API_KEY", raising=False)
+    other = caller_env({"OPENPRAXIS_MODE": "openclaw", "DEEPSEEK_API_KEY": "sk-other"})
+    assert "sk-other" not in str(other)
+    reply = request("POST", "/run", {"args": ["list"], "env": other}, socket_path=daemon)
+    assert reply == {
+        "status": "run_locally",
+        "reason": "caller environment differs: DEEPSEEK_API_KEY, OPENPRAXIS_MODE",
+    }
+
+    # The client falls back to the local CLI, replaying the stdin it already read.
+    monkeypatch.setenv("OPENPRAXIS_MODE", "openclaw")
+    monkeypatch.setattr(sys, "stdin", io.StringIO("my answer\n"))
+    with patch("openpraxis.server.caller_env", return_value=caller_env({})):
+        assert run_remote(["answer", "t-1"], daemon) is None
+    assert sys.stdin.read() == "my answer\n"
+    assert capsys.readouterr().out == ""
+
+
+def test_caller_env_covers_every_provider_key() -> None:
+    assert set(client._KEY_ENV_VARS) == set(config_module._PROVIDER_ENV_KEY_MAP.values())
+
+
+def test_socket_is_private_and_not_shared(daemon) -> None:
+    assert daemon.stat().st_mode & 0o777 == 0o600
+    with pytest.raises(RuntimeError, match="already listening"):
+        make_server(daemon)
+
+
+def test_stale_socket_file_is_replaced(tmp_path) -> None:
+    path = tmp_path / "stale.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+    server = make_server(path)
+    server.server_close()
+    assert path.exists()
@@ -0,0 +1,168 @@
+"""Background job queue and worker tests."""
+
+import sqlite3
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import openpraxis.config as config_module
+from openpraxis.config import Settings
+from openpraxis.db import (
+    complete_job,
+    count_pooled_scenes,
+    create_input,
+    enqueue_job,
+    ensure_schema,
+    extend_job_leases,
+    fail_job,
+    get_connection,
+    get_dead_jobs,
+    get_insights,
+    get_job_counts,
+    get_response_by_scene,
+    get_review_state,
+    get_tagger_output,
+    lease_jobs,
+    release_jobs,
+    retry_dead_jobs,
+    save_scene,
+    save_tagger_output,
+)
+from openpraxis.scheduler import format_timestamp, utc_now
+from openpraxis.worker import backoff_seconds, run_worker
+
+T0 = utc_now()
+
+
+def _at(seconds: int) -> str:
+    return format_timestamp(T0 + timedelta(seconds=seconds))
+
+
+@pytest.fixture
+def memory_conn() -> sqlite3.Connection:
+    conn = get_connection(Path(":memory:"))
+    ensure_schema(conn)
+    return conn
+
+
+def test_a_job_is_leased_to_one_worker_at_a_time(memory_conn) -> None:
+    job_id = enqueue_job(memory_conn, "tag", {"input_id": "in-1"}, available_at=_at(0))
+    [job] = lease_jobs(memory_conn, "w1", _at(1), _at(61))
+    assert (job["id"], job["payload"], job["attempts"]) == (job_id, {"input_id": "in-1"}, 1)
+    assert lease_jobs(memory_conn, "w2", _at(30), _at(90)) == []
+
+    # w1 renews, so the job is still invisible after the original expiry.
+    assert extend_job_leases(memory_conn, "w1", [job_id], _at(120)) == 1
+    assert lease_jobs(memory_conn, "w2", _at(90), _at(150)) == []
+    assert complete_job(memory_conn, job_id, "w1") is True
+    assert get_job_counts(memory_conn) == {}
+
+
+def test_expired_lease_is_taken_over(memory_conn) -> None:
+    job_id = enqueue_job(memory_conn, "tag", {"input_id": "in-1"}, available_at=_at(0))
+    lease_jobs(memory_conn, "w1", _at(1), _at(61))
+    [job] = lease_jobs(memory_conn, "w2", _at(62), _at(122))
+    assert (job["id"], job["attempts"]) == (job_id, 2)
+    # The first worker's late results are refused.
+    assert complete_job(memory_conn, job_id, "w1") is False
+    assert fail_job(memory_conn, job_id, "w1", "late", None) is False
+    assert get_job_counts(memory_conn) == {"leased": 1}
+
+
+def test_failed_job_backs_off_then_dead_letters(memory_conn) -> None:
+    job_id = enqueue_job(memory_conn, "tag", {}, max_attempts=2, available_at=_at(0))
+    lease_jobs(memory_conn, "w1", _at(1), _at(61))
+    assert fail_job(memory_conn, job_id, "w1", "timeout", _at(31)) is True
+    assert lease_jobs(memory_conn, "w1", _at(30), _at(90)) == []
+    [job] = lease_jobs(memory_conn, "w1", _at(31), _at(91))
+    assert job["attempts"] == 2
+    fail_job(memory_conn, job_id, "w1", "timeout again", None)
+
+    assert get_job_counts(memory_conn) == {"dead": 1}
+    [dead] = get_dead_jobs(memory_conn)
+    assert (dead["id"], dead["last_error"]) == (job_id, "timeout again")
+    assert retry_dead_jobs(memory_conn) == 1
+    assert lease_jobs(memory_conn, "w1", format_timestamp(utc_now()), _at(3600))[0]["attempts"] == 1
+
+
+def test_expired_lease_on_last_attempt_is_dead_lettered(memory_conn) -> None:
+    enqueue_job(memory_conn, "tag", {}, max_attempts=1, available_at=_at(0))
+    lease_jobs(memory_conn, "w1", _at(1), _at(61))
+    assert lease_jobs(memory_conn, "w2", _at(62), _at(122)) == []
+    assert get_dead_jobs(memory_conn)[0]["last_error"] == "lease expired"
+
+
+def test_release_hands_jobs_back_without_using_an_attempt(memory_conn) -> None:
+    enqueue_job(memory_conn, "tag", {}, available_at=_at(0))
+    enqueue_job(memory_conn, "insight", {}, available_at=_at(0))
+    leased = lease_jobs(memory_conn, "w1", _at(1), _at(61), kinds=("insight",))
+    assert [j["kind"] for j in leased] == ["insight"]
+    assert release_jobs(memory_conn, "w1") == 1
+    leased = lease_jobs(memory_conn, "w2", _at(2), _at(62), limit=5)
+    assert [j["attempts"] for j in leased] == [1, 1]
+
+
+def test_backoff_doubles_up_to_the_cap() -> None:
+    assert [backoff_seconds(n, 30, 100) for n in (1, 2, 3, 4)] == [30, 60, 100, 100]
+
+
+@pytest.mark.usefixtures("mock_llm")
+def test_worker_tags_then_pools_a_scene(memory_conn) -> None:
+    create_input(memory_conn, "in-1", None, "hash-1", "RAG report")
+    enqueue_job(memory_conn, "tag", {"input_id": "in-1", "generate": True})
+
+    summary = run_worker(memory_conn, concurrency=2, once=True)
+
+    assert (summary.done, summary.retried, summary.dead) == (2, 0, 0)
+    assert get_tagger_output(memory_conn, "in-1") is not None
+    assert count_pooled_scenes(memory_conn, ["in-1"]) == {"in-1": 1}
+    assert get_job_counts(memory_conn) == {}
+
+
+@pytest.mark.usefixtures("mock_llm")
+def test_worker_evaluates_then_writes_insights(memory_conn, mock_tagger_output, mock_scene) -> None:
+    create_input(memory_conn, "in-1", None, "hash-1", "RAG report")
+    save_tagger_output(memory_conn, "in-1", mock_tagger_output)
+    save_scene(memory_conn, "in-1", mock_scene)
+    enqueue_job(memory_conn, "evaluate", {"scene_id": mock_scene.scene_id, "answer": "my answer"})
+
+    summary = run_worker(memory_conn, once=True)
+
+    assert summary.done == 2
+    response = get_response_by_scene(memory_conn, mock_scene.scene_id)
+    assert response["answer_text"] == "my answer" and response["perf_json"]
+    assert get_review_state(memory_conn, mock_scene.scene_id) is not None
+    assert len(get_insights(memory_conn)) == 1
+
+
+@pytest.mark.usefixtures("mock_llm")
+def test_follow_up_jobs_get_the_configured_attempts(
+    memory_conn, monkeypatch: pytest.MonkeyPatch, mock_scene
+) -> None:
+    monkeypatch.setattr(config_module, "_settings", Settings(worker_max_attempts=9))
+    create_input(memory_conn, "in-1", None, "hash-1", "RAG report")
+    enqueue_job(memory_conn, "tag", {"input_id": "in-1", "generate": True})
+    run_worker(memory_conn, once=True, kinds=("tag",))
+    save_scene(memory_conn, "in-1", mock_scene)
+    enqueue_job(memory_conn, "evaluate", {"scene_id": mock_scene.scene_id, "answer": "my answer"})
+    run_worker(memory_conn, once=True, kinds=("evaluate",))
+
+    rows = memory_conn.execute("SELECT kind, max_attempts FROM jobs ORDER BY id").fetchall()
+    assert [tuple(row) for row in rows] == [("generate", 9), ("insight", 9)]
+
+
+def test_worker_retries_llm_errors_and_dead_letters_missing_rows(memory_conn) -> None:
+    create_input(memory_conn, "in-1", None, "hash-1", "RAG report")
+    enqueue_job(memory_conn, "tag", {"input_id": "in-1"})
+    enqueue_job(memory_conn, "tag", {"input_id": "missing"})
+
+    with patch("openpraxis.nodes.tagger.tagger_node", side_effect=RuntimeError("HTTP 503")):
+        summary = run_worker(memory_conn, once=True, backoff_base_seconds=60)
+
+    assert (summary.done, summary.retried, summary.dead) == (0, 1, 1)
+    assert get_job_counts(memory_conn) == {"queued": 1, "dead": 1}
+    assert "not found" in get_dead_jobs(memory_conn)[0]["last_error"]
+    # The retry is backed off, so an immediate second pass finds nothing ready.
+    assert run_worker(memory_conn, once=True).done == 0